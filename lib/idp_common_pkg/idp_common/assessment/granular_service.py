@@ -1496,7 +1496,8 @@ class GranularAssessmentService:
                     continue
 
                 page = document.pages[page_id]
-                image_uri = page.image_uri
+                # Use the variant OCR wrote for this size, if any
+                image_uri = page.get_image_uri(target_width, target_height)
                 # Just pass the values directly - prepare_image handles empty strings/None
                 image_content = image.prepare_image(
                     image_uri, target_width, target_height
@@ -3,7 +3,28 @@
 
 """Bedrock integration module for IDP Common package."""
 
-from .client import BedrockClient, invoke_model, default_client
+from .client import BedrockClient, StreamAborted, invoke_model, default_client
+from .async_client import AsyncBedrockClient, get_async_client, invoke_model_async
+from .rate_limiter import (
+    DynamoDBRateLimiter,
+    RateLimiter,
+    TokenBucketRateLimiter,
+    configure_rate_limits,
+    get_rate_limiter,
+)
+from .batch import (
+    BatchInferenceJob,
+    BatchRecordError,
+    BedrockBatchRunner,
+    LocalBatchRunner,
+)
+from .router import ModelRouter, Target, configure_routing, get_router
+from .response_cache import (
+    ResponseCache,
+    configure_response_cache,
+    create_response_store,
+    get_response_cache,
+)
 
 # Add version info
 __version__ = "0.1.0"
@@ -11,8 +32,29 @@ __version__ = "0.1.0"
 # Export the public API
 __all__ = [
     "BedrockClient",
+    "StreamAborted",
     "invoke_model",
-    "default_client"
+    "default_client",
+    "AsyncBedrockClient",
+    "get_async_client",
+    "invoke_model_async",
+    "DynamoDBRateLimiter",
+    "RateLimiter",
+    "TokenBucketRateLimiter",
+    "configure_rate_limits",
+    "get_rate_limiter",
+    "ModelRouter",
+    "Target",
+    "configure_routing",
+    "get_router",
+    "BatchInferenceJob",
+    "BatchRecordError",
+    "BedrockBatchRunner",
+    "LocalBatchRunner",
+    "ResponseCache",
+    "configure_response_cache",
+    "create_response_store",
+    "get_response_cache",
 ]
 
 # Re-export key functions from the default client for backward compatibility
@@ -0,0 +1,590 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Asyncio-native Bedrock client.
+
+``BedrockClient`` calls ``converse`` through boto3, so concurrent requests
+need one OS thread each. ``AsyncBedrockClient`` sends the same SigV4-signed
+``Converse`` requests over a shared aiohttp connection pool, so thousands of
+in-flight calls cost coroutines instead of threads.
+
+Request building (cachePoint tags, parameter conversion, 1M context models,
+guardrails), retries with exponential backoff, metrics, metering, client-side
+rate limiting and the response cache behave exactly like ``BedrockClient``::
+
+    async with AsyncBedrockClient() as client:
+        result = await client.invoke_model_async(
+            model_id="us.amazon.nova-pro-v1:0",
+            system_prompt="...",
+            content=[{"text": "..."}],
+            context="Classification",
+        )
+
+Requires the optional ``aiohttp`` dependency (``idp_common[async]``).
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote
+
+import boto3
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.exceptions import ClientError
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+    URL = None
+
+# Whether the optional aiohttp dependency is installed
+ASYNC_CLIENT_AVAILABLE = aiohttp is not None
+
+from ..utils.resilience import RetryPolicy
+from .client import (
+    DEFAULT_INITIAL_BACKOFF,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    RETRYABLE_ERROR_CODES,
+    BedrockClient,
+)
+from .rate_limiter import estimate_input_tokens, get_rate_limiter
+from .response_cache import ResponseCache, compute_cache_key, get_response_cache
+from .router import RoutedRequest
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open to the Bedrock runtime endpoint
+DEFAULT_MAX_CONNECTIONS = 1000
+
+# Same timeouts as the boto3 client
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 300
+
+# Timeouts and connection errors are retried like throttling
+RETRYABLE_NETWORK_ERRORS = (asyncio.TimeoutError,) + (
+    (aiohttp.ClientConnectionError,) if aiohttp is not None else ()
+)
+
+
+def _to_json(value: Any) -> Any:
+    """Convert converse parameters to their JSON wire format (bytes as base64)."""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+
+class AsyncBedrockClient(BedrockClient):
+    """Bedrock client that invokes models with asyncio and aiohttp."""
+
+    def __init__(
+        self,
+        region: Optional[str] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        metrics_enabled: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
+        """
+        Initialize an async Bedrock client.
+
+        Args:
+            region: AWS region (defaults to AWS_REGION env var or the boto3 default)
+            max_retries: Maximum number of retry attempts
+            initial_backoff: Initial backoff time in seconds
+            max_backoff: Maximum backoff time in seconds
+            metrics_enabled: Whether to publish metrics
+            response_cache: Optional cache for temperature 0 responses
+                (defaults to the process-wide cache from get_response_cache)
+            retry_policy: Optional retry budget, circuit breaker and hedging policy
+                (defaults to the process-wide "bedrock" policy from get_retry_policy)
+            max_connections: Maximum concurrent connections to Bedrock
+        """
+        super().__init__(
+            region=region,
+            max_retries=max_retries,
+            initial_backoff=initial_backoff,
+            max_backoff=max_backoff,
+            metrics_enabled=metrics_enabled,
+            response_cache=response_cache,
+            retry_policy=retry_policy,
+        )
+        self.max_connections = max_connections
+        self._boto_session = boto3.Session(region_name=self.region)
+        self.region = self.region or self._boto_session.region_name or "us-east-1"
+        # Sessions are bound to the event loop that created them; each is kept
+        # with the task that closes it when the loop shuts down
+        self._sessions = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self) -> "AsyncBedrockClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool of the running event loop."""
+        entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            session, closer = entry
+            closer.cancel()
+            if not session.closed:
+                await session.close()
+
+    async def _close_with_loop(
+        self, loop: asyncio.AbstractEventLoop, session: "aiohttp.ClientSession"
+    ) -> None:
+        """
+        Wait until cancelled, then close the session.
+
+        asyncio.run cancels pending tasks before closing its loop, so sessions
+        are closed even when callers never call close().
+        """
+        try:
+            await loop.create_future()
+        finally:
+            entry = self._sessions.get(loop)
+            if entry is not None and entry[0] is session:
+                del self._sessions[loop]
+            if not session.closed:
+                await session.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the HTTP session of the running event loop, creating it if needed."""
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for AsyncBedrockClient. "
+                "Install it with: pip install 'idp_common[async]'"
+            )
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(loop)
+        if entry is not None and not entry[0].closed:
+            return entry[0]
+        if entry is not None:
+            entry[1].cancel()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(
+                connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+            ),
+        )
+        closer = loop.create_task(self._close_with_loop(loop, session))
+        self._sessions[loop] = (session, closer)
+        return session
+
+    def _sign_request(
+        self, url: str, body: bytes, region: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Sign a converse request with SigV4.
+
+        Args:
+            url: Request URL with the model ID percent-encoded
+            body: JSON request body
+            region: Region of the endpoint (defaults to the client's region)
+
+        Returns:
+            Request headers including the signature
+        """
+        credentials = self._boto_session.get_credentials()
+        if credentials is None:
+            raise ValueError("No AWS credentials available to sign Bedrock requests")
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=body,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        SigV4Auth(
+            credentials.get_frozen_credentials(), "bedrock", region or self.region
+        ).add_auth(request)
+        return dict(request.headers.items())
+
+    async def _converse(
+        self, converse_params: Dict[str, Any], region: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Call the Converse API.
+
+        Args:
+            converse_params: Parameters for the Bedrock converse API call
+            region: Region to call (defaults to the client's region)
+
+        Returns:
+            Converse response in the same shape boto3 returns
+
+        Raises:
+            ClientError: If Bedrock returns an error response
+        """
+        region = region or self.region
+        params = dict(converse_params)
+        model_id = params.pop("modelId")
+        url = (
+            f"https://bedrock-runtime.{region}.amazonaws.com"
+            f"/model/{quote(model_id, safe='')}/converse"
+        )
+        body = json.dumps(_to_json(params)).encode("utf-8")
+        headers = self._sign_request(url, body, region)
+
+        session = self._get_session()
+        # The URL is already encoded exactly as signed
+        async with session.post(
+            URL(url, encoded=True), data=body, headers=headers
+        ) as http_response:
+            payload = await http_response.read()
+            metadata = {
+                "RequestId": http_response.headers.get("x-amzn-RequestId", ""),
+                "HTTPStatusCode": http_response.status,
+            }
+            try:
+                data = json.loads(payload) if payload else {}
+            except ValueError:
+                data = {"message": payload.decode("utf-8", errors="replace")}
+
+            if http_response.status >= 300:
+                error_type = http_response.headers.get("x-amzn-ErrorType") or data.get(
+                    "__type", ""
+                )
+                # e.g. "ThrottlingException:http://internal.amazon.com/coral/..."
+                error_code = error_type.split(":")[0].split("#")[-1] or str(
+                    http_response.status
+                )
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": error_code,
+                            "Message": data.get("message") or data.get("Message", ""),
+                        },
+                        "ResponseMetadata": metadata,
+                    },
+                    "Converse",
+                )
+
+        data["ResponseMetadata"] = metadata
+        return data
+
+    async def invoke_model_async(
+        self,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None,
+        max_retries: Optional[int] = None,
+        context: str = "Unspecified",
+    ) -> Dict[str, Any]:
+        """
+        Invoke a Bedrock model with retry logic without blocking the event loop.
+
+        Args:
+            model_id: The Bedrock model ID (e.g., 'anthropic.claude-3-sonnet-20240229-v1:0')
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference (float or string)
+            top_k: Optional top_k parameter (float or string)
+            top_p: Optional top_p parameter (float or string)
+            max_tokens: Optional max_tokens parameter (int or string)
+            max_retries: Optional override for the instance's max_retries setting
+            context: Context prefix for metering key
+
+        Returns:
+            Bedrock response object with metering information
+        """
+        self._put_metric("BedrockRequestsTotal", 1)
+
+        effective_max_retries = (
+            max_retries if max_retries is not None else self.max_retries
+        )
+
+        converse_params = self._build_converse_params(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=content,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+        )
+
+        # Cache stores make blocking calls, so they run in the default executor
+        loop = asyncio.get_running_loop()
+        response_cache = self.response_cache or get_response_cache()
+        cache_key = None
+        if (
+            response_cache is not None
+            and converse_params["inferenceConfig"]["temperature"] == 0
+        ):
+            cache_key = compute_cache_key(model_id, converse_params)
+            cached_response = await loop.run_in_executor(
+                None, response_cache.lookup, cache_key
+            )
+            if cached_response is not None:
+                logger.info(f"Bedrock response cache hit for {model_id} ({context})")
+                self._put_metric("BedrockCacheHits", 1)
+                return self._cached_response_with_metering(
+                    cached_response, model_id, context
+                )
+            self._put_metric("BedrockCacheMisses", 1)
+
+        def build_params(target_model_id: str) -> Dict[str, Any]:
+            if target_model_id == model_id:
+                return converse_params
+            return self._build_converse_params(
+                model_id=target_model_id,
+                system_prompt=system_prompt,
+                content=content,
+                temperature=temperature,
+                top_k=top_k,
+                top_p=top_p,
+                max_tokens=max_tokens,
+            )
+
+        routing = self._get_routing(model_id, context, build_params)
+        result = await self._invoke_with_retry_async(
+            model_id=model_id,
+            converse_params=converse_params,
+            max_retries=effective_max_retries,
+            context=context,
+            routing=routing,
+        )
+
+        if cache_key is not None:
+            if routing is not None and routing.target.model_id != model_id:
+                # A fallback model served the request; file the response under
+                # that model's key so it is never returned for the requested one
+                cache_key = compute_cache_key(routing.target.model_id, routing.params)
+            await loop.run_in_executor(
+                None,
+                response_cache.save,
+                cache_key,
+                {
+                    k: v
+                    for k, v in result["response"].items()
+                    if k != "ResponseMetadata"
+                },
+            )
+
+        return result
+
+    async def _invoke_with_retry_async(
+        self,
+        model_id: str,
+        converse_params: Dict[str, Any],
+        max_retries: int,
+        context: str = "Unspecified",
+        routing: Optional[RoutedRequest] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call converse, retrying throttling and timeout errors with backoff.
+
+        Args:
+            model_id: The Bedrock model ID
+            converse_params: Parameters for the Bedrock converse API call
+            max_retries: Maximum number of retry attempts
+            context: Context prefix for metering key
+            routing: Optional routing that picks the target of each attempt
+
+        Returns:
+            Bedrock response object with metering information
+
+        Raises:
+            Exception: The last exception encountered if max retries are exceeded
+                or the retry budget is exhausted
+            CircuitOpenError: If the circuit for the model is open
+        """
+        request_start_time = time.time()
+        retry_policy = self._get_retry_policy()
+        retry_policy.record_call()
+        retry_count = 0
+        while True:
+            target = None
+            converse_kwargs = {}
+            if routing is not None:
+                target, converse_params = routing.next_target()
+                model_id = target.model_id
+                converse_kwargs = {"region": target.region}
+
+            self._check_circuit(retry_policy, model_id)
+            try:
+                if target is not None:
+                    logger.info(f"Routing {context} request to {target}")
+                self._log_request(converse_params, retry_count, max_retries)
+
+                rate_limiter = get_rate_limiter(model_id)
+                reservation = None
+                if rate_limiter is not None:
+                    reservation = await self._reserve_rate_limit_async(
+                        rate_limiter, converse_params
+                    )
+
+                attempt_start_time = time.time()
+                try:
+                    response = await retry_policy.call_async(
+                        model_id,
+                        lambda: self._converse(converse_params, **converse_kwargs),
+                    )
+                except BaseException:
+                    if reservation is not None:
+                        # Failed (or cancelled) attempts give their tokens back
+                        rate_limiter.reconcile(reservation, 0)
+                    raise
+                if reservation is not None:
+                    usage = response.get("usage", {})
+                    rate_limiter.reconcile(
+                        reservation,
+                        usage.get("inputTokens", 0) + usage.get("outputTokens", 0),
+                    )
+                retry_policy.record_success(model_id, time.time() - attempt_start_time)
+                if target is not None:
+                    routing.router.record_success(
+                        target, time.time() - attempt_start_time
+                    )
+
+                return self._response_with_metering(
+                    model_id=model_id,
+                    response=response,
+                    attempt_start_time=attempt_start_time,
+                    retry_count=retry_count,
+                    request_start_time=request_start_time,
+                    context=context,
+                )
+
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                error_message = e.response["Error"]["Message"]
+
+                if error_code not in RETRYABLE_ERROR_CODES:
+                    retry_policy.record_success(model_id)
+                    logger.error(
+                        f"Non-retryable Bedrock error: {error_code} - {error_message}"
+                    )
+                    self._put_metric("BedrockRequestsFailed", 1)
+                    self._put_metric("BedrockNonRetryableErrors", 1)
+                    raise
+
+                self._put_metric("BedrockThrottles", 1)
+                retry_policy.record_failure(model_id)
+                if retry_count >= max_retries:
+                    logger.error(
+                        f"Max retries ({max_retries}) exceeded. Last error: {error_message}"
+                    )
+                    self._put_metric("BedrockRequestsFailed", 1)
+                    self._put_metric("BedrockMaxRetriesExceeded", 1)
+                    raise
+                if not self._retry_allowed(retry_policy):
+                    raise
+
+                backoff = self._calculate_backoff(retry_count)
+                if self._reroute_after_failure(routing, target, throttled=True):
+                    backoff = 0
+                logger.warning(
+                    f"Bedrock throttling occurred (attempt {retry_count + 1}/{max_retries}). "
+                    f"Error: {error_message}. "
+                    f"Backing off for {backoff:.2f}s"
+                )
+
+            except RETRYABLE_NETWORK_ERRORS as e:
+                error_message = str(e) or type(e).__name__
+                self._put_metric("BedrockTimeouts", 1)
+                retry_policy.record_failure(model_id)
+                if retry_count >= max_retries:
+                    logger.error(
+                        f"Max retries ({max_retries}) exceeded. Last timeout error: {error_message}"
+                    )
+                    self._put_metric("BedrockRequestsFailed", 1)
+                    self._put_metric("BedrockMaxRetriesExceeded", 1)
+                    raise
+                if not self._retry_allowed(retry_policy):
+                    raise
+
+                backoff = self._calculate_backoff(retry_count)
+                if self._reroute_after_failure(routing, target, throttled=False):
+                    backoff = 0
+                logger.warning(
+                    f"Bedrock timeout occurred (attempt {retry_count + 1}/{max_retries}). "
+                    f"Error: {error_message}. "
+                    f"Backing off for {backoff:.2f}s"
+                )
+
+            except Exception as e:
+                logger.error(f"Unexpected Bedrock error: {str(e)}", exc_info=True)
+                self._put_metric("BedrockRequestsFailed", 1)
+                self._put_metric("BedrockUnexpectedErrors", 1)
+                raise
+
+            await asyncio.sleep(backoff)
+            retry_count += 1
+
+    async def _reserve_rate_limit_async(
+        self, rate_limiter, converse_params: Dict[str, Any]
+    ):
+        """
+        Reserve rate limit budget for one converse attempt, waiting if necessary.
+
+        Args:
+            rate_limiter: Rate limiter for the model
+            converse_params: Parameters for the Bedrock converse API call
+
+        Returns:
+            Reservation to reconcile with the actual token usage
+        """
+        wait_start_time = time.time()
+        reservation = await rate_limiter.acquire_async(
+            estimate_input_tokens(converse_params)
+        )
+        wait = time.time() - wait_start_time
+        if wait > 0.01:
+            logger.info(
+                f"Waited {wait:.2f}s for rate limit budget for {rate_limiter.model_id}"
+            )
+            self._put_metric("BedrockRateLimitWait", wait * 1000, "Milliseconds")
+        return reservation
+
+
+_default_async_client: Optional[AsyncBedrockClient] = None
+
+
+def get_async_client() -> AsyncBedrockClient:
+    """
+    Get the process-wide AsyncBedrockClient.
+
+    The client keeps one connection pool per event loop, so it can be shared
+    by services that each run their own loop; call close() before closing a
+    loop to release its connections.
+
+    Returns:
+        Shared AsyncBedrockClient
+    """
+    global _default_async_client
+    if _default_async_client is None:
+        _default_async_client = AsyncBedrockClient()
+    return _default_async_client
+
+
+async def invoke_model_async(*args, **kwargs) -> Dict[str, Any]:
+    """
+    Invoke a Bedrock model with the process-wide AsyncBedrockClient.
+
+    Takes the same arguments as AsyncBedrockClient.invoke_model_async.
+
+    Returns:
+        Bedrock response object with metering information
+    """
+    return await get_async_client().invoke_model_async(*args, **kwargs)
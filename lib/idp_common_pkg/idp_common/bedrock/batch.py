@@ -0,0 +1,520 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Bedrock batch inference for backlog processing.
+
+Replaying a large backlog through ``invoke_model`` pays on-demand prices and
+spends most of its time backing off from throttling. Bedrock batch inference
+(``CreateModelInvocationJob``) runs the same prompts from a JSONL file in S3 at
+a lower price and outside the on-demand quotas, returning the results hours
+later. A ``BatchInferenceJob`` collects the requests services would otherwise
+send with ``invoke_model``:
+
+1. Services add the keyword arguments they would pass to ``invoke_model``
+   under a record ID of their choosing (``ClassificationService.prepare_batch``,
+   ``ExtractionService.prepare_batch``)
+2. ``submit`` writes the records as JSONL, each request converted from the
+   converse format to the model's native request body, and starts the job
+3. Once ``get_status`` reports completion, ``get_results`` maps the output
+   records back to converse-shaped responses with metering, so services parse
+   them with the same code as on-demand responses (``complete_batch``)
+
+A job runs one model. Records are metered under
+``<context>/bedrock_batch/<model_id>`` so reporting can price them separately.
+``BedrockBatchRunner`` submits real jobs; ``LocalBatchRunner`` reads and writes
+the JSONL files itself, for tests and notebooks.
+"""
+
+import base64
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import boto3
+
+from .. import s3
+from ..utils import parse_s3_uri
+from .client import default_client
+
+logger = logging.getLogger(__name__)
+
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+# Claude requires max_tokens in the native request body
+DEFAULT_MAX_TOKENS = 4096
+NOVA_INFERENCE_FIELDS = {
+    "maxTokens": "max_new_tokens",
+    "topP": "top_p",
+    "topK": "top_k",
+}
+
+COMPLETED_STATUSES = {"Completed", "PartiallyCompleted"}
+FAILED_STATUSES = {"Failed", "Stopped", "Expired"}
+
+
+class BatchRecordError(Exception):
+    """A record of a batch job that produced no output."""
+
+    def __init__(self, record_id: str, code: str, message: str):
+        super().__init__(f"Batch record {record_id} failed ({code}): {message}")
+        self.record_id = record_id
+        self.code = code
+
+
+def _read_text(uri: str) -> str:
+    if uri.startswith("s3://"):
+        return s3.get_text_content(uri)
+    with open(uri, encoding="utf-8") as f:
+        return f.read()
+
+
+def _write_text(uri: str, text: str) -> None:
+    if uri.startswith("s3://"):
+        bucket, key = parse_s3_uri(uri)
+        s3.write_content(text, bucket, key, content_type="application/jsonl")
+        return
+    os.makedirs(os.path.dirname(uri) or ".", exist_ok=True)
+    with open(uri, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _output_uri(output_uri: str, job_id: str, input_uri: str) -> str:
+    """Location of the output file Bedrock writes for an input file."""
+    return f"{output_uri.rstrip('/')}/{job_id}/{os.path.basename(input_uri)}.out"
+
+
+def _encode_bytes(value: Any) -> str:
+    return base64.b64encode(value).decode("utf-8")
+
+
+def _anthropic_block(block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if "text" in block:
+        return {"type": "text", "text": block["text"]}
+    if "image" in block:
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": f"image/{block['image']['format']}",
+                "data": _encode_bytes(block["image"]["source"]["bytes"]),
+            },
+        }
+    if "cachePoint" in block:
+        return None
+    raise ValueError(f"Unsupported content for batch inference: {list(block)}")
+
+
+def _nova_block(block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if "text" in block:
+        return {"text": block["text"]}
+    if "image" in block:
+        return {
+            "image": {
+                "format": block["image"]["format"],
+                "source": {"bytes": _encode_bytes(block["image"]["source"]["bytes"])},
+            }
+        }
+    if "cachePoint" in block:
+        return None
+    raise ValueError(f"Unsupported content for batch inference: {list(block)}")
+
+
+def build_model_input(converse_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert converse parameters to the model's native request body.
+
+    Batch inference takes InvokeModel request bodies. cachePoint blocks are
+    dropped since batch requests are not prompt cached.
+
+    Args:
+        converse_params: Parameters built for the Bedrock converse API call
+
+    Returns:
+        The request body for the model
+
+    Raises:
+        ValueError: If the model family or content type is not supported
+    """
+    model_id = converse_params["modelId"]
+    inference = converse_params.get("inferenceConfig", {})
+    additional = converse_params.get("additionalModelRequestFields") or {}
+
+    if "anthropic" in model_id.lower():
+        body = {
+            "anthropic_version": ANTHROPIC_VERSION,
+            "max_tokens": additional.get("max_tokens", DEFAULT_MAX_TOKENS),
+            "system": "".join(
+                item["text"]
+                for item in converse_params.get("system", [])
+                if "text" in item
+            ),
+            "messages": [
+                {
+                    "role": message["role"],
+                    "content": [
+                        b
+                        for b in map(_anthropic_block, message["content"])
+                        if b is not None
+                    ],
+                }
+                for message in converse_params["messages"]
+            ],
+            "temperature": inference.get("temperature", 0.0),
+        }
+        if "topP" in inference:
+            body["top_p"] = inference["topP"]
+        if "top_k" in additional:
+            body["top_k"] = int(additional["top_k"])
+        if "anthropic_beta" in additional:
+            body["anthropic_beta"] = additional["anthropic_beta"]
+        return body
+
+    if "amazon" in model_id.lower():
+        # The native Nova request uses snake_case inference parameters
+        inference_config = {
+            NOVA_INFERENCE_FIELDS.get(name, name): value
+            for name, value in {
+                **inference,
+                **additional.get("inferenceConfig", {}),
+            }.items()
+        }
+        return {
+            "schemaVersion": "messages-v1",
+            "system": [
+                item for item in converse_params.get("system", []) if "text" in item
+            ],
+            "messages": [
+                {
+                    "role": message["role"],
+                    "content": [
+                        b for b in map(_nova_block, message["content"]) if b is not None
+                    ],
+                }
+                for message in converse_params["messages"]
+            ],
+            "inferenceConfig": inference_config,
+        }
+
+    raise ValueError(f"Batch inference is not supported for model {model_id}")
+
+
+def parse_model_output(model_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a native model response to the shape of a converse response.
+
+    Args:
+        model_output: The ``modelOutput`` of a batch output record
+
+    Returns:
+        Converse-shaped response with output, stopReason and usage
+    """
+    if "output" in model_output:
+        # Nova responses already use the converse shape
+        return model_output
+
+    usage = model_output.get("usage", {})
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    return {
+        "output": {
+            "message": {
+                "role": "assistant",
+                "content": [
+                    {"text": block.get("text", "")}
+                    for block in model_output.get("content", [])
+                    if block.get("type") == "text"
+                ],
+            }
+        },
+        "stopReason": model_output.get("stop_reason"),
+        "usage": {
+            "inputTokens": input_tokens,
+            "outputTokens": output_tokens,
+            "totalTokens": input_tokens + output_tokens,
+            "cacheReadInputTokens": usage.get("cache_read_input_tokens", 0),
+            "cacheWriteInputTokens": usage.get("cache_creation_input_tokens", 0),
+        },
+    }
+
+
+class BatchRunner(ABC):
+    """Base class for the services that run batch jobs."""
+
+    @abstractmethod
+    def submit(
+        self, job_name: str, model_id: str, input_uri: str, output_uri: str
+    ) -> str:
+        """Start a job and return its ID."""
+
+    @abstractmethod
+    def get_status(self, job_id: str) -> str:
+        """Get the Bedrock status of a job (InProgress, Completed, Failed, ...)."""
+
+
+class BedrockBatchRunner(BatchRunner):
+    """Runs jobs with Bedrock CreateModelInvocationJob."""
+
+    def __init__(self, role_arn: Optional[str] = None, region: Optional[str] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            role_arn: Service role Bedrock assumes to read the input and write
+                the output (default: BEDROCK_BATCH_ROLE_ARN env var)
+            region: AWS region (default: AWS_REGION env var)
+        """
+        self.role_arn = role_arn or os.environ.get("BEDROCK_BATCH_ROLE_ARN")
+        if not self.role_arn:
+            raise ValueError(
+                "A service role is required for batch inference (BEDROCK_BATCH_ROLE_ARN)"
+            )
+        self.region = region or os.environ.get("AWS_REGION")
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = boto3.client("bedrock", region_name=self.region)
+        return self._client
+
+    def submit(
+        self, job_name: str, model_id: str, input_uri: str, output_uri: str
+    ) -> str:
+        response = self.client.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=model_id,
+            inputDataConfig={
+                "s3InputDataConfig": {"s3Uri": input_uri, "s3InputFormat": "JSONL"}
+            },
+            outputDataConfig={"s3OutputDataConfig": {"s3Uri": output_uri}},
+        )
+        return response["jobArn"].split("/")[-1]
+
+    def get_status(self, job_id: str) -> str:
+        return self.client.get_model_invocation_job(jobIdentifier=job_id)["status"]
+
+
+class LocalBatchRunner(BatchRunner):
+    """
+    Runs jobs in process by passing each record to a function.
+
+    Reads the input JSONL and writes the output JSONL where Bedrock would, so
+    the whole batch flow can be exercised without AWS.
+    """
+
+    def __init__(self, respond: Callable[[str, Dict[str, Any]], Dict[str, Any]]):
+        """
+        Initialize the runner.
+
+        Args:
+            respond: Returns the native model output for (model_id, model_input);
+                an exception makes the record fail
+        """
+        self.respond = respond
+        self._statuses: Dict[str, str] = {}
+
+    def submit(
+        self, job_name: str, model_id: str, input_uri: str, output_uri: str
+    ) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        lines = []
+        for line in _read_text(input_uri).splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                record["modelOutput"] = self.respond(model_id, record["modelInput"])
+            except Exception as e:
+                record["error"] = {"errorCode": 400, "errorMessage": str(e)}
+            lines.append(json.dumps(record))
+        _write_text(_output_uri(output_uri, job_id, input_uri), "\n".join(lines) + "\n")
+        self._statuses[job_id] = "Completed"
+        return job_id
+
+    def get_status(self, job_id: str) -> str:
+        return self._statuses.get(job_id, "Failed")
+
+
+class BatchInferenceJob:
+    """Collects invoke_model requests for one model and runs them as a batch job."""
+
+    def __init__(
+        self,
+        model_id: str,
+        input_uri: str,
+        output_uri: str,
+        context: str = "Unspecified",
+        job_id: Optional[str] = None,
+        client=None,
+    ):
+        """
+        Initialize a batch job.
+
+        Args:
+            model_id: Model every record is sent to
+            input_uri: S3 URI (or local path) of the JSONL input file
+            output_uri: S3 URI (or local directory) prefix for the output
+            context: Metering context of the records
+            job_id: ID of an already submitted job, to collect its results
+            client: BedrockClient used to build requests (default: default_client)
+        """
+        self.model_id = model_id
+        self.input_uri = input_uri
+        self.output_uri = output_uri
+        self.context = context
+        self.job_id = job_id
+        self._client = client
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def add(
+        self,
+        record_id: str,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None,
+        context: Optional[str] = None,
+        **_: Any,
+    ) -> None:
+        """
+        Add a request, taking the same arguments as invoke_model.
+
+        Args:
+            record_id: Unique ID used to look up the result
+            model_id: The Bedrock model ID; must be the model of the job
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference
+            top_k: Optional top_k parameter
+            top_p: Optional top_p parameter
+            max_tokens: Optional max_tokens parameter
+            context: Metering context; must be the context of the job
+
+        Raises:
+            ValueError: If the model or context differ from the job's, or the
+                record ID was already added
+        """
+        if model_id != self.model_id:
+            raise ValueError(
+                f"Batch job for {self.model_id} cannot run requests for {model_id}"
+            )
+        if context is not None and context != self.context:
+            raise ValueError(
+                f"Batch job for {self.context} cannot run {context} requests"
+            )
+        if record_id in self.records:
+            raise ValueError(f"Duplicate batch record ID {record_id}")
+        converse_params = (self._client or default_client)._build_converse_params(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=content,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+        )
+        self.records[record_id] = build_model_input(converse_params)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def write_input(self) -> str:
+        """
+        Write the records as JSONL to the input URI.
+
+        Returns:
+            The input URI
+        """
+        lines = [
+            json.dumps({"recordId": record_id, "modelInput": model_input})
+            for record_id, model_input in self.records.items()
+        ]
+        _write_text(self.input_uri, "\n".join(lines) + "\n")
+        logger.info(f"Wrote {len(lines)} batch records to {self.input_uri}")
+        return self.input_uri
+
+    def submit(self, runner: BatchRunner, job_name: Optional[str] = None) -> str:
+        """
+        Write the input file and start the job.
+
+        Args:
+            runner: Runner that executes the job
+            job_name: Name of the job (default: generated)
+
+        Returns:
+            The job ID
+        """
+        if not self.records:
+            raise ValueError("Batch job has no records")
+        self.write_input()
+        job_name = job_name or f"idp-{self.context.lower()}-{uuid.uuid4().hex[:12]}"
+        self.job_id = runner.submit(
+            job_name, self.model_id, self.input_uri, self.output_uri
+        )
+        logger.info(
+            f"Submitted batch job {self.job_id} with {len(self.records)} {self.context} records for {self.model_id}"
+        )
+        return self.job_id
+
+    def get_status(self, runner: BatchRunner) -> str:
+        """
+        Get the status of the submitted job.
+
+        Args:
+            runner: Runner that executes the job
+
+        Returns:
+            Bedrock job status; results can be read once it is in
+            COMPLETED_STATUSES
+        """
+        if self.job_id is None:
+            raise ValueError("Batch job has not been submitted")
+        return runner.get_status(self.job_id)
+
+    def get_results(self) -> Dict[str, Union[Dict[str, Any], BatchRecordError]]:
+        """
+        Read the output of the completed job.
+
+        Returns:
+            Map of record ID to a Bedrock response object with metering
+            information (as returned by invoke_model), or a BatchRecordError
+            for records that failed. Records missing from the output are absent.
+        """
+        if self.job_id is None:
+            raise ValueError("Batch job has not been submitted")
+        output = _read_text(_output_uri(self.output_uri, self.job_id, self.input_uri))
+        results: Dict[str, Union[Dict[str, Any], BatchRecordError]] = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_id = record.get("recordId")
+            if "modelOutput" not in record:
+                error = record.get("error", {})
+                results[record_id] = BatchRecordError(
+                    record_id,
+                    str(error.get("errorCode", "Unknown")),
+                    error.get("errorMessage", "No output"),
+                )
+                continue
+            response = parse_model_output(record["modelOutput"])
+            results[record_id] = {
+                "response": response,
+                "metering": {
+                    f"{self.context}/bedrock_batch/{self.model_id}": response.get(
+                        "usage", {}
+                    )
+                },
+            }
+        failed = sum(isinstance(r, BatchRecordError) for r in results.values())
+        logger.info(
+            f"Batch job {self.job_id}: {len(results) - failed} records succeeded, {failed} failed"
+        )
+        return results
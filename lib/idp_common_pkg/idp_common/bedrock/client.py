@@ -16,7 +16,7 @@ import logging
 import copy
 import random
 import socket
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, List, Optional, Union, Tuple, Callable
 from botocore.config import Config
 from botocore.exceptions import ClientError, ReadTimeoutError, ConnectTimeoutError, EndpointConnectionError
 from urllib3.exceptions import ReadTimeoutError as Urllib3ReadTimeoutError
@@ -27,6 +27,11 @@ except ImportError:
     RequestsReadTimeout = Exception
     RequestsConnectTimeout = Exception
 
+from .rate_limiter import CHARS_PER_TOKEN, estimate_input_tokens, get_rate_limiter
+from .response_cache import ResponseCache, compute_cache_key, get_response_cache
+from .router import RoutedRequest, Target, get_router
+from ..utils.resilience import CircuitOpenError, RetryPolicy, get_retry_policy
+
 logger = logging.getLogger(__name__)
 
 # Default retry settings
@@ -34,6 +39,19 @@ DEFAULT_MAX_RETRIES = 7
 DEFAULT_INITIAL_BACKOFF = 2  # seconds
 DEFAULT_MAX_BACKOFF = 300    # 5 minutes
 
+# Converse error codes that are retried with backoff
+RETRYABLE_ERROR_CODES = [
+    'ThrottlingException', 
+    'ServiceQuotaExceededException', 
+    'RequestLimitExceeded', 
+    'TooManyRequestsException', 
+    'ServiceUnavailableException',
+    'ModelErrorException',
+    'RequestTimeout',
+    'RequestTimeoutException',
+    'ModelStreamErrorException'
+]
+
 
 # Models that support cachePoint functionality
 CACHEPOINT_SUPPORTED_MODELS = [
@@ -47,6 +65,27 @@ CACHEPOINT_SUPPORTED_MODELS = [
     "us.amazon.nova-pro-v1:0"
 ]
 
+class StreamAborted(Exception):
+    """
+    Raised when a stream handler rejects streamed output and the stream is closed.
+    
+    The handler's exception is the ``__cause__``. ``text`` holds the output
+    received before the stream was closed and ``metering`` its usage, which
+    is estimated since Bedrock only reports usage at the end of a stream.
+    """
+    
+    def __init__(self, text: str, usage: Dict[str, int]):
+        super().__init__(f"Stream aborted after {len(text)} characters")
+        self.text = text
+        self.usage = usage
+        self.metering: Dict[str, Any] = {}
+
+
+def _normalize_error_code(error_code: str) -> str:
+    """Capitalize lower-camel error codes (throttlingException -> ThrottlingException)."""
+    return error_code[:1].upper() + error_code[1:]
+
+
 class BedrockClient:
     """Client for interacting with Amazon Bedrock models."""
     
@@ -56,7 +95,9 @@ class BedrockClient:
         max_retries: int = DEFAULT_MAX_RETRIES,
         initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
         max_backoff: float = DEFAULT_MAX_BACKOFF,
-        metrics_enabled: bool = True
+        metrics_enabled: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None
     ):
         """
         Initialize a Bedrock client.
@@ -67,13 +108,21 @@ class BedrockClient:
             initial_backoff: Initial backoff time in seconds
             max_backoff: Maximum backoff time in seconds
             metrics_enabled: Whether to publish metrics
+            response_cache: Optional cache for temperature 0 responses
+                (defaults to the process-wide cache from get_response_cache)
+            retry_policy: Optional retry budget, circuit breaker and hedging policy
+                (defaults to the process-wide "bedrock" policy from get_retry_policy)
         """
         self.region = region or os.environ.get('AWS_REGION')
         self.max_retries = max_retries
         self.initial_backoff = initial_backoff
         self.max_backoff = max_backoff
         self.metrics_enabled = metrics_enabled
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy
         self._client = None
+        self._regional_clients = {}
+        self._default_region = None
         
     @property
     def client(self):
@@ -86,6 +135,49 @@ class BedrockClient:
             self._client = boto3.client('bedrock-runtime', region_name=self.region, config=config)
         return self._client
     
+    def _get_regional_client(self, region: str):
+        """
+        Get the Bedrock client for a routing target's region.
+        
+        Args:
+            region: AWS region of the target
+            
+        Returns:
+            The default client for the client's own region, otherwise a lazily
+            created client for that region
+        """
+        if region == self._get_region_name():
+            return self.client
+        if region not in self._regional_clients:
+            config = Config(connect_timeout=10, read_timeout=300)
+            self._regional_clients[region] = boto3.client('bedrock-runtime', region_name=region, config=config)
+        return self._regional_clients[region]
+    
+    def _get_region_name(self) -> str:
+        """Get the region requests go to when they are not routed elsewhere."""
+        if self.region:
+            return self.region
+        if self._default_region is None:
+            self._default_region = boto3.session.Session().region_name or 'us-west-2'
+        return self._default_region
+    
+    def _get_routing(self, model_id: str, context: str, build_params) -> Optional[RoutedRequest]:
+        """
+        Get the routing of a request if its stage has a routing pool.
+        
+        Args:
+            model_id: The model ID requested by the service
+            context: Metering context of the stage
+            build_params: Builds the converse parameters for a model ID
+            
+        Returns:
+            RoutedRequest, or None to send the request to model_id in this client's region
+        """
+        router = get_router(context, Target(self._get_region_name(), model_id))
+        if router is None:
+            return None
+        return RoutedRequest(router, build_params)
+    
     def __call__(
         self,
         model_id: str,
@@ -96,7 +188,8 @@ class BedrockClient:
         top_p: Optional[Union[float, str]] = None,
         max_tokens: Optional[Union[int, str]] = None,
         max_retries: Optional[int] = None,
-        context: str = "Unspecified"
+        context: str = "Unspecified",
+        stream_handler: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Make the instance callable with the same signature as the original function.
@@ -112,6 +205,8 @@ class BedrockClient:
             top_p: Optional top_p parameter (float or string)
             max_tokens: Optional max_tokens parameter (int or string)
             max_retries: Optional override for the instance's max_retries setting
+            context: Context prefix for metering key
+            stream_handler: Optional callback for text deltas (see invoke_model)
             
         Returns:
             Bedrock response object with metering information
@@ -128,7 +223,8 @@ class BedrockClient:
             top_p=top_p,
             max_tokens=max_tokens,
             max_retries=effective_max_retries,
-            context=context
+            context=context,
+            stream_handler=stream_handler
         )
     
     def _preprocess_content_for_cachepoint(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -197,7 +293,8 @@ class BedrockClient:
         top_p: Optional[Union[float, str]] = 0.1,
         max_tokens: Optional[Union[int, str]] = None,
         max_retries: Optional[int] = None,
-        context: str = "Unspecified"
+        context: str = "Unspecified",
+        stream_handler: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Invoke a Bedrock model with retry logic.
@@ -211,9 +308,19 @@ class BedrockClient:
             top_p: Optional top_p parameter (float or string)
             max_tokens: Optional max_tokens parameter (int or string)
             max_retries: Optional override for the instance's max_retries setting
+            context: Context prefix for metering key
+            stream_handler: Optional callback for each text delta. When set the
+                model is called with converse_stream; the returned response has
+                the same shape as a converse response. If the handler raises,
+                the stream is closed and StreamAborted is raised. A stream that
+                fails after output was delivered is only retried if the handler
+                has a reset() method, which is called before the retry
             
         Returns:
             Bedrock response object with metering information
+            
+        Raises:
+            StreamAborted: If stream_handler raised
         """
         # Track total requests
         self._put_metric('BedrockRequestsTotal', 1)
@@ -221,6 +328,109 @@ class BedrockClient:
         # Use instance max_retries if not overridden
         effective_max_retries = max_retries if max_retries is not None else self.max_retries
         
+        converse_params = self._build_converse_params(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=content,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens
+        )
+        
+        # Serve deterministic (temperature 0) requests from the response cache if enabled
+        response_cache = self.response_cache or get_response_cache()
+        cache_key = None
+        if response_cache is not None and converse_params["inferenceConfig"]["temperature"] == 0:
+            cache_key = compute_cache_key(model_id, converse_params)
+            cached_response = response_cache.lookup(cache_key)
+            if cached_response is not None:
+                logger.info(f"Bedrock response cache hit for {model_id} ({context})")
+                self._put_metric('BedrockCacheHits', 1)
+                result = self._cached_response_with_metering(cached_response, model_id, context)
+                if stream_handler is not None:
+                    # Replay the cached output as a single delta
+                    text = self.extract_text_from_response(result)
+                    try:
+                        stream_handler(text)
+                    except Exception as e:
+                        aborted = StreamAborted(text, {})
+                        aborted.metering = result["metering"]
+                        raise aborted from e
+                return result
+            self._put_metric('BedrockCacheMisses', 1)
+        
+        # Spread the request over the stage's routing pool if one is configured
+        def build_params(target_model_id: str) -> Dict[str, Any]:
+            if target_model_id == model_id:
+                return converse_params
+            return self._build_converse_params(
+                model_id=target_model_id,
+                system_prompt=system_prompt,
+                content=content,
+                temperature=temperature,
+                top_k=top_k,
+                top_p=top_p,
+                max_tokens=max_tokens
+            )
+        
+        routing = self._get_routing(model_id, context, build_params)
+        
+        # Start timing the entire request
+        request_start_time = time.time()
+        
+        # Call the recursive retry function
+        result = self._invoke_with_retry(
+            model_id=model_id,
+            converse_params=converse_params,
+            retry_count=0,
+            max_retries=effective_max_retries,
+            request_start_time=request_start_time,
+            context=context,
+            routing=routing,
+            stream_handler=stream_handler
+        )
+        
+        if cache_key is not None:
+            if routing is not None and routing.target.model_id != model_id:
+                # A fallback model served the request; file the response under
+                # that model's key so it is never returned for the requested one
+                cache_key = compute_cache_key(routing.target.model_id, routing.params)
+            response_cache.save(
+                cache_key,
+                {k: v for k, v in result["response"].items() if k != "ResponseMetadata"}
+            )
+        
+        return result
+
+    def _build_converse_params(
+        self,
+        model_id: str,
+        system_prompt: Union[str, List[Dict[str, str]]],
+        content: List[Dict[str, Any]],
+        temperature: Union[float, str] = 0.0,
+        top_k: Optional[Union[float, str]] = 5,
+        top_p: Optional[Union[float, str]] = 0.1,
+        max_tokens: Optional[Union[int, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the converse API parameters for a model invocation.
+        
+        Handles cachePoint tags, parameter type conversion, model-specific
+        parameter placement, 1M context models and guardrails.
+        
+        Args:
+            model_id: The Bedrock model ID
+            system_prompt: The system prompt as string or list of content objects
+            content: The content for the user message (can include text and images)
+            temperature: The temperature parameter for model inference (float or string)
+            top_k: Optional top_k parameter (float or string)
+            top_p: Optional top_p parameter (float or string)
+            max_tokens: Optional max_tokens parameter (int or string)
+            
+        Returns:
+            Parameters for the Bedrock converse API call
+        """
         # Format system prompt if needed
         if isinstance(system_prompt, str):
             formatted_system_prompt = [{"text": system_prompt}]
@@ -355,20 +565,127 @@ class BedrockClient:
         if guardrail_config:
             converse_params["guardrailConfig"] = guardrail_config
         
-        # Start timing the entire request
-        request_start_time = time.time()
+        return converse_params
+
+    def _cached_response_with_metering(
+        self,
+        cached_response: Dict[str, Any],
+        model_id: str,
+        context: str
+    ) -> Dict[str, Any]:
+        """
+        Wrap a cached response with metering that records the hit, not billed tokens.
         
-        # Call the recursive retry function
-        result = self._invoke_with_retry(
-            model_id=model_id,
-            converse_params=converse_params,
-            retry_count=0,
-            max_retries=effective_max_retries,
-            request_start_time=request_start_time,
-            context=context
-        )
+        Args:
+            cached_response: Response returned by the response cache
+            model_id: The Bedrock model ID
+            context: Metering context of the caller
+            
+        Returns:
+            Bedrock response object with metering information
+        """
+        usage = cached_response.get('usage', {})
+        return {
+            "response": cached_response,
+            "metering": {
+                f"{context}/bedrock_cache/{model_id}": {
+                    "hits": 1,
+                    "cachedInputTokens": usage.get('inputTokens', 0),
+                    "cachedOutputTokens": usage.get('outputTokens', 0)
+                }
+            }
+        }
+
+    def _response_with_metering(
+        self,
+        model_id: str,
+        response: Dict[str, Any],
+        attempt_start_time: float,
+        retry_count: int,
+        request_start_time: float,
+        context: str
+    ) -> Dict[str, Any]:
+        """
+        Record metrics for a successful converse call and attach metering data.
         
-        return result
+        Args:
+            model_id: The Bedrock model ID
+            response: Converse API response
+            attempt_start_time: Time when the successful attempt started
+            retry_count: Number of retries before the successful attempt
+            request_start_time: Time when the original request started
+            context: Metering context of the caller
+            
+        Returns:
+            Bedrock response object with metering information
+        """
+        # Calculate duration
+        duration = time.time() - attempt_start_time
+        
+        # Log response details, but sanitize large content
+        logger.info(f"Bedrock request successful after {retry_count + 1} attempts. Duration: {duration:.2f}s")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Response: {self._sanitize_response_for_logging(response)}")
+        logger.info(f"Token Usage: {response.get('usage')}")
+        # Track successful requests and latency
+        self._put_metric('BedrockRequestsSucceeded', 1)
+        self._put_metric('BedrockRequestLatency', duration * 1000, 'Milliseconds')
+        if retry_count > 0:
+            self._put_metric('BedrockRetrySuccess', 1)
+        
+        # Track token usage
+        if 'usage' in response:
+            inputTokens = response['usage'].get('inputTokens', 0)
+            outputTokens = response['usage'].get('outputTokens', 0)
+            total_tokens = response['usage'].get('totalTokens', 0)
+            cacheReadInputTokens = response['usage'].get('cacheReadInputTokens', 0)
+            cacheWriteInputTokens = response['usage'].get('cacheWriteInputTokens', 0)
+            self._put_metric('InputTokens', inputTokens)
+            self._put_metric('OutputTokens', outputTokens)
+            self._put_metric('TotalTokens', total_tokens)
+            self._put_metric('CacheReadInputTokens', cacheReadInputTokens)
+            self._put_metric('CacheWriteInputTokens', cacheWriteInputTokens)
+        
+        # Calculate total duration
+        total_duration = time.time() - request_start_time
+        self._put_metric('BedrockTotalLatency', total_duration * 1000, 'Milliseconds')
+        
+        # Create metering data
+        usage = response.get('usage', {})
+        return {
+            "response": response,
+            "metering": {
+                f"{context}/bedrock/{model_id}": {
+                    **usage
+                }
+            }
+        }
+
+    def _log_request(self, converse_params: Dict[str, Any], retry_count: int, max_retries: int):
+        """
+        Log the parameters of a converse attempt with image content sanitized.
+        
+        Args:
+            converse_params: Parameters for the Bedrock converse API call
+            retry_count: Current retry attempt (0-based)
+            max_retries: Maximum number of retry attempts
+        """
+        # Copying and sanitizing the messages (with their image bytes) is only
+        # worth it when the request is actually logged
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        # Log detailed request parameters
+        logger.info(f"Bedrock request attempt {retry_count + 1}/{max_retries}:")
+        logger.info(f"  - model: {converse_params['modelId']}")
+        logger.info(f"  - inferenceConfig: {converse_params['inferenceConfig']}")
+        logger.info(f"  - system: {converse_params['system']}")
+        logger.info(f"  - messages: {self._sanitize_messages_for_logging(converse_params.get('messages', []))}")
+        logger.info(f"  - additionalModelRequestFields: {converse_params['additionalModelRequestFields']}")
+        
+        # Log guardrail usage if configured
+        if "guardrailConfig" in converse_params:
+            logger.debug(f"  - guardrailConfig: {converse_params['guardrailConfig']}")
 
     def _invoke_with_retry(
         self,
@@ -378,7 +695,9 @@ class BedrockClient:
         max_retries: int,
         request_start_time: float,
         last_exception: Exception = None,
-        context: str = "Unspecified"
+        context: str = "Unspecified",
+        routing: Optional[RoutedRequest] = None,
+        stream_handler: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Recursive helper method to handle retries for Bedrock invocation.
@@ -389,99 +708,107 @@ class BedrockClient:
             max_retries: Maximum number of retry attempts
             request_start_time: Time when the original request started
             last_exception: The last exception encountered (for final error reporting)
+            context: Context prefix for metering key
+            routing: Optional routing that picks the target of each attempt
+            stream_handler: Optional callback for text deltas; uses converse_stream
             
         Returns:
             Bedrock response object with metering information
             
         Raises:
             Exception: The last exception encountered if max retries are exceeded
+                or the retry budget is exhausted
+            CircuitOpenError: If the circuit for the model is open
+            StreamAborted: If stream_handler raised
         """
+        bedrock_client = self.client
+        target = None
+        if routing is not None:
+            # Each attempt goes to the best healthy target of the pool
+            target, converse_params = routing.next_target()
+            model_id = target.model_id
+            bedrock_client = self._get_regional_client(target.region)
+        
+        retry_policy = self._get_retry_policy()
+        if retry_count == 0:
+            retry_policy.record_call()
+        self._check_circuit(retry_policy, model_id)
+        
+        # Tracks whether this attempt passed any output to the stream handler
+        deltas_delivered = []
+        
+        def deliver_delta(text: str) -> None:
+            deltas_delivered.append(True)
+            stream_handler(text)
+        
         try:
-            # Create a copy of the messages to sanitize for logging
-            sanitized_params = copy.deepcopy(converse_params)
-            if "messages" in sanitized_params:
-                sanitized_params["messages"] = self._sanitize_messages_for_logging(sanitized_params["messages"])
-            
-            # Log detailed request parameters
-            logger.info(f"Bedrock request attempt {retry_count + 1}/{max_retries}:")
-            logger.info(f"  - model: {converse_params['modelId']}")
-            logger.info(f"  - inferenceConfig: {converse_params['inferenceConfig']}")
-            logger.info(f"  - system: {converse_params['system']}")
-            logger.info(f"  - messages: {sanitized_params['messages']}")
-            logger.info(f"  - additionalModelRequestFields: {converse_params['additionalModelRequestFields']}")
-            
-            # Log guardrail usage if configured
-            if "guardrailConfig" in converse_params:
-                logger.debug(f"  - guardrailConfig: {converse_params['guardrailConfig']}")
+            if target is not None:
+                logger.info(f"Routing {context} request to {target}")
+            self._log_request(converse_params, retry_count, max_retries)
+            
+            # Wait for rate limit budget if the model has configured limits
+            rate_limiter = get_rate_limiter(model_id)
+            reservation = None
+            if rate_limiter is not None:
+                reservation = self._reserve_rate_limit(rate_limiter, converse_params)
             
             # Start timing this attempt
             attempt_start_time = time.time()
 
-            # Make the API call
-            response = self.client.converse(**converse_params)
-            
-            # Calculate duration
-            duration = time.time() - attempt_start_time
+            # Make the API call, hedged if the retry policy enables it
+            try:
+                if stream_handler is not None:
+                    response = self._converse_stream(bedrock_client, converse_params, deliver_delta)
+                else:
+                    response = retry_policy.call(
+                        model_id, lambda: bedrock_client.converse(**converse_params)
+                    )
+            except StreamAborted as e:
+                if reservation is not None:
+                    rate_limiter.reconcile(reservation, e.usage['totalTokens'])
+                raise
+            except Exception:
+                if reservation is not None:
+                    # Failed attempts give their tokens back
+                    rate_limiter.reconcile(reservation, 0)
+                raise
+            if reservation is not None:
+                usage = response.get('usage', {})
+                rate_limiter.reconcile(
+                    reservation, usage.get('inputTokens', 0) + usage.get('outputTokens', 0)
+                )
+            retry_policy.record_success(model_id, time.time() - attempt_start_time)
+            if target is not None:
+                routing.router.record_success(target, time.time() - attempt_start_time)
             
-            # Log response details, but sanitize large content
-            sanitized_response = self._sanitize_response_for_logging(response)
-            logger.info(f"Bedrock request successful after {retry_count + 1} attempts. Duration: {duration:.2f}s")
-            logger.debug(f"Response: {sanitized_response}")
-            logger.info(f"Token Usage: {response.get('usage')}")
-            # Track successful requests and latency
-            self._put_metric('BedrockRequestsSucceeded', 1)
-            self._put_metric('BedrockRequestLatency', duration * 1000, 'Milliseconds')
-            if retry_count > 0:
-                self._put_metric('BedrockRetrySuccess', 1)
-            
-            # Track token usage
-            if 'usage' in response:
-                inputTokens = response['usage'].get('inputTokens', 0)
-                outputTokens = response['usage'].get('outputTokens', 0)
-                total_tokens = response['usage'].get('totalTokens', 0)
-                cacheReadInputTokens = response['usage'].get('cacheReadInputTokens', 0)
-                cacheWriteInputTokens = response['usage'].get('cacheWriteInputTokens', 0)
-                self._put_metric('InputTokens', inputTokens)
-                self._put_metric('OutputTokens', outputTokens)
-                self._put_metric('TotalTokens', total_tokens)
-                self._put_metric('CacheReadInputTokens', cacheReadInputTokens)
-                self._put_metric('CacheWriteInputTokens', cacheWriteInputTokens)
-            
-            # Calculate total duration
-            total_duration = time.time() - request_start_time
-            self._put_metric('BedrockTotalLatency', total_duration * 1000, 'Milliseconds')
-            
-            # Create metering data
-            usage = response.get('usage', {})
-            response_with_metering = {
-                "response": response,
-                "metering": {
-                    f"{context}/bedrock/{model_id}": {
-                        **usage
-                    }
-                }
-            }
+            # Metering records the model that actually served the request
+            return self._response_with_metering(
+                model_id=model_id,
+                response=response,
+                attempt_start_time=attempt_start_time,
+                retry_count=retry_count,
+                request_start_time=request_start_time,
+                context=context
+            )
             
-            return response_with_metering
+        except StreamAborted as e:
+            # The caller rejected the output; meter what was generated so far
+            logger.warning(f"Bedrock stream aborted by handler: {e.__cause__}")
+            self._put_metric('BedrockStreamsAborted', 1)
+            # The model itself answered, so this counts as a success for the circuit
+            self._get_retry_policy().record_success(model_id)
+            e.metering = {f"{context}/bedrock/{model_id}": e.usage}
+            raise
             
         except ClientError as e:
             # Handle boto3/botocore client errors (have response structure)
-            error_code = e.response['Error']['Code']
+            # Errors inside a stream arrive with lower-camel codes (throttlingException)
+            error_code = _normalize_error_code(e.response['Error']['Code'])
             error_message = e.response['Error']['Message']
             
-            retryable_errors = [
-                'ThrottlingException', 
-                'ServiceQuotaExceededException', 
-                'RequestLimitExceeded', 
-                'TooManyRequestsException', 
-                'ServiceUnavailableException',
-                'ModelErrorException',
-                'RequestTimeout',
-                'RequestTimeoutException'
-            ]
-            
-            if error_code in retryable_errors:
+            if error_code in RETRYABLE_ERROR_CODES:
                 self._put_metric('BedrockThrottles', 1)
+                retry_policy.record_failure(model_id)
                 
                 # Check if we've reached max retries
                 if retry_count >= max_retries:
@@ -489,9 +816,16 @@ class BedrockClient:
                     self._put_metric('BedrockRequestsFailed', 1)
                     self._put_metric('BedrockMaxRetriesExceeded', 1)
                     raise
+                if not self._retry_allowed(retry_policy):
+                    raise
+                if deltas_delivered and not self._restart_stream(stream_handler):
+                    self._put_metric('BedrockRequestsFailed', 1)
+                    raise
                 
-                # Calculate backoff time
+                # Calculate backoff time, unless another routing target can take the retry
                 backoff = self._calculate_backoff(retry_count)
+                if self._reroute_after_failure(routing, target, throttled=True):
+                    backoff = 0
                 logger.warning(f"Bedrock throttling occurred (attempt {retry_count + 1}/{max_retries}). "
                              f"Error: {error_message}. "
                              f"Backing off for {backoff:.2f}s")
@@ -507,9 +841,13 @@ class BedrockClient:
                     max_retries=max_retries,
                     request_start_time=request_start_time,
                     last_exception=e,
-                    context=context
+                    context=context,
+                    routing=routing,
+                    stream_handler=stream_handler
                 )
             else:
+                # The model responded, so the error says nothing about its health
+                retry_policy.record_success(model_id)
                 logger.error(f"Non-retryable Bedrock error: {error_code} - {error_message}")
                 self._put_metric('BedrockRequestsFailed', 1)
                 self._put_metric('BedrockNonRetryableErrors', 1)
@@ -521,6 +859,7 @@ class BedrockClient:
             error_message = str(e)
             
             self._put_metric('BedrockTimeouts', 1)
+            retry_policy.record_failure(model_id)
             
             # Check if we've reached max retries
             if retry_count >= max_retries:
@@ -528,9 +867,16 @@ class BedrockClient:
                 self._put_metric('BedrockRequestsFailed', 1)
                 self._put_metric('BedrockMaxRetriesExceeded', 1)
                 raise
+            if not self._retry_allowed(retry_policy):
+                raise
+            if deltas_delivered and not self._restart_stream(stream_handler):
+                self._put_metric('BedrockRequestsFailed', 1)
+                raise
             
-            # Calculate backoff time
+            # Calculate backoff time, unless another routing target can take the retry
             backoff = self._calculate_backoff(retry_count)
+            if self._reroute_after_failure(routing, target, throttled=False):
+                backoff = 0
             logger.warning(f"Bedrock timeout occurred (attempt {retry_count + 1}/{max_retries}). "
                          f"Error: {error_message}. "
                          f"Backing off for {backoff:.2f}s")
@@ -546,7 +892,9 @@ class BedrockClient:
                 max_retries=max_retries,
                 request_start_time=request_start_time,
                 last_exception=e,
-                context=context
+                context=context,
+                routing=routing,
+                stream_handler=stream_handler
             )
             
         except Exception as e:
@@ -558,6 +906,94 @@ class BedrockClient:
             raise
 
     
+    def _restart_stream(self, stream_handler: Callable[[str], None]) -> bool:
+        """
+        Prepare a stream handler that already received output for a retry.
+        
+        A retried stream starts over, so the handler must discard what it has
+        seen. Handlers with a ``reset()`` method are reset; others cannot be
+        retried without receiving the output twice.
+        
+        Args:
+            stream_handler: Callback for text deltas
+            
+        Returns:
+            True if the request can be retried
+        """
+        reset = getattr(stream_handler, 'reset', None)
+        if reset is None:
+            logger.warning("Not retrying: the stream handler already received output and has no reset()")
+            return False
+        reset()
+        return True
+    
+    def _converse_stream(
+        self,
+        bedrock_client,
+        converse_params: Dict[str, Any],
+        stream_handler: Callable[[str], None]
+    ) -> Dict[str, Any]:
+        """
+        Call converse_stream, passing text deltas to the handler as they arrive.
+        
+        Args:
+            bedrock_client: Bedrock runtime client to call
+            converse_params: Parameters for the Bedrock converse API call
+            stream_handler: Callback for each text delta
+            
+        Returns:
+            Response in the same shape converse returns
+            
+        Raises:
+            StreamAborted: If the handler raised; the stream is closed
+        """
+        start_time = time.time()
+        response = bedrock_client.converse_stream(**converse_params)
+        stream = response['stream']
+        blocks: Dict[int, Dict[str, Any]] = {}
+        text_parts: List[str] = []
+        result = {
+            "output": {"message": {"role": "assistant", "content": []}},
+            "ResponseMetadata": response.get('ResponseMetadata', {})
+        }
+        
+        for event in stream:
+            if 'contentBlockDelta' in event:
+                index = event['contentBlockDelta'].get('contentBlockIndex', 0)
+                delta = event['contentBlockDelta'].get('delta', {})
+                if 'text' in delta:
+                    block = blocks.setdefault(index, {"text": ""})
+                    block["text"] += delta['text']
+                    if not text_parts:
+                        self._put_metric('BedrockTimeToFirstToken', (time.time() - start_time) * 1000, 'Milliseconds')
+                    text_parts.append(delta['text'])
+                    try:
+                        stream_handler(delta['text'])
+                    except Exception as e:
+                        stream.close()
+                        text = "".join(text_parts)
+                        raise StreamAborted(text, {
+                            "inputTokens": estimate_input_tokens(converse_params),
+                            "outputTokens": len(text) // CHARS_PER_TOKEN,
+                            "totalTokens": estimate_input_tokens(converse_params) + len(text) // CHARS_PER_TOKEN
+                        }) from e
+                elif 'reasoningContent' in delta:
+                    reasoning = blocks.setdefault(
+                        index, {"reasoningContent": {"reasoningText": {"text": ""}}}
+                    )["reasoningContent"]["reasoningText"]
+                    if 'text' in delta['reasoningContent']:
+                        reasoning["text"] += delta['reasoningContent']['text']
+                    if 'signature' in delta['reasoningContent']:
+                        reasoning["signature"] = delta['reasoningContent']['signature']
+            elif 'messageStop' in event:
+                result["stopReason"] = event['messageStop'].get('stopReason')
+            elif 'metadata' in event:
+                result["usage"] = event['metadata'].get('usage', {})
+                result["metrics"] = event['metadata'].get('metrics', {})
+        
+        result["output"]["message"]["content"] = [blocks[i] for i in sorted(blocks)]
+        return result
+    
     def get_guardrail_config(self) -> Optional[Dict[str, str]]:
         """
         Get guardrail configuration from environment if available.
@@ -658,20 +1094,31 @@ class BedrockClient:
             
         Raises:
             Exception: The last exception encountered if max retries are exceeded
+                or the retry budget is exhausted
+            CircuitOpenError: If the circuit for the model is open
         """
+        retry_policy = self._get_retry_policy()
+        if retry_count == 0:
+            retry_policy.record_call()
+        self._check_circuit(retry_policy, model_id, 'BedrockEmbedding')
+        
         try:
             logger.info(f"Bedrock embedding request attempt {retry_count + 1}/{max_retries}:")
             logger.debug(f"  - model: {model_id}")
             logger.debug(f"  - input text length: {len(normalized_text)} characters")
             
             attempt_start_time = time.time()
-            response = self.client.invoke_model(
-                modelId=model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=request_body
+            response = retry_policy.call(
+                model_id,
+                lambda: self.client.invoke_model(
+                    modelId=model_id,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=request_body
+                )
             )
             duration = time.time() - attempt_start_time
+            retry_policy.record_success(model_id, duration)
             
             # Extract the embedding vector from response
             response_body = json.loads(response["body"].read())
@@ -708,6 +1155,7 @@ class BedrockClient:
             
             if error_code in retryable_errors:
                 self._put_metric('BedrockEmbeddingThrottles', 1)
+                retry_policy.record_failure(model_id)
                 
                 # Check if we've reached max retries
                 if retry_count >= max_retries:
@@ -715,6 +1163,8 @@ class BedrockClient:
                     self._put_metric('BedrockEmbeddingRequestsFailed', 1)
                     self._put_metric('BedrockEmbeddingMaxRetriesExceeded', 1)
                     raise
+                if not self._retry_allowed(retry_policy, 'BedrockEmbedding'):
+                    raise
                 
                 # Calculate backoff time
                 backoff = self._calculate_backoff(retry_count)
@@ -735,6 +1185,7 @@ class BedrockClient:
                     last_exception=e
                 )
             else:
+                retry_policy.record_success(model_id)
                 logger.error(f"Non-retryable Bedrock error for embedding: {error_code} - {error_message}")
                 self._put_metric('BedrockEmbeddingRequestsFailed', 1)
                 self._put_metric('BedrockEmbeddingNonRetryableErrors', 1)
@@ -816,6 +1267,91 @@ class BedrockClient:
         
         return backoff_seconds + jitter
     
+    def _reserve_rate_limit(self, rate_limiter, converse_params: Dict[str, Any]):
+        """
+        Reserve rate limit budget for one converse attempt, waiting if necessary.
+        
+        Args:
+            rate_limiter: Rate limiter for the model
+            converse_params: Parameters for the Bedrock converse API call
+            
+        Returns:
+            Reservation to reconcile with the actual token usage
+        """
+        wait_start_time = time.time()
+        reservation = rate_limiter.acquire(estimate_input_tokens(converse_params))
+        wait = time.time() - wait_start_time
+        if wait > 0.01:
+            logger.info(f"Waited {wait:.2f}s for rate limit budget for {rate_limiter.model_id}")
+            self._put_metric('BedrockRateLimitWait', wait * 1000, 'Milliseconds')
+        return reservation
+    
+    def _reroute_after_failure(
+        self, routing: Optional[RoutedRequest], target: Optional[Target], throttled: bool
+    ) -> bool:
+        """
+        Record a failed attempt with the router.
+        
+        Args:
+            routing: Routing of the request, if any
+            target: Target of the failed attempt
+            throttled: Whether the attempt was throttled (otherwise it timed out)
+            
+        Returns:
+            True if another healthy target can take the retry right away
+        """
+        if routing is None:
+            return False
+        if throttled:
+            routing.router.record_throttle(target)
+        else:
+            routing.router.record_error(target)
+        if routing.router.has_alternative(target):
+            self._put_metric('BedrockRoutingFailovers', 1)
+            return True
+        return False
+    
+    def _get_retry_policy(self) -> RetryPolicy:
+        """Get the retry policy of this client, defaulting to the process-wide one."""
+        return self.retry_policy or get_retry_policy('bedrock')
+    
+    def _check_circuit(self, retry_policy: RetryPolicy, model_id: str, metric_prefix: str = 'Bedrock'):
+        """
+        Fail fast if the circuit breaker for the model is open.
+        
+        Args:
+            retry_policy: Retry policy of the call
+            model_id: The Bedrock model ID
+            metric_prefix: Prefix of the failure metrics
+            
+        Raises:
+            CircuitOpenError: If calls to the model are currently rejected
+        """
+        try:
+            retry_policy.before_attempt(model_id)
+        except CircuitOpenError as e:
+            logger.error(str(e))
+            self._put_metric(f'{metric_prefix}RequestsFailed', 1)
+            self._put_metric(f'{metric_prefix}CircuitOpen', 1)
+            raise
+    
+    def _retry_allowed(self, retry_policy: RetryPolicy, metric_prefix: str = 'Bedrock') -> bool:
+        """
+        Spend retry budget for the next attempt, recording a failure if it is exhausted.
+        
+        Args:
+            retry_policy: Retry policy of the call
+            metric_prefix: Prefix of the failure metrics
+            
+        Returns:
+            True if the retry may go ahead
+        """
+        if retry_policy.can_retry():
+            return True
+        self._put_metric(f'{metric_prefix}RequestsFailed', 1)
+        self._put_metric(f'{metric_prefix}RetryBudgetExhausted', 1)
+        return False
+    
     def _put_metric(self, metric_name: str, value: Union[int, float], unit: str = 'Count'):
         """
         Publish a metric if metrics are enabled.
@@ -842,10 +1378,17 @@ class BedrockClient:
         Returns:
             Sanitized message objects suitable for logging
         """
-        sanitized = copy.deepcopy(messages)
-        
-        for message in sanitized:
+        # Shallow copies are enough since only top-level content keys are
+        # replaced; this avoids deep-copying the image bytes
+        sanitized = []
+        for message in messages:
+            message = dict(message)
+            sanitized.append(message)
             if 'content' in message and isinstance(message['content'], list):
+                message['content'] = [
+                    dict(item) if isinstance(item, dict) else item
+                    for item in message['content']
+                ]
                 for content_item in message['content']:
                     # Check for image type content
                     if isinstance(content_item, dict) and content_item.get('type') == 'image':
@@ -920,6 +1463,7 @@ Args:
     max_tokens: Optional max_tokens parameter (int or string)
     max_retries: Optional override for the instance's max_retries setting
     context: Context prefix for metering key (default: "Unspecified")
+    stream_handler: Optional callback for each text delta (uses converse_stream)
     
 Returns:
     Bedrock response object with metering information
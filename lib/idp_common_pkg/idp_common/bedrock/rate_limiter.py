@@ -0,0 +1,416 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Client-side rate limiting for Bedrock models.
+
+Classification, extraction, assessment, summarization and evaluation each run
+their own thread pool against Bedrock and otherwise only discover the account
+quota by receiving ``ThrottlingException``. A rate limiter holds the traffic
+for a model just under its requests-per-minute and tokens-per-minute quota:
+
+- Each attempt reserves one request and its estimated input tokens before
+  calling Bedrock, waiting if the budget is exhausted
+- After the call the reservation is reconciled with the actual ``usage``
+  (input plus output tokens); a failed attempt gives its tokens back
+
+``TokenBucketRateLimiter`` coordinates the threads of one process.
+``DynamoDBRateLimiter`` counts requests and tokens per one-minute window in a
+DynamoDB table (with ``PK``/``SK`` keys and an ``ExpiresAfter`` TTL, like the
+tracking table), so concurrent Lambdas share one budget.
+
+Limiters are process-wide per model (see ``get_rate_limiter``) and configured
+with ``configure_rate_limits`` or the ``BEDROCK_RATE_LIMITS`` environment
+variable, e.g.::
+
+    BEDROCK_RATE_LIMITS='{"us.amazon.nova-pro-v1:0": {"requests_per_minute": 200, "tokens_per_minute": 800000}}'
+    BEDROCK_RATE_LIMIT_TABLE=<table name>  # optional, selects DynamoDBRateLimiter
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate used for the reservation; reconciled with actual usage
+CHARS_PER_TOKEN = 4
+TOKENS_PER_IMAGE = 1600
+
+WINDOW_SECONDS = 60
+# Keep DynamoDB window counters a little past their window
+WINDOW_TTL_SECONDS = 3600
+
+
+def estimate_input_tokens(converse_params: Dict[str, Any]) -> int:
+    """
+    Estimate the input tokens of a converse request.
+
+    Args:
+        converse_params: Parameters for the Bedrock converse API call
+
+    Returns:
+        Estimated number of input tokens
+    """
+    chars = 0
+    images = 0
+    for item in converse_params.get("system") or []:
+        chars += len(item.get("text", "") or "")
+    for message in converse_params.get("messages") or []:
+        for item in message.get("content") or []:
+            if "text" in item:
+                chars += len(item["text"] or "")
+            elif "image" in item:
+                images += 1
+    return chars // CHARS_PER_TOKEN + images * TOKENS_PER_IMAGE
+
+
+@dataclass
+class Reservation:
+    """Budget reserved for one Bedrock call."""
+
+    tokens: int
+    window: Optional[int] = None
+
+
+class RateLimiter(ABC):
+    """Base class for rate limiters; subclasses implement _try_acquire and reconcile."""
+
+    model_id: str
+
+    @abstractmethod
+    def _try_acquire(
+        self, estimated_tokens: int
+    ) -> Tuple[Optional[Reservation], float]:
+        """Reserve capacity now, or return (None, seconds to wait before retrying)."""
+
+    def acquire(self, estimated_tokens: int) -> Reservation:
+        """
+        Reserve one request and the estimated tokens, waiting until both are available.
+
+        Args:
+            estimated_tokens: Estimated input tokens of the request
+
+        Returns:
+            Reservation to pass to reconcile()
+        """
+        while True:
+            reservation, wait = self._try_acquire(estimated_tokens)
+            if reservation is not None:
+                return reservation
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens: int) -> Reservation:
+        """
+        Reserve one request and the estimated tokens, waiting without blocking the event loop.
+
+        Args:
+            estimated_tokens: Estimated input tokens of the request
+
+        Returns:
+            Reservation to pass to reconcile()
+        """
+        while True:
+            reservation, wait = self._try_acquire(estimated_tokens)
+            if reservation is not None:
+                return reservation
+            await asyncio.sleep(wait)
+
+    @abstractmethod
+    def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """Replace a reservation's estimated tokens with the tokens actually used."""
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Token buckets for requests/min and tokens/min shared by the threads of a process."""
+
+    def __init__(
+        self,
+        model_id: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            model_id: Bedrock model ID the limits apply to
+            requests_per_minute: Request quota, or None for no request limit
+            tokens_per_minute: Token quota, or None for no token limit
+        """
+        self.model_id = model_id
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        # Buckets start full so a cold container is not slowed down
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(
+                self.requests_per_minute,
+                self._requests + elapsed * self.requests_per_minute / WINDOW_SECONDS,
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.tokens_per_minute / WINDOW_SECONDS,
+            )
+
+    def _try_acquire(
+        self, estimated_tokens: int
+    ) -> Tuple[Optional[Reservation], float]:
+        """
+        Reserve one request and the estimated tokens if both are available.
+
+        Returns:
+            (reservation, 0) on success, otherwise (None, seconds to wait)
+        """
+        if self.tokens_per_minute:
+            # A request larger than the whole quota can only wait for a full bucket
+            estimated_tokens = min(estimated_tokens, int(self.tokens_per_minute))
+
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0
+            if self.requests_per_minute and self._requests < 1:
+                wait = (1 - self._requests) * WINDOW_SECONDS / self.requests_per_minute
+            if self.tokens_per_minute and self._tokens < estimated_tokens:
+                wait = max(
+                    wait,
+                    (estimated_tokens - self._tokens)
+                    * WINDOW_SECONDS
+                    / self.tokens_per_minute,
+                )
+            if wait > 0:
+                return None, wait
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= estimated_tokens
+            return Reservation(tokens=estimated_tokens), 0.0
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once the actual usage of a call is known.
+
+        Args:
+            reservation: Reservation returned by acquire()
+            actual_tokens: Tokens the call actually consumed (0 if it failed)
+        """
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            # May go negative when a call used more than estimated
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + reservation.tokens - actual_tokens,
+            )
+
+
+class DynamoDBRateLimiter(RateLimiter):
+    """Per-minute request and token counters in DynamoDB shared by all Lambdas."""
+
+    def __init__(
+        self,
+        model_id: str,
+        table_name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        region: Optional[str] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            model_id: Bedrock model ID the limits apply to
+            table_name: DynamoDB table with PK/SK string keys
+            requests_per_minute: Request quota, or None for no request limit
+            tokens_per_minute: Token quota, or None for no token limit
+            region: AWS region of the table
+        """
+        self.model_id = model_id
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        dynamodb = boto3.resource(
+            "dynamodb", region_name=region or os.environ.get("AWS_REGION")
+        )
+        self.table = dynamodb.Table(table_name)
+
+    def _key(self, window: int) -> Dict[str, str]:
+        return {"PK": f"bedrock_rate#{self.model_id}", "SK": str(window)}
+
+    async def acquire_async(self, estimated_tokens: int) -> Reservation:
+        # The conditional update is a blocking boto3 call, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        while True:
+            reservation, wait = await loop.run_in_executor(
+                None, self._try_acquire, estimated_tokens
+            )
+            if reservation is not None:
+                return reservation
+            await asyncio.sleep(wait)
+
+    def _try_acquire(
+        self, estimated_tokens: int
+    ) -> Tuple[Optional[Reservation], float]:
+        """
+        Count one request and the estimated tokens in the current window if it has room.
+
+        Returns:
+            (reservation, 0) on success, otherwise (None, seconds until the next window)
+        """
+        if self.tokens_per_minute:
+            estimated_tokens = min(estimated_tokens, int(self.tokens_per_minute))
+
+        conditions = []
+        values: Dict[str, Any] = {":one": 1, ":tokens": estimated_tokens}
+        if self.requests_per_minute:
+            conditions.append("Requests < :rpm")
+            values[":rpm"] = int(self.requests_per_minute)
+        if self.tokens_per_minute:
+            conditions.append("Tokens <= :token_room")
+            values[":token_room"] = int(self.tokens_per_minute) - estimated_tokens
+        condition = "attribute_not_exists(Requests)"
+        if conditions:
+            condition += " OR (" + " AND ".join(conditions) + ")"
+
+        now = time.time()
+        window = int(now // WINDOW_SECONDS)
+        values[":ttl"] = window * WINDOW_SECONDS + WINDOW_TTL_SECONDS
+        try:
+            self.table.update_item(
+                Key=self._key(window),
+                UpdateExpression="ADD Requests :one, Tokens :tokens SET ExpiresAfter = :ttl",
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values,
+            )
+            return Reservation(tokens=estimated_tokens, window=window), 0.0
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                # Fail open: the service-side quota still applies
+                logger.warning(f"Rate limit table unavailable for {self.model_id}: {e}")
+                return Reservation(tokens=0), 0.0
+        # Spread waiting Lambdas over the start of the next window
+        return None, (window + 1) * WINDOW_SECONDS - now + random.random()
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int) -> None:
+        """
+        Correct the token count of the reservation's window with the actual usage.
+
+        Args:
+            reservation: Reservation returned by acquire()
+            actual_tokens: Tokens the call actually consumed (0 if it failed)
+        """
+        delta = actual_tokens - reservation.tokens
+        if reservation.window is None or not delta or not self.tokens_per_minute:
+            return
+        try:
+            self.table.update_item(
+                Key=self._key(reservation.window),
+                UpdateExpression="ADD Tokens :delta",
+                ExpressionAttributeValues={":delta": delta},
+            )
+        except ClientError as e:
+            logger.warning(f"Could not reconcile token usage for {self.model_id}: {e}")
+
+
+_rate_limits: Optional[Dict[str, Dict[str, Any]]] = None
+_rate_limit_table: Optional[str] = None
+_rate_limiters: Dict[str, Any] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def configure_rate_limits(
+    limits: Dict[str, Dict[str, Any]], table_name: Optional[str] = None
+) -> None:
+    """
+    Set the per-model rate limits, replacing any existing limiters.
+
+    Args:
+        limits: Map of model_id to {"requests_per_minute": ..., "tokens_per_minute": ...}
+        table_name: Optional DynamoDB table to coordinate limits across Lambdas
+    """
+    global _rate_limits, _rate_limit_table
+    with _rate_limiters_lock:
+        _rate_limits = dict(limits or {})
+        _rate_limit_table = table_name
+        _rate_limiters.clear()
+
+
+def _load_rate_limits() -> None:
+    """Load the rate limits from the environment unless already configured."""
+    global _rate_limits, _rate_limit_table
+    if _rate_limits is not None:
+        return
+    _rate_limits = {}
+    _rate_limit_table = os.environ.get("BEDROCK_RATE_LIMIT_TABLE") or None
+    limits_env = os.environ.get("BEDROCK_RATE_LIMITS", "")
+    if limits_env:
+        try:
+            _rate_limits = json.loads(limits_env)
+        except ValueError:
+            logger.warning(
+                f"Invalid BEDROCK_RATE_LIMITS value: {limits_env}. Expected a JSON object"
+            )
+
+
+def get_rate_limiter(model_id: str):
+    """
+    Get the process-wide rate limiter for a model.
+
+    Args:
+        model_id: Bedrock model ID
+
+    Returns:
+        TokenBucketRateLimiter or DynamoDBRateLimiter, or None if the model has no limits
+    """
+    with _rate_limiters_lock:
+        if model_id in _rate_limiters:
+            return _rate_limiters[model_id]
+        _load_rate_limits()
+        limits = _rate_limits.get(model_id)
+        limiter = None
+        if limits:
+            requests_per_minute = limits.get("requests_per_minute")
+            tokens_per_minute = limits.get("tokens_per_minute")
+            if _rate_limit_table:
+                limiter = DynamoDBRateLimiter(
+                    model_id,
+                    _rate_limit_table,
+                    requests_per_minute=requests_per_minute,
+                    tokens_per_minute=tokens_per_minute,
+                )
+            else:
+                limiter = TokenBucketRateLimiter(
+                    model_id,
+                    requests_per_minute=requests_per_minute,
+                    tokens_per_minute=tokens_per_minute,
+                )
+            logger.info(f"Rate limiting {model_id}: {limits}")
+        _rate_limiters[model_id] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Discard all limiters and configured limits (used by tests)."""
+    global _rate_limits, _rate_limit_table
+    with _rate_limiters_lock:
+        _rate_limits = None
+        _rate_limit_table = None
+        _rate_limiters.clear()
@@ -0,0 +1,272 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Deterministic response cache for Bedrock converse calls.
+
+Reprocessing a document with unchanged configuration sends byte-identical
+requests to Bedrock, and at temperature 0 gets the same answer back. The cache
+key is a SHA-256 of the model ID, system prompt, message content (with image
+and document bytes replaced by their own SHA-256), inference configuration,
+additional model request fields and guardrail configuration. Only requests with
+temperature 0 are cached.
+
+Entries live in a chain of stores from ``idp_common.utils.cache_store`` that
+is searched in order; a hit in a slower tier is copied into the faster tiers
+before it:
+
+- ``memory``: in-process LRU, shared by every service in a Lambda
+- ``local``: one JSON file per entry in a directory (tests, notebooks)
+- ``dynamodb``: items in a table (the tracking table by default) using its
+  ``ExpiresAfter`` TTL attribute
+- ``s3``: one JSON object per entry under a bucket prefix, for responses too
+  large for a DynamoDB item
+
+The cache is opt-in, either with ``configure_response_cache`` or the
+``BEDROCK_RESPONSE_CACHE`` environment variable (a comma-separated list of
+tiers, e.g. ``memory,dynamodb``).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..utils.cache_store import (
+    DEFAULT_MEMORY_ENTRIES,
+    CacheStore,
+    DynamoDBCacheStore,
+    LocalCacheStore,
+    MemoryCacheStore,
+    S3CacheStore,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_DAYS = 7
+CACHE_KEY_PREFIX = "bedrockcache#"
+
+
+def _hash_binary(value: Any) -> Any:
+    """Replace bytes anywhere in a request with their SHA-256 digest."""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {k: _hash_binary(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_hash_binary(v) for v in value]
+    return value
+
+
+def compute_cache_key(model_id: str, converse_params: Dict[str, Any]) -> str:
+    """
+    Compute the cache key of a converse request.
+
+    Args:
+        model_id: Model ID as requested (before any ':1m' suffix is stripped)
+        converse_params: Parameters for the Bedrock converse API call
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    fingerprint = {
+        "model_id": model_id,
+        "system": converse_params.get("system"),
+        "messages": converse_params.get("messages"),
+        "inferenceConfig": converse_params.get("inferenceConfig"),
+        "additionalModelRequestFields": converse_params.get(
+            "additionalModelRequestFields"
+        ),
+        "guardrailConfig": converse_params.get("guardrailConfig"),
+    }
+    serialized = json.dumps(_hash_binary(fingerprint), sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def create_response_store(tier: str, settings: Dict[str, Any]) -> CacheStore:
+    """
+    Create one cache tier.
+
+    Args:
+        tier: "memory", "local", "dynamodb" or "s3"
+        settings: Store settings ("max_entries", "directory", "table_name",
+            "bucket"/"prefix")
+
+    Returns:
+        CacheStore instance
+    """
+    tier = tier.strip().lower()
+    if tier == "memory":
+        return MemoryCacheStore(
+            max_entries=int(settings.get("max_entries") or DEFAULT_MEMORY_ENTRIES)
+        )
+    if tier == "local":
+        return LocalCacheStore(directory=settings.get("directory") or ".bedrock_cache")
+    if tier == "dynamodb":
+        return DynamoDBCacheStore(
+            CACHE_KEY_PREFIX, "response", table_name=settings.get("table_name")
+        )
+    if tier == "s3":
+        return S3CacheStore(
+            bucket=settings.get("bucket"),
+            prefix=settings.get("prefix") or "bedrock-cache",
+        )
+    raise ValueError(
+        f"Invalid Bedrock response cache store: {tier}. Must be one of: memory, local, dynamodb, s3"
+    )
+
+
+class ResponseCache:
+    """Tiered response lookups and writes with TTL handling and hit/miss counters."""
+
+    def __init__(self, stores: List[CacheStore], ttl_days: float = DEFAULT_TTL_DAYS):
+        """
+        Args:
+            stores: Stores searched in order, fastest first
+            ttl_days: Days an entry remains valid after it is written
+        """
+        self.stores = stores
+        self.ttl_seconds = int(float(ttl_days) * 86400)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response, filling faster tiers on a hit in a slower one.
+        Store errors are logged and treated as misses.
+
+        Args:
+            key: Cache key from compute_cache_key
+
+        Returns:
+            Cached entry ({"response": ..., "model_id": ...}) or None
+        """
+        for index, store in enumerate(self.stores):
+            try:
+                entry = store.get(key)
+            except Exception as e:
+                logger.warning(f"Bedrock cache lookup failed for {key}: {str(e)}")
+                with self._lock:
+                    self._errors += 1
+                continue
+            if entry is not None:
+                expires_at = int(time.time()) + self.ttl_seconds
+                for faster in self.stores[:index]:
+                    self._put(faster, key, entry, expires_at)
+                with self._lock:
+                    self._hits += 1
+                return entry
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store an entry in every tier. Store errors are logged and ignored.
+
+        Args:
+            key: Cache key from compute_cache_key
+            entry: Entry to store
+        """
+        expires_at = int(time.time()) + self.ttl_seconds
+        for store in self.stores:
+            self._put(store, key, entry, expires_at)
+
+    def _put(
+        self, store: CacheStore, key: str, entry: Dict[str, Any], expires_at: int
+    ) -> None:
+        try:
+            store.put(key, entry, expires_at)
+        except Exception as e:
+            logger.warning(f"Bedrock cache write failed for {key}: {str(e)}")
+            with self._lock:
+                self._errors += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return cumulative hit/miss counters and the hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_loaded = False
+_response_cache_lock = threading.Lock()
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """
+    Set the process-wide response cache used by BedrockClient instances
+    that were not given one explicitly.
+
+    Args:
+        cache: ResponseCache, or None to disable caching
+    """
+    global _response_cache, _response_cache_loaded
+    with _response_cache_lock:
+        _response_cache = cache
+        _response_cache_loaded = True
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache, creating it from the environment on
+    first use.
+
+    BEDROCK_RESPONSE_CACHE lists the tiers (e.g. "memory,dynamodb");
+    BEDROCK_RESPONSE_CACHE_TTL_DAYS, BEDROCK_RESPONSE_CACHE_TABLE,
+    BEDROCK_RESPONSE_CACHE_BUCKET, BEDROCK_RESPONSE_CACHE_PREFIX and
+    BEDROCK_RESPONSE_CACHE_DIR configure them.
+
+    Returns:
+        ResponseCache, or None if caching is not enabled
+    """
+    global _response_cache, _response_cache_loaded
+    with _response_cache_lock:
+        if _response_cache_loaded:
+            return _response_cache
+        _response_cache_loaded = True
+        tiers = [
+            t
+            for t in os.environ.get("BEDROCK_RESPONSE_CACHE", "").split(",")
+            if t.strip()
+        ]
+        if not tiers:
+            return None
+        settings = {
+            "table_name": os.environ.get("BEDROCK_RESPONSE_CACHE_TABLE"),
+            "bucket": os.environ.get("BEDROCK_RESPONSE_CACHE_BUCKET"),
+            "prefix": os.environ.get("BEDROCK_RESPONSE_CACHE_PREFIX"),
+            "directory": os.environ.get("BEDROCK_RESPONSE_CACHE_DIR"),
+        }
+        try:
+            _response_cache = ResponseCache(
+                [create_response_store(tier, settings) for tier in tiers],
+                ttl_days=os.environ.get(
+                    "BEDROCK_RESPONSE_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS
+                ),
+            )
+            logger.info(f"Bedrock response cache enabled with tiers: {tiers}")
+        except Exception as e:
+            logger.warning(f"Bedrock response cache disabled: {str(e)}")
+            _response_cache = None
+        return _response_cache
+
+
+def reset_response_cache() -> None:
+    """Discard the process-wide response cache (used by tests)."""
+    global _response_cache, _response_cache_loaded
+    with _response_cache_lock:
+        _response_cache = None
+        _response_cache_loaded = False
@@ -0,0 +1,314 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Latency-aware routing of Bedrock requests across regions and models.
+
+Each service sends all of its requests to one model in one region, so when
+that model is throttled the stage stalls in backoff even though the same
+model in another region, or an approved fallback model, has capacity. A
+``ModelRouter`` holds an ordered pool of (region, model_id) targets for one
+stage and picks the target for every attempt:
+
+- Rolling (exponentially weighted) latency, throttle rate and error rate are
+  tracked per target
+- A throttled or failing target cools down (5s, doubling per consecutive
+  failure up to 60s) and is skipped meanwhile, so the retry goes to the next
+  healthy target without backing off
+- Among healthy targets the first one in pool order whose score (latency
+  weighted by its throttle and error rates) is within ``latency_tolerance`` of
+  the best score wins, so the pool order expresses preference (e.g. cost)
+  while a much slower target is passed over
+
+Pools are keyed by the metering context of the stage (``Classification``,
+``Extraction``, ``Assessment``, ``Summarization``, ...) and configured with
+``configure_routing`` or the ``BEDROCK_ROUTING`` environment variable, e.g.::
+
+    BEDROCK_ROUTING='{"Extraction": [{"region": "us-east-1", "model_id": "us.amazon.nova-pro-v1:0"}, {"region": "us-west-2", "model_id": "us.amazon.nova-pro-v1:0"}, {"region": "us-east-1", "model_id": "us.anthropic.claude-3-7-sonnet-20250219-v1:0"}]}'
+
+The model requested by the service (in the client's region) is always part of
+its pool, first unless the pool lists it elsewhere.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Target:
+    """A model in a region that can serve a request."""
+
+    region: str
+    model_id: str
+
+    def __str__(self) -> str:
+        return f"{self.region}/{self.model_id}"
+
+
+class _TargetStats:
+    """Rolling health and latency of one target."""
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.throttle_rate = 0.0
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+
+class ModelRouter:
+    """Picks the best healthy target from an ordered pool for each attempt."""
+
+    def __init__(
+        self,
+        targets: List[Target],
+        latency_tolerance: float = 1.5,
+        cooldown_seconds: float = 5.0,
+        max_cooldown_seconds: float = 60.0,
+        smoothing: float = 0.2,
+    ):
+        """
+        Initialize a router.
+
+        Args:
+            targets: Targets in order of preference
+            latency_tolerance: How much worse than the best score a preferred
+                target may be and still be chosen
+            cooldown_seconds: Time a target is skipped after a throttle or error
+            max_cooldown_seconds: Cap for the cooldown, which doubles with each
+                consecutive failure
+            smoothing: Weight of the newest sample in the rolling averages
+        """
+        if not targets:
+            raise ValueError("A routing pool needs at least one target")
+        self.targets = list(targets)
+        self.latency_tolerance = latency_tolerance
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.smoothing = smoothing
+        self._stats = {target: _TargetStats() for target in self.targets}
+        self._lock = threading.Lock()
+
+    def _score(self, stats: _TargetStats) -> Optional[float]:
+        if stats.latency is None:
+            return None
+        return stats.latency * (1 + stats.throttle_rate + stats.error_rate)
+
+    def choose(self) -> Target:
+        """
+        Pick the target for the next attempt.
+
+        Returns:
+            The preferred healthy target, or the one that recovers first if
+            all targets are cooling down
+        """
+        with self._lock:
+            now = time.monotonic()
+            healthy = [t for t in self.targets if self._stats[t].cooldown_until <= now]
+            if not healthy:
+                return min(self.targets, key=lambda t: self._stats[t].cooldown_until)
+            scores = [(t, self._score(self._stats[t])) for t in healthy]
+            known = [score for _, score in scores if score is not None]
+            best = min(known) if known else None
+            for target, score in scores:
+                # Targets without latency samples yet are worth trying
+                if score is None or score <= best * self.latency_tolerance:
+                    return target
+            return healthy[0]
+
+    def has_alternative(self, target: Target) -> bool:
+        """
+        Check whether a healthy target other than the given one is available.
+
+        Args:
+            target: Target that just failed
+
+        Returns:
+            True if the next attempt can go elsewhere without backing off
+        """
+        with self._lock:
+            now = time.monotonic()
+            return any(
+                t != target and self._stats[t].cooldown_until <= now
+                for t in self.targets
+            )
+
+    def _update(self, target: Target, throttled: float, errored: float) -> _TargetStats:
+        stats = self._stats[target]
+        stats.throttle_rate += self.smoothing * (throttled - stats.throttle_rate)
+        stats.error_rate += self.smoothing * (errored - stats.error_rate)
+        return stats
+
+    def record_success(self, target: Target, latency: float) -> None:
+        """Record a successful attempt and its latency in seconds."""
+        with self._lock:
+            stats = self._update(target, 0.0, 0.0)
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency += self.smoothing * (latency - stats.latency)
+            stats.consecutive_failures = 0
+            stats.cooldown_until = 0.0
+
+    def record_throttle(self, target: Target) -> None:
+        """Record a throttled attempt, cooling the target down."""
+        with self._lock:
+            self._cool_down(target, self._update(target, 1.0, 0.0))
+
+    def record_error(self, target: Target) -> None:
+        """Record a failed attempt (timeout or connection error), cooling the target down."""
+        with self._lock:
+            self._cool_down(target, self._update(target, 0.0, 1.0))
+
+    def _cool_down(self, target: Target, stats: _TargetStats) -> None:
+        stats.consecutive_failures += 1
+        cooldown = min(
+            self.max_cooldown_seconds,
+            self.cooldown_seconds * (2 ** (stats.consecutive_failures - 1)),
+        )
+        stats.cooldown_until = time.monotonic() + cooldown
+        logger.info(f"Routing away from {target} for {cooldown:.1f}s")
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the rolling statistics of every target, in pool order.
+
+        Returns:
+            List of dicts with region, model_id, latency, throttle_rate,
+            error_rate and healthy
+        """
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "region": target.region,
+                    "model_id": target.model_id,
+                    "latency": self._stats[target].latency,
+                    "throttle_rate": self._stats[target].throttle_rate,
+                    "error_rate": self._stats[target].error_rate,
+                    "healthy": self._stats[target].cooldown_until <= now,
+                }
+                for target in self.targets
+            ]
+
+
+class RoutedRequest:
+    """One request routed by a ModelRouter, with parameters built per model."""
+
+    def __init__(
+        self, router: ModelRouter, build_params: Callable[[str], Dict[str, Any]]
+    ):
+        """
+        Initialize a routed request.
+
+        Args:
+            router: Router of the stage
+            build_params: Builds the converse parameters for a model ID (cachePoint
+                and request field support differ between models)
+        """
+        self.router = router
+        self._build_params = build_params
+        self._params: Dict[str, Dict[str, Any]] = {}
+        # Target and converse parameters of the latest attempt
+        self.target: Optional[Target] = None
+        self.params: Optional[Dict[str, Any]] = None
+
+    def next_target(self) -> Tuple[Target, Dict[str, Any]]:
+        """
+        Pick the target of the next attempt.
+
+        Returns:
+            Tuple of the target and its converse parameters
+        """
+        target = self.router.choose()
+        if target.model_id not in self._params:
+            self._params[target.model_id] = self._build_params(target.model_id)
+        self.target = target
+        self.params = self._params[target.model_id]
+        return target, self.params
+
+
+_routing_pools: Optional[Dict[str, List[Target]]] = None
+_routers: Dict[Tuple[str, Target], ModelRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def _parse_pools(pools: Dict[str, List[Dict[str, str]]]) -> Dict[str, List[Target]]:
+    return {
+        context: [Target(t["region"], t["model_id"]) for t in targets]
+        for context, targets in (pools or {}).items()
+    }
+
+
+def configure_routing(pools: Dict[str, List[Dict[str, str]]]) -> None:
+    """
+    Set the routing pools, replacing any existing routers.
+
+    Args:
+        pools: Map of metering context to an ordered list of
+            {"region": ..., "model_id": ...} targets
+    """
+    global _routing_pools
+    with _routers_lock:
+        _routing_pools = _parse_pools(pools)
+        _routers.clear()
+
+
+def _load_routing_pools() -> None:
+    """Load the routing pools from the environment unless already configured."""
+    global _routing_pools
+    if _routing_pools is not None:
+        return
+    _routing_pools = {}
+    pools_env = os.environ.get("BEDROCK_ROUTING", "")
+    if pools_env:
+        try:
+            _routing_pools = _parse_pools(json.loads(pools_env))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning(
+                f"Invalid BEDROCK_ROUTING value: {pools_env}. Expected a JSON object "
+                "mapping contexts to lists of {region, model_id} targets"
+            )
+
+
+def get_router(context: str, requested: Target) -> Optional[ModelRouter]:
+    """
+    Get the process-wide router for a stage.
+
+    Args:
+        context: Metering context of the stage
+        requested: Model and region the service asked for
+
+    Returns:
+        ModelRouter, or None if the stage has no routing pool
+    """
+    with _routers_lock:
+        key = (context, requested)
+        if key in _routers:
+            return _routers[key]
+        _load_routing_pools()
+        pool = _routing_pools.get(context)
+        router = None
+        if pool:
+            targets = pool if requested in pool else [requested] + pool
+            router = ModelRouter(targets)
+            logger.info(
+                f"Routing {context} requests across {[str(t) for t in targets]}"
+            )
+        _routers[key] = router
+        return router
+
+
+def reset_routers() -> None:
+    """Discard all routers and configured pools (used by tests)."""
+    global _routing_pools
+    with _routers_lock:
+        _routing_pools = None
+        _routers.clear()
@@ -11,6 +11,13 @@ from idp_common.classification.models import (
     ClassificationResult,
     DocumentClassification,
 )
+from idp_common.classification.pre_classifier import PreClassifier, PreClassifierIndex
 from idp_common.classification.service import ClassificationService
 
-__all__ = ["ClassificationService", "DocumentClassification", "ClassificationResult"]
+__all__ = [
+    "ClassificationService",
+    "DocumentClassification",
+    "ClassificationResult",
+    "PreClassifier",
+    "PreClassifierIndex",
+]
@@ -0,0 +1,363 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Content-addressed DynamoDB cache of page classifications.
+
+Each page classification is stored as its own item keyed by a hash of the
+page content (parsed text and image) and a hash of the classification
+configuration, so the cache is shared by every execution that classifies the
+same page with the same configuration: Step Functions retries, reprocessing
+and duplicate uploads. Items are written with BatchWriteItem as pages complete,
+so a Lambda timeout keeps the pages finished before it, and read with
+BatchGetItem.
+
+The content hash is the ``Page.content_hash`` OCR records when it writes the
+page artifacts, so building keys reads no page content. Pages without one
+(e.g. from BDA or restored from the OCR result cache) fall back to the S3 ETags
+of their parsed text and image, which identify the objects but, under SSE-KMS,
+not their content, so those pages only hit for the same objects (retries).
+
+A page classified by a different workflow execution was billed there, so its
+metering is reported under ``<context>/bedrock_cache/<model_id>`` (like a
+Bedrock response cache hit) instead of being counted again.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from idp_common import s3, utils
+from idp_common.classification.models import (
+    DocumentClassification,
+    PageClassification,
+)
+from idp_common.models import Document
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "classcache#page#"
+# DynamoDB limits per request
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_WRITE_ITEMS = 25
+MAX_UNPROCESSED_RETRIES = 5
+# Documents whose page keys are kept for writing after the lookup
+MAX_REMEMBERED_DOCUMENTS = 16
+
+
+def compute_config_hash(*parts: Any) -> str:
+    """
+    Compute the hash of the configuration a classification depends on.
+
+    Args:
+        parts: JSON-serializable values (classes, classification settings,
+            backend and model)
+
+    Returns:
+        SHA-256 hex digest of the parts
+    """
+    canonical = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _cache_hit_metering(metering: Dict[str, Any]) -> Dict[str, Any]:
+    """Report the billed metering of a cached result as cache hits."""
+    hits = {}
+    for key, usage in metering.items():
+        context, _, model_id = key.partition("/bedrock/")
+        if not model_id or not isinstance(usage, dict):
+            continue
+        hits[f"{context}/bedrock_cache/{model_id}"] = {
+            "hits": 1,
+            "cachedInputTokens": usage.get("inputTokens", 0),
+            "cachedOutputTokens": usage.get("outputTokens", 0),
+        }
+    return hits
+
+
+class PageClassificationCache:
+    """Page classifications stored per page content and configuration."""
+
+    def __init__(
+        self,
+        dynamodb: Any,
+        table_name: str,
+        config_hash: str,
+        ttl_days: float = 1.0,
+        max_workers: int = 20,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            dynamodb: boto3 DynamoDB service resource
+            table_name: Table with PK/SK keys and an ExpiresAfter TTL attribute
+            config_hash: Hash of the classification configuration
+            ttl_days: Time entries are kept
+            max_workers: Concurrent S3 HEAD requests for pages without a
+                recorded content hash
+        """
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.config_hash = config_hash
+        self.ttl_days = ttl_days
+        self.max_workers = max_workers
+        self._page_keys: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _hash_page(self, page: Any) -> Optional[str]:
+        """Hash the content a page is classified from, or None if it has none."""
+        if page.content_hash:
+            return page.content_hash
+        digest = hashlib.sha256(b"etag")
+        has_content = False
+        for uri in (page.parsed_text_uri, page.image_uri):
+            digest.update(b"\0")
+            if uri:
+                try:
+                    bucket, key = utils.parse_s3_uri(uri)
+                    response = s3.get_s3_client().head_object(Bucket=bucket, Key=key)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to read the ETag of {uri} for the cache key: {e}"
+                    )
+                    return None
+                digest.update(response["ETag"].encode("utf-8"))
+                has_content = True
+        return digest.hexdigest() if has_content else None
+
+    def get_page_keys(self, document: Document) -> Dict[str, str]:
+        """
+        Get the cache key of each page of a document.
+
+        Keys are computed once per document and remembered for writing.
+
+        Args:
+            document: Document object
+
+        Returns:
+            Dictionary mapping page_id to cache key, for pages with content
+        """
+        with self._lock:
+            if document.id in self._page_keys:
+                return self._page_keys[document.id]
+
+        pages = list(document.pages.values())
+        if all(page.content_hash for page in pages):
+            hashes = [page.content_hash for page in pages]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                hashes = list(executor.map(self._hash_page, pages))
+        keys = {
+            page.page_id: f"{CACHE_KEY_PREFIX}{self.config_hash}#{content_hash}"
+            for page, content_hash in zip(pages, hashes)
+            if content_hash
+        }
+
+        with self._lock:
+            self._page_keys[document.id] = keys
+            while len(self._page_keys) > MAX_REMEMBERED_DOCUMENTS:
+                self._page_keys.popitem(last=False)
+        return keys
+
+    def get(self, document: Document) -> Dict[str, PageClassification]:
+        """
+        Look up the cached classifications of the pages of a document.
+
+        Args:
+            document: Document object
+
+        Returns:
+            Dictionary mapping page_id to cached PageClassification
+        """
+        keys = self.get_page_keys(document)
+        page_ids_by_key: Dict[str, List[str]] = {}
+        for page_id, key in keys.items():
+            # Identical pages in a document share a key
+            page_ids_by_key.setdefault(key, []).append(page_id)
+
+        items = {}
+        pending = list(page_ids_by_key)
+        for start in range(0, len(pending), MAX_BATCH_GET_KEYS):
+            request = {
+                self.table_name: {
+                    "Keys": [
+                        {"PK": key, "SK": "none"}
+                        for key in pending[start : start + MAX_BATCH_GET_KEYS]
+                    ]
+                }
+            }
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    items[item["PK"]] = item
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(0.05 * 2**attempt)
+            else:
+                logger.warning("Some cached page classifications could not be read")
+
+        now = time.time()
+        results = {}
+        for key, item in items.items():
+            # DynamoDB deletes expired items lazily, so check the TTL ourselves
+            if int(item.get("ExpiresAfter", 0)) <= now:
+                continue
+            data = json.loads(item["page_classification"])
+            metadata = data["metadata"]
+            if item.get("workflow_execution_arn") != document.workflow_execution_arn:
+                metadata = dict(
+                    metadata, metering=_cache_hit_metering(metadata.get("metering", {}))
+                )
+            for page_id in page_ids_by_key[key]:
+                page = document.pages[page_id]
+                results[page_id] = PageClassification(
+                    page_id=page_id,
+                    classification=DocumentClassification(
+                        doc_type=data["doc_type"],
+                        confidence=data["confidence"],
+                        metadata=dict(metadata),
+                    ),
+                    image_uri=page.image_uri,
+                    text_uri=page.parsed_text_uri,
+                    raw_text_uri=page.raw_text_uri,
+                )
+        return results
+
+    def _item(
+        self, document: Document, key: str, result: PageClassification
+    ) -> Dict[str, Any]:
+        return {
+            "PK": key,
+            "SK": "none",
+            "cached_at": str(int(time.time())),
+            "document_id": document.id,
+            "page_id": result.page_id,
+            "workflow_execution_arn": document.workflow_execution_arn,
+            "page_classification": json.dumps(
+                {
+                    "doc_type": result.classification.doc_type,
+                    "confidence": result.classification.confidence,
+                    "metadata": result.classification.metadata,
+                }
+            ),
+            "ExpiresAfter": int(time.time() + self.ttl_days * 86400),
+        }
+
+    def put(self, document: Document, results: List[PageClassification]) -> None:
+        """
+        Write page classifications with BatchWriteItem.
+
+        Args:
+            document: Document object the pages belong to
+            results: Successful page classifications
+        """
+        keys = self.get_page_keys(document)
+        # Items of one request must have distinct keys
+        items = {
+            keys[result.page_id]: self._item(document, keys[result.page_id], result)
+            for result in results
+            if result.page_id in keys
+        }
+        pending = list(items.values())
+        for start in range(0, len(pending), MAX_BATCH_WRITE_ITEMS):
+            request = {
+                self.table_name: [
+                    {"PutRequest": {"Item": item}}
+                    for item in pending[start : start + MAX_BATCH_WRITE_ITEMS]
+                ]
+            }
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                response = self.dynamodb.batch_write_item(RequestItems=request)
+                request = response.get("UnprocessedItems") or {}
+                if not request:
+                    break
+                time.sleep(0.05 * 2**attempt)
+            else:
+                logger.warning("Some page classifications could not be cached")
+        if items:
+            logger.info(
+                f"Cached {len(items)} page classifications for document {document.id}"
+            )
+
+    def writer(
+        self, document: Document, flush_interval: float = 1.0
+    ) -> "PageCacheWriter":
+        """
+        Create a writer that caches page classifications as they complete.
+
+        Args:
+            document: Document object being classified
+            flush_interval: Maximum time a completed page waits to be written
+
+        Returns:
+            PageCacheWriter
+        """
+        return PageCacheWriter(self, document, flush_interval)
+
+
+class PageCacheWriter:
+    """Buffers completed page classifications into BatchWriteItem requests."""
+
+    def __init__(
+        self,
+        cache: PageClassificationCache,
+        document: Document,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            cache: Cache to write to
+            document: Document object being classified
+            flush_interval: Maximum time a completed page waits to be written
+        """
+        self.cache = cache
+        self.document = document
+        self.flush_interval = flush_interval
+        self._pending: List[PageClassification] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, result: Any) -> None:
+        """
+        Add the outcome of a page, writing the buffer when it is full or old.
+
+        Args:
+            result: PageClassification, or the exception raised for the page;
+                exceptions and results with an error are not cached
+        """
+        if (
+            not isinstance(result, PageClassification)
+            or "error" in result.classification.metadata
+        ):
+            return
+        with self._lock:
+            self._pending.append(result)
+            due = (
+                len(self._pending) >= MAX_BATCH_WRITE_ITEMS
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered page classifications."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            self.cache.put(self.document, pending)
+        except Exception as e:
+            logger.warning(
+                f"Failed to cache page classifications for document {self.document.id}: {e}"
+            )
@@ -0,0 +1,604 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Local nearest-neighbor pre-classification of pages.
+
+In high-volume flows most pages are one of a few recurring form types, yet
+every page without a regex match is sent to the LLM. ``PreClassifier`` compares
+the text of a page with labeled example pages in a ``PreClassifierIndex`` and
+classifies it locally when the match is confident, so only the remaining pages
+reach the LLM:
+
+- Pages are turned into L2-normalized vectors, either hashed word and bigram
+  counts (``HashingTextFeaturizer``, no network calls) or Bedrock embeddings
+  (``EmbeddingFeaturizer``)
+- ``centroid`` compares a page with the mean vector of each class, ``knn``
+  with its k most similar example pages; both are a single matrix product
+- A page is classified locally when the best class has a cosine similarity of
+  at least ``minSimilarity`` and beats the runner-up by at least ``minMargin``
+- Examples also record whether they were the first page of their document, so
+  a pre-classified page gets a ``start`` or ``continue`` boundary: ``start``
+  or ``continue`` if all examples of its class agree, otherwise that of the
+  most similar example. Pages whose boundary the index cannot tell (an index
+  without boundaries) go to the LLM unless ``defaultBoundary`` is set
+
+The index is built from labeled pages (e.g. pages of already classified
+documents, see ``examples_from_documents``) and saved as a ``.npz`` file, locally
+or in S3 next to the configuration. ``auditSampleRate`` sends that fraction of
+confident pages to the LLM anyway and records whether it agreed.
+
+CloudWatch metrics: ``PreClassifierPages`` (pages evaluated),
+``PreClassifierShortCircuits`` (pages classified locally; divide by
+``PreClassifierPages`` for the short-circuit rate), ``PreClassifierAudits`` and
+``PreClassifierAgreement`` (1 or 0 per audited page; its average is the
+agreement rate).
+"""
+
+import io
+import json
+import logging
+import os
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from idp_common import bedrock, metrics, s3
+from idp_common.utils import parse_s3_uri
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+VALID_METHODS = ["centroid", "knn"]
+MAX_PENDING_AUDITS = 1000
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_DIGITS_PATTERN = re.compile(r"[0-9]+")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "numpy is required for the pre-classifier. "
+            "Install it with 'pip install idp_common[classification]'"
+        )
+
+
+def _normalize_rows(vectors: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class HashingTextFeaturizer:
+    """Hashed, sublinear word and bigram counts of page text."""
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = 4096):
+        """
+        Initialize the featurizer.
+
+        Args:
+            dimensions: Length of the feature vectors
+        """
+        self.dimensions = dimensions
+
+    def _token_ids(self, text: str) -> List[int]:
+        # Digits differ between pages of the same form (dates, amounts, IDs)
+        tokens = [
+            _DIGITS_PATTERN.sub("0", token)
+            for token in _TOKEN_PATTERN.findall(text.lower())
+        ]
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(term.encode("utf-8")) % self.dimensions for term in terms]
+
+    def transform(self, texts: List[str]) -> "np.ndarray":
+        """
+        Turn texts into feature vectors.
+
+        Args:
+            texts: Page texts
+
+        Returns:
+            L2-normalized float32 array of shape (len(texts), dimensions)
+        """
+        counts = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(counts[row], self._token_ids(text or ""), 1)
+        return _normalize_rows(np.log1p(counts))
+
+    def to_config(self) -> Dict[str, Any]:
+        return {"type": self.name, "dimensions": self.dimensions}
+
+
+class EmbeddingFeaturizer:
+    """Bedrock text embeddings of page text."""
+
+    name = "embedding"
+
+    def __init__(self, model_id: str = "amazon.titan-embed-text-v1"):
+        """
+        Initialize the featurizer.
+
+        Args:
+            model_id: Bedrock embedding model ID
+        """
+        self.model_id = model_id
+
+    def transform(self, texts: List[str]) -> "np.ndarray":
+        """
+        Turn texts into feature vectors.
+
+        Args:
+            texts: Page texts
+
+        Returns:
+            L2-normalized float32 array with one embedding per text
+        """
+        embeddings = [bedrock.generate_embedding(text, self.model_id) for text in texts]
+        dimensions = max((len(e) for e in embeddings), default=0)
+        vectors = np.zeros((len(texts), dimensions), dtype=np.float32)
+        for row, embedding in enumerate(embeddings):
+            # Empty texts have empty embeddings
+            if embedding:
+                vectors[row] = embedding
+        return _normalize_rows(vectors)
+
+    def to_config(self) -> Dict[str, Any]:
+        return {"type": self.name, "model_id": self.model_id}
+
+
+def featurizer_from_config(config: Optional[Dict[str, Any]] = None):
+    """
+    Create a featurizer from its configuration.
+
+    Args:
+        config: {"type": "hashing", "dimensions": ...} or
+            {"type": "embedding", "model_id": ...}; defaults to hashing
+
+    Returns:
+        HashingTextFeaturizer or EmbeddingFeaturizer
+    """
+    config = dict(config or {})
+    featurizer_type = config.pop("type", HashingTextFeaturizer.name)
+    if featurizer_type == HashingTextFeaturizer.name:
+        return HashingTextFeaturizer(**config)
+    if featurizer_type == EmbeddingFeaturizer.name:
+        return EmbeddingFeaturizer(**config)
+    raise ValueError(f"Unknown pre-classifier featurizer type: {featurizer_type}")
+
+
+@dataclass
+class PreClassification:
+    """Best class of a page according to the index."""
+
+    label: str
+    similarity: float
+    margin: float
+    boundary: Optional[str] = None
+
+
+class PreClassifierIndex:
+    """Feature vectors of labeled example pages."""
+
+    def __init__(
+        self,
+        vectors: "np.ndarray",
+        labels: List[str],
+        featurizer=None,
+        starts: Optional[List[Optional[bool]]] = None,
+    ):
+        """
+        Initialize an index.
+
+        Args:
+            vectors: L2-normalized example vectors, one row per example
+            labels: Class of each example
+            featurizer: Featurizer the vectors were built with
+            starts: Whether each example was the first page of its document,
+                None where unknown
+        """
+        _require_numpy()
+        if len(vectors) != len(labels):
+            raise ValueError("Pre-classifier index needs one label per vector")
+        if not len(labels):
+            raise ValueError("Pre-classifier index needs at least one example")
+        if starts is not None and len(starts) != len(labels):
+            raise ValueError("Pre-classifier index needs one boundary per vector")
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.labels = list(labels)
+        self.starts = list(starts) if starts is not None else [None] * len(labels)
+        self.featurizer = featurizer or HashingTextFeaturizer()
+        self.classes = sorted(set(self.labels))
+        class_ids = {label: i for i, label in enumerate(self.classes)}
+        self._label_ids = np.array([class_ids[label] for label in self.labels])
+        one_hot = np.zeros((len(self.labels), len(self.classes)), dtype=np.float32)
+        one_hot[np.arange(len(self.labels)), self._label_ids] = 1
+        self._centroids = _normalize_rows(one_hot.T @ self.vectors)
+        # Examples of each class whose boundary is known
+        self._known_starts = [
+            np.array(
+                [
+                    i
+                    for i in np.flatnonzero(self._label_ids == label_id)
+                    if self.starts[i] is not None
+                ],
+                dtype=np.int64,
+            )
+            for label_id in range(len(self.classes))
+        ]
+
+    @classmethod
+    def build(cls, examples: Iterable[Tuple], featurizer=None) -> "PreClassifierIndex":
+        """
+        Build an index from labeled page texts.
+
+        Args:
+            examples: (class, page text) pairs or (class, page text, starts)
+                triples, where starts tells whether the page was the first
+                page of its document
+            featurizer: Featurizer to use, HashingTextFeaturizer by default
+
+        Returns:
+            PreClassifierIndex
+        """
+        _require_numpy()
+        featurizer = featurizer or HashingTextFeaturizer()
+        labels, texts, starts = [], [], []
+        for label, text, *start in examples:
+            labels.append(label)
+            texts.append(text)
+            starts.append(start[0] if start else None)
+        return cls(featurizer.transform(texts), labels, featurizer, starts)
+
+    def _boundary(self, label_id: int, similarities: "np.ndarray") -> Optional[str]:
+        """Boundary of a page of a class, given its similarity to each example."""
+        known = self._known_starts[label_id]
+        if not len(known):
+            return None
+        flags = {self.starts[i] for i in known}
+        if len(flags) > 1:
+            # The class has both first and later pages; take the boundary of
+            # the most similar example
+            flags = {self.starts[known[np.argmax(similarities[known])]]}
+        return "start" if flags.pop() else "continue"
+
+    def predict(
+        self, texts: List[str], method: str = "centroid", k: int = 5
+    ) -> List[PreClassification]:
+        """
+        Find the best class of each text.
+
+        Args:
+            texts: Page texts
+            method: "centroid" or "knn"
+            k: Number of neighbors for "knn"
+
+        Returns:
+            PreClassification of each text, with the cosine similarity of the
+            best class and its margin over the runner-up
+        """
+        if method not in VALID_METHODS:
+            raise ValueError(f"Unknown pre-classifier method: {method}")
+        features = self.featurizer.transform(texts)
+        similarities = features @ self.vectors.T
+
+        if method == "centroid":
+            scores = features @ self._centroids.T
+        else:
+            k = min(k, len(self.labels))
+            neighbors = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            rows = np.arange(len(texts))[:, None]
+            # Mean similarity of the neighbors of each class
+            scores = np.zeros((len(texts), len(self.classes)), dtype=np.float32)
+            np.add.at(
+                scores,
+                (rows, self._label_ids[neighbors]),
+                similarities[rows, neighbors],
+            )
+            scores /= k
+
+        order = np.argsort(-scores, axis=1)
+        best = scores[np.arange(len(texts)), order[:, 0]]
+        if len(self.classes) > 1:
+            runner_up = scores[np.arange(len(texts)), order[:, 1]]
+        else:
+            runner_up = np.zeros(len(texts), dtype=np.float32)
+        return [
+            PreClassification(
+                label=self.classes[order[i, 0]],
+                similarity=float(best[i]),
+                margin=float(best[i] - runner_up[i]),
+                boundary=self._boundary(order[i, 0], similarities[i]),
+            )
+            for i in range(len(texts))
+        ]
+
+    def save(self, uri: str) -> None:
+        """
+        Save the index as a .npz file.
+
+        Args:
+            uri: Local path or S3 URI
+        """
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            vectors=self.vectors,
+            labels=np.array(self.labels),
+            featurizer=np.array(json.dumps(self.featurizer.to_config())),
+            # 1 first page of a document, 0 later page, -1 unknown
+            starts=np.array(
+                [-1 if start is None else int(start) for start in self.starts],
+                dtype=np.int8,
+            ),
+        )
+        if uri.startswith("s3://"):
+            bucket, key = parse_s3_uri(uri)
+            s3.write_content(buffer.getvalue(), bucket, key)
+            return
+        os.makedirs(os.path.dirname(uri) or ".", exist_ok=True)
+        with open(uri, "wb") as f:
+            f.write(buffer.getvalue())
+
+    @classmethod
+    def load(cls, uri: str) -> "PreClassifierIndex":
+        """
+        Load an index saved with save().
+
+        Args:
+            uri: Local path or S3 URI
+
+        Returns:
+            PreClassifierIndex
+        """
+        _require_numpy()
+        if uri.startswith("s3://"):
+            data = s3.get_binary_content(uri)
+        else:
+            with open(uri, "rb") as f:
+                data = f.read()
+        with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+            # Indexes saved before boundaries were recorded have no starts
+            starts = None
+            if "starts" in npz.files:
+                starts = [None if start < 0 else bool(start) for start in npz["starts"]]
+            return cls(
+                npz["vectors"],
+                [str(label) for label in npz["labels"]],
+                featurizer_from_config(json.loads(str(npz["featurizer"]))),
+                starts,
+            )
+
+
+def examples_from_documents(
+    documents: Iterable[Any],
+) -> Iterator[Tuple[str, str, Optional[bool]]]:
+    """
+    Get labeled page texts from classified documents.
+
+    Args:
+        documents: Document objects whose pages have a classification and
+            parsed text
+
+    Yields:
+        (class, page text, starts) triples, where starts tells whether the
+        page is the first page of its section (None if the document has no
+        sections); unclassified and failed pages are skipped
+    """
+    for document in documents:
+        first_pages = {
+            section.page_ids[0] for section in document.sections if section.page_ids
+        }
+        for page_id, page in document.pages.items():
+            if (
+                not page.classification
+                or not page.parsed_text_uri
+                or page.classification == "unclassified"
+                or page.classification.startswith("error")
+            ):
+                continue
+            yield (
+                page.classification,
+                s3.get_text_content(page.parsed_text_uri),
+                page_id in first_pages if document.sections else None,
+            )
+
+
+_loaded_indexes: Dict[str, PreClassifierIndex] = {}
+_loaded_indexes_lock = threading.Lock()
+
+
+def _load_index_cached(uri: str) -> PreClassifierIndex:
+    """Load an index once per process."""
+    with _loaded_indexes_lock:
+        if uri not in _loaded_indexes:
+            _loaded_indexes[uri] = PreClassifierIndex.load(uri)
+            logger.info(f"Loaded pre-classifier index from {uri}")
+        return _loaded_indexes[uri]
+
+
+def reset_loaded_indexes() -> None:
+    """Discard the indexes loaded by PreClassifier.from_config (used by tests)."""
+    with _loaded_indexes_lock:
+        _loaded_indexes.clear()
+
+
+class PreClassifier:
+    """Classifies pages locally when the index match is confident."""
+
+    def __init__(
+        self,
+        index: PreClassifierIndex,
+        method: str = "centroid",
+        k: int = 5,
+        min_similarity: float = 0.8,
+        min_margin: float = 0.1,
+        audit_sample_rate: float = 0.0,
+        valid_labels: Optional[Iterable[str]] = None,
+        default_boundary: Optional[str] = None,
+        metrics_enabled: bool = True,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize a pre-classifier.
+
+        Args:
+            index: Index of labeled example pages
+            method: "centroid" or "knn"
+            k: Number of neighbors for "knn"
+            min_similarity: Minimum cosine similarity of the best class
+            min_margin: Minimum lead of the best class over the runner-up
+            audit_sample_rate: Fraction of confident pages still sent to the
+                LLM to measure agreement
+            valid_labels: Classes of the current configuration; predictions of
+                other classes are never used
+            default_boundary: "start" or "continue" for pages whose boundary
+                the index cannot tell; None sends those pages to the LLM
+            metrics_enabled: Whether to publish CloudWatch metrics
+            rng: Random generator for audit sampling
+        """
+        if method not in VALID_METHODS:
+            raise ValueError(f"Unknown pre-classifier method: {method}")
+        if default_boundary not in (None, "start", "continue"):
+            raise ValueError(
+                f"Unknown pre-classifier default boundary: {default_boundary}"
+            )
+        self.index = index
+        self.method = method
+        self.k = k
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.audit_sample_rate = audit_sample_rate
+        self.valid_labels = set(valid_labels) if valid_labels is not None else None
+        self.default_boundary = default_boundary
+        self.metrics_enabled = metrics_enabled
+        self._rng = rng or random.Random()
+        self._pending_audits: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"pages": 0, "short_circuits": 0, "audits": 0, "agreements": 0}
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], valid_labels: Optional[Iterable[str]] = None
+    ) -> "PreClassifier":
+        """
+        Create a pre-classifier from the classification.preClassifier configuration.
+
+        Args:
+            config: Configuration with indexUri and optional method, k,
+                minSimilarity, minMargin, auditSampleRate and defaultBoundary
+            valid_labels: Classes of the current configuration
+
+        Returns:
+            PreClassifier
+        """
+        index_uri = config.get("indexUri")
+        if not index_uri:
+            raise ValueError("No indexUri found in preClassifier configuration")
+        return cls(
+            _load_index_cached(index_uri),
+            method=config.get("method", "centroid"),
+            k=int(config.get("k", 5)),
+            min_similarity=float(config.get("minSimilarity", 0.8)),
+            min_margin=float(config.get("minMargin", 0.1)),
+            audit_sample_rate=float(config.get("auditSampleRate", 0.0)),
+            valid_labels=valid_labels,
+            default_boundary=config.get("defaultBoundary"),
+        )
+
+    def _put_metric(self, name: str, value: float) -> None:
+        if self.metrics_enabled:
+            metrics.put_metric(name, value)
+
+    def classify(
+        self, text: str, audit_key: Optional[str] = None
+    ) -> Optional[PreClassification]:
+        """
+        Classify a page if the index match is confident.
+
+        A confident page sampled for audit is not classified; call
+        complete_audit with the LLM's class once it is known.
+
+        Args:
+            text: Page text
+            audit_key: Unique key of the page (e.g. its text URI), required
+                for auditing
+
+        Returns:
+            PreClassification with a boundary to use instead of the LLM, or None
+        """
+        prediction = self.index.predict([text], self.method, self.k)[0]
+        prediction.boundary = prediction.boundary or self.default_boundary
+        # Without a boundary, a page of the same class as the page before it
+        # cannot be told apart from the start of a new document
+        confident = (
+            prediction.similarity >= self.min_similarity
+            and prediction.margin >= self.min_margin
+            and (self.valid_labels is None or prediction.label in self.valid_labels)
+            and prediction.boundary is not None
+        )
+        audit = (
+            confident
+            and audit_key is not None
+            and self._rng.random() < self.audit_sample_rate
+        )
+        with self._lock:
+            self._stats["pages"] += 1
+            if audit:
+                self._pending_audits[audit_key] = prediction.label
+                while len(self._pending_audits) > MAX_PENDING_AUDITS:
+                    self._pending_audits.popitem(last=False)
+            elif confident:
+                self._stats["short_circuits"] += 1
+        self._put_metric("PreClassifierPages", 1)
+        if not confident or audit:
+            return None
+        logger.info(
+            f"Pre-classified page as '{prediction.label}' ({prediction.boundary}, "
+            f"similarity {prediction.similarity:.3f}, margin {prediction.margin:.3f})"
+        )
+        self._put_metric("PreClassifierShortCircuits", 1)
+        return prediction
+
+    def complete_audit(self, audit_key: Optional[str], llm_label: str) -> None:
+        """
+        Record whether the LLM agreed with a page sampled for audit.
+
+        Args:
+            audit_key: Key passed to classify
+            llm_label: Class the LLM assigned
+        """
+        if audit_key is None:
+            return
+        with self._lock:
+            label = self._pending_audits.pop(audit_key, None)
+            if label is None:
+                return
+            agreed = label == llm_label
+            self._stats["audits"] += 1
+            self._stats["agreements"] += int(agreed)
+        if not agreed:
+            logger.info(
+                f"Pre-classifier audit disagreement: predicted '{label}', LLM classified '{llm_label}'"
+            )
+        self._put_metric("PreClassifierAudits", 1)
+        self._put_metric("PreClassifierAgreement", 1 if agreed else 0)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pre-classification statistics of this instance.
+
+        Returns:
+            Dict with pages, short_circuits, audits and agreements
+        """
+        with self._lock:
+            return dict(self._stats)
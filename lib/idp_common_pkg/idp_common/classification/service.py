@@ -17,19 +17,24 @@ Classification methods:
   across the entire document packet at once.
 """
 
+import asyncio
+import functools
 import json
 import logging
 import os
-import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import boto3
 from botocore.exceptions import ClientError
 
 from idp_common import bedrock, image, s3, utils
+from idp_common.classification.cache import (
+    PageCacheWriter,
+    PageClassificationCache,
+    compute_config_hash,
+)
 from idp_common.classification.models import (
     ClassificationResult,
     DocumentClassification,
@@ -37,8 +42,11 @@ from idp_common.classification.models import (
     DocumentType,
     PageClassification,
 )
-from idp_common.models import Document, Section, Status
+from idp_common.classification.pre_classifier import PreClassifier
+from idp_common.models import Document, Section, Status, image_variant_key
 from idp_common.utils import extract_json_from_text, extract_structured_data_from_text
+from idp_common.utils.few_shot_cache import compute_few_shot_key, get_few_shot_cache
+from idp_common.utils.resilience import CircuitOpenError, get_retry_policy
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,12 @@ class ClassificationService:
     MULTIMODAL_PAGE_LEVEL = "multimodalPageLevelClassification"
     TEXTBASED_HOLISTIC = "textbasedHolisticClassification"
 
+    # Appended to the task prompt when several pages share one request
+    PAGE_GROUP_INSTRUCTIONS = """
+The content above contains {page_count} consecutive pages of a document package, each introduced by its <page-number> tag. Classify each page separately following the instructions above. Respond only with a JSON array containing one object per page, in page order:
+[{{"page": "<page number>", "class": "<class name>", "document_boundary": "<start or continue>"}}]
+"""
+
     def __init__(
         self,
         region: str = None,
@@ -91,9 +105,26 @@ class ClassificationService:
             "CLASSIFICATION_CACHE_TABLE"
         )
         self.cache_table = None
+        self.page_cache = None
         if self.cache_table_name:
             dynamodb = boto3.resource("dynamodb", region_name=self.region)
             self.cache_table = dynamodb.Table(self.cache_table_name)
+            # Cached pages are reused by any execution with the same configuration
+            self.page_cache = PageClassificationCache(
+                dynamodb,
+                self.cache_table_name,
+                compute_config_hash(
+                    self.config.get("classes"),
+                    self.config.get("classification"),
+                    self.config.get("model_id"),
+                    self.config.get("sagemaker_endpoint_name"),
+                    backend.lower(),
+                ),
+                ttl_days=float(
+                    self.config.get("classification", {}).get("cacheTtlDays", 1)
+                ),
+                max_workers=max_workers,
+            )
             logger.info(
                 f"Classification caching enabled using table: {self.cache_table_name}"
             )
@@ -142,6 +173,50 @@ class ClassificationService:
             "maxPagesForClassification", "ALL"
         )
 
+        # Get number of consecutive pages classified per model request
+        # (multimodal page-level classification with the Bedrock backend)
+        try:
+            self.pages_per_request = max(
+                1, int(classification_config.get("pagesPerRequest", 1))
+            )
+        except (TypeError, ValueError):
+            logger.warning(
+                f"Invalid pagesPerRequest value: {classification_config.get('pagesPerRequest')}, using 1"
+            )
+            self.pages_per_request = 1
+
+        # Get sliding window settings for holistic classification of long packets
+        try:
+            self.holistic_window_size = int(
+                classification_config.get("holisticWindowSize") or 0
+            )
+            self.holistic_window_overlap = int(
+                classification_config.get("holisticWindowOverlap", 2)
+            )
+        except (TypeError, ValueError):
+            logger.warning(
+                "Invalid holisticWindowSize or holisticWindowOverlap value, classifying packets in one request"
+            )
+            self.holistic_window_size = 0
+            self.holistic_window_overlap = 0
+        self.holistic_window_overlap = max(
+            0, min(self.holistic_window_overlap, self.holistic_window_size - 1)
+        )
+
+        # Optional local pre-classification of pages against labeled examples
+        self.pre_classifier = None
+        pre_classifier_config = classification_config.get("preClassifier") or {}
+        if pre_classifier_config.get("enabled"):
+            try:
+                self.pre_classifier = PreClassifier.from_config(
+                    pre_classifier_config, valid_labels=self.valid_doc_types
+                )
+                logger.info(
+                    f"Pre-classification enabled using index {pre_classifier_config.get('indexUri')}"
+                )
+            except Exception as e:
+                logger.warning(f"Pre-classification disabled: {e}")
+
         # Log classification method
         if self.classification_method == self.TEXTBASED_HOLISTIC:
             logger.info("Using textbased holistic packet classification method")
@@ -337,52 +412,18 @@ class ClassificationService:
             cached_page_classifications = self._get_cached_page_classifications(
                 document
             )
-            all_page_results = list(cached_page_classifications.values())
-            combined_metering = {}
-            errors_lock = threading.Lock()  # Thread safety for error collection
-            failed_page_exceptions = {}  # Store original exceptions for failed pages
-
-            # Determine which pages need classification
-            pages_to_classify = {}
-            for page_id, page in document.pages.items():
-                if page_id not in cached_page_classifications:
-                    pages_to_classify[page_id] = page
-                else:
-                    # Update document with cached classification
-                    cached_result = cached_page_classifications[page_id]
-                    document.pages[
-                        page_id
-                    ].classification = cached_result.classification.doc_type
-                    document.pages[
-                        page_id
-                    ].confidence = cached_result.classification.confidence
-
-                    # Copy metadata (including boundary information) to the page
-                    if hasattr(document.pages[page_id], "metadata"):
-                        document.pages[
-                            page_id
-                        ].metadata = cached_result.classification.metadata
-                    else:
-                        # If the page doesn't have a metadata attribute, add it
-                        setattr(
-                            document.pages[page_id],
-                            "metadata",
-                            cached_result.classification.metadata,
-                        )
-
-                    # Merge cached metering data
-                    page_metering = cached_result.classification.metadata.get(
-                        "metering", {}
-                    )
-                    combined_metering = utils.merge_metering_data(
-                        combined_metering, page_metering
-                    )
+            pages_to_classify = self._get_pages_to_classify(
+                document, cached_page_classifications
+            )
 
-            if pages_to_classify:
-                logger.info(
-                    f"Found {len(cached_page_classifications)} cached page classifications, classifying {len(pages_to_classify)} remaining pages"
+            # Pages are cached as they complete, so a timeout keeps them
+            cache_writer = self._create_page_cache_writer(document)
+            page_outcomes = {}
+            if pages_to_classify and self._uses_page_groups():
+                page_outcomes = self._classify_page_groups(
+                    pages_to_classify, cache_writer
                 )
-
+            elif pages_to_classify:
                 with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                     futures = {}
 
@@ -394,179 +435,376 @@ class ClassificationService:
                             text_uri=page.parsed_text_uri,
                             image_uri=page.image_uri,
                             raw_text_uri=page.raw_text_uri,
+                            image_variants=page.image_variants,
                         )
                         futures[future] = page_id
 
-                    # Process results as they complete
+                    # Collect results (or exceptions) as they complete
                     for future in as_completed(futures):
                         page_id = futures[future]
                         try:
-                            page_result = future.result()
-                            all_page_results.append(page_result)
-
-                            # Check if there was an error in the classification
-                            if "error" in page_result.classification.metadata:
-                                with errors_lock:
-                                    error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
-                                    document.errors.append(error_msg)
-
-                            # Update the page in the document
-                            document.pages[
-                                page_id
-                            ].classification = page_result.classification.doc_type
-                            document.pages[
-                                page_id
-                            ].confidence = page_result.classification.confidence
-
-                            # Copy metadata (including boundary information) to the page
-                            if hasattr(document.pages[page_id], "metadata"):
-                                document.pages[
-                                    page_id
-                                ].metadata = page_result.classification.metadata
-                            else:
-                                # If the page doesn't have a metadata attribute, add it
-                                setattr(
-                                    document.pages[page_id],
-                                    "metadata",
-                                    page_result.classification.metadata,
-                                )
-
-                            # Merge metering data
-                            page_metering = page_result.classification.metadata.get(
-                                "metering", {}
-                            )
-                            combined_metering = utils.merge_metering_data(
-                                combined_metering, page_metering
-                            )
+                            page_outcomes[page_id] = future.result()
                         except Exception as e:
-                            # Capture exception details in the document object instead of raising
-                            error_msg = f"Error classifying page {page_id}: {str(e)}"
-                            logger.error(error_msg)
-                            with errors_lock:
-                                document.errors.append(error_msg)
-                                # Store the original exception for later use
-                                failed_page_exceptions[page_id] = e
-
-                            # Mark page as unclassified on error
-                            if page_id in document.pages:
-                                document.pages[
-                                    page_id
-                                ].classification = "error (backoff/retry)"
-                                document.pages[page_id].confidence = 0.0
-
-                # Store failed page exceptions in document metadata for caller to access
-                if failed_page_exceptions:
-                    logger.info(
-                        f"Processing {len(failed_page_exceptions)} failed page exceptions for document {document.id}"
-                    )
+                            page_outcomes[page_id] = e
+                        if cache_writer:
+                            cache_writer.add(page_outcomes[page_id])
+            if cache_writer:
+                cache_writer.flush()
+
+            document = self._complete_multimodal_classification(
+                document, cached_page_classifications, page_outcomes, t0
+            )
 
-                    # Store the first encountered exception as the primary failure cause
-                    first_exception = next(iter(failed_page_exceptions.values()))
-                    document.metadata = document.metadata or {}
-                    document.metadata["failed_page_exceptions"] = {
-                        page_id: {
-                            "exception_type": type(exc).__name__,
-                            "exception_message": str(exc),
-                            "exception_class": exc.__class__.__module__
-                            + "."
-                            + exc.__class__.__name__,
-                        }
-                        for page_id, exc in failed_page_exceptions.items()
-                    }
-                    # Store the primary exception for easy access by caller
-                    document.metadata["primary_exception"] = first_exception
-
-                    # Cache successful page classifications (only when some pages fail - for retry scenarios)
-                    successful_results = [
-                        r
-                        for r in all_page_results
-                        if "error" not in r.classification.metadata
-                    ]
-                    if successful_results:
-                        logger.info(
-                            f"Caching {len(successful_results)} successful page classifications for document {document.id} due to {len(failed_page_exceptions)} failed pages (retry scenario)"
-                        )
-                        self._cache_successful_page_classifications(
-                            document, successful_results
-                        )
-                    else:
-                        logger.warning(
-                            f"No successful page classifications to cache for document {document.id} - all {len(failed_page_exceptions)} pages failed"
-                        )
-                else:
-                    # All pages succeeded - no need to cache since there won't be retries
-                    logger.info(
-                        f"All pages succeeded for document {document.id} - skipping cache (no retry needed)"
-                    )
-            else:
-                logger.info(
-                    f"All {len(cached_page_classifications)} page classifications found in cache"
-                )
+        except Exception as e:
+            self._fail_multimodal_classification(document, e)
+            # raise exception to enable client retries
+            raise
 
-            # Group pages into sections only if we have results
-            document.sections = []
-            sorted_results = self._sort_page_results(all_page_results)
-
-            if sorted_results:
-                current_group = 1
-                current_type = sorted_results[0].classification.doc_type
-                current_pages = [sorted_results[0]]
-
-                for result in sorted_results[1:]:
-                    boundary = result.classification.metadata.get(
-                        "document_boundary", "continue"
-                    ).lower()
-                    if (
-                        result.classification.doc_type == current_type
-                        and boundary != "start"
+        return document
+
+    async def _classify_pages_multimodal_async(self, document: Document) -> Document:
+        """
+        Classify pages using multimodal page-level classification with one
+        coroutine per page instead of one thread per page.
+        """
+        t0 = time.time()
+        logger.info(
+            f"Classifying document with {len(document.pages)} pages using async multimodal page-level classification with {self.backend} backend"
+        )
+
+        loop = asyncio.get_running_loop()
+        try:
+            cached_page_classifications = await loop.run_in_executor(
+                None, self._get_cached_page_classifications, document
+            )
+            pages_to_classify = self._get_pages_to_classify(
+                document, cached_page_classifications
+            )
+            cache_writer = self._create_page_cache_writer(document)
+
+            async def cache_on_completion(outcomes):
+                # Write each page (or group) to the cache as soon as it completes
+                try:
+                    result = await outcomes
+                except Exception as e:
+                    result = e
+                if cache_writer:
+                    for outcome in (
+                        result.values() if isinstance(result, dict) else [result]
                     ):
-                        current_pages.append(result)
-                    else:
-                        # Create a new section with the current group of pages
-                        section = self._create_section(
-                            section_id=str(current_group),
-                            doc_type=current_type,
-                            pages=[p.page_id for p in current_pages],
+                        await loop.run_in_executor(None, cache_writer.add, outcome)
+                return result
+
+            if self._uses_page_groups():
+                page_outcomes = {}
+                for group_outcomes in await asyncio.gather(
+                    *[
+                        cache_on_completion(self.classify_page_group_async(group))
+                        for group in self._get_page_groups(pages_to_classify)
+                    ]
+                ):
+                    page_outcomes.update(group_outcomes)
+            else:
+                results = await asyncio.gather(
+                    *[
+                        cache_on_completion(
+                            self.classify_page_async(
+                                page_id=page_id,
+                                text_uri=page.parsed_text_uri,
+                                image_uri=page.image_uri,
+                                raw_text_uri=page.raw_text_uri,
+                                image_variants=page.image_variants,
+                            )
                         )
-                        document.sections.append(section)
-
-                        # Start a new group
-                        current_group += 1
-                        current_type = result.classification.doc_type
-                        current_pages = [result]
-
-                # Add the final section
-                section = self._create_section(
-                    section_id=str(current_group),
-                    doc_type=current_type,
-                    pages=[p.page_id for p in current_pages],
+                        for page_id, page in pages_to_classify.items()
+                    ]
                 )
-                document.sections.append(section)
+                page_outcomes = dict(zip(pages_to_classify, results))
+            if cache_writer:
+                await loop.run_in_executor(None, cache_writer.flush)
 
-            # Update document status and metering
-            document = self._update_document_status(document)
-            document.metering = utils.merge_metering_data(
-                document.metering, combined_metering
+            document = await loop.run_in_executor(
+                None,
+                self._complete_multimodal_classification,
+                document,
+                cached_page_classifications,
+                page_outcomes,
+                t0,
             )
 
-            t1 = time.time()
+        except Exception as e:
+            self._fail_multimodal_classification(document, e)
+            raise
+
+        return document
+
+    def _get_pages_to_classify(
+        self,
+        document: Document,
+        cached_page_classifications: Dict[str, PageClassification],
+    ) -> Dict[str, Any]:
+        """
+        Return the pages that have no cached classification.
+
+        Args:
+            document: Document being classified
+            cached_page_classifications: Cached results keyed by page ID
+
+        Returns:
+            Dictionary mapping page_id to Page for the pages to classify
+        """
+        pages_to_classify = {
+            page_id: page
+            for page_id, page in document.pages.items()
+            if page_id not in cached_page_classifications
+        }
+        if pages_to_classify:
+            logger.info(
+                f"Found {len(cached_page_classifications)} cached page classifications, classifying {len(pages_to_classify)} remaining pages"
+            )
+        else:
             logger.info(
-                f"Document classified with {len(document.sections)} sections in {t1 - t0:.2f} seconds"
+                f"All {len(cached_page_classifications)} page classifications found in cache"
             )
+        return pages_to_classify
 
-        except Exception as e:
-            error_msg = f"Error classifying all document pages: {str(e)}"
-            document = self._update_document_status(
-                document, success=False, error_message=error_msg
+    def _uses_page_groups(self) -> bool:
+        """Check whether consecutive pages are classified several per request."""
+        return self.backend == "bedrock" and self.pages_per_request > 1
+
+    def _get_page_groups(
+        self, pages_to_classify: Dict[str, Any]
+    ) -> List[List[Tuple[str, Any]]]:
+        """
+        Split the pages to classify into groups of consecutive pages.
+
+        Args:
+            pages_to_classify: Dictionary mapping page_id to Page
+
+        Returns:
+            Lists of (page_id, Page) with up to pagesPerRequest pages each
+        """
+        try:
+            ordered = sorted(pages_to_classify.items(), key=lambda x: int(x[0]))
+        except (ValueError, TypeError):
+            ordered = sorted(pages_to_classify.items(), key=lambda x: x[0])
+        return [
+            ordered[i : i + self.pages_per_request]
+            for i in range(0, len(ordered), self.pages_per_request)
+        ]
+
+    def _classify_page_groups(
+        self,
+        pages_to_classify: Dict[str, Any],
+        cache_writer: Optional[PageCacheWriter] = None,
+    ) -> Dict[str, Union[PageClassification, BaseException]]:
+        """
+        Classify pages in groups of consecutive pages, one group per thread.
+
+        Args:
+            pages_to_classify: Dictionary mapping page_id to Page
+            cache_writer: Optional writer that caches each group's pages as it completes
+
+        Returns:
+            New result, or the exception raised, keyed by page ID
+        """
+        page_outcomes = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.classify_page_group, group): group
+                for group in self._get_page_groups(pages_to_classify)
+            }
+            for future in as_completed(futures):
+                try:
+                    group_outcomes = future.result()
+                except Exception as e:
+                    group_outcomes = {page_id: e for page_id, _ in futures[future]}
+                page_outcomes.update(group_outcomes)
+                if cache_writer:
+                    for outcome in group_outcomes.values():
+                        cache_writer.add(outcome)
+        return page_outcomes
+
+    def _apply_page_classification(
+        self, document: Document, page_id: str, page_result: PageClassification
+    ) -> None:
+        """
+        Copy a page classification result (including boundary metadata) to the page.
+
+        Args:
+            document: Document being classified
+            page_id: ID of the page
+            page_result: Classification result for the page
+        """
+        document.pages[page_id].classification = page_result.classification.doc_type
+        document.pages[page_id].confidence = page_result.classification.confidence
+
+        # Copy metadata (including boundary information) to the page
+        if hasattr(document.pages[page_id], "metadata"):
+            document.pages[page_id].metadata = page_result.classification.metadata
+        else:
+            # If the page doesn't have a metadata attribute, add it
+            setattr(
+                document.pages[page_id],
+                "metadata",
+                page_result.classification.metadata,
+            )
+
+    def _complete_multimodal_classification(
+        self,
+        document: Document,
+        cached_page_classifications: Dict[str, PageClassification],
+        page_outcomes: Dict[str, Union[PageClassification, BaseException]],
+        t0: float,
+    ) -> Document:
+        """
+        Apply cached and new page results to the document and group pages into sections.
+
+        Args:
+            document: Document being classified
+            cached_page_classifications: Cached results keyed by page ID
+            page_outcomes: New result, or the exception raised, keyed by page ID
+            t0: Time classification started
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        all_page_results = list(cached_page_classifications.values())
+        combined_metering = {}
+        failed_page_exceptions = {}  # Store original exceptions for failed pages
+
+        for page_id, cached_result in cached_page_classifications.items():
+            # Update document with cached classification
+            self._apply_page_classification(document, page_id, cached_result)
+
+            # Merge cached metering data
+            page_metering = cached_result.classification.metadata.get("metering", {})
+            combined_metering = utils.merge_metering_data(
+                combined_metering, page_metering
+            )
+
+        for page_id, page_result in page_outcomes.items():
+            if isinstance(page_result, BaseException):
+                # Capture exception details in the document object instead of raising
+                error_msg = f"Error classifying page {page_id}: {str(page_result)}"
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                # Store the original exception for later use
+                failed_page_exceptions[page_id] = page_result
+
+                # Mark page as unclassified on error
+                if page_id in document.pages:
+                    document.pages[page_id].classification = "error (backoff/retry)"
+                    document.pages[page_id].confidence = 0.0
+                continue
+
+            all_page_results.append(page_result)
+
+            # Check if there was an error in the classification
+            if "error" in page_result.classification.metadata:
+                error_msg = f"Error classifying page {page_id}: {page_result.classification.metadata['error']}"
+                document.errors.append(error_msg)
+
+            # Update the page in the document
+            self._apply_page_classification(document, page_id, page_result)
+
+            # Merge metering data
+            page_metering = page_result.classification.metadata.get("metering", {})
+            combined_metering = utils.merge_metering_data(
+                combined_metering, page_metering
+            )
+
+        # Store failed page exceptions in document metadata for caller to access
+        if failed_page_exceptions:
+            logger.info(
+                f"Processing {len(failed_page_exceptions)} failed page exceptions for document {document.id}"
             )
-            # Store the exception in metadata for caller to access
+
+            # Store the first encountered exception as the primary failure cause
+            first_exception = next(iter(failed_page_exceptions.values()))
             document.metadata = document.metadata or {}
-            document.metadata["primary_exception"] = e
-            # raise exception to enable client retries
-            raise
+            document.metadata["failed_page_exceptions"] = {
+                page_id: {
+                    "exception_type": type(exc).__name__,
+                    "exception_message": str(exc),
+                    "exception_class": exc.__class__.__module__
+                    + "."
+                    + exc.__class__.__name__,
+                }
+                for page_id, exc in failed_page_exceptions.items()
+            }
+            # Store the primary exception for easy access by caller
+            document.metadata["primary_exception"] = first_exception
+
+        # Group pages into sections only if we have results
+        document.sections = []
+        sorted_results = self._sort_page_results(all_page_results)
+
+        if sorted_results:
+            current_group = 1
+            current_type = sorted_results[0].classification.doc_type
+            current_pages = [sorted_results[0]]
+
+            for result in sorted_results[1:]:
+                boundary = result.classification.metadata.get(
+                    "document_boundary", "continue"
+                ).lower()
+                if (
+                    result.classification.doc_type == current_type
+                    and boundary != "start"
+                ):
+                    current_pages.append(result)
+                else:
+                    # Create a new section with the current group of pages
+                    section = self._create_section(
+                        section_id=str(current_group),
+                        doc_type=current_type,
+                        pages=[p.page_id for p in current_pages],
+                    )
+                    document.sections.append(section)
+
+                    # Start a new group
+                    current_group += 1
+                    current_type = result.classification.doc_type
+                    current_pages = [result]
+
+            # Add the final section
+            section = self._create_section(
+                section_id=str(current_group),
+                doc_type=current_type,
+                pages=[p.page_id for p in current_pages],
+            )
+            document.sections.append(section)
+
+        # Update document status and metering
+        document = self._update_document_status(document)
+        document.metering = utils.merge_metering_data(
+            document.metering, combined_metering
+        )
+
+        t1 = time.time()
+        logger.info(
+            f"Document classified with {len(document.sections)} sections in {t1 - t0:.2f} seconds"
+        )
 
         return document
 
+    def _fail_multimodal_classification(
+        self, document: Document, exception: Exception
+    ) -> None:
+        """
+        Record a failed multimodal classification on the document.
+
+        Args:
+            document: Document being classified
+            exception: Exception that stopped classification
+        """
+        error_msg = f"Error classifying all document pages: {str(exception)}"
+        self._update_document_status(document, success=False, error_message=error_msg)
+        # Store the exception in metadata for caller to access
+        document.metadata = document.metadata or {}
+        document.metadata["primary_exception"] = exception
+
     def _check_page_content_regex(self, text_content: str) -> Optional[str]:
         """
         Check if page content matches any class regex patterns.
@@ -668,7 +906,7 @@ class ClassificationService:
         prompt_template: str,
         document_text: str,
         class_names_and_descriptions: str,
-        image_content: Optional[bytes] = None,
+        image_content: Optional[Union[bytes, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build content array, automatically deciding whether to use image placeholder processing.
@@ -680,7 +918,8 @@ class ClassificationService:
             prompt_template: The prompt template that may contain {DOCUMENT_IMAGE}
             document_text: The document text content
             class_names_and_descriptions: Formatted class names and descriptions
-            image_content: Optional image content to insert (only used when {DOCUMENT_IMAGE} is present)
+            image_content: Optional image content, or the content items of several page images,
+                to insert (only used when {DOCUMENT_IMAGE} is present)
 
         Returns:
             List of content items with text and image content properly ordered based on presence of placeholder
@@ -705,7 +944,7 @@ class ClassificationService:
         prompt_template: str,
         document_text: str,
         class_names_and_descriptions: str,
-        image_content: Optional[bytes] = None,
+        image_content: Optional[Union[bytes, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build content array with image inserted at DOCUMENT_IMAGE placeholder if present.
@@ -714,7 +953,8 @@ class ClassificationService:
             prompt_template: The prompt template that may contain {DOCUMENT_IMAGE}
             document_text: The document text content
             class_names_and_descriptions: Formatted class names and descriptions
-            image_content: Optional image content to insert
+            image_content: Optional image content to insert, or the content
+                items of several page images
 
         Returns:
             List of content items with text and image content properly ordered
@@ -762,8 +1002,11 @@ class ClassificationService:
             if before_image.strip():
                 content.append({"text": before_image})
 
-            # Add the image if available
-            if image_content:
+            # Add the image if available; several pages arrive as prepared
+            # content items
+            if isinstance(image_content, list):
+                content.extend(image_content)
+            elif image_content:
                 content.append(image.prepare_bedrock_image_attachment(image_content))
 
             # Add the part after the image
@@ -785,7 +1028,7 @@ class ClassificationService:
         prompt_template: str,
         document_text: str,
         class_names_and_descriptions: str,
-        image_content: Optional[bytes] = None,
+        image_content: Optional[Union[bytes, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build content array without DOCUMENT_IMAGE placeholder (standard processing).
@@ -822,7 +1065,7 @@ class ClassificationService:
         task_prompt_template: str,
         document_text: str,
         class_names_and_descriptions: str,
-        image_content: Optional[bytes] = None,
+        image_content: Optional[Union[bytes, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build content array with support for optional FEW_SHOT_EXAMPLES and DOCUMENT_IMAGE placeholders.
@@ -831,7 +1074,8 @@ class ClassificationService:
             task_prompt_template: The task prompt template that may contain placeholders
             document_text: The document text content
             class_names_and_descriptions: Formatted class names and descriptions
-            image_content: Optional image content to insert
+            image_content: Optional image content to insert, or the content
+                items of several page images
 
         Returns:
             List of content items with text and image content properly ordered
@@ -877,10 +1121,36 @@ class ClassificationService:
         """
         Build content items for few-shot examples from the configuration.
 
+        The content is cached for the lifetime of the process, keyed by the
+        examples of all classes, so example images are loaded once per
+        configuration instead of once per page.
+
         Returns:
             List of content items containing text and image content for examples
         """
+        examples = [
+            (class_obj.get("name"), class_obj.get("examples", []))
+            for class_obj in self.config.get("classes", [])
+        ]
+        key = compute_few_shot_key(
+            "classification",
+            examples,
+            os.environ.get("CONFIGURATION_BUCKET"),
+            os.environ.get("ROOT_DIR"),
+        )
+        return get_few_shot_cache().get_or_build(
+            key, self._load_few_shot_examples_content
+        )
+
+    def _load_few_shot_examples_content(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Load the text and images of the few-shot examples.
+
+        Returns:
+            Tuple of the content items and whether all example images loaded
+        """
         content = []
+        complete = True
         classes = self.config.get("classes", [])
 
         for class_obj in classes:
@@ -933,6 +1203,7 @@ class ClassificationService:
                                 logger.warning(
                                     f"Failed to load image {image_file_path}: {e}"
                                 )
+                                complete = False
                                 continue
 
                     except Exception as e:
@@ -940,7 +1211,7 @@ class ClassificationService:
                             f"Failed to load example images from {image_path}: {e}"
                         )
 
-        return content
+        return content, complete
 
     def _get_image_files_from_path(self, image_path: str) -> List[str]:
         """
@@ -1011,6 +1282,7 @@ class ClassificationService:
         text_uri: Optional[str] = None,
         image_uri: Optional[str] = None,
         raw_text_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
     ) -> PageClassification:
         """
         Classify a single page using Bedrock LLMs.
@@ -1020,163 +1292,722 @@ class ClassificationService:
             text_uri: URI of the text content
             image_uri: URI of the image content
             raw_text_uri: URI of the raw text content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
 
         Returns:
             PageClassification: Classification result for the page
         """
-        # Initialize content variables
-        text_content = None
-        image_content = None
+        prepared = self._prepare_page_classification(
+            page_id=page_id,
+            text_uri=text_uri,
+            image_uri=image_uri,
+            raw_text_uri=raw_text_uri,
+            image_variants=image_variants,
+        )
+        if isinstance(prepared, PageClassification):
+            return prepared
+        content, config = prepared
 
-        # Load text content from URI
-        if text_uri:
-            try:
-                text_content = s3.get_text_content(text_uri)
-            except Exception as e:
-                logger.warning(f"Failed to load text content from {text_uri}: {e}")
-                # Continue without text content
+        logger.info(f"Classifying page {page_id} with Bedrock")
 
-        # Load image content from URI with configurable dimensions
-        if image_uri:
-            try:
-                image_config = self.config.get("classification", {}).get("image", {})
-                target_width = image_config.get("target_width")
-                target_height = image_config.get("target_height")
+        t0 = time.time()
 
-                # Just pass the values directly - prepare_image handles empty strings/None
-                image_content = image.prepare_image(
-                    image_uri, target_width, target_height
-                )
-            except Exception as e:
-                logger.warning(f"Failed to load image content from {image_uri}: {e}")
-                # Continue without image content
+        # Invoke Bedrock model
+        try:
+            response_with_metering = self._invoke_bedrock_model(
+                content=content, config=config
+            )
 
-        # Check for page content regex match (multi-modal page-level classification only)
-        if text_content:
-            regex_matched_class = self._check_page_content_regex(text_content)
-            if regex_matched_class:
-                logger.info(
-                    f"Page {page_id} classified as '{regex_matched_class}' based on content regex match. Skipping LLM classification."
-                )
+            t1 = time.time()
+            logger.info(
+                f"Time taken for classification of page {page_id}: {t1 - t0:.2f} seconds"
+            )
 
-                # Create and return classification result with regex match
-                return PageClassification(
-                    page_id=page_id,
-                    classification=DocumentClassification(
-                        doc_type=regex_matched_class,
-                        confidence=1.0,  # High confidence for regex matches
-                        metadata={
-                            "regex_matched": True,
-                            "document_boundary": "continue",  # Default boundary
-                        },
-                    ),
-                    image_uri=image_uri,
-                    text_uri=text_uri,
-                    raw_text_uri=raw_text_uri,
-                )
+            return self._parse_page_classification(
+                page_id, response_with_metering, image_uri, text_uri, raw_text_uri
+            )
+        except Exception as e:
+            logger.error(f"Error classifying page {page_id}: {str(e)}")
+            raise
 
-        # Verify we have at least some content to classify
-        if not text_content and not image_content:
-            logger.warning(f"No content available for page {page_id}")
-            # Return unclassified result
-            return self._create_unclassified_result(
+    async def classify_page_bedrock_async(
+        self,
+        page_id: str,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
+    ) -> PageClassification:
+        """
+        Classify a single page using Bedrock LLMs without blocking the event loop.
+
+        Args:
+            page_id: ID of the page
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            raw_text_uri: URI of the raw text content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        # Loading text and images from S3 is blocking I/O
+        prepared = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                self._prepare_page_classification,
                 page_id=page_id,
-                image_uri=image_uri,
                 text_uri=text_uri,
+                image_uri=image_uri,
                 raw_text_uri=raw_text_uri,
-                error_message="No content available for classification",
-            )
-
-        # Get classification configuration
-        config = self._get_classification_config()
-
-        # Build content with support for placeholders
-        content = self._build_content(
-            config["task_prompt"],
-            text_content or "",
-            self._format_classes_list(),
-            image_content,
+                image_variants=image_variants,
+            ),
         )
+        if isinstance(prepared, PageClassification):
+            return prepared
+        content, config = prepared
 
-        logger.info(f"Classifying page {page_id} with Bedrock")
+        logger.info(f"Classifying page {page_id} with Bedrock (async)")
 
         t0 = time.time()
-
-        # Invoke Bedrock model
         try:
-            response_with_metering = self._invoke_bedrock_model(
+            response_with_metering = await self._invoke_bedrock_model_async(
                 content=content, config=config
             )
+            logger.info(
+                f"Time taken for classification of page {page_id}: {time.time() - t0:.2f} seconds"
+            )
+            return self._parse_page_classification(
+                page_id, response_with_metering, image_uri, text_uri, raw_text_uri
+            )
+        except Exception as e:
+            logger.error(f"Error classifying page {page_id}: {str(e)}")
+            raise
 
-            t1 = time.time()
+    def classify_page_group(
+        self, pages: List[Tuple[str, Any]]
+    ) -> Dict[str, Union[PageClassification, BaseException]]:
+        """
+        Classify consecutive pages with one Bedrock request.
+
+        Pages classified without the model (content regex match or no content)
+        are left out of the request. Pages missing from the model output, or
+        whose entry cannot be parsed, are classified with single-page requests.
+
+        Args:
+            pages: (page_id, Page) tuples in page order
+
+        Returns:
+            Dictionary mapping page_id to its PageClassification, or to the
+            exception raised while classifying it
+        """
+        outcomes, loaded = self._prepare_page_group(pages)
+        if not loaded:
+            return outcomes
+        config = self._get_classification_config()
+
+        group_metering = {}
+        if len(loaded) > 1:
+            page_ids = [page_id for page_id, _, _, _ in loaded]
+            logger.info(f"Classifying pages {page_ids} with Bedrock in one request")
+            t0 = time.time()
+            try:
+                response_with_metering = self._invoke_bedrock_model(
+                    content=self._build_page_group_content(loaded, config),
+                    config=config,
+                )
+            except Exception as e:
+                logger.error(f"Error classifying pages {page_ids}: {str(e)}")
+                outcomes.update({page_id: e for page_id in page_ids})
+                return outcomes
             logger.info(
-                f"Time taken for classification of page {page_id}: {t1 - t0:.2f} seconds"
+                f"Time taken for classification of pages {page_ids}: {time.time() - t0:.2f} seconds"
+            )
+            group_metering = response_with_metering["metering"]
+            outcomes.update(
+                self._parse_page_group_classification(loaded, response_with_metering)
+            )
+
+        for loaded_page in loaded:
+            page_id = loaded_page[0]
+            if page_id in outcomes:
+                continue
+            try:
+                outcomes[page_id] = self._classify_loaded_page(loaded_page, config)
+            except Exception as e:
+                logger.error(f"Error classifying page {page_id}: {str(e)}")
+                outcomes[page_id] = e
+
+        self._add_page_group_metering(outcomes, loaded, group_metering)
+        return outcomes
+
+    async def classify_page_group_async(
+        self, pages: List[Tuple[str, Any]]
+    ) -> Dict[str, Union[PageClassification, BaseException]]:
+        """
+        Classify consecutive pages with one Bedrock request without blocking the event loop.
+
+        Args:
+            pages: (page_id, Page) tuples in page order
+
+        Returns:
+            Dictionary mapping page_id to its PageClassification, or to the
+            exception raised while classifying it
+        """
+        # Loading text and images from S3 is blocking I/O
+        outcomes, loaded = await asyncio.get_running_loop().run_in_executor(
+            None, self._prepare_page_group, pages
+        )
+        if not loaded:
+            return outcomes
+        config = self._get_classification_config()
+
+        group_metering = {}
+        if len(loaded) > 1:
+            page_ids = [page_id for page_id, _, _, _ in loaded]
+            logger.info(
+                f"Classifying pages {page_ids} with Bedrock in one request (async)"
+            )
+            t0 = time.time()
+            try:
+                response_with_metering = await self._invoke_bedrock_model_async(
+                    content=self._build_page_group_content(loaded, config),
+                    config=config,
+                )
+            except Exception as e:
+                logger.error(f"Error classifying pages {page_ids}: {str(e)}")
+                outcomes.update({page_id: e for page_id in page_ids})
+                return outcomes
+            logger.info(
+                f"Time taken for classification of pages {page_ids}: {time.time() - t0:.2f} seconds"
+            )
+            group_metering = response_with_metering["metering"]
+            outcomes.update(
+                self._parse_page_group_classification(loaded, response_with_metering)
             )
 
-            response = response_with_metering["response"]
-            metering = response_with_metering["metering"]
+        remaining = [p for p in loaded if p[0] not in outcomes]
+        results = await asyncio.gather(
+            *[self._classify_loaded_page_async(p, config) for p in remaining],
+            return_exceptions=True,
+        )
+        outcomes.update({p[0]: result for p, result in zip(remaining, results)})
+
+        self._add_page_group_metering(outcomes, loaded, group_metering)
+        return outcomes
+
+    def _prepare_page_group(
+        self, pages: List[Tuple[str, Any]]
+    ) -> Tuple[Dict[str, PageClassification], List[Tuple[str, Any, Any, Any]]]:
+        """
+        Load the content of a group of pages.
+
+        Args:
+            pages: (page_id, Page) tuples in page order
 
-            # Extract classification result
-            classification_text = response["output"]["message"]["content"][0].get(
-                "text", ""
+        Returns:
+            Tuple of the results of pages classified without the model, keyed
+            by page ID, and (page_id, Page, text, image) of the pages that need it
+        """
+        outcomes = {}
+        loaded = []
+        for page_id, page in pages:
+            text_content, image_content = self._load_page_content(
+                page.parsed_text_uri, page.image_uri, page.image_variants
+            )
+            result = self._classify_page_without_model(
+                page_id,
+                text_content,
+                image_content,
+                page.image_uri,
+                page.parsed_text_uri,
+                page.raw_text_uri,
             )
+            if result:
+                outcomes[page_id] = result
+            else:
+                loaded.append((page_id, page, text_content, image_content))
+        return outcomes, loaded
+
+    def _build_page_group_content(
+        self, loaded: List[Tuple[str, Any, Any, Any]], config: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the content of one request for several pages.
+
+        The text of every page, introduced by its page number, replaces
+        {DOCUMENT_TEXT}; the images, each introduced by its page number, are
+        inserted at {DOCUMENT_IMAGE}. The prompt ends with instructions to
+        return one classification per page.
 
-            # Try to extract structured data (JSON or YAML) from the response
+        Args:
+            loaded: (page_id, Page, text, image) of the pages
+            config: Classification configuration
+
+        Returns:
+            List of content items for the request
+        """
+        document_text = ""
+        image_items = []
+        for page_id, _, text_content, image_content in loaded:
+            document_text += (
+                f"<page-number>{page_id}</page-number>\n{text_content or ''}\n\n"
+            )
+            if image_content:
+                image_items.append({"text": f"<page-number>{page_id}</page-number>"})
+                image_items.append(
+                    image.prepare_bedrock_image_attachment(image_content)
+                )
+
+        content = self._build_content(
+            config["task_prompt"],
+            document_text,
+            self._format_classes_list(),
+            image_items,
+        )
+        content.append(
+            {"text": self.PAGE_GROUP_INSTRUCTIONS.format(page_count=len(loaded))}
+        )
+        return content
+
+    def _parse_page_group_classification(
+        self,
+        loaded: List[Tuple[str, Any, Any, Any]],
+        response_with_metering: Dict[str, Any],
+    ) -> Dict[str, PageClassification]:
+        """
+        Parse the per-page classifications of a multi-page response.
+
+        Entries are matched to pages by their page number, or by position when
+        the response has exactly one entry per page.
+
+        Args:
+            loaded: (page_id, Page, text, image) of the pages in the request
+            response_with_metering: Bedrock response with metering information
+
+        Returns:
+            PageClassification of each page that was parsed, keyed by page ID
+        """
+        response = response_with_metering["response"]
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
+        # extract_structured_data_from_text returns the first object of a bare
+        # JSON array, so parse the outermost array directly first
+        start, end = classification_text.find("["), classification_text.rfind("]")
+        try:
+            classification_data = json.loads(classification_text[start : end + 1])
+        except ValueError:
             try:
-                classification_data, detected_format = (
-                    extract_structured_data_from_text(classification_text)
+                classification_data, _ = extract_structured_data_from_text(
+                    classification_text
                 )
-                if isinstance(classification_data, dict):
-                    doc_type = classification_data.get("class", "")
-                    document_boundary = classification_data.get(
-                        "document_boundary", "continue"
-                    )
-                    logger.info(
-                        f"Parsed classification response as {detected_format}: {classification_data}"
-                    )
-                else:
-                    # If parsing failed, try to extract classification directly from text
-                    doc_type = self._extract_class_from_text(classification_text)
-                    document_boundary = "continue"
             except Exception as e:
                 logger.warning(f"Failed to parse structured data from response: {e}")
-                # Try to extract classification directly from text
-                doc_type = self._extract_class_from_text(classification_text)
-                document_boundary = "continue"
+                return {}
+        if isinstance(classification_data, dict):
+            classification_data = classification_data.get("pages")
+        if not isinstance(classification_data, list):
+            logger.warning(
+                "Multi-page classification response is not a list of page classifications"
+            )
+            return {}
 
-            # Validate classification against known document types
-            if not doc_type:
-                doc_type = "unclassified"
-                logger.warning(
-                    f"Empty classification for page {page_id}, using 'unclassified'"
-                )
-            elif doc_type not in self.valid_doc_types:
+        pages = {page_id: page for page_id, page, _, _ in loaded}
+        by_position = len(classification_data) == len(loaded)
+        results = {}
+        for index, entry in enumerate(classification_data):
+            if not isinstance(entry, dict) or not isinstance(entry.get("class"), str):
+                continue
+            page_id = str(entry.get("page", "")).strip()
+            if page_id not in pages:
+                if not by_position:
+                    continue
+                page_id = loaded[index][0]
+            if page_id in results or not entry["class"]:
+                continue
+
+            doc_type = entry["class"]
+            if doc_type not in self.valid_doc_types:
                 logger.warning(
                     f"Unknown document type '{doc_type}' for page {page_id}, "
                     f"valid types are: {', '.join(self.valid_doc_types)}"
                 )
-                # Still use the classification, it might be a new valid type
-
             logger.info(f"Page {page_id} classified as {doc_type}")
 
-            # Create and return classification result
-            return PageClassification(
+            page = pages[page_id]
+            if self.pre_classifier:
+                self.pre_classifier.complete_audit(page.parsed_text_uri, doc_type)
+            results[page_id] = PageClassification(
                 page_id=page_id,
                 classification=DocumentClassification(
                     doc_type=doc_type,
                     confidence=1.0,  # Default confidence
                     metadata={
-                        "metering": metering,
-                        "document_boundary": str(document_boundary).lower(),
+                        "metering": {},
+                        "document_boundary": str(
+                            entry.get("document_boundary", "continue")
+                        ).lower(),
                     },
                 ),
+                image_uri=page.image_uri,
+                text_uri=page.parsed_text_uri,
+                raw_text_uri=page.raw_text_uri,
+            )
+
+        missing = [page_id for page_id in pages if page_id not in results]
+        if missing:
+            logger.warning(
+                f"No usable classification for pages {missing} in multi-page response, "
+                "falling back to single-page requests"
+            )
+        return results
+
+    def _classify_loaded_page(
+        self, loaded_page: Tuple[str, Any, Any, Any], config: Dict[str, Any]
+    ) -> PageClassification:
+        """
+        Classify one page of a group with its own request.
+
+        Args:
+            loaded_page: (page_id, Page, text, image) of the page
+            config: Classification configuration
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        page_id, page, text_content, image_content = loaded_page
+        content = self._build_content(
+            config["task_prompt"],
+            text_content or "",
+            self._format_classes_list(),
+            image_content,
+        )
+        return self._parse_page_classification(
+            page_id,
+            self._invoke_bedrock_model(content=content, config=config),
+            page.image_uri,
+            page.parsed_text_uri,
+            page.raw_text_uri,
+        )
+
+    async def _classify_loaded_page_async(
+        self, loaded_page: Tuple[str, Any, Any, Any], config: Dict[str, Any]
+    ) -> PageClassification:
+        """
+        Classify one page of a group with its own request using the async client.
+
+        Args:
+            loaded_page: (page_id, Page, text, image) of the page
+            config: Classification configuration
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        page_id, page, text_content, image_content = loaded_page
+        content = self._build_content(
+            config["task_prompt"],
+            text_content or "",
+            self._format_classes_list(),
+            image_content,
+        )
+        return self._parse_page_classification(
+            page_id,
+            await self._invoke_bedrock_model_async(content=content, config=config),
+            page.image_uri,
+            page.parsed_text_uri,
+            page.raw_text_uri,
+        )
+
+    def _add_page_group_metering(
+        self,
+        outcomes: Dict[str, Union[PageClassification, BaseException]],
+        loaded: List[Tuple[str, Any, Any, Any]],
+        group_metering: Dict[str, Any],
+    ) -> None:
+        """
+        Record the metering of a multi-page request on the first page of the group.
+
+        The document merges the metering of all pages, so the request is
+        counted once.
+
+        Args:
+            outcomes: Results of the group keyed by page ID
+            loaded: (page_id, Page, text, image) of the pages in the request
+            group_metering: Metering of the multi-page request
+        """
+        if not group_metering:
+            return
+        for page_id, _, _, _ in loaded:
+            result = outcomes.get(page_id)
+            if isinstance(result, PageClassification):
+                metadata = result.classification.metadata
+                metadata["metering"] = utils.merge_metering_data(
+                    metadata.get("metering", {}), group_metering
+                )
+                return
+        logger.warning("No page result to record multi-page request metering on")
+
+    def _prepare_page_classification(
+        self,
+        page_id: str,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
+    ) -> Union[PageClassification, Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Load page content and build the classification request.
+
+        Args:
+            page_id: ID of the page
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            raw_text_uri: URI of the raw text content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
+
+        Returns:
+            PageClassification if the page was classified without the model
+            (content regex match or no content), otherwise (content, config)
+        """
+        text_content, image_content = self._load_page_content(
+            text_uri, image_uri, image_variants
+        )
+        result = self._classify_page_without_model(
+            page_id, text_content, image_content, image_uri, text_uri, raw_text_uri
+        )
+        if result:
+            return result
+
+        # Get classification configuration
+        config = self._get_classification_config()
+
+        # Build content with support for placeholders
+        content = self._build_content(
+            config["task_prompt"],
+            text_content or "",
+            self._format_classes_list(),
+            image_content,
+        )
+        return content, config
+
+    def _load_page_content(
+        self,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Load the text and image of a page.
+
+        Args:
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
+
+        Returns:
+            Tuple of the text and image content, None for content that could
+            not be loaded
+        """
+        # Initialize content variables
+        text_content = None
+        image_content = None
+
+        # Load text content from URI
+        if text_uri:
+            try:
+                text_content = s3.get_text_content(text_uri)
+            except Exception as e:
+                logger.warning(f"Failed to load text content from {text_uri}: {e}")
+                # Continue without text content
+
+        # Load image content from URI with configurable dimensions
+        if image_uri:
+            try:
+                image_config = self.config.get("classification", {}).get("image", {})
+                target_width = image_config.get("target_width")
+                target_height = image_config.get("target_height")
+
+                # Use the variant OCR wrote for this size, if any
+                variant_uri = (image_variants or {}).get(
+                    image_variant_key(target_width, target_height)
+                )
+
+                # Just pass the values directly - prepare_image handles empty strings/None
+                image_content = image.prepare_image(
+                    variant_uri or image_uri, target_width, target_height
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load image content from {image_uri}: {e}")
+                # Continue without image content
+
+        return text_content, image_content
+
+    def _classify_page_without_model(
+        self,
+        page_id: str,
+        text_content: Optional[str],
+        image_content: Optional[bytes],
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> Optional[PageClassification]:
+        """
+        Classify a page by content regex, or as unclassified if it has no content.
+
+        Args:
+            page_id: ID of the page
+            text_content: Loaded text of the page
+            image_content: Loaded image of the page
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            PageClassification, or None if the page needs the model
+        """
+        # Check for page content regex match (multi-modal page-level classification only)
+        if text_content:
+            regex_matched_class = self._check_page_content_regex(text_content)
+            if regex_matched_class:
+                logger.info(
+                    f"Page {page_id} classified as '{regex_matched_class}' based on content regex match. Skipping LLM classification."
+                )
+
+                # Create and return classification result with regex match
+                return PageClassification(
+                    page_id=page_id,
+                    classification=DocumentClassification(
+                        doc_type=regex_matched_class,
+                        confidence=1.0,  # High confidence for regex matches
+                        metadata={
+                            "regex_matched": True,
+                            "document_boundary": "continue",  # Default boundary
+                        },
+                    ),
+                    image_uri=image_uri,
+                    text_uri=text_uri,
+                    raw_text_uri=raw_text_uri,
+                )
+
+        # Check for a confident match with the pre-classifier index
+        if text_content and self.pre_classifier:
+            prediction = self.pre_classifier.classify(text_content, audit_key=text_uri)
+            if prediction:
+                return PageClassification(
+                    page_id=page_id,
+                    classification=DocumentClassification(
+                        doc_type=prediction.label,
+                        confidence=prediction.similarity,
+                        metadata={
+                            "pre_classified": True,
+                            "pre_classifier_margin": prediction.margin,
+                            "document_boundary": prediction.boundary,
+                        },
+                    ),
+                    image_uri=image_uri,
+                    text_uri=text_uri,
+                    raw_text_uri=raw_text_uri,
+                )
+
+        # Verify we have at least some content to classify
+        if not text_content and not image_content:
+            logger.warning(f"No content available for page {page_id}")
+            # Return unclassified result
+            return self._create_unclassified_result(
+                page_id=page_id,
                 image_uri=image_uri,
                 text_uri=text_uri,
                 raw_text_uri=raw_text_uri,
+                error_message="No content available for classification",
+            )
+
+        return None
+
+    def _parse_page_classification(
+        self,
+        page_id: str,
+        response_with_metering: Dict[str, Any],
+        image_uri: Optional[str] = None,
+        text_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+    ) -> PageClassification:
+        """
+        Parse the model response for a page into a PageClassification.
+
+        Args:
+            page_id: ID of the page
+            response_with_metering: Bedrock response with metering information
+            image_uri: URI of the image content
+            text_uri: URI of the text content
+            raw_text_uri: URI of the raw text content
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        response = response_with_metering["response"]
+        metering = response_with_metering["metering"]
+
+        # Extract classification result
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
+
+        # Try to extract structured data (JSON or YAML) from the response
+        try:
+            classification_data, detected_format = extract_structured_data_from_text(
+                classification_text
             )
+            if isinstance(classification_data, dict):
+                doc_type = classification_data.get("class", "")
+                document_boundary = classification_data.get(
+                    "document_boundary", "continue"
+                )
+                logger.info(
+                    f"Parsed classification response as {detected_format}: {classification_data}"
+                )
+            else:
+                # If parsing failed, try to extract classification directly from text
+                doc_type = self._extract_class_from_text(classification_text)
+                document_boundary = "continue"
         except Exception as e:
-            logger.error(f"Error classifying page {page_id}: {str(e)}")
-            raise
+            logger.warning(f"Failed to parse structured data from response: {e}")
+            # Try to extract classification directly from text
+            doc_type = self._extract_class_from_text(classification_text)
+            document_boundary = "continue"
+
+        # Validate classification against known document types
+        if not doc_type:
+            doc_type = "unclassified"
+            logger.warning(
+                f"Empty classification for page {page_id}, using 'unclassified'"
+            )
+        elif doc_type not in self.valid_doc_types:
+            logger.warning(
+                f"Unknown document type '{doc_type}' for page {page_id}, "
+                f"valid types are: {', '.join(self.valid_doc_types)}"
+            )
+            # Still use the classification, it might be a new valid type
+
+        logger.info(f"Page {page_id} classified as {doc_type}")
+        if self.pre_classifier:
+            self.pre_classifier.complete_audit(text_uri, doc_type)
+
+        # Create and return classification result
+        return PageClassification(
+            page_id=page_id,
+            classification=DocumentClassification(
+                doc_type=doc_type,
+                confidence=1.0,  # Default confidence
+                metadata={
+                    "metering": metering,
+                    "document_boundary": str(document_boundary).lower(),
+                },
+            ),
+            image_uri=image_uri,
+            text_uri=text_uri,
+            raw_text_uri=raw_text_uri,
+        )
 
     def classify_page_sagemaker(
         self,
@@ -1219,25 +2050,33 @@ class ClassificationService:
             "debug": 0,
         }
 
-        # Implement retry logic
+        # Implement retry logic, bounded by the shared retry budget and
+        # circuit breaker of the endpoint
+        retry_policy = get_retry_policy("sagemaker")
+        retry_policy.record_call()
         retry_count = 0
         metering = {}
 
         while retry_count < self.MAX_RETRIES:
             try:
+                retry_policy.before_attempt(endpoint_name)
                 logger.info(
                     f"Classifying page {page_id} with SageMaker UDOP model. Payload: {json.dumps(payload)}"
                 )
                 t0 = time.time()
 
-                # Invoke endpoint
-                response = self.sm_client.invoke_endpoint(
-                    EndpointName=endpoint_name,
-                    ContentType="application/json",
-                    Body=json.dumps(payload),
+                # Invoke endpoint, hedged if the retry policy enables it
+                response = retry_policy.call(
+                    endpoint_name,
+                    lambda: self.sm_client.invoke_endpoint(
+                        EndpointName=endpoint_name,
+                        ContentType="application/json",
+                        Body=json.dumps(payload),
+                    ),
                 )
 
                 duration = time.time() - t0
+                retry_policy.record_success(endpoint_name, duration)
 
                 # Parse response
                 response_body = json.loads(response["Body"].read().decode())
@@ -1283,6 +2122,7 @@ class ClassificationService:
                 ]
 
                 if error_code in retryable_errors:
+                    retry_policy.record_failure(endpoint_name)
                     retry_count += 1
 
                     if retry_count == self.MAX_RETRIES:
@@ -1291,6 +2131,15 @@ class ClassificationService:
                         )
                         break
 
+                    if not retry_policy.can_retry():
+                        return self._create_unclassified_result(
+                            page_id=page_id,
+                            image_uri=image_uri,
+                            text_uri=text_uri,
+                            raw_text_uri=raw_text_uri,
+                            error_message=f"Retry budget exhausted: {error_code}: {error_message}",
+                        )
+
                     backoff = utils.calculate_backoff(
                         retry_count, self.INITIAL_BACKOFF, self.MAX_BACKOFF
                     )
@@ -1305,6 +2154,7 @@ class ClassificationService:
                         backoff
                     )  # semgrep-ignore: arbitrary-sleep - Intentional delay backoff/retry. Duration is algorithmic and not user-controlled.
                 else:
+                    retry_policy.record_success(endpoint_name)
                     logger.error(
                         f"Non-retryable SageMaker error for page {page_id}: "
                         f"{error_code} - {error_message}"
@@ -1317,6 +2167,15 @@ class ClassificationService:
                         raw_text_uri=raw_text_uri,
                         error_message=f"{error_code}: {error_message}",
                     )
+            except CircuitOpenError as e:
+                logger.error(f"Not classifying page {page_id}: {str(e)}")
+                return self._create_unclassified_result(
+                    page_id=page_id,
+                    image_uri=image_uri,
+                    text_uri=text_uri,
+                    raw_text_uri=raw_text_uri,
+                    error_message=str(e),
+                )
             except Exception as e:
                 logger.error(f"Unexpected error classifying page {page_id}: {str(e)}")
                 # Return unclassified with error
@@ -1337,40 +2196,84 @@ class ClassificationService:
             error_message="Max retries exceeded for SageMaker classification",
         )
 
-    def classify_page(
+    def classify_page(
+        self,
+        page_id: str,
+        text_uri: Optional[str] = None,
+        image_uri: Optional[str] = None,
+        raw_text_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
+    ) -> PageClassification:
+        """
+        Classify a single page based on its text and/or image content.
+        Uses the configured backend (Bedrock or SageMaker).
+
+        Args:
+            page_id: ID of the page
+            text_uri: URI of the text content
+            image_uri: URI of the image content
+            raw_text_uri: URI of the raw text content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
+
+        Returns:
+            PageClassification: Classification result for the page
+        """
+        if self.backend == "bedrock":
+            return self.classify_page_bedrock(
+                page_id=page_id,
+                text_uri=text_uri,
+                image_uri=image_uri,
+                raw_text_uri=raw_text_uri,
+                image_variants=image_variants,
+            )
+        else:  # sagemaker
+            return self.classify_page_sagemaker(
+                page_id=page_id,
+                image_uri=image_uri,
+                raw_text_uri=raw_text_uri,
+                text_uri=text_uri,
+            )
+
+    async def classify_page_async(
         self,
         page_id: str,
         text_uri: Optional[str] = None,
         image_uri: Optional[str] = None,
         raw_text_uri: Optional[str] = None,
+        image_variants: Optional[Dict[str, str]] = None,
     ) -> PageClassification:
         """
-        Classify a single page based on its text and/or image content.
-        Uses the configured backend (Bedrock or SageMaker).
+        Classify a single page without blocking the event loop.
+        The SageMaker backend runs in the default executor.
 
         Args:
             page_id: ID of the page
             text_uri: URI of the text content
             image_uri: URI of the image content
             raw_text_uri: URI of the raw text content
+            image_variants: Resized copies of the image keyed by "<width>x<height>"
 
         Returns:
             PageClassification: Classification result for the page
         """
         if self.backend == "bedrock":
-            return self.classify_page_bedrock(
+            return await self.classify_page_bedrock_async(
                 page_id=page_id,
                 text_uri=text_uri,
                 image_uri=image_uri,
                 raw_text_uri=raw_text_uri,
+                image_variants=image_variants,
             )
-        else:  # sagemaker
-            return self.classify_page_sagemaker(
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                self.classify_page_sagemaker,
                 page_id=page_id,
                 image_uri=image_uri,
                 raw_text_uri=raw_text_uri,
                 text_uri=text_uri,
-            )
+            ),
+        )
 
     def _invoke_bedrock_model(
         self, content: List[Dict[str, Any]], config: Dict[str, Any]
@@ -1385,17 +2288,49 @@ class ClassificationService:
         Returns:
             Dictionary with response and metering data
         """
-        return bedrock.invoke_model(
-            model_id=config["model_id"],
-            system_prompt=config["system_prompt"],
-            content=content,
-            temperature=config["temperature"],
-            top_k=config["top_k"],
-            top_p=config["top_p"],
-            max_tokens=config["max_tokens"],
-            context="Classification",
+        return bedrock.invoke_model(**self._get_invoke_kwargs(content, config))
+
+    async def _invoke_bedrock_model_async(
+        self, content: List[Dict[str, Any]], config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Invoke Bedrock model with standard parameters using the async client.
+
+        Args:
+            content: Content to send to the model
+            config: Configuration with model parameters
+
+        Returns:
+            Dictionary with response and metering data
+        """
+        return await bedrock.invoke_model_async(
+            **self._get_invoke_kwargs(content, config)
         )
 
+    def _get_invoke_kwargs(
+        self, content: List[Dict[str, Any]], config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build the model invocation arguments shared by the on-demand and batch paths.
+
+        Args:
+            content: Content to send to the model
+            config: Configuration with model parameters
+
+        Returns:
+            Keyword arguments for bedrock.invoke_model
+        """
+        return {
+            "model_id": config["model_id"],
+            "system_prompt": config["system_prompt"],
+            "content": content,
+            "temperature": config["temperature"],
+            "top_k": config["top_k"],
+            "top_p": config["top_p"],
+            "max_tokens": config["max_tokens"],
+            "context": "Classification",
+        }
+
     def _create_unclassified_result(
         self,
         page_id: str,
@@ -1452,176 +2387,312 @@ class ClassificationService:
 
         return ""
 
-    def _get_cache_key(self, document: Document) -> str:
-        """
-        Generate cache key for a document.
-
-        Args:
-            document: Document object
-
-        Returns:
-            Cache key string
-        """
-        workflow_id = document.workflow_execution_arn.split(":")[-1]
-        return f"classcache#{document.id}#{workflow_id}"
-
     def _get_cached_page_classifications(
         self, document: Document
     ) -> Dict[str, PageClassification]:
         """
         Retrieve cached page classifications for a document.
 
+        Pages are looked up by a hash of their content and of the
+        classification configuration, so results cached by other executions
+        (retries, reprocessing, duplicate uploads) are reused.
+
         Args:
             document: Document object
 
         Returns:
             Dictionary mapping page_id to cached PageClassification, empty dict if no cache
         """
+        if not self.page_cache:
+            return {}
 
         logger.info(
             f"Attempting to retrieve cached page classifications for document {document.id}"
         )
-
-        if not self.cache_table:
+        try:
+            page_classifications = self.page_cache.get(document)
+            if page_classifications:
+                logger.info(
+                    f"Retrieved {len(page_classifications)} cached page classifications for document {document.id}"
+                )
+            else:
+                logger.info(f"No cache entries found for document {document.id}")
+            return page_classifications
+        except Exception as e:
+            logger.warning(
+                f"Failed to retrieve cached classifications for document {document.id}: {e}"
+            )
             return {}
 
-        cache_key = self._get_cache_key(document)
+    def _create_page_cache_writer(
+        self, document: Document
+    ) -> Optional[PageCacheWriter]:
+        """
+        Create a writer that caches page classifications as they complete.
 
-        try:
-            response = self.cache_table.get_item(Key={"PK": cache_key, "SK": "none"})
+        Args:
+            document: Document object being classified
 
-            if "Item" not in response:
-                logger.info(f"No cache entry found for document {document.id}")
-                return {}
+        Returns:
+            PageCacheWriter, or None if caching is disabled
+        """
+        if not self.page_cache:
+            return None
+        return self.page_cache.writer(document)
 
-            # Parse cached data from JSON
-            cached_data = response["Item"]
-            logger.debug(f"Cached data keys: {list(cached_data.keys())}")
-            page_classifications = {}
+    def classify_document(self, document: Document) -> Document:
+        """
+        Classify a document's pages and update the Document object with sections.
+        Uses the configured backend (Bedrock or SageMaker) and classification method.
 
-            # Extract page classifications from JSON attribute
-            if "page_classifications" in cached_data:
-                try:
-                    page_data_list = json.loads(cached_data["page_classifications"])
+        The classification method is determined by the 'classificationMethod' setting:
+        - multimodalPageLevelClassification (default): Uses page-by-page classification
+          with sequence segmentation similar to BIO (Begin-Inside-Outside) tagging.
+          Each page receives both a document type and a boundary indicator:
+          * "start": Marks the beginning of a new document segment
+          * "continue": Indicates continuation of the current segment
+          This enables accurate segmentation of multi-document packets where multiple
+          documents of the same or different types may be combined in a single file.
+        - textbasedHolisticClassification: Processes the entire document as a packet
+          to identify document segments across pages using a holistic approach.
 
-                    for page_data in page_data_list:
-                        page_id = page_data["page_id"]
-                        page_classifications[page_id] = PageClassification(
-                            page_id=page_id,
-                            classification=DocumentClassification(
-                                doc_type=page_data["classification"]["doc_type"],
-                                confidence=page_data["classification"]["confidence"],
-                                metadata=page_data["classification"]["metadata"],
-                            ),
-                            image_uri=page_data.get("image_uri"),
-                            text_uri=page_data.get("text_uri"),
-                            raw_text_uri=page_data.get("raw_text_uri"),
-                        )
+        Args:
+            document: Document object to classify and update
 
-                    if page_classifications:
-                        logger.info(
-                            f"Retrieved {len(page_classifications)} cached page classifications for document {document.id} (PK: {cache_key})"
-                        )
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        classified = self._classify_document_without_model(document)
+        if classified is not None:
+            return classified
 
-                except json.JSONDecodeError as e:
-                    logger.warning(
-                        f"Failed to parse cached page classifications JSON for document {document.id}: {e}"
+        # Check for limited page classification
+        if self.max_pages_for_classification != "ALL":
+            logger.info(
+                f"Using limited page classification: {self.max_pages_for_classification} pages"
+            )
+
+            # Create limited document for classification
+            limited_document = self._limit_pages_for_classification(document)
+
+            if limited_document.id != document.id:  # Pages were actually limited
+                # Classify the limited document
+                if self.classification_method == self.TEXTBASED_HOLISTIC:
+                    logger.info(
+                        f"Classifying limited document with {len(limited_document.pages)} pages using holistic packet method"
+                    )
+                    classified_limited = self.holistic_classify_document(
+                        limited_document
+                    )
+                else:
+                    classified_limited = self._classify_pages_multimodal(
+                        limited_document
                     )
 
-            return page_classifications
+                # Apply results to all pages in original document
+                document = self._apply_limited_classification_to_all_pages(
+                    document, classified_limited
+                )
+                return document
 
-        except Exception as e:
-            logger.warning(
-                f"Failed to retrieve cached classifications for document {document.id}: {e}"
+        # Use the appropriate classification method based on configuration
+        if self.classification_method == self.TEXTBASED_HOLISTIC:
+            logger.info(
+                f"Classifying document with {len(document.pages)} pages using holistic packet method"
             )
-            return {}
+            return self.holistic_classify_document(document)
 
-    def _cache_successful_page_classifications(
-        self, document: Document, page_classifications: List[PageClassification]
-    ) -> None:
+        return self._classify_pages_multimodal(document)
+
+    async def classify_document_async(self, document: Document) -> Document:
         """
-        Cache successful page classifications to DynamoDB as a JSON-serialized list.
+        Classify a document's pages like classify_document, but with asyncio:
+        page-level classification runs one coroutine per page and all Bedrock
+        calls go through the async Bedrock client.
 
         Args:
-            document: Document object
-            page_classifications: List of successful page classifications
+            document: Document object to classify and update
+
+        Returns:
+            Document: Updated Document object with classifications and sections
         """
-        if not self.cache_table or not page_classifications:
-            return
+        classified = self._classify_document_without_model(document)
+        if classified is not None:
+            return classified
 
-        cache_key = self._get_cache_key(document)
+        if self.max_pages_for_classification != "ALL":
+            logger.info(
+                f"Using limited page classification: {self.max_pages_for_classification} pages"
+            )
+            limited_document = self._limit_pages_for_classification(document)
+            if limited_document.id != document.id:  # Pages were actually limited
+                if self.classification_method == self.TEXTBASED_HOLISTIC:
+                    classified_limited = await self.holistic_classify_document_async(
+                        limited_document
+                    )
+                else:
+                    classified_limited = await self._classify_pages_multimodal_async(
+                        limited_document
+                    )
+                return self._apply_limited_classification_to_all_pages(
+                    document, classified_limited
+                )
 
-        try:
-            # Filter out failed classifications and prepare data for JSON serialization
-            successful_pages = []
-            for page_result in page_classifications:
-                # Only cache if there's no error in the metadata
-                if "error" not in page_result.classification.metadata:
-                    page_data = {
-                        "page_id": page_result.page_id,
-                        "classification": {
-                            "doc_type": page_result.classification.doc_type,
-                            "confidence": page_result.classification.confidence,
-                            "metadata": page_result.classification.metadata,
-                        },
-                        "image_uri": page_result.image_uri,
-                        "text_uri": page_result.text_uri,
-                        "raw_text_uri": page_result.raw_text_uri,
-                    }
-                    successful_pages.append(page_data)
+        if self.classification_method == self.TEXTBASED_HOLISTIC:
+            return await self.holistic_classify_document_async(document)
 
-            if len(successful_pages) == 0:
-                logger.debug(
-                    f"No successful page classifications to cache for document {document.id}"
-                )
-                return
+        return await self._classify_pages_multimodal_async(document)
 
-            # Prepare item structure with JSON-serialized page classifications
-            item = {
-                "PK": cache_key,
-                "SK": "none",
-                "cached_at": str(int(time.time())),
-                "document_id": document.id,
-                "workflow_execution_arn": document.workflow_execution_arn,
-                "page_classifications": json.dumps(successful_pages),
-                "ExpiresAfter": int(
-                    (datetime.now(timezone.utc) + timedelta(days=1)).timestamp()
-                ),
-            }
+    def prepare_batch(
+        self, document: Document, batch: bedrock.BatchInferenceJob
+    ) -> List[str]:
+        """
+        Add the classification requests of a document to a batch job instead
+        of invoking the model.
 
-            # Store in DynamoDB using Table resource with JSON serialization
-            self.cache_table.put_item(Item=item)
+        Uses the configured classification method and page limit. Pages and
+        documents that are classified without the model get no records. Run
+        complete_batch with the job's results.
 
-            logger.info(
-                f"Cached {len(successful_pages)} successful page classifications for document {document.id} (PK: {cache_key})"
+        Args:
+            document: Document object to classify
+            batch: Batch job for the classification model
+
+        Returns:
+            Record IDs added to the batch job
+
+        Raises:
+            ValueError: If the backend is not Bedrock
+        """
+        if self.backend != "bedrock":
+            raise ValueError("Batch classification requires the bedrock backend")
+        if self._classify_document_without_model(document) is not None:
+            return []
+
+        target = self._limit_pages_for_classification(document)
+        record_ids = []
+        if self.classification_method == self.TEXTBASED_HOLISTIC:
+            prepared_prompt, config = self._prepare_holistic_request(target)
+            record_id = self._get_batch_record_id(target)
+            batch.add(
+                record_id,
+                **self._get_invoke_kwargs([{"text": prepared_prompt}], config),
             )
+            return [record_id]
 
-        except Exception as e:
-            logger.warning(
-                f"Failed to cache page classifications for document {document.id}: {e}"
+        cached_page_classifications = self._get_cached_page_classifications(target)
+        for page_id, page in self._get_pages_to_classify(
+            target, cached_page_classifications
+        ).items():
+            prepared = self._prepare_page_classification(
+                page_id=page_id,
+                text_uri=page.parsed_text_uri,
+                image_uri=page.image_uri,
+                raw_text_uri=page.raw_text_uri,
+                image_variants=page.image_variants,
             )
+            if isinstance(prepared, PageClassification):
+                continue
+            content, config = prepared
+            record_id = self._get_batch_record_id(target, page_id)
+            batch.add(record_id, **self._get_invoke_kwargs(content, config))
+            record_ids.append(record_id)
+        return record_ids
+
+    def complete_batch(self, document: Document, results: Dict[str, Any]) -> Document:
+        """
+        Classify a document from the results of a completed batch job, parsing
+        them like on-demand responses.
 
-    def classify_document(self, document: Document) -> Document:
+        Args:
+            document: Document object passed to prepare_batch
+            results: Results of the batch job from BatchInferenceJob.get_results
+
+        Returns:
+            Document: Updated Document object with classifications and sections
         """
-        Classify a document's pages and update the Document object with sections.
-        Uses the configured backend (Bedrock or SageMaker) and classification method.
+        classified = self._classify_document_without_model(document)
+        if classified is not None:
+            return classified
 
-        The classification method is determined by the 'classificationMethod' setting:
-        - multimodalPageLevelClassification (default): Uses page-by-page classification
-          with sequence segmentation similar to BIO (Begin-Inside-Outside) tagging.
-          Each page receives both a document type and a boundary indicator:
-          * "start": Marks the beginning of a new document segment
-          * "continue": Indicates continuation of the current segment
-          This enables accurate segmentation of multi-document packets where multiple
-          documents of the same or different types may be combined in a single file.
-        - textbasedHolisticClassification: Processes the entire document as a packet
-          to identify document segments across pages using a holistic approach.
+        target = self._limit_pages_for_classification(document)
+        if self.classification_method == self.TEXTBASED_HOLISTIC:
+            result = results.get(self._get_batch_record_id(target))
+            if result is None or isinstance(result, Exception):
+                error = result or "No batch result for the document"
+                classified = self._update_document_status(
+                    target,
+                    success=False,
+                    error_message=f"Error in holistic classification: {error}",
+                )
+            else:
+                classified = self._apply_holistic_result(target, result)
+        else:
+            t0 = time.time()
+            cached_page_classifications = self._get_cached_page_classifications(target)
+            page_outcomes = {}
+            for page_id, page in self._get_pages_to_classify(
+                target, cached_page_classifications
+            ).items():
+                record_id = self._get_batch_record_id(target, page_id)
+                result = results.get(record_id)
+                if result is None:
+                    # No record was added if the page needed no model call
+                    prepared = self._prepare_page_classification(
+                        page_id=page_id,
+                        text_uri=page.parsed_text_uri,
+                        image_uri=page.image_uri,
+                        raw_text_uri=page.raw_text_uri,
+                        image_variants=page.image_variants,
+                    )
+                    if isinstance(prepared, PageClassification):
+                        result = prepared
+                    else:
+                        result = bedrock.BatchRecordError(
+                            record_id, "Missing", "No batch result for the page"
+                        )
+                elif not isinstance(result, Exception):
+                    result = self._parse_page_classification(
+                        page_id,
+                        result,
+                        page.image_uri,
+                        page.parsed_text_uri,
+                        page.raw_text_uri,
+                    )
+                page_outcomes[page_id] = result
+            cache_writer = self._create_page_cache_writer(target)
+            if cache_writer:
+                for outcome in page_outcomes.values():
+                    cache_writer.add(outcome)
+                cache_writer.flush()
+            classified = self._complete_multimodal_classification(
+                target, cached_page_classifications, page_outcomes, t0
+            )
+
+        if target.id != document.id:
+            return self._apply_limited_classification_to_all_pages(document, classified)
+        return classified
+
+    def _get_batch_record_id(
+        self, document: Document, page_id: Optional[str] = None
+    ) -> str:
+        """Return the batch record ID of a document's (or page's) classification request."""
+        record_id = f"{document.id}#classification"
+        return f"{record_id}#{page_id}" if page_id else record_id
+
+    def _classify_document_without_model(
+        self, document: Document
+    ) -> Optional[Document]:
+        """
+        Classify a document that needs no model call: one without pages, one
+        whose name matches a document name regex, or any document when only
+        one class is configured.
 
         Args:
             document: Document object to classify and update
 
         Returns:
-            Document: Updated Document object with classifications and sections
+            Document: Updated Document object, or None if the model is needed
         """
         if not document.pages:
             logger.warning("Document has no pages to classify")
@@ -1671,57 +2742,21 @@ class ClassificationService:
                 page.confidence = 1.0
 
             # Create a single section containing all pages
-            page_ids = list(document.pages.keys())
-            section = self._create_section(
-                section_id="1",
-                doc_type=self.single_class_name,
-                pages=page_ids,
-                confidence=1.0,
-            )
-            document.sections = [section]
-
-            # Update document status
-            document = self._update_document_status(document)
-
-            return document
-
-        # Check for limited page classification
-        if self.max_pages_for_classification != "ALL":
-            logger.info(
-                f"Using limited page classification: {self.max_pages_for_classification} pages"
-            )
-
-            # Create limited document for classification
-            limited_document = self._limit_pages_for_classification(document)
-
-            if limited_document.id != document.id:  # Pages were actually limited
-                # Classify the limited document
-                if self.classification_method == self.TEXTBASED_HOLISTIC:
-                    logger.info(
-                        f"Classifying limited document with {len(limited_document.pages)} pages using holistic packet method"
-                    )
-                    classified_limited = self.holistic_classify_document(
-                        limited_document
-                    )
-                else:
-                    classified_limited = self._classify_pages_multimodal(
-                        limited_document
-                    )
-
-                # Apply results to all pages in original document
-                document = self._apply_limited_classification_to_all_pages(
-                    document, classified_limited
-                )
-                return document
-
-        # Use the appropriate classification method based on configuration
-        if self.classification_method == self.TEXTBASED_HOLISTIC:
-            logger.info(
-                f"Classifying document with {len(document.pages)} pages using holistic packet method"
+            page_ids = list(document.pages.keys())
+            section = self._create_section(
+                section_id="1",
+                doc_type=self.single_class_name,
+                pages=page_ids,
+                confidence=1.0,
             )
-            return self.holistic_classify_document(document)
+            document.sections = [section]
 
-        return self._classify_pages_multimodal(document)
+            # Update document status
+            document = self._update_document_status(document)
+
+            return document
+
+        return None
 
     def classify_pages(self, pages: Dict[str, Dict[str, Any]]) -> ClassificationResult:
         """
@@ -1936,7 +2971,7 @@ class ClassificationService:
 
     def _format_pages(self, document: Document) -> Dict[str, str]:
         """
-        Format document pages as text.
+        Format document pages as text, fetching the pages concurrently.
 
         Args:
             document: Document object with pages
@@ -1944,24 +2979,34 @@ class ClassificationService:
         Returns:
             Dictionary mapping page_id to text content
         """
-        pages_content = {}
+        if not document.pages:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            texts = executor.map(self._load_page_text, document.pages.values())
+            return dict(zip(document.pages, texts))
+
+    def _load_page_text(self, page: Any) -> str:
+        """
+        Load the text of a page for holistic classification.
 
-        for page_id, page in document.pages.items():
-            # Fetch page text content from S3 if available
-            if page.parsed_text_uri:
-                try:
-                    pages_content[page_id] = s3.get_text_content(page.parsed_text_uri)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to load text content from {page.parsed_text_uri}: {e}"
-                    )
-                    # Continue with empty content
-                    pages_content[page_id] = f"[Error loading page {page_id} content]"
-            else:
-                # Page has no text content
-                pages_content[page_id] = f"[No text content for page {page_id}]"
+        Args:
+            page: Page object
 
-        return pages_content
+        Returns:
+            Text content, or a placeholder if the page has none
+        """
+        # Fetch page text content from S3 if available
+        if page.parsed_text_uri:
+            try:
+                return s3.get_text_content(page.parsed_text_uri)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to load text content from {page.parsed_text_uri}: {e}"
+                )
+                # Continue with empty content
+                return f"[Error loading page {page.page_id} content]"
+        # Page has no text content
+        return f"[No text content for page {page.page_id}]"
 
     def holistic_classify_document(self, document: Document) -> Document:
         """
@@ -2019,32 +3064,11 @@ class ClassificationService:
         )
 
         try:
-            # Format document pages as text
-            pages_content = self._format_pages(document)
+            windows = self._get_holistic_windows(document)
+            if len(windows) > 1:
+                return self._holistic_classify_windows(document, windows, t0)
 
-            # Get classification configuration
-            config = self._get_classification_config()
-
-            # Prepare paged document text
-            doc_text = ""
-            for page_id, page_text in sorted(
-                pages_content.items(),
-                key=lambda x: int(x[0]) if x[0].isdigit() else float("inf"),
-            ):
-                doc_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
-
-            # Prepare document classes and descriptions as a table
-            classes_table = self._format_classes_and_descriptions()
-
-            # Prepare prompt using common function
-            prepared_prompt = self._prepare_prompt_from_template(
-                config["task_prompt"],
-                {
-                    "DOCUMENT_TEXT": doc_text,
-                    "CLASS_NAMES_AND_DESCRIPTIONS": classes_table,
-                },
-                required_placeholders=[],
-            )
+            prepared_prompt, config = self._prepare_holistic_request(document)
 
             # Invoke Bedrock to get the holistic classification
             logger.info("Invoking Bedrock for holistic packet classification")
@@ -2058,93 +3082,509 @@ class ClassificationService:
                 f"Time taken for holistic classification: {t1 - t0:.2f} seconds"
             )
 
-            response = response_with_metering["response"]
-            metering = response_with_metering["metering"]
+            document = self._apply_holistic_result(document, response_with_metering)
 
-            # Extract classification result
-            classification_text = response["output"]["message"]["content"][0].get(
-                "text", ""
+        except Exception as e:
+            error_msg = f"Error in holistic classification: {str(e)}"
+            document = self._update_document_status(
+                document, success=False, error_message=error_msg
             )
+            raise
 
-            # Try to extract JSON from the response
-            try:
-                classification_json = extract_json_from_text(classification_text)
-                classification_data = json.loads(classification_json)
-                segments = classification_data.get("segments", [])
-
-                if not segments:
-                    raise ValueError("No segments found in the classification result")
-
-                # Update the document with sections based on the segments
-                document.sections = []
-                for i, segment in enumerate(segments):
-                    # Validate segment data
-                    if not all(
-                        k in segment
-                        for k in ["ordinal_start_page", "ordinal_end_page", "type"]
-                    ):
-                        logger.warning(f"Segment {i} is missing required fields")
-                        continue
+        return document
 
-                    # Normalize page IDs (convert from 1-based to actual page IDs in the document)
-                    start_page = segment["ordinal_start_page"]
-                    end_page = segment["ordinal_end_page"]
-                    doc_type = segment["type"]
+    async def holistic_classify_document_async(self, document: Document) -> Document:
+        """
+        Classify a document using holistic packet classification with the async
+        Bedrock client.
 
-                    # Check if the doc_type is valid
-                    if doc_type not in self.valid_doc_types:
-                        logger.warning(
-                            f"Unknown document type '{doc_type}', using anyway"
-                        )
+        Args:
+            document: Document object to classify
 
-                    # Find corresponding page IDs
-                    page_ids = []
-                    try:
-                        for page_idx in range(start_page, end_page + 1):
-                            page_id = str(page_idx)
-                            if page_id in document.pages:
-                                page_ids.append(page_id)
-                                # Update page classification
-                                document.pages[page_id].classification = doc_type
-                                document.pages[page_id].confidence = 1.0
-                    except Exception as e:
-                        logger.error(f"Error processing segment {i}: {e}")
-                        continue
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        if not document.pages or self.has_single_class:
+            return self.holistic_classify_document(document)
 
-                    if not page_ids:
-                        logger.warning(f"No valid pages found for segment {i}")
-                        continue
+        t0 = time.time()
+        logger.info(
+            f"Classifying document with {len(document.pages)} pages using async holistic packet method"
+        )
+
+        try:
+            windows = self._get_holistic_windows(document)
+            if len(windows) > 1:
+                return await self._holistic_classify_windows_async(
+                    document, windows, t0
+                )
+
+            # Reading page text from S3 is blocking I/O
+            prepared_prompt, config = await asyncio.get_running_loop().run_in_executor(
+                None, self._prepare_holistic_request, document
+            )
+
+            response_with_metering = await self._invoke_bedrock_model_async(
+                content=[{"text": prepared_prompt}], config=config
+            )
+            logger.info(
+                f"Time taken for holistic classification: {time.time() - t0:.2f} seconds"
+            )
+
+            document = self._apply_holistic_result(document, response_with_metering)
+
+        except Exception as e:
+            error_msg = f"Error in holistic classification: {str(e)}"
+            document = self._update_document_status(
+                document, success=False, error_message=error_msg
+            )
+            raise
+
+        return document
+
+    def _get_holistic_windows(self, document: Document) -> List[List[str]]:
+        """
+        Split the pages of a document into overlapping windows.
+
+        Args:
+            document: Document object to classify
+
+        Returns:
+            Lists of page IDs in page order; a single window with all pages
+            unless holisticWindowSize is set and the document is longer
+        """
+        page_ids = sorted(
+            document.pages,
+            key=lambda x: int(x) if x.isdigit() else float("inf"),
+        )
+        size = self.holistic_window_size
+        if not size or len(page_ids) <= size:
+            return [page_ids]
+        step = size - self.holistic_window_overlap
+        windows = []
+        for start in range(0, len(page_ids), step):
+            windows.append(page_ids[start : start + size])
+            if start + size >= len(page_ids):
+                break
+        return windows
+
+    def _holistic_classify_windows(
+        self, document: Document, windows: List[List[str]], t0: float
+    ) -> Document:
+        """
+        Classify a long document with one holistic request per page window, in parallel.
+
+        Args:
+            document: Document object to classify
+            windows: Overlapping lists of page IDs
+            t0: Time classification started
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        logger.info(
+            f"Classifying {len(document.pages)} pages in {len(windows)} windows of up to {self.holistic_window_size} pages"
+        )
+        pages_content = self._format_pages(document)
+        config = self._get_classification_config()
+
+        def classify_window(window: List[str]) -> Dict[str, Any]:
+            prompt = self._build_holistic_prompt(
+                {page_id: pages_content[page_id] for page_id in window}, config
+            )
+            return self._invoke_bedrock_model(content=[{"text": prompt}], config=config)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            responses = list(executor.map(classify_window, windows))
+            retry = self._holistic_windows_to_retry(windows, responses)
+            retried = list(executor.map(classify_window, [windows[i] for i in retry]))
+        self._merge_holistic_retries(responses, retry, retried)
+        logger.info(
+            f"Time taken for windowed holistic classification: {time.time() - t0:.2f} seconds"
+        )
+        return self._apply_holistic_window_results(document, windows, responses)
+
+    async def _holistic_classify_windows_async(
+        self, document: Document, windows: List[List[str]], t0: float
+    ) -> Document:
+        """
+        Classify a long document with one holistic request per page window using the async client.
+
+        Args:
+            document: Document object to classify
+            windows: Overlapping lists of page IDs
+            t0: Time classification started
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        logger.info(
+            f"Classifying {len(document.pages)} pages in {len(windows)} windows of up to {self.holistic_window_size} pages (async)"
+        )
+        # Reading page text from S3 is blocking I/O
+        pages_content = await asyncio.get_running_loop().run_in_executor(
+            None, self._format_pages, document
+        )
+        config = self._get_classification_config()
+
+        def classify_window(window: List[str]):
+            prompt = self._build_holistic_prompt(
+                {page_id: pages_content[page_id] for page_id in window}, config
+            )
+            return self._invoke_bedrock_model_async(
+                content=[{"text": prompt}], config=config
+            )
 
-                    # Create and add the section
-                    section = Section(
-                        section_id=str(i + 1),
-                        classification=doc_type,
-                        confidence=1.0,
-                        page_ids=page_ids,
+        responses = list(
+            await asyncio.gather(*[classify_window(window) for window in windows])
+        )
+        retry = self._holistic_windows_to_retry(windows, responses)
+        retried = await asyncio.gather(*[classify_window(windows[i]) for i in retry])
+        self._merge_holistic_retries(responses, retry, retried)
+        logger.info(
+            f"Time taken for windowed holistic classification: {time.time() - t0:.2f} seconds"
+        )
+        return self._apply_holistic_window_results(document, windows, responses)
+
+    def _holistic_windows_to_retry(
+        self, windows: List[List[str]], responses: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Find the windows whose result leaves some of their pages without a class.
+
+        Args:
+            windows: Overlapping lists of page IDs
+            responses: Bedrock response with metering information per window
+
+        Returns:
+            Indices of the windows to classify again
+        """
+        retry = []
+        for window_index, (window, response_with_metering) in enumerate(
+            zip(windows, responses)
+        ):
+            covered = set()
+            for start_page, end_page, _ in self._parse_holistic_segments(
+                response_with_metering
+            ):
+                covered.update(str(p) for p in range(start_page, end_page + 1))
+            if not set(window) <= covered:
+                retry.append(window_index)
+        if retry:
+            logger.warning(
+                f"Retrying holistic windows {retry}: their results left pages "
+                "without a class"
+            )
+        return retry
+
+    @staticmethod
+    def _merge_holistic_retries(
+        responses: List[Dict[str, Any]],
+        retry: List[int],
+        retried: List[Dict[str, Any]],
+    ) -> None:
+        """Replace retried window responses, keeping the metering of both calls."""
+        for window_index, response_with_metering in zip(retry, retried):
+            responses[window_index] = {
+                **response_with_metering,
+                "metering": utils.merge_metering_data(
+                    responses[window_index]["metering"],
+                    response_with_metering["metering"],
+                ),
+            }
+
+    def _apply_holistic_window_results(
+        self,
+        document: Document,
+        windows: List[List[str]],
+        responses: List[Dict[str, Any]],
+    ) -> Document:
+        """
+        Stitch the segments of overlapping windows into document sections.
+
+        A page covered by several windows takes the class and segment start
+        of the window in which it is farthest from the window edge, where the
+        model saw the most surrounding context. A segment starting at the
+        first page of a later window only marks a boundary if the class
+        changes, since the model cannot see the pages before it. If any page
+        is left without a class the document fails, with the page IDs in
+        its errors.
+
+        Args:
+            document: Document object being classified
+            windows: Overlapping lists of page IDs
+            responses: Bedrock response with metering information per window
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        # page_id -> (distance from the window edge, class, starts a segment)
+        labels: Dict[str, Tuple[int, str, bool]] = {}
+        disagreements = set()
+        metering = {}
+        for window_index, (window, response_with_metering) in enumerate(
+            zip(windows, responses)
+        ):
+            metering = utils.merge_metering_data(
+                metering, response_with_metering["metering"]
+            )
+            positions = {page_id: i for i, page_id in enumerate(window)}
+            for start_page, end_page, doc_type in self._parse_holistic_segments(
+                response_with_metering
+            ):
+                for page_idx in range(start_page, end_page + 1):
+                    page_id = str(page_idx)
+                    if page_id not in positions:
+                        continue
+                    position = positions[page_id]
+                    centrality = min(position, len(window) - 1 - position)
+                    starts = page_idx == start_page and (
+                        window_index == 0 or position > 0
                     )
-                    document.sections.append(section)
+                    if page_id in labels and labels[page_id][1] != doc_type:
+                        disagreements.add(page_id)
+                    if page_id not in labels or centrality > labels[page_id][0]:
+                        labels[page_id] = (centrality, doc_type, starts)
+
+        if disagreements:
+            logger.info(
+                f"Overlapping windows disagreed on pages {sorted(disagreements)}, "
+                "using the window with the most context for each"
+            )
 
-                # Update document metering and status
-                document.metering = utils.merge_metering_data(
-                    document.metering, metering
+        document.sections = []
+        current_section = None
+        # Windows are in page order, so this is every page once, in order
+        for page_id in dict.fromkeys(p for window in windows for p in window):
+            if page_id not in labels:
+                continue
+            _, doc_type, starts = labels[page_id]
+            document.pages[page_id].classification = doc_type
+            document.pages[page_id].confidence = 1.0
+            if (
+                current_section
+                and current_section.classification == doc_type
+                and not starts
+            ):
+                current_section.page_ids.append(page_id)
+            else:
+                current_section = Section(
+                    section_id=str(len(document.sections) + 1),
+                    classification=doc_type,
+                    confidence=1.0,
+                    page_ids=[page_id],
                 )
-                document = self._update_document_status(document)
+                document.sections.append(current_section)
 
-                logger.info(
-                    f"Document classified with {len(document.sections)} sections using holistic method"
+        document.metering = utils.merge_metering_data(document.metering, metering)
+        if not document.sections:
+            return self._update_document_status(
+                document,
+                success=False,
+                error_message="Error parsing holistic classification result: No segments found in the classification result",
+            )
+        unlabeled = [page_id for page_id in document.pages if page_id not in labels]
+        if unlabeled:
+            return self._update_document_status(
+                document,
+                success=False,
+                error_message=f"Error parsing holistic classification result: pages {unlabeled} were not assigned a class",
+            )
+
+        document = self._update_document_status(document)
+        logger.info(
+            f"Document classified with {len(document.sections)} sections using windowed holistic method"
+        )
+        return document
+
+    def _parse_holistic_segments(
+        self, response_with_metering: Dict[str, Any]
+    ) -> List[Tuple[int, int, str]]:
+        """
+        Parse the segments of a holistic classification response.
+
+        Args:
+            response_with_metering: Bedrock response with metering information
+
+        Returns:
+            (start page, end page, class) of each valid segment; empty if the
+            response cannot be parsed
+        """
+        response = response_with_metering["response"]
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
+        try:
+            classification_data = json.loads(
+                extract_json_from_text(classification_text)
+            )
+            segments = classification_data.get("segments", [])
+        except Exception as e:
+            logger.warning(f"Error parsing holistic classification result: {e}")
+            return []
+
+        parsed = []
+        for i, segment in enumerate(segments):
+            try:
+                parsed.append(
+                    (
+                        int(segment["ordinal_start_page"]),
+                        int(segment["ordinal_end_page"]),
+                        segment["type"],
+                    )
                 )
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Segment {i} is missing required fields")
+                continue
+            if parsed[-1][2] not in self.valid_doc_types:
+                logger.warning(f"Unknown document type '{parsed[-1][2]}', using anyway")
+        return parsed
+
+    def _prepare_holistic_request(
+        self, document: Document
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the holistic classification prompt for a document.
 
-            except Exception as e:
-                error_msg = f"Error parsing holistic classification result: {str(e)}"
-                document = self._update_document_status(
-                    document, success=False, error_message=error_msg
+        Args:
+            document: Document object to classify
+
+        Returns:
+            Tuple of the prompt text and the classification configuration
+        """
+        # Format document pages as text
+        pages_content = self._format_pages(document)
+
+        # Get classification configuration
+        config = self._get_classification_config()
+
+        return self._build_holistic_prompt(pages_content, config), config
+
+    def _build_holistic_prompt(
+        self, pages_content: Dict[str, str], config: Dict[str, Any]
+    ) -> str:
+        """
+        Build the holistic classification prompt for a set of pages.
+
+        Args:
+            pages_content: Dictionary mapping page_id to text content
+            config: Classification configuration
+
+        Returns:
+            Prompt text with every page introduced by its page number
+        """
+        # Prepare paged document text
+        doc_text = ""
+        for page_id, page_text in sorted(
+            pages_content.items(),
+            key=lambda x: int(x[0]) if x[0].isdigit() else float("inf"),
+        ):
+            doc_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
+
+        # Prepare document classes and descriptions as a table
+        classes_table = self._format_classes_and_descriptions()
+
+        # Prepare prompt using common function
+        prepared_prompt = self._prepare_prompt_from_template(
+            config["task_prompt"],
+            {
+                "DOCUMENT_TEXT": doc_text,
+                "CLASS_NAMES_AND_DESCRIPTIONS": classes_table,
+            },
+            required_placeholders=[],
+        )
+
+        return prepared_prompt
+
+    def _apply_holistic_result(
+        self, document: Document, response_with_metering: Dict[str, Any]
+    ) -> Document:
+        """
+        Apply the segments of a holistic classification response to the document.
+
+        Args:
+            document: Document object being classified
+            response_with_metering: Bedrock response with metering information
+
+        Returns:
+            Document: Updated Document object with classifications and sections
+        """
+        response = response_with_metering["response"]
+        metering = response_with_metering["metering"]
+
+        # Extract classification result
+        classification_text = response["output"]["message"]["content"][0].get(
+            "text", ""
+        )
+
+        # Try to extract JSON from the response
+        try:
+            classification_json = extract_json_from_text(classification_text)
+            classification_data = json.loads(classification_json)
+            segments = classification_data.get("segments", [])
+
+            if not segments:
+                raise ValueError("No segments found in the classification result")
+
+            # Update the document with sections based on the segments
+            document.sections = []
+            for i, segment in enumerate(segments):
+                # Validate segment data
+                if not all(
+                    k in segment
+                    for k in ["ordinal_start_page", "ordinal_end_page", "type"]
+                ):
+                    logger.warning(f"Segment {i} is missing required fields")
+                    continue
+
+                # Normalize page IDs (convert from 1-based to actual page IDs in the document)
+                start_page = segment["ordinal_start_page"]
+                end_page = segment["ordinal_end_page"]
+                doc_type = segment["type"]
+
+                # Check if the doc_type is valid
+                if doc_type not in self.valid_doc_types:
+                    logger.warning(f"Unknown document type '{doc_type}', using anyway")
+
+                # Find corresponding page IDs
+                page_ids = []
+                try:
+                    for page_idx in range(start_page, end_page + 1):
+                        page_id = str(page_idx)
+                        if page_id in document.pages:
+                            page_ids.append(page_id)
+                            # Update page classification
+                            document.pages[page_id].classification = doc_type
+                            document.pages[page_id].confidence = 1.0
+                except Exception as e:
+                    logger.error(f"Error processing segment {i}: {e}")
+                    continue
+
+                if not page_ids:
+                    logger.warning(f"No valid pages found for segment {i}")
+                    continue
+
+                # Create and add the section
+                section = Section(
+                    section_id=str(i + 1),
+                    classification=doc_type,
+                    confidence=1.0,
+                    page_ids=page_ids,
                 )
+                document.sections.append(section)
+
+            # Update document metering and status
+            document.metering = utils.merge_metering_data(document.metering, metering)
+            document = self._update_document_status(document)
+
+            logger.info(
+                f"Document classified with {len(document.sections)} sections using holistic method"
+            )
 
         except Exception as e:
-            error_msg = f"Error in holistic classification: {str(e)}"
+            error_msg = f"Error parsing holistic classification result: {str(e)}"
             document = self._update_document_status(
                 document, success=False, error_message=error_msg
             )
-            raise
 
         return document
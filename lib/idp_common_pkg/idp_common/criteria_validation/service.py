@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional
 import s3fs
 
 from idp_common import bedrock, s3, utils
+from idp_common.bedrock.async_client import ASYNC_CLIENT_AVAILABLE
 from idp_common.criteria_validation.models import (
     CriteriaValidationResult,
     LLMResponse,
@@ -158,28 +159,36 @@ class CriteriaValidationService:
         context: str = "CriteriaValidation",
     ) -> Dict[str, Any]:
         """
-        Async wrapper for bedrock.invoke_model.
+        Invoke a Bedrock model with the async Bedrock client.
 
-        Since the common bedrock client is synchronous, we run it in an executor
-        to maintain async compatibility.
+        Without the optional aiohttp dependency, the synchronous
+        bedrock.invoke_model runs in an executor instead.
         """
-        loop = asyncio.get_event_loop()
-
-        # Run the synchronous bedrock.invoke_model in an executor
-        response = await loop.run_in_executor(
-            None,
-            bedrock.invoke_model,
-            model_id,
-            system_prompt,
-            [{"text": content}],  # content as list
-            temperature,
-            top_k,
-            top_p,
-            max_tokens,
-            context,
-        )
+        if not ASYNC_CLIENT_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                bedrock.invoke_model,
+                model_id,
+                system_prompt,
+                [{"text": content}],  # content as list
+                temperature,
+                top_k,
+                top_p,
+                max_tokens,
+                context,
+            )
 
-        return response
+        return await bedrock.invoke_model_async(
+            model_id=model_id,
+            system_prompt=system_prompt,
+            content=[{"text": content}],
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            context=context,
+        )
 
     async def _process_criteria_question(
         self,
@@ -584,4 +593,6 @@ class CriteriaValidationService:
                 self.validate_request_async(request_id, config)
             )
         finally:
+            # Release the Bedrock connections bound to this loop
+            loop.run_until_complete(bedrock.get_async_client().close())
             loop.close()
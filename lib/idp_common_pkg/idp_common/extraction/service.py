@@ -8,15 +8,18 @@ This module provides a service for extracting fields and values from documents
 using LLMs, with support for text and image content.
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from idp_common import bedrock, image, metrics, s3, utils
-from idp_common.models import Document
+from idp_common.models import Document, Section
 from idp_common.utils import extract_json_from_text
+from idp_common.utils.few_shot_cache import compute_few_shot_key, get_few_shot_cache
+from idp_common.utils.incremental_json import IncrementalJsonParser, MalformedJsonError
 
 logger = logging.getLogger(__name__)
 
@@ -391,7 +394,6 @@ class ExtractionService:
         Returns:
             List of content items containing text and image content for examples
         """
-        content = []
         classes = self.config.get("classes", [])
 
         # Find the specific class that matches the class_label
@@ -405,10 +407,36 @@ class ExtractionService:
             logger.warning(
                 f"No class found matching '{class_label}' for few-shot examples"
             )
-            return content
+            return []
 
-        # Get examples from the target class only
+        # Get examples from the target class only; the content is cached for
+        # the lifetime of the process so images are loaded once per configuration
         examples = target_class.get("examples", [])
+        key = compute_few_shot_key(
+            "extraction",
+            class_label.lower(),
+            examples,
+            os.environ.get("CONFIGURATION_BUCKET"),
+            os.environ.get("ROOT_DIR"),
+        )
+        return get_few_shot_cache().get_or_build(
+            key, lambda: self._load_few_shot_examples_content(examples)
+        )
+
+    def _load_few_shot_examples_content(
+        self, examples: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Load the text and images of a class's few-shot examples.
+
+        Args:
+            examples: Example configurations of the class
+
+        Returns:
+            Tuple of the content items and whether all example images loaded
+        """
+        content = []
+        complete = True
         for example in examples:
             attributes_prompt = example.get("attributesPrompt")
 
@@ -453,6 +481,7 @@ class ExtractionService:
                             logger.warning(
                                 f"Failed to load image {image_file_path}: {e}"
                             )
+                            complete = False
                             continue
 
                 except Exception as e:
@@ -460,7 +489,7 @@ class ExtractionService:
                         f"Failed to load example images from {image_path}: {e}"
                     )
 
-        return content
+        return content, complete
 
     def _get_image_files_from_path(self, image_path: str) -> List[str]:
         """
@@ -720,15 +749,270 @@ class ExtractionService:
         Returns:
             Document: Updated Document object with extraction results for the section
         """
+        section = self._get_section_to_process(document, section_id)
+        if section is None:
+            return document
+
+        try:
+            t0 = time.time()
+            request = self._prepare_extraction_request(document, section)
+            if request is None:
+                return document
+
+            logger.info(
+                f"Extracting fields for {section.classification} document, section {section_id}"
+            )
+
+            # Time the model invocation
+            request_start_time = time.time()
+
+            # Invoke Bedrock with the common library
+            if self._get_streaming_config().get("enabled", False):
+                response_with_metering = self._invoke_streaming(request)
+            else:
+                response_with_metering = bedrock.invoke_model(**request)
+
+            total_duration = time.time() - request_start_time
+            logger.info(f"Time taken for extraction: {total_duration:.2f} seconds")
+
+            self._complete_extraction(
+                document, section, response_with_metering, total_duration
+            )
+
+            t3 = time.time()
+            logger.info(
+                f"Total extraction time for section {section_id}: {t3 - t0:.2f} seconds"
+            )
+
+        except Exception as e:
+            error_msg = f"Error processing section {section_id}: {str(e)}"
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+            raise
+
+        return document
+
+    async def process_document_section_async(
+        self, document: Document, section_id: str
+    ) -> Document:
+        """
+        Process a single section from a Document object using the async Bedrock
+        client. S3 reads and writes run in the default executor.
+
+        Args:
+            document: Document object containing section to process
+            section_id: ID of the section to process
+
+        Returns:
+            Document: Updated Document object with extraction results for the section
+        """
+        section = self._get_section_to_process(document, section_id)
+        if section is None:
+            return document
+
+        loop = asyncio.get_running_loop()
+        try:
+            t0 = time.time()
+            request = await loop.run_in_executor(
+                None, self._prepare_extraction_request, document, section
+            )
+            if request is None:
+                return document
+
+            logger.info(
+                f"Extracting fields for {section.classification} document, section {section_id} (async)"
+            )
+
+            request_start_time = time.time()
+            response_with_metering = await bedrock.invoke_model_async(**request)
+            total_duration = time.time() - request_start_time
+            logger.info(f"Time taken for extraction: {total_duration:.2f} seconds")
+
+            await loop.run_in_executor(
+                None,
+                self._complete_extraction,
+                document,
+                section,
+                response_with_metering,
+                total_duration,
+            )
+
+            logger.info(
+                f"Total extraction time for section {section_id}: {time.time() - t0:.2f} seconds"
+            )
+
+        except Exception as e:
+            error_msg = f"Error processing section {section_id}: {str(e)}"
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+            raise
+
+        return document
+
+    def prepare_batch(
+        self,
+        document: Document,
+        batch: bedrock.BatchInferenceJob,
+        section_ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Add the extraction requests of a document's sections to a batch job
+        instead of invoking the model.
+
+        Sections whose class has no attributes are completed right away, as in
+        process_document_section. Run complete_batch with the job's results.
+
+        Args:
+            document: Document object containing the sections
+            batch: Batch job for the extraction model
+            section_ids: IDs of the sections to extract (default: all)
+
+        Returns:
+            Record IDs added to the batch job
+        """
+        record_ids = []
+        for section_id in section_ids or [s.section_id for s in document.sections]:
+            section = self._get_section_to_process(document, section_id)
+            if section is None:
+                continue
+            request = self._prepare_extraction_request(document, section)
+            if request is None:
+                continue
+            record_id = self._get_batch_record_id(document, section_id)
+            batch.add(record_id, **request)
+            record_ids.append(record_id)
+        return record_ids
+
+    def complete_batch(
+        self,
+        document: Document,
+        results: Dict[str, Any],
+        section_ids: Optional[List[str]] = None,
+    ) -> Document:
+        """
+        Write the extraction results of a completed batch job for a document's
+        sections, parsing them like on-demand responses.
+
+        Args:
+            document: Document object passed to prepare_batch
+            results: Results of the batch job from BatchInferenceJob.get_results
+            section_ids: IDs of the sections to complete (default: all)
+
+        Returns:
+            Document: Updated Document object with extraction results for the sections
+        """
+        for section_id in section_ids or [s.section_id for s in document.sections]:
+            result = results.get(self._get_batch_record_id(document, section_id))
+            if result is None:
+                # Not part of the batch (skipped or already completed)
+                continue
+            if isinstance(result, Exception):
+                error_msg = f"Error processing section {section_id}: {str(result)}"
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                continue
+            section = self._get_section_to_process(document, section_id)
+            if section is not None:
+                self._complete_extraction(document, section, result, 0.0)
+        return document
+
+    def _get_batch_record_id(self, document: Document, section_id: str) -> str:
+        """Return the batch record ID of a section's extraction request."""
+        return f"{document.id}#extraction#{section_id}"
+
+    def _get_streaming_config(self) -> Dict[str, Any]:
+        """
+        Get the extraction streaming settings.
+
+        ``extraction.streaming`` accepts ``enabled`` (stream the model output and
+        parse attributes as they arrive, default False) and ``fail_fast`` (stop
+        generating as soon as the output is malformed, default True).
+
+        Returns:
+            Streaming settings dict
+        """
+        streaming = self.config.get("extraction", {}).get("streaming") or {}
+        if isinstance(streaming, bool):
+            return {"enabled": streaming}
+        return streaming
+
+    def _invoke_streaming(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invoke the model with converse_stream, parsing attributes as they arrive.
+
+        The complete response is parsed by _complete_extraction exactly like a
+        non-streaming one. With fail_fast, generation stops at the first
+        malformed attribute and the partial output is returned, which
+        _complete_extraction records as unparsed raw output.
+
+        Args:
+            request: Keyword arguments for bedrock.invoke_model
+
+        Returns:
+            Bedrock response object with metering information
+        """
+        parser = IncrementalJsonParser()
+        fail_fast = self._get_streaming_config().get("fail_fast", True)
+        start_time = time.time()
+
+        def handle_delta(delta: str) -> None:
+            had_attributes = bool(parser.attributes)
+            try:
+                parser.feed(delta)
+            except MalformedJsonError:
+                if fail_fast:
+                    raise
+                return
+            if parser.attributes and not had_attributes:
+                time_to_first = time.time() - start_time
+                logger.info(
+                    f"First extracted attribute '{parser.attributes[0][0]}' after {time_to_first:.2f} seconds"
+                )
+                metrics.put_metric(
+                    "ExtractionTimeToFirstAttribute",
+                    time_to_first * 1000,
+                    "Milliseconds",
+                )
+
+        def reset_parser() -> None:
+            # A retried stream starts the output over
+            nonlocal parser
+            parser = IncrementalJsonParser()
+
+        handle_delta.reset = reset_parser
+
+        try:
+            return bedrock.invoke_model(**request, stream_handler=handle_delta)
+        except bedrock.StreamAborted as e:
+            logger.error(f"Stopped extraction on malformed output: {e.__cause__}")
+            return {
+                "response": {"output": {"message": {"content": [{"text": e.text}]}}},
+                "metering": e.metering,
+            }
+
+    def _get_section_to_process(
+        self, document: Document, section_id: str
+    ) -> Optional[Section]:
+        """
+        Find the section to extract, recording an error on the document if it
+        is missing or has no pages.
+
+        Args:
+            document: Document object containing section to process
+            section_id: ID of the section to process
+
+        Returns:
+            The section, or None if it cannot be processed
+        """
         # Validate input document
         if not document:
             logger.error("No document provided")
-            return document
+            return None
 
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
-            return document
+            return None
 
         # Find the section with the given ID
         section = None
@@ -741,21 +1025,44 @@ class ExtractionService:
             error_msg = f"Section {section_id} not found in document"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document
-
-        # Extract information about the section
-        class_label = section.classification
-        output_bucket = document.output_bucket
-        output_prefix = document.input_key
-        output_key = f"{output_prefix}/sections/{section.section_id}/result.json"
-        output_uri = f"s3://{output_bucket}/{output_key}"
+            return None
 
         # Check if the section has required pages
         if not section.page_ids:
             error_msg = f"Section {section_id} has no page IDs"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document
+            return None
+
+        return section
+
+    def _get_output_location(
+        self, document: Document, section: Section
+    ) -> Tuple[str, str]:
+        """Return the S3 key and URI of the extraction result of a section."""
+        output_key = f"{document.input_key}/sections/{section.section_id}/result.json"
+        return output_key, f"s3://{document.output_bucket}/{output_key}"
+
+    def _prepare_extraction_request(
+        self, document: Document, section: Section
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read the section's text and images and build the extraction request.
+
+        Sections whose class has no attributes get an empty result written
+        without invoking the model.
+
+        Args:
+            document: Document object containing the section
+            section: Section to extract
+
+        Returns:
+            Keyword arguments for bedrock.invoke_model, or None if extraction was skipped
+        """
+        section_id = section.section_id
+        class_label = section.classification
+        output_bucket = document.output_bucket
+        output_key, output_uri = self._get_output_location(document, section)
 
         # Sort pages by page number
         sorted_page_ids = sorted(section.page_ids, key=int)
@@ -769,394 +1076,376 @@ class ExtractionService:
         metrics.put_metric("InputDocuments", 1)
         metrics.put_metric("InputDocumentPages", len(section.page_ids))
 
-        try:
-            # Read document text from all pages in order
-            t0 = time.time()
-            document_texts = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    error_msg = f"Page {page_id} not found in document"
-                    logger.error(error_msg)
-                    document.errors.append(error_msg)
-                    continue
+        # Read document text from all pages in order
+        t0 = time.time()
+        document_texts = []
+        for page_id in sorted_page_ids:
+            if page_id not in document.pages:
+                error_msg = f"Page {page_id} not found in document"
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                continue
 
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
-                document_texts.append(page_text)
+            page = document.pages[page_id]
+            text_path = page.parsed_text_uri
+            page_text = s3.get_text_content(text_path)
+            document_texts.append(page_text)
 
-            document_text = "\n".join(document_texts)
-            t1 = time.time()
-            logger.info(f"Time taken to read text content: {t1 - t0:.2f} seconds")
+        document_text = "\n".join(document_texts)
+        t1 = time.time()
+        logger.info(f"Time taken to read text content: {t1 - t0:.2f} seconds")
 
-            # Read page images with configurable dimensions
-            extraction_config = self.config.get("extraction", {})
-            image_config = extraction_config.get("image", {})
-            target_width = image_config.get("target_width")
-            target_height = image_config.get("target_height")
+        # Read page images with configurable dimensions
+        extraction_config = self.config.get("extraction", {})
+        image_config = extraction_config.get("image", {})
+        target_width = image_config.get("target_width")
+        target_height = image_config.get("target_height")
 
-            page_images = []
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    continue
+        page_images = []
+        for page_id in sorted_page_ids:
+            if page_id not in document.pages:
+                continue
 
-                page = document.pages[page_id]
-                image_uri = page.image_uri
-                # Just pass the values directly - prepare_image handles empty strings/None
-                image_content = image.prepare_image(
-                    image_uri, target_width, target_height
-                )
-                page_images.append(image_content)
-
-            t2 = time.time()
-            logger.info(f"Time taken to read images: {t2 - t1:.2f} seconds")
-
-            # Get extraction configuration
-            model_id = self.config.get("model_id") or extraction_config.get("model")
-            temperature = float(extraction_config.get("temperature", 0))
-            top_k = float(extraction_config.get("top_k", 5))
-            top_p = float(extraction_config.get("top_p", 0.1))
-            max_tokens = (
-                int(extraction_config.get("max_tokens", 4096))
-                if extraction_config.get("max_tokens")
-                else None
-            )
-            system_prompt = extraction_config.get("system_prompt", "")
+            page = document.pages[page_id]
+            # Use the variant OCR wrote for this size, if any
+            image_uri = page.get_image_uri(target_width, target_height)
+            # Just pass the values directly - prepare_image handles empty strings/None
+            image_content = image.prepare_image(image_uri, target_width, target_height)
+            page_images.append(image_content)
+
+        t2 = time.time()
+        logger.info(f"Time taken to read images: {t2 - t1:.2f} seconds")
+
+        # Get extraction configuration
+        model_id = self.config.get("model_id") or extraction_config.get("model")
+        temperature = float(extraction_config.get("temperature", 0))
+        top_k = float(extraction_config.get("top_k", 5))
+        top_p = float(extraction_config.get("top_p", 0.1))
+        max_tokens = (
+            int(extraction_config.get("max_tokens", 4096))
+            if extraction_config.get("max_tokens")
+            else None
+        )
+        system_prompt = extraction_config.get("system_prompt", "")
 
-            # Get attributes for this document class
-            attributes = self._get_class_attributes(class_label)
-            attribute_descriptions = self._format_attribute_descriptions(attributes)
+        # Get attributes for this document class
+        attributes = self._get_class_attributes(class_label)
+        attribute_descriptions = self._format_attribute_descriptions(attributes)
 
-            # Check if attributes list is empty - if so, skip LLM invocation entirely
-            if not attributes or not attribute_descriptions.strip():
-                logger.info(
-                    f"No attributes defined for class {class_label}, skipping LLM extraction"
-                )
+        # Check if attributes list is empty - if so, skip LLM invocation entirely
+        if not attributes or not attribute_descriptions.strip():
+            logger.info(
+                f"No attributes defined for class {class_label}, skipping LLM extraction"
+            )
 
-                # Create empty result structure without invoking LLM
-                extracted_fields = {}
-                metering = {
-                    "input_tokens": 0,
-                    "output_tokens": 0,
-                    "invocation_count": 0,
-                    "total_cost": 0.0,
-                }
-                total_duration = 0.0
-                parsing_succeeded = True
-
-                # Write to S3 with empty extraction result
-                output = {
-                    "document_class": {"type": class_label},
-                    "inference_result": extracted_fields,
-                    "metadata": {
-                        "parsing_succeeded": parsing_succeeded,
-                        "extraction_time_seconds": total_duration,
-                        "skipped_due_to_empty_attributes": True,
-                    },
-                }
-                s3.write_content(
-                    output, output_bucket, output_key, content_type="application/json"
-                )
+            # Create empty result structure without invoking LLM
+            extracted_fields = {}
+            metering = {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "invocation_count": 0,
+                "total_cost": 0.0,
+            }
+            total_duration = 0.0
+            parsing_succeeded = True
+
+            # Write to S3 with empty extraction result
+            output = {
+                "document_class": {"type": class_label},
+                "inference_result": extracted_fields,
+                "metadata": {
+                    "parsing_succeeded": parsing_succeeded,
+                    "extraction_time_seconds": total_duration,
+                    "skipped_due_to_empty_attributes": True,
+                },
+            }
+            s3.write_content(
+                output, output_bucket, output_key, content_type="application/json"
+            )
 
-                # Update the section with extraction result URI
-                section.extraction_result_uri = output_uri
+            # Update the section with extraction result URI
+            section.extraction_result_uri = output_uri
 
-                # Update document with zero metering data
-                document.metering = utils.merge_metering_data(
-                    document.metering, metering
-                )
+            # Update document with zero metering data
+            document.metering = utils.merge_metering_data(document.metering, metering)
 
-                t3 = time.time()
-                logger.info(
-                    f"Skipped extraction for section {section_id} due to empty attributes: {t3 - t0:.2f} seconds"
-                )
-                return document
+            t3 = time.time()
+            logger.info(
+                f"Skipped extraction for section {section_id} due to empty attributes: {t3 - t0:.2f} seconds"
+            )
+            return None
 
-            # Check for custom prompt Lambda function
-            custom_lambda_arn = extraction_config.get("custom_prompt_lambda_arn")
+        # Check for custom prompt Lambda function
+        custom_lambda_arn = extraction_config.get("custom_prompt_lambda_arn")
 
-            if custom_lambda_arn and custom_lambda_arn.strip():
-                logger.info(f"Using custom prompt Lambda: {custom_lambda_arn}")
+        if custom_lambda_arn and custom_lambda_arn.strip():
+            logger.info(f"Using custom prompt Lambda: {custom_lambda_arn}")
 
-                # Prepare prompt placeholders including image URIs
-                image_uris = []
-                for page_id in sorted_page_ids:
-                    if page_id in document.pages:
-                        page = document.pages[page_id]
-                        if page.image_uri:
-                            image_uris.append(page.image_uri)
+            # Prepare prompt placeholders including image URIs
+            image_uris = []
+            for page_id in sorted_page_ids:
+                if page_id in document.pages:
+                    page = document.pages[page_id]
+                    if page.image_uri:
+                        image_uris.append(page.image_uri)
 
-                prompt_placeholders = {
-                    "DOCUMENT_TEXT": document_text,
-                    "DOCUMENT_CLASS": class_label,
-                    "ATTRIBUTE_NAMES_AND_DESCRIPTIONS": attribute_descriptions,
-                    "DOCUMENT_IMAGE": image_uris,
-                }
+            prompt_placeholders = {
+                "DOCUMENT_TEXT": document_text,
+                "DOCUMENT_CLASS": class_label,
+                "ATTRIBUTE_NAMES_AND_DESCRIPTIONS": attribute_descriptions,
+                "DOCUMENT_IMAGE": image_uris,
+            }
 
-                logger.info(
-                    f"Lambda will receive {len(image_uris)} image URIs in DOCUMENT_IMAGE placeholder"
-                )
+            logger.info(
+                f"Lambda will receive {len(image_uris)} image URIs in DOCUMENT_IMAGE placeholder"
+            )
 
-                # Build default content for Lambda input
-                prompt_template = extraction_config.get("task_prompt", "")
-                if prompt_template:
-                    # Check if task prompt contains FEW_SHOT_EXAMPLES placeholder
-                    if "{FEW_SHOT_EXAMPLES}" in prompt_template:
-                        default_content = self._build_content_with_few_shot_examples(
+            # Build default content for Lambda input
+            prompt_template = extraction_config.get("task_prompt", "")
+            if prompt_template:
+                # Check if task prompt contains FEW_SHOT_EXAMPLES placeholder
+                if "{FEW_SHOT_EXAMPLES}" in prompt_template:
+                    default_content = self._build_content_with_few_shot_examples(
+                        prompt_template,
+                        document_text,
+                        class_label,
+                        attribute_descriptions,
+                        page_images,
+                    )
+                else:
+                    # Use the unified content builder for DOCUMENT_IMAGE placeholder support
+                    default_content = (
+                        self._build_content_with_or_without_image_placeholder(
                             prompt_template,
                             document_text,
                             class_label,
                             attribute_descriptions,
                             page_images,
                         )
-                    else:
-                        # Use the unified content builder for DOCUMENT_IMAGE placeholder support
-                        default_content = (
-                            self._build_content_with_or_without_image_placeholder(
-                                prompt_template,
-                                document_text,
-                                class_label,
-                                attribute_descriptions,
-                                page_images,
-                            )
+                    )
+            else:
+                # Default content if no template
+                task_prompt = f"""
+                Extract the following fields from this {class_label} document:
+                
+                {attribute_descriptions}
+                
+                Document text:
+                {document_text}
+                
+                Respond with a JSON object containing each field name and its extracted value.
+                """
+                default_content = [{"text": task_prompt}]
+                if page_images:
+                    for img in page_images[:20]:
+                        default_content.append(
+                            image.prepare_bedrock_image_attachment(img)
                         )
-                else:
-                    # Default content if no template
-                    task_prompt = f"""
-                    Extract the following fields from this {class_label} document:
-                    
-                    {attribute_descriptions}
-                    
-                    Document text:
-                    {document_text}
-                    
-                    Respond with a JSON object containing each field name and its extracted value.
-                    """
-                    default_content = [{"text": task_prompt}]
-                    if page_images:
-                        for img in page_images[:20]:
-                            default_content.append(
-                                image.prepare_bedrock_image_attachment(img)
-                            )
 
-                # Prepare Lambda payload with JSON-serializable content
-                try:
-                    # Use Document's built-in to_dict() method which properly handles Status enum conversion
-                    document_dict = document.to_dict()
-                except Exception as e:
-                    logger.warning(
-                        f"Error serializing document for Lambda payload: {e}"
-                    )
-                    document_dict = {"id": getattr(document, "id", "unknown")}
+            # Prepare Lambda payload with JSON-serializable content
+            try:
+                # Use Document's built-in to_dict() method which properly handles Status enum conversion
+                document_dict = document.to_dict()
+            except Exception as e:
+                logger.warning(f"Error serializing document for Lambda payload: {e}")
+                document_dict = {"id": getattr(document, "id", "unknown")}
 
-                # Convert image bytes to URIs in default content for JSON serialization
-                serializable_default_content = (
-                    self._convert_image_bytes_to_uris_in_content(default_content)
-                )
+            # Convert image bytes to URIs in default content for JSON serialization
+            serializable_default_content = self._convert_image_bytes_to_uris_in_content(
+                default_content
+            )
 
-                # Create fully serializable payload using comprehensive helper
-                payload = {
-                    "config": self._make_json_serializable(self.config),
-                    "prompt_placeholders": prompt_placeholders,
-                    "default_task_prompt_content": serializable_default_content,
-                    "serialized_document": document_dict,
-                }
+            # Create fully serializable payload using comprehensive helper
+            payload = {
+                "config": self._make_json_serializable(self.config),
+                "prompt_placeholders": prompt_placeholders,
+                "default_task_prompt_content": serializable_default_content,
+                "serialized_document": document_dict,
+            }
 
-                # Test JSON serialization before sending to Lambda to catch any remaining issues
+            # Test JSON serialization before sending to Lambda to catch any remaining issues
+            try:
+                json.dumps(payload)
+                logger.info("Lambda payload successfully serialized")
+            except (TypeError, ValueError) as e:
+                logger.error(
+                    f"Lambda payload still contains non-serializable data: {e}"
+                )
+                logger.info("Using comprehensive serialization as fallback")
+                # Apply comprehensive serialization to entire payload
+                payload = self._make_json_serializable(payload)
                 try:
                     json.dumps(payload)
-                    logger.info("Lambda payload successfully serialized")
-                except (TypeError, ValueError) as e:
-                    logger.error(
-                        f"Lambda payload still contains non-serializable data: {e}"
-                    )
-                    logger.info("Using comprehensive serialization as fallback")
-                    # Apply comprehensive serialization to entire payload
-                    payload = self._make_json_serializable(payload)
-                    try:
-                        json.dumps(payload)
-                        logger.info("Comprehensive serialization successful")
-                    except (TypeError, ValueError) as e2:
-                        logger.error(f"Even comprehensive serialization failed: {e2}")
-                        # Ultimate fallback to minimal payload
-                        payload = {
-                            "config": {
-                                "extraction": {
-                                    "model": extraction_config.get("model", "")
-                                }
-                            },
-                            "prompt_placeholders": prompt_placeholders,
-                            "default_task_prompt_content": [
-                                {"text": "Fallback content"}
-                            ],
-                            "serialized_document": {
-                                "id": str(document.id),
-                                "status": "PROCESSING",
-                            },
-                        }
-
-                # Invoke custom Lambda and get result (pass original images for restoration)
-                lambda_result = self._invoke_custom_prompt_lambda(
-                    custom_lambda_arn, payload, page_images
-                )
+                    logger.info("Comprehensive serialization successful")
+                except (TypeError, ValueError) as e2:
+                    logger.error(f"Even comprehensive serialization failed: {e2}")
+                    # Ultimate fallback to minimal payload
+                    payload = {
+                        "config": {
+                            "extraction": {"model": extraction_config.get("model", "")}
+                        },
+                        "prompt_placeholders": prompt_placeholders,
+                        "default_task_prompt_content": [{"text": "Fallback content"}],
+                        "serialized_document": {
+                            "id": str(document.id),
+                            "status": "PROCESSING",
+                        },
+                    }
 
-                # Use Lambda results
-                system_prompt = lambda_result.get("system_prompt", system_prompt)
-                content = lambda_result.get("task_prompt_content", default_content)
+            # Invoke custom Lambda and get result (pass original images for restoration)
+            lambda_result = self._invoke_custom_prompt_lambda(
+                custom_lambda_arn, payload, page_images
+            )
 
-                logger.info("Successfully applied custom prompt from Lambda function")
+            # Use Lambda results
+            system_prompt = lambda_result.get("system_prompt", system_prompt)
+            content = lambda_result.get("task_prompt_content", default_content)
 
+            logger.info("Successfully applied custom prompt from Lambda function")
+
+        else:
+            # Use default prompt logic when no custom Lambda is configured
+            logger.info(
+                "No custom prompt Lambda configured - using default prompt generation"
+            )
+            prompt_template = extraction_config.get("task_prompt", "")
+
+            if not prompt_template:
+                # Default prompt if template not found
+                task_prompt = f"""
+                Extract the following fields from this {class_label} document:
+                
+                {attribute_descriptions}
+                
+                Document text:
+                {document_text}
+                
+                Respond with a JSON object containing each field name and its extracted value.
+                """
+                content = [{"text": task_prompt}]
+
+                # Add image attachments to the content (limit to 20 images as per Bedrock constraints)
+                if page_images:
+                    logger.info(
+                        f"Attaching images to prompt, for {len(page_images)} pages."
+                    )
+                    # Limit to 20 images as per Bedrock constraints
+                    for img in page_images[:20]:
+                        content.append(image.prepare_bedrock_image_attachment(img))
             else:
-                # Use default prompt logic when no custom Lambda is configured
-                logger.info(
-                    "No custom prompt Lambda configured - using default prompt generation"
-                )
-                prompt_template = extraction_config.get("task_prompt", "")
-
-                if not prompt_template:
-                    # Default prompt if template not found
-                    task_prompt = f"""
-                    Extract the following fields from this {class_label} document:
-                    
-                    {attribute_descriptions}
-                    
-                    Document text:
-                    {document_text}
-                    
-                    Respond with a JSON object containing each field name and its extracted value.
-                    """
-                    content = [{"text": task_prompt}]
-
-                    # Add image attachments to the content (limit to 20 images as per Bedrock constraints)
-                    if page_images:
-                        logger.info(
-                            f"Attaching images to prompt, for {len(page_images)} pages."
-                        )
-                        # Limit to 20 images as per Bedrock constraints
-                        for img in page_images[:20]:
-                            content.append(image.prepare_bedrock_image_attachment(img))
+                # Check if task prompt contains FEW_SHOT_EXAMPLES placeholder
+                if "{FEW_SHOT_EXAMPLES}" in prompt_template:
+                    content = self._build_content_with_few_shot_examples(
+                        prompt_template,
+                        document_text,
+                        class_label,
+                        attribute_descriptions,
+                        page_images,  # Pass images to the content builder
+                    )
                 else:
-                    # Check if task prompt contains FEW_SHOT_EXAMPLES placeholder
-                    if "{FEW_SHOT_EXAMPLES}" in prompt_template:
-                        content = self._build_content_with_few_shot_examples(
+                    # Use the unified content builder for DOCUMENT_IMAGE placeholder support
+                    try:
+                        content = self._build_content_with_or_without_image_placeholder(
                             prompt_template,
                             document_text,
                             class_label,
                             attribute_descriptions,
                             page_images,  # Pass images to the content builder
                         )
-                    else:
-                        # Use the unified content builder for DOCUMENT_IMAGE placeholder support
-                        try:
-                            content = (
-                                self._build_content_with_or_without_image_placeholder(
-                                    prompt_template,
-                                    document_text,
-                                    class_label,
-                                    attribute_descriptions,
-                                    page_images,  # Pass images to the content builder
-                                )
-                            )
-                        except ValueError as e:
-                            logger.warning(
-                                f"Error formatting prompt template: {str(e)}. Using default prompt."
+                    except ValueError as e:
+                        logger.warning(
+                            f"Error formatting prompt template: {str(e)}. Using default prompt."
+                        )
+                        # Fall back to default prompt if template validation fails
+                        task_prompt = f"""
+                        Extract the following fields from this {class_label} document:
+                        
+                        {attribute_descriptions}
+                        
+                        Document text:
+                        {document_text}
+                        
+                        Respond with a JSON object containing each field name and its extracted value.
+                        """
+                        content = [{"text": task_prompt}]
+
+                        # Add image attachments for fallback case
+                        if page_images:
+                            logger.info(
+                                f"Attaching images to prompt, for {len(page_images)} pages."
                             )
-                            # Fall back to default prompt if template validation fails
-                            task_prompt = f"""
-                            Extract the following fields from this {class_label} document:
-                            
-                            {attribute_descriptions}
-                            
-                            Document text:
-                            {document_text}
-                            
-                            Respond with a JSON object containing each field name and its extracted value.
-                            """
-                            content = [{"text": task_prompt}]
-
-                            # Add image attachments for fallback case
-                            if page_images:
-                                logger.info(
-                                    f"Attaching images to prompt, for {len(page_images)} pages."
+                            # Limit to 20 images as per Bedrock constraints
+                            for img in page_images[:20]:
+                                content.append(
+                                    image.prepare_bedrock_image_attachment(img)
                                 )
-                                # Limit to 20 images as per Bedrock constraints
-                                for img in page_images[:20]:
-                                    content.append(
-                                        image.prepare_bedrock_image_attachment(img)
-                                    )
-
-            logger.info(
-                f"Extracting fields for {class_label} document, section {section_id}"
-            )
-
-            # Time the model invocation
-            request_start_time = time.time()
 
-            # Invoke Bedrock with the common library
-            response_with_metering = bedrock.invoke_model(
-                model_id=model_id,
-                system_prompt=system_prompt,
-                content=content,
-                temperature=temperature,
-                top_k=top_k,
-                top_p=top_p,
-                max_tokens=max_tokens,
-                context="Extraction",
-            )
-
-            total_duration = time.time() - request_start_time
-            logger.info(f"Time taken for extraction: {total_duration:.2f} seconds")
-
-            # Extract text from response
-            extracted_text = bedrock.extract_text_from_response(response_with_metering)
-            metering = response_with_metering.get("metering", {})
-
-            # Parse response into JSON
-            extracted_fields = {}
-            parsing_succeeded = True  # Flag to track if parsing was successful
-
-            try:
-                # Try to parse the extracted text as JSON
-                extracted_fields = json.loads(extract_json_from_text(extracted_text))
-            except Exception as e:
-                # Handle parsing error
-                logger.error(
-                    f"Error parsing LLM output - invalid JSON?: {extracted_text} - {e}"
-                )
-                logger.info("Using unparsed LLM output.")
-                extracted_fields = {"raw_output": extracted_text}
-                parsing_succeeded = False  # Mark that parsing failed
+        return {
+            "model_id": model_id,
+            "system_prompt": system_prompt,
+            "content": content,
+            "temperature": temperature,
+            "top_k": top_k,
+            "top_p": top_p,
+            "max_tokens": max_tokens,
+            "context": "Extraction",
+        }
+
+    def _complete_extraction(
+        self,
+        document: Document,
+        section: Section,
+        response_with_metering: Dict[str, Any],
+        total_duration: float,
+    ) -> None:
+        """
+        Parse the model response, write the extraction result to S3 and update
+        the section and document metering.
 
-            # Write to S3
-            output = {
-                "document_class": {"type": class_label},
-                "inference_result": extracted_fields,
-                "metadata": {
-                    "parsing_succeeded": parsing_succeeded,
-                    "extraction_time_seconds": total_duration,
-                },
-            }
-            s3.write_content(
-                output, output_bucket, output_key, content_type="application/json"
-            )
+        Args:
+            document: Document object containing the section
+            section: Section that was extracted
+            response_with_metering: Bedrock response with metering information
+            total_duration: Seconds the model invocation took
+        """
+        class_label = section.classification
+        output_key, output_uri = self._get_output_location(document, section)
 
-            # Update the section with extraction result URI only (not the attributes themselves)
-            section.extraction_result_uri = output_uri
+        # Extract text from response
+        extracted_text = bedrock.extract_text_from_response(response_with_metering)
+        metering = response_with_metering.get("metering", {})
 
-            # Update document with metering data
-            document.metering = utils.merge_metering_data(
-                document.metering, metering or {}
-            )
+        # Parse response into JSON
+        extracted_fields = {}
+        parsing_succeeded = True  # Flag to track if parsing was successful
 
-            t3 = time.time()
-            logger.info(
-                f"Total extraction time for section {section_id}: {t3 - t0:.2f} seconds"
+        try:
+            # Try to parse the extracted text as JSON
+            extracted_fields = json.loads(extract_json_from_text(extracted_text))
+        except Exception as e:
+            # Handle parsing error
+            logger.error(
+                f"Error parsing LLM output - invalid JSON?: {extracted_text} - {e}"
             )
+            logger.info("Using unparsed LLM output.")
+            extracted_fields = {"raw_output": extracted_text}
+            parsing_succeeded = False  # Mark that parsing failed
+
+        # Write to S3
+        output = {
+            "document_class": {"type": class_label},
+            "inference_result": extracted_fields,
+            "metadata": {
+                "parsing_succeeded": parsing_succeeded,
+                "extraction_time_seconds": total_duration,
+            },
+        }
+        s3.write_content(
+            output, document.output_bucket, output_key, content_type="application/json"
+        )
 
-        except Exception as e:
-            error_msg = f"Error processing section {section_id}: {str(e)}"
-            logger.error(error_msg)
-            document.errors.append(error_msg)
-            raise
+        # Update the section with extraction result URI only (not the attributes themselves)
+        section.extraction_result_uri = output_uri
 
-        return document
+        # Update document with metering data
+        document.metering = utils.merge_metering_data(document.metering, metering or {})
@@ -4,9 +4,10 @@
 from PIL import Image, ImageFilter, ImageChops, ImageOps
 import io
 import logging
-from typing import Tuple, Optional, Dict, Any, Union
+from typing import Tuple, Optional, Dict, Any, List, Union
 from ..s3 import get_binary_content
 from ..utils import parse_s3_uri
+from .preprocessing import PreprocessingPipeline, preprocess_image
 
 logger = logging.getLogger(__name__)
 
@@ -63,38 +64,80 @@ def resize_image(image_data: bytes,
         new_height = int(current_height * scale_factor)
         logger.info(f"Resizing image from {current_width}x{current_height} to {new_width}x{new_height} (scale: {scale_factor:.3f})")
         image = image.resize((new_width, new_height), Image.LANCZOS)
-        
-        # Save in original format if possible
-        img_byte_array = io.BytesIO()
-        
-        # Determine save format - use original if available, otherwise JPEG
-        if original_format and original_format in ['JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP']:
-            save_format = original_format
-        else:
-            save_format = 'JPEG'
-            logger.info(f"Converting from {original_format or 'unknown'} to JPEG")
-        
-        # Prepare save parameters
-        save_kwargs = {"format": save_format}
-        
-        # Add quality parameters for JPEG
-        if save_format in ['JPEG', 'JPG']:
-            save_kwargs["quality"] = 95  # High quality
-            save_kwargs["optimize"] = True
-        
-        # Handle format-specific requirements
-        if save_format == 'PNG' and image.mode not in ['RGBA', 'LA', 'L', 'P']:
-            # PNG requires specific modes
-            if image.mode == 'CMYK':
-                image = image.convert('RGB')
-        
-        image.save(img_byte_array, **save_kwargs)
-        return img_byte_array.getvalue()
+        return _save_resized_image(image, original_format)
     else:
         # No resizing needed - return original data unchanged
         logger.info(f"Image {current_width}x{current_height} already fits within {target_width}x{target_height}, returning original")
         return image_data
 
+def _save_resized_image(image: Image.Image, original_format: Optional[str]) -> bytes:
+    """
+    Encode a resized image in its original format when possible, otherwise JPEG.
+    """
+    # Save in original format if possible
+    img_byte_array = io.BytesIO()
+    
+    # Determine save format - use original if available, otherwise JPEG
+    if original_format and original_format in ['JPEG', 'PNG', 'GIF', 'BMP', 'TIFF', 'WEBP']:
+        save_format = original_format
+    else:
+        save_format = 'JPEG'
+        logger.info(f"Converting from {original_format or 'unknown'} to JPEG")
+    
+    # Prepare save parameters
+    save_kwargs = {"format": save_format}
+    
+    # Add quality parameters for JPEG
+    if save_format in ['JPEG', 'JPG']:
+        save_kwargs["quality"] = 95  # High quality
+        save_kwargs["optimize"] = True
+    
+    # Handle format-specific requirements
+    if save_format == 'PNG' and image.mode not in ['RGBA', 'LA', 'L', 'P']:
+        # PNG requires specific modes
+        if image.mode == 'CMYK':
+            image = image.convert('RGB')
+    
+    image.save(img_byte_array, **save_kwargs)
+    return img_byte_array.getvalue()
+
+def resize_image_variants(image_data: bytes,
+                          sizes: List[Tuple[int, int]]) -> Dict[Tuple[int, int], bytes]:
+    """
+    Produce several downscaled copies of an image with a single decode.
+    
+    Each variant is identical to resize_image(image_data, width, height) for
+    its size. Sizes the image already fits within are omitted, since
+    resize_image would return the original image for them.
+    
+    Args:
+        image_data: Raw image bytes
+        sizes: (target_width, target_height) pairs
+        
+    Returns:
+        Dict mapping each (target_width, target_height) that needs a resize
+        to the resized image bytes
+    """
+    variants = {}
+    if not sizes:
+        return variants
+    
+    image = Image.open(io.BytesIO(image_data))
+    current_width, current_height = image.size
+    original_format = image.format
+    image.load()
+    
+    for target_width, target_height in sizes:
+        scale_factor = min(target_width / current_width, target_height / current_height)
+        if scale_factor >= 1.0:
+            continue
+        new_width = int(current_width * scale_factor)
+        new_height = int(current_height * scale_factor)
+        resized = image.resize((new_width, new_height), Image.LANCZOS)
+        variants[(target_width, target_height)] = _save_resized_image(resized, original_format)
+    
+    return variants
+
 def prepare_image(image_source: Union[str, bytes],
                  target_width: Optional[int] = None, 
                  target_height: Optional[int] = None,
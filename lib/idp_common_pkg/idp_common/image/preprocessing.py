@@ -0,0 +1,378 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+NumPy-backed image preprocessing pipeline for OCR.
+
+A page is decoded once into a grayscale ``uint8`` array, passed through the
+configured steps and encoded once as JPEG. Available steps:
+
+- ``normalize``: contrast stretch between two intensity percentiles
+- ``denoise``: median filter that removes salt-and-pepper scanner noise
+- ``deskew``: projection-profile skew estimate and rotation
+- ``binarize``: adaptive mean thresholding using an integral image, matching
+  ``apply_adaptive_binarization`` (``block_size=15``, ``C=10``)
+
+Steps are configured as names or dicts with parameters::
+
+    preprocessing:
+      enabled: true
+      engine: numpy        # or "pillow" for apply_adaptive_binarization
+      steps:
+        - normalize
+        - name: deskew
+          max_angle: 5
+        - binarize
+
+When NumPy is unavailable, or the pipeline fails on an image, the Pillow
+``apply_adaptive_binarization`` implementation is used instead.
+"""
+
+import io
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from PIL import Image, ImageFilter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+VALID_ENGINES = ["numpy", "pillow"]
+DEFAULT_STEPS = ["binarize"]
+
+
+def normalize_contrast(
+    gray: "np.ndarray", low_percentile: float = 1.0, high_percentile: float = 99.0
+) -> "np.ndarray":
+    """
+    Stretch intensities so the given percentiles map to 0 and 255.
+
+    Args:
+        gray: Grayscale uint8 array
+        low_percentile: Percentile mapped to black
+        high_percentile: Percentile mapped to white
+
+    Returns:
+        Contrast-normalized uint8 array
+    """
+    histogram = np.bincount(gray.ravel(), minlength=256)
+    cdf = np.cumsum(histogram)
+    low = int(np.searchsorted(cdf, gray.size * low_percentile / 100.0, side="right"))
+    high = min(255, int(np.searchsorted(cdf, gray.size * high_percentile / 100.0)))
+    if high - low < 1:
+        return gray
+    lut = (np.arange(256, dtype=np.float32) - low) * (255.0 / (high - low))
+    return np.clip(lut, 0, 255).astype(np.uint8)[gray]
+
+
+def denoise(gray: "np.ndarray", size: int = 3) -> "np.ndarray":
+    """
+    Apply a median filter.
+
+    The array is wrapped as a Pillow image without encoding, so the filter
+    runs in C.
+
+    Args:
+        gray: Grayscale uint8 array
+        size: Odd filter size
+
+    Returns:
+        Filtered uint8 array
+    """
+    size = int(size)
+    if size < 3:
+        return gray
+    if size % 2 == 0:
+        size += 1
+    filtered = Image.fromarray(gray).filter(ImageFilter.MedianFilter(size))
+    return np.asarray(filtered)
+
+
+def estimate_skew_angle(
+    gray: "np.ndarray",
+    max_angle: float = 5.0,
+    step: float = 0.5,
+    sample_width: int = 1000,
+) -> float:
+    """
+    Estimate the skew of text lines with a projection profile.
+
+    Dark pixels of a downsampled copy are projected onto rows for each
+    candidate angle; the angle whose profile has the sharpest transitions
+    (text lines aligned with rows) wins.
+
+    Args:
+        gray: Grayscale uint8 array
+        max_angle: Largest skew considered, in degrees
+        step: Angle resolution, in degrees
+        sample_width: Approximate width the image is downsampled to
+
+    Returns:
+        Skew angle in degrees (positive when lines descend to the right)
+    """
+    factor = max(1, gray.shape[1] // max(1, int(sample_width)))
+    sample = gray[::factor, ::factor]
+    ys, xs = np.nonzero(sample < 128)
+    if ys.size < 100:
+        return 0.0
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+
+    best_angle = 0.0
+    best_score = -1.0
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        profile = np.bincount(rows - rows.min()).astype(np.float64)
+        score = float(np.sum(np.diff(profile) ** 2))
+        if score > best_score:
+            best_score = score
+            best_angle = float(angle)
+    return best_angle
+
+
+def deskew(
+    gray: "np.ndarray",
+    max_angle: float = 5.0,
+    step: float = 0.5,
+    sample_width: int = 1000,
+) -> "np.ndarray":
+    """
+    Rotate the image so text lines are horizontal.
+
+    Args:
+        gray: Grayscale uint8 array
+        max_angle: Largest skew corrected, in degrees
+        step: Angle resolution, in degrees
+        sample_width: Approximate width used for the skew estimate
+
+    Returns:
+        Deskewed uint8 array (same size, white fill)
+    """
+    angle = estimate_skew_angle(gray, max_angle, step, sample_width)
+    if abs(angle) < step / 2:
+        return gray
+    logger.debug(f"Deskewing image by {angle:.2f} degrees")
+    rotated = Image.fromarray(gray).rotate(
+        angle, resample=Image.BILINEAR, fillcolor=255
+    )
+    return np.asarray(rotated)
+
+
+def binarize(gray: "np.ndarray", block_size: int = 15, c: int = 10) -> "np.ndarray":
+    """
+    Adaptive mean thresholding using an integral image.
+
+    A pixel becomes white if it is brighter than the mean of its
+    ``block_size`` x ``block_size`` neighborhood minus ``c``. The window sums
+    come from a summed-area table, so the cost does not depend on block_size.
+
+    Args:
+        gray: Grayscale uint8 array
+        block_size: Odd neighborhood size
+        c: Constant subtracted from the local mean
+
+    Returns:
+        Binary uint8 array (0 or 255)
+    """
+    block_size = max(1, int(block_size))
+    if block_size % 2 == 0:
+        block_size += 1
+    radius = block_size // 2
+    padded = np.pad(gray, radius, mode="edge")
+
+    # int32 is enough unless the padded image sum can overflow it
+    dtype = np.int32 if padded.size * 255 < 2**31 else np.int64
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=dtype)
+    np.cumsum(padded, axis=0, dtype=dtype, out=integral[1:, 1:])
+    np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+
+    k = block_size
+    window_sums = (
+        integral[k:, k:] - integral[:-k, k:] - integral[k:, :-k] + integral[:-k, :-k]
+    )
+    area = block_size * block_size
+    # gray > mean - c, in integers: gray * area > sum - c * area
+    mask = gray.astype(dtype) * area > window_sums - int(c) * area
+    return np.where(mask, np.uint8(255), np.uint8(0))
+
+
+STEP_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "normalize": normalize_contrast,
+    "denoise": denoise,
+    "deskew": deskew,
+    "binarize": binarize,
+}
+
+
+class PreprocessingPipeline:
+    """Composes array preprocessing steps with one decode and one encode per image."""
+
+    def __init__(
+        self,
+        steps: Optional[Sequence[Union[str, Dict[str, Any]]]] = None,
+        engine: str = "numpy",
+    ):
+        """
+        Args:
+            steps: Step names or dicts with a "name" and step parameters
+                (default: binarize only)
+            engine: "numpy" or "pillow" (apply_adaptive_binarization)
+
+        Raises:
+            ValueError: If the engine or a step is unknown
+        """
+        engine = str(engine or "numpy").lower()
+        if engine not in VALID_ENGINES:
+            raise ValueError(
+                f"Invalid preprocessing engine: {engine}. "
+                f"Must be one of: {', '.join(VALID_ENGINES)}"
+            )
+        if engine == "numpy" and np is None:
+            logger.warning("NumPy not available, using Pillow image preprocessing")
+            engine = "pillow"
+        self.engine = engine
+
+        self.steps: List[tuple] = []
+        for step in DEFAULT_STEPS if steps is None else steps:
+            if isinstance(step, str):
+                name, params = step, {}
+            else:
+                params = dict(step)
+                name = params.pop("name", None)
+            name = str(name or "").lower()
+            if name not in STEP_FUNCTIONS:
+                raise ValueError(
+                    f"Invalid preprocessing step: {name}. "
+                    f"Must be one of: {', '.join(STEP_FUNCTIONS)}"
+                )
+            self.steps.append((name, params))
+
+        if self.engine == "pillow" and any(
+            name != "binarize" for name, _ in self.steps
+        ):
+            logger.warning(
+                "Pillow preprocessing only supports binarization; "
+                "other steps are skipped"
+            )
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]]
+    ) -> Optional["PreprocessingPipeline"]:
+        """
+        Build a pipeline from the image preprocessing configuration.
+
+        Args:
+            config: Dict with "enabled", optional "engine" and "steps"
+
+        Returns:
+            PreprocessingPipeline, or None if preprocessing is disabled
+        """
+        if not config or str(config.get("enabled", True)).lower() != "true":
+            return None
+        return cls(steps=config.get("steps"), engine=config.get("engine", "numpy"))
+
+    @property
+    def binarizes(self) -> bool:
+        """True if the pipeline includes binarization."""
+        return any(name == "binarize" for name, _ in self.steps)
+
+    def apply(self, gray: "np.ndarray") -> "np.ndarray":
+        """Run the steps on a grayscale uint8 array."""
+        for name, params in self.steps:
+            gray = STEP_FUNCTIONS[name](gray, **params)
+        return gray
+
+    def _pillow_fallback(self, image_data: bytes) -> bytes:
+        if not self.binarizes:
+            return image_data
+        from idp_common.image import apply_adaptive_binarization
+
+        return apply_adaptive_binarization(image_data)
+
+    def process(self, image_data: bytes) -> bytes:
+        """
+        Preprocess encoded image bytes.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Processed image as JPEG bytes. Falls back to the Pillow
+            implementation (or the original image) if processing fails.
+        """
+        if self.engine == "pillow":
+            return self._pillow_fallback(image_data)
+        try:
+            with Image.open(io.BytesIO(image_data)) as pil_image:
+                gray = np.asarray(pil_image.convert("L"))
+            gray = self.apply(gray)
+            output = io.BytesIO()
+            Image.fromarray(np.ascontiguousarray(gray)).save(output, format="JPEG")
+            return output.getvalue()
+        except Exception as e:
+            logger.warning(
+                f"NumPy image preprocessing failed, using Pillow fallback: {str(e)}"
+            )
+            return self._pillow_fallback(image_data)
+
+
+def preprocess_image(
+    image_data: bytes, config: Optional[Dict[str, Any]] = None
+) -> bytes:
+    """
+    Preprocess an image for OCR according to the preprocessing configuration.
+
+    Args:
+        image_data: Raw image bytes
+        config: Preprocessing configuration (default: binarize with NumPy)
+
+    Returns:
+        Processed image as JPEG bytes
+    """
+    pipeline = PreprocessingPipeline.from_config(config or {"enabled": True})
+    if pipeline is None:
+        return image_data
+    return pipeline.process(image_data)
+
+
+def benchmark_preprocessing(
+    image_data: bytes,
+    steps: Optional[Sequence[Union[str, Dict[str, Any]]]] = None,
+    engines: Sequence[str] = ("numpy", "pillow"),
+    repeat: int = 3,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure preprocessing cost per megapixel for each engine.
+
+    Args:
+        image_data: Raw image bytes
+        steps: Pipeline steps (default: binarize only)
+        engines: Engines to compare
+        repeat: Runs per engine; the fastest is reported
+
+    Returns:
+        Dict keyed by engine with megapixels, seconds and ms_per_megapixel
+    """
+    with Image.open(io.BytesIO(image_data)) as image:
+        megapixels = image.width * image.height / 1e6
+
+    results = {}
+    for engine in engines:
+        pipeline = PreprocessingPipeline(steps=steps, engine=engine)
+        best = float("inf")
+        for _ in range(max(1, int(repeat))):
+            t0 = time.perf_counter()
+            pipeline.process(image_data)
+            best = min(best, time.perf_counter() - t0)
+        results[engine] = {
+            "megapixels": round(megapixels, 2),
+            "seconds": round(best, 4),
+            "ms_per_megapixel": round(best * 1000 / megapixels, 2),
+        }
+    return results
@@ -2,17 +2,24 @@
 # SPDX-License-Identifier: MIT-0
 
 import boto3
+import functools
 import os
 import logging
 import threading
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Optional
+
+from .publisher import (
+    MetricsPublisher,
+    configure_metrics_publisher,
+    get_metrics_publisher,
+    reset_metrics_publisher,
+)
 
 logger = logging.getLogger(__name__)
 
 # Initialize clients
 _cloudwatch_client = None
 _client_lock = threading.Lock()
-_metric_lock = threading.Lock()
 
 def get_cloudwatch_client():
     """
@@ -27,11 +34,32 @@ def get_cloudwatch_client():
             _cloudwatch_client = boto3.client('cloudwatch')
         return _cloudwatch_client
 
+def get_publisher() -> MetricsPublisher:
+    """
+    Get the process-wide metrics publisher, configured from the environment
+    
+    METRIC_PUBLISH_MODE selects "sync" (default), "buffered" or "emf";
+    METRIC_FLUSH_INTERVAL sets the background flush interval in seconds.
+    Handlers decorated with flush_after buffer unless METRIC_PUBLISH_MODE is set.
+    
+    Returns:
+        Shared MetricsPublisher
+    """
+    return get_metrics_publisher(
+        mode=os.environ.get('METRIC_PUBLISH_MODE', 'sync').lower(),
+        flush_interval=float(os.environ.get('METRIC_FLUSH_INTERVAL', 10)),
+        client_factory=lambda: get_cloudwatch_client(),
+    )
+
 def put_metric(name: str, value: float, unit: str = 'Count', 
               dimensions: Optional[List[Dict[str, str]]] = None,
               namespace: Optional[str] = None) -> None:
     """
-    Publish a metric to CloudWatch in a thread-safe manner
+    Record a metric for publishing to CloudWatch
+    
+    Datapoints are published before this returns unless the publisher is
+    buffered (inside a flush_after handler, or METRIC_PUBLISH_MODE=buffered/emf),
+    in which case a background thread publishes them in batches.
     
     Args:
         name: The name of the metric
@@ -40,34 +68,53 @@ def put_metric(name: str, value: float, unit: str = 'Count',
         dimensions: Optional list of dimensions
         namespace: Optional metric namespace, defaults to environment variable
     """
-    dimensions = dimensions or []
-    
     # Get namespace from environment if not provided
     if namespace is None:
         namespace = os.environ.get('METRIC_NAMESPACE', 'GENAIDP')
     
-    # Use thread lock to ensure thread safety when publishing metrics
-    with _metric_lock:
-        logger.debug(f"Publishing metric {name}: {value}")
+    logger.debug(f"Recording metric {name}: {value}")
+    try:
+        get_publisher().put(name, value, unit, dimensions, namespace)
+    except Exception as e:
+        logger.error(f"Error recording metric {name}: {e}")
+
+def flush() -> None:
+    """
+    Publish all buffered metrics now
+    
+    Lambda freezes the container when the handler returns, so call this (or
+    decorate the handler with flush_after) at the end of every handler.
+    """
+    get_publisher().flush()
+
+def flush_after(handler: Callable) -> Callable:
+    """
+    Decorate a Lambda handler so buffered metrics are flushed when it returns or raises
+    
+    Since the flush is guaranteed, the handler buffers its metrics unless
+    METRIC_PUBLISH_MODE selects a mode explicitly.
+    
+    Args:
+        handler: Lambda handler function
+        
+    Returns:
+        Wrapped handler
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if 'METRIC_PUBLISH_MODE' not in os.environ:
+            get_publisher().set_mode('buffered')
         try:
-            cloudwatch = get_cloudwatch_client()
-            cloudwatch.put_metric_data(
-                Namespace=namespace,
-                MetricData=[{
-                    'MetricName': name,
-                    'Value': value,
-                    'Unit': unit,
-                    'Dimensions': dimensions
-                }]
-            )
-        except Exception as e:
-            logger.error(f"Error publishing metric {name}: {e}")
+            return handler(*args, **kwargs)
+        finally:
+            flush()
+    return wrapper
 
 def create_client_performance_metrics(name: str, duration_ms: float, 
                                      is_success: bool = True, 
                                      error_type: Optional[str] = None) -> None:
     """
-    Helper to publish standardized client performance metrics in a thread-safe manner
+    Helper to record standardized client performance metrics
     
     Args:
         name: Base name for the metric group
@@ -75,52 +122,12 @@ def create_client_performance_metrics(name: str, duration_ms: float,
         is_success: Whether the operation succeeded
         error_type: Optional error type for failures
     """
-    # Use a single lock for all metrics to ensure they are published as a group
-    with _metric_lock:
-        # Get namespace from environment
-        namespace = os.environ.get('METRIC_NAMESPACE', 'GENAIDP')
-        dimensions = []
-        cloudwatch = get_cloudwatch_client()
-        
-        # Build metric data array for all metrics we want to publish
-        metric_data = [
-            {
-                'MetricName': f"{name}Latency",
-                'Value': duration_ms,
-                'Unit': 'Milliseconds',
-                'Dimensions': dimensions
-            }
-        ]
-        
-        # Add success/failure metrics
-        if is_success:
-            metric_data.append({
-                'MetricName': f"{name}Success",
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': dimensions
-            })
-        else:
-            metric_data.append({
-                'MetricName': f"{name}Failure",
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': dimensions
-            })
-            if error_type:
-                metric_data.append({
-                    'MetricName': f"{name}Error.{error_type}",
-                    'Value': 1,
-                    'Unit': 'Count',
-                    'Dimensions': dimensions
-                })
-        
-        # Publish all metrics in a single API call for efficiency
-        try:
-            cloudwatch.put_metric_data(
-                Namespace=namespace,
-                MetricData=metric_data
-            )
-            logger.debug(f"Published {len(metric_data)} metrics for {name}")
-        except Exception as e:
-            logger.error(f"Error publishing performance metrics for {name}: {e}")
\ No newline at end of file
+    put_metric(f"{name}Latency", duration_ms, 'Milliseconds')
+    
+    # Add success/failure metrics
+    if is_success:
+        put_metric(f"{name}Success", 1)
+    else:
+        put_metric(f"{name}Failure", 1)
+        if error_type:
+            put_metric(f"{name}Error.{error_type}", 1)
@@ -0,0 +1,342 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Buffered, non-blocking metrics publisher.
+
+``put_metric`` used to make one synchronous ``put_metric_data`` call per
+datapoint under a global lock, so every worker thread that invoked Bedrock
+waited on CloudWatch round-trips in turn. ``MetricsPublisher`` instead
+can aggregate datapoints in memory and publish them from a background thread:
+
+- **buffered**: datapoints with the same namespace, name, unit and
+  dimensions are merged into ``Values``/``Counts`` arrays and sent with as few
+  ``put_metric_data`` calls as possible
+- **emf**: datapoints are printed to stdout as CloudWatch Embedded Metric
+  Format lines, which Lambda ships to CloudWatch Logs without any API call
+- **sync** (default): every datapoint is published before ``put`` returns
+
+Lambda freezes the container as soon as the handler returns, so buffering is
+only safe in handlers that call ``flush()`` before returning;
+``idp_common.metrics.flush_after`` does that and switches the publisher to
+buffered mode. In buffered and emf modes, datapoints that fail to publish are
+re-queued for the next flush, up to ``max_retained`` datapoints; in sync mode
+they are dropped, so an outage does not make every later ``put`` re-send the
+backlog.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_MODES = ("buffered", "emf", "sync")
+
+DEFAULT_FLUSH_INTERVAL = 10.0
+DEFAULT_MAX_BUFFERED = 1000
+DEFAULT_MAX_RETAINED = 10000
+
+# CloudWatch and EMF request limits
+MAX_DATA_PER_REQUEST = 1000
+MAX_VALUES_PER_DATUM = 150
+MAX_VALUES_PER_EMF_METRIC = 100
+MAX_METRICS_PER_EMF_LINE = 100
+
+# (namespace, name, unit, ((dimension name, dimension value), ...))
+MetricKey = Tuple[str, str, str, Tuple[Tuple[str, str], ...]]
+
+
+class MetricsPublisher:
+    """Aggregates metric datapoints and publishes them in batches."""
+
+    def __init__(
+        self,
+        mode: str = "sync",
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+        max_retained: int = DEFAULT_MAX_RETAINED,
+        client_factory: Optional[Callable[[], Any]] = None,
+        emit: Callable[[str], None] = print,
+    ):
+        """
+        Initialize the publisher.
+
+        Args:
+            mode: "buffered", "emf" or "sync"
+            flush_interval: Seconds between background flushes
+            max_buffered: Number of buffered datapoints that triggers an early flush
+            max_retained: Maximum number of buffered datapoints kept after
+                failed publishes in buffered and emf modes; failed batches
+                beyond it are dropped
+            client_factory: Returns the CloudWatch client (buffered and sync modes)
+            emit: Writes one EMF line (emf mode)
+        """
+        _validate_mode(mode)
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.max_retained = max_retained
+        self._client_factory = client_factory
+        self._emit = emit
+
+        self._lock = threading.Lock()
+        # Serializes flushes so datapoints reach CloudWatch in order
+        self._flush_lock = threading.Lock()
+        self._buffer: Dict[MetricKey, Dict[float, int]] = {}
+        self._buffered = 0
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def set_mode(self, mode: str) -> None:
+        """
+        Change the publish mode.
+
+        Args:
+            mode: "buffered", "emf" or "sync"
+        """
+        _validate_mode(mode)
+        if mode != self.mode:
+            self.flush()
+            self.mode = mode
+
+    def put(
+        self,
+        name: str,
+        value: float,
+        unit: str = "Count",
+        dimensions: Optional[List[Dict[str, str]]] = None,
+        namespace: str = "GENAIDP",
+    ) -> None:
+        """
+        Record a datapoint.
+
+        Args:
+            name: The name of the metric
+            value: The value of the metric
+            unit: The unit of the metric
+            dimensions: Optional list of {"Name": ..., "Value": ...} dimensions
+            namespace: Metric namespace
+        """
+        key = (
+            namespace,
+            name,
+            unit,
+            tuple((d["Name"], str(d["Value"])) for d in dimensions or []),
+        )
+        with self._lock:
+            counts = self._buffer.setdefault(key, defaultdict(int))
+            counts[float(value)] += 1
+            self._buffered += 1
+            full = self._buffered >= self.max_buffered
+
+        if self.mode == "sync":
+            self.flush()
+            return
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Publish all buffered datapoints now."""
+        with self._flush_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, {}
+                self._buffered = 0
+            if not buffer:
+                return
+            try:
+                if self.mode == "emf":
+                    self._publish_emf(buffer)
+                    unsent = {}
+                else:
+                    unsent = self._publish_cloudwatch(buffer)
+            except Exception as e:
+                logger.error(f"Error publishing metrics: {e}")
+                unsent = buffer
+            if not unsent:
+                return
+            if self.mode == "sync":
+                # Each put flushes, so a re-queued backlog would be re-sent
+                # with every datapoint while CloudWatch is failing
+                count = sum(sum(counts.values()) for counts in unsent.values())
+                logger.warning(
+                    f"Dropping {count} metric datapoints that failed to publish"
+                )
+                return
+            self._requeue(unsent)
+
+    def _requeue(self, unsent: Dict[MetricKey, Dict[float, int]]) -> None:
+        count = sum(sum(counts.values()) for counts in unsent.values())
+        with self._lock:
+            if self._buffered + count > self.max_retained:
+                logger.warning(
+                    f"Dropping {count} metric datapoints that failed to publish"
+                )
+                return
+            for key, counts in unsent.items():
+                buffered = self._buffer.setdefault(key, defaultdict(int))
+                for value, n in counts.items():
+                    buffered[value] += n
+            self._buffered += count
+
+    def close(self) -> None:
+        """Stop the background thread and flush remaining datapoints."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="metrics-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _publish_cloudwatch(
+        self, buffer: Dict[MetricKey, Dict[float, int]]
+    ) -> Dict[MetricKey, Dict[float, int]]:
+        """Publish the buffer; returns the datapoints of failed requests."""
+        # Each datum is kept with the datapoints it carries, to re-queue them
+        by_namespace: Dict[str, List[Tuple[Dict[str, Any], MetricKey, List]]] = (
+            defaultdict(list)
+        )
+        for key, counts in buffer.items():
+            namespace, name, unit, dimensions = key
+            items = list(counts.items())
+            for i in range(0, len(items), MAX_VALUES_PER_DATUM):
+                chunk = items[i : i + MAX_VALUES_PER_DATUM]
+                datum = {
+                    "MetricName": name,
+                    "Unit": unit,
+                    "Dimensions": [{"Name": n, "Value": v} for n, v in dimensions],
+                    "Values": [value for value, _ in chunk],
+                    "Counts": [float(count) for _, count in chunk],
+                }
+                by_namespace[namespace].append((datum, key, chunk))
+
+        cloudwatch = self._client_factory()
+        unsent: Dict[MetricKey, Dict[float, int]] = {}
+        for namespace, entries in by_namespace.items():
+            for i in range(0, len(entries), MAX_DATA_PER_REQUEST):
+                batch = entries[i : i + MAX_DATA_PER_REQUEST]
+                try:
+                    cloudwatch.put_metric_data(
+                        Namespace=namespace, MetricData=[datum for datum, _, _ in batch]
+                    )
+                    logger.debug(f"Published {len(batch)} metrics to {namespace}")
+                except Exception as e:
+                    logger.error(f"Error publishing metrics to {namespace}: {e}")
+                    for _, key, chunk in batch:
+                        unsent.setdefault(key, {}).update(chunk)
+        return unsent
+
+    def _publish_emf(self, buffer: Dict[MetricKey, Dict[float, int]]) -> None:
+        # Metrics sharing a namespace and dimension set go on the same line
+        groups: Dict[Tuple, List[Tuple[str, str, List[float]]]] = defaultdict(list)
+        for (namespace, name, unit, dimensions), counts in buffer.items():
+            values = [v for v, count in counts.items() for _ in range(count)]
+            groups[(namespace, dimensions)].append((name, unit, values))
+
+        timestamp = int(time.time() * 1000)
+        for (namespace, dimensions), metrics in groups.items():
+            pending = [(name, unit, values, 0) for name, unit, values in metrics]
+            while pending:
+                line: Dict[str, Any] = dict(dimensions)
+                definitions = []
+                remaining = []
+                for name, unit, values, offset in pending:
+                    if name in line or len(definitions) >= MAX_METRICS_PER_EMF_LINE:
+                        remaining.append((name, unit, values, offset))
+                        continue
+                    end = offset + MAX_VALUES_PER_EMF_METRIC
+                    line[name] = values[offset:end]
+                    definitions.append({"Name": name, "Unit": unit})
+                    if end < len(values):
+                        remaining.append((name, unit, values, end))
+                line["_aws"] = {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": namespace,
+                            "Dimensions": [[n for n, _ in dimensions]],
+                            "Metrics": definitions,
+                        }
+                    ],
+                }
+                self._emit(json.dumps(line))
+                pending = remaining
+
+
+def _validate_mode(mode: str) -> None:
+    if mode not in PUBLISH_MODES:
+        raise ValueError(
+            f"Invalid metric publish mode: {mode}. "
+            f"Must be one of {', '.join(PUBLISH_MODES)}"
+        )
+
+
+_publisher: Optional[MetricsPublisher] = None
+_publisher_lock = threading.Lock()
+
+
+def get_metrics_publisher(**settings) -> MetricsPublisher:
+    """
+    Get or create the process-wide metrics publisher.
+
+    Settings are applied only when the publisher is first created.
+
+    Args:
+        **settings: MetricsPublisher keyword arguments
+
+    Returns:
+        Shared MetricsPublisher
+    """
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = MetricsPublisher(**settings)
+            atexit.register(_publisher.close)
+            logger.debug(f"Created metrics publisher in {_publisher.mode} mode")
+        return _publisher
+
+
+def configure_metrics_publisher(publisher: Optional[MetricsPublisher]) -> None:
+    """
+    Set the process-wide metrics publisher.
+
+    Args:
+        publisher: Publisher to use, or None to create one from the settings
+            on next use
+    """
+    reset_metrics_publisher()
+    global _publisher
+    with _publisher_lock:
+        _publisher = publisher
+
+
+def reset_metrics_publisher() -> None:
+    """Flush and discard the process-wide metrics publisher (used by tests)."""
+    global _publisher
+    with _publisher_lock:
+        publisher, _publisher = _publisher, None
+    if publisher is not None:
+        atexit.unregister(publisher.close)
+        publisher.close()
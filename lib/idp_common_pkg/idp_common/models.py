@@ -31,6 +31,27 @@ class Status(Enum):
     FAILED = "FAILED"  # Processing failed
 
 
+def image_variant_key(target_width: Any, target_height: Any) -> Optional[str]:
+    """
+    Return the Page.image_variants key ("<width>x<height>") for a target size.
+
+    Args:
+        target_width: Target width in pixels (int or numeric string)
+        target_height: Target height in pixels (int or numeric string)
+
+    Returns:
+        Variant key, or None if either dimension is missing or invalid
+    """
+    try:
+        width = int(target_width)
+        height = int(target_height)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return f"{width}x{height}"
+
+
 @dataclass
 class Page:
     """Represents a single page in a document."""
@@ -44,6 +65,26 @@ class Page:
     confidence: float = 0.0
     tables: List[Dict[str, Any]] = field(default_factory=list)
     forms: Dict[str, str] = field(default_factory=dict)
+    # Pre-resized copies of the page image written by OCR, keyed by "<width>x<height>"
+    image_variants: Dict[str, str] = field(default_factory=dict)
+    # SHA-256 of the parsed text and page image, recorded by OCR when it writes them
+    content_hash: Optional[str] = None
+
+    def get_image_uri(
+        self, target_width: Any = None, target_height: Any = None
+    ) -> Optional[str]:
+        """
+        Return the URI of the page image to use for a target size.
+
+        Args:
+            target_width: Target width in pixels
+            target_height: Target height in pixels
+
+        Returns:
+            URI of the matching image variant if OCR produced one, else image_uri
+        """
+        key = image_variant_key(target_width, target_height)
+        return self.image_variants.get(key) or self.image_uri
 
 
 @dataclass
@@ -245,6 +286,10 @@ class Document:
                 "tables": page.tables,
                 "forms": page.forms,
             }
+            if page.image_variants:
+                result["pages"][page_id]["image_variants"] = page.image_variants
+            if page.content_hash:
+                result["pages"][page_id]["content_hash"] = page.content_hash
 
         # Convert sections
         result["sections"] = []
@@ -312,6 +357,8 @@ class Document:
                 confidence=page_data.get("confidence", 0.0),
                 tables=page_data.get("tables", []),
                 forms=page_data.get("forms", {}),
+                image_variants=page_data.get("image_variants") or {},
+                content_hash=page_data.get("content_hash"),
             )
 
         # Convert sections
@@ -0,0 +1,284 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Adaptive (AIMD) concurrency governor for Textract calls.
+
+A fixed ``max_workers`` is either too low for accounts with a generous
+Textract TPS quota or too high for accounts with a small one. The governor
+bounds the number of in-flight Textract requests in the process and adapts
+that bound the way TCP congestion control does:
+
+- **Additive increase**: each successful call raises the limit by
+  ``additive_increase / limit``, i.e. roughly ``additive_increase`` per window
+  of successful calls
+- **Multiplicative decrease**: a throttling error multiplies the limit by
+  ``decrease_factor``. Throttles from calls that started before the last
+  decrease are counted but do not cut the limit again, so one burst of
+  throttles halves the limit once instead of collapsing it to the minimum
+
+Throttled calls, and the server-side, connection and timeout errors botocore
+would otherwise have retried, are retried with jittered exponential backoff. The governor is
+process-wide (see ``get_textract_governor``), so every ``OcrService`` in a
+Lambda container shares the same view of the account quota.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+
+from idp_common import metrics
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "ProvisionedThroughputExceededException",
+    "LimitExceededException",
+}
+
+# Server-side errors retried without changing the limit. Botocore retries are
+# disabled on governed clients so that throttles reach the governor.
+TRANSIENT_ERROR_CODES = {
+    "InternalServerError",
+    "InternalFailure",
+    "ServiceUnavailableException",
+    "ServiceUnavailable",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+# Network errors retried without changing the limit: EndpointConnectionError
+# and ConnectTimeoutError are ConnectionErrors, ReadTimeoutError and
+# ConnectionClosedError are HTTPClientErrors
+TRANSIENT_EXCEPTIONS = (BotocoreConnectionError, HTTPClientError)
+
+DEFAULT_INITIAL_LIMIT = 5
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 50
+DEFAULT_ADDITIVE_INCREASE = 1.0
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_MAX_RETRIES = 8
+DEFAULT_BASE_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 20.0
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Return True if error is a Textract throttling error."""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    return False
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Return True if error is a retryable server-side, connection or timeout error."""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in TRANSIENT_ERROR_CODES
+    return isinstance(error, TRANSIENT_EXCEPTIONS)
+
+
+class AimdConcurrencyGovernor:
+    """Bounds in-flight calls with an additive-increase/multiplicative-decrease limit."""
+
+    def __init__(
+        self,
+        initial_limit: float = DEFAULT_INITIAL_LIMIT,
+        min_limit: float = DEFAULT_MIN_LIMIT,
+        max_limit: float = DEFAULT_MAX_LIMIT,
+        additive_increase: float = DEFAULT_ADDITIVE_INCREASE,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        name: str = "Textract",
+    ):
+        """
+        Args:
+            initial_limit: Starting number of concurrent calls
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            additive_increase: Limit increase per window of successful calls
+            decrease_factor: Factor applied to the limit on throttling (0-1)
+            max_retries: Retries for a throttled call before the error is raised
+            base_backoff: Initial retry backoff in seconds
+            max_backoff: Maximum retry backoff in seconds
+            name: Prefix for published metric names
+        """
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.min_limit = max(1.0, float(min_limit))
+        self.max_limit = max(self.min_limit, float(max_limit))
+        self.additive_increase = float(additive_increase)
+        self.decrease_factor = float(decrease_factor)
+        self.max_retries = int(max_retries)
+        self.base_backoff = float(base_backoff)
+        self.max_backoff = float(max_backoff)
+        self.name = name
+
+        self._limit = min(self.max_limit, max(self.min_limit, float(initial_limit)))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._last_decrease = 0.0
+        self._successes = 0
+        self._throttles = 0
+        self._decreases = 0
+        self._published_throttles = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        with self._condition:
+            return int(self._limit)
+
+    def acquire(self) -> float:
+        """
+        Block until a call may start.
+
+        Returns:
+            Monotonic start time to pass to release()
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    def release(
+        self, started: float, throttled: bool = False, succeeded: bool = True
+    ) -> None:
+        """
+        Finish a call and adapt the limit.
+
+        Args:
+            started: Value returned by acquire()
+            throttled: True if the call failed with a throttling error
+            succeeded: False if the call failed for another reason, which
+                leaves the limit unchanged
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._throttles += 1
+                # Only the first throttle of a congestion window cuts the limit
+                if started >= self._last_decrease:
+                    old_limit = self._limit
+                    self._limit = max(
+                        self.min_limit, self._limit * self.decrease_factor
+                    )
+                    self._last_decrease = time.monotonic()
+                    self._decreases += 1
+                    logger.info(
+                        f"{self.name} throttled: concurrency limit "
+                        f"{old_limit:.1f} -> {self._limit:.1f}"
+                    )
+            elif succeeded:
+                self._successes += 1
+                self._limit = min(
+                    self.max_limit,
+                    self._limit + self.additive_increase / self._limit,
+                )
+            self._condition.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return random.uniform(
+            0, min(self.max_backoff, self.base_backoff * (2**attempt))
+        )
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call fn under the concurrency limit, retrying throttled and transient errors.
+
+        Args:
+            fn: Function making one API call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+
+        Raises:
+            The last retryable error after max_retries retries, or any
+            other error immediately
+        """
+        attempt = 0
+        while True:
+            started = self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                self.release(started, throttled=throttled, succeeded=False)
+                retryable = throttled or is_transient_error(e)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                backoff = self._backoff(attempt)
+                attempt += 1
+                logger.warning(
+                    f"{self.name} {'throttling' if throttled else 'error'}: {str(e)} "
+                    f"(attempt {attempt}/{self.max_retries}), backing off {backoff:.2f}s"
+                )
+                time.sleep(backoff)
+                continue
+            self.release(started)
+            return result
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit, in-flight calls and counters."""
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "successes": self._successes,
+                "throttles": self._throttles,
+                "decreases": self._decreases,
+            }
+
+    def publish_metrics(self) -> None:
+        """Publish the current limit and throttles since the previous call."""
+        with self._condition:
+            limit = int(self._limit)
+            throttles = self._throttles - self._published_throttles
+            self._published_throttles = self._throttles
+        metrics.put_metric(f"{self.name}ConcurrencyLimit", limit)
+        metrics.put_metric(f"{self.name}Throttles", throttles)
+
+
+_textract_governor: Optional[AimdConcurrencyGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_textract_governor(**settings) -> AimdConcurrencyGovernor:
+    """
+    Get or create the process-wide Textract governor.
+
+    Settings are applied only when the governor is first created, so the limit
+    learned by earlier documents carries over to later ones in the same container.
+
+    Args:
+        **settings: AimdConcurrencyGovernor keyword arguments
+
+    Returns:
+        Shared AimdConcurrencyGovernor
+    """
+    global _textract_governor
+    with _governor_lock:
+        if _textract_governor is None:
+            _textract_governor = AimdConcurrencyGovernor(name="Textract", **settings)
+            logger.info(
+                f"Created Textract concurrency governor: {_textract_governor.stats}"
+            )
+        return _textract_governor
+
+
+def reset_textract_governor() -> None:
+    """Discard the process-wide Textract governor (used by tests)."""
+    global _textract_governor
+    with _governor_lock:
+        _textract_governor = None
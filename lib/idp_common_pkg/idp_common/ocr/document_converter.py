@@ -13,27 +13,45 @@ import io
 import logging
 import os
 import tempfile
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from idp_common.ocr.text_layout import TextLayout, load_font
+
 logger = logging.getLogger(__name__)
 
+# Rows read at a time when streaming CSV and Excel inputs
+DEFAULT_CHUNK_ROWS = 1000
+
 
 class DocumentConverter:
-    """Converter for various document formats to images and text."""
+    """Converter for various document formats to images and text.
+
+    The ``iter_*_pages`` methods are generators that render one page at a
+    time, reading CSV and Excel rows in chunks of ``chunk_rows``, so memory
+    use does not grow with the size of the input. The ``convert_*_to_pages``
+    methods return the same pages as a list.
+    """
 
-    def __init__(self, dpi: int = 150):
+    # Line height for markdown pages (slightly more space for better readability)
+    MARKDOWN_LINE_HEIGHT = 18
+
+    def __init__(self, dpi: int = 150, chunk_rows: int = DEFAULT_CHUNK_ROWS):
         """
         Initialize the document converter.
 
         Args:
             dpi: DPI for image generation
+            chunk_rows: Rows read at a time from CSV and Excel inputs
         """
         self.dpi = dpi
+        self.chunk_rows = max(1, int(chunk_rows))
         self.page_width = int(8.5 * dpi)  # 8.5 inches at specified DPI
         self.page_height = int(11 * dpi)  # 11 inches at specified DPI
         self.margin = int(0.5 * dpi)  # 0.5 inch margin
+        # Per-font width caches shared by all rendering paths
+        self.text_layout = TextLayout()
 
     def convert_text_to_pages(self, content: str) -> List[Tuple[bytes, str]]:
         """
@@ -45,10 +63,23 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
+        return list(self.iter_text_pages(content))
+
+    def iter_text_pages(self, content: str) -> Iterator[Tuple[bytes, str]]:
+        """
+        Convert plain text content to page images and text, one page at a time.
+
+        Args:
+            content: Plain text content
+
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        yielded = False
         try:
             # Use a basic font
             try:
-                font = ImageFont.truetype("DejaVuSansMono.ttf", 12)
+                font = load_font("DejaVuSansMono.ttf", 12)
             except OSError:
                 font = ImageFont.load_default()
 
@@ -56,59 +87,75 @@ class DocumentConverter:
             text_width = self.page_width - (2 * self.margin)
             text_height = self.page_height - (2 * self.margin)
 
-            # Split content into lines and wrap long lines
-            lines = []
-            for line in content.split("\n"):
-                if not line.strip():
-                    lines.append("")
-                    continue
-
-                # Estimate characters per line based on font and width
-                avg_char_width = 7  # Approximate for monospace font
-                chars_per_line = text_width // avg_char_width
-
-                if len(line) <= chars_per_line:
-                    lines.append(line)
-                else:
-                    # Wrap long lines
-                    while len(line) > chars_per_line:
-                        lines.append(line[:chars_per_line])
-                        line = line[chars_per_line:]
-                    if line:
-                        lines.append(line)
+            # Estimate characters per line based on font and width
+            avg_char_width = 7  # Approximate for monospace font
+            chars_per_line = text_width // avg_char_width
 
             # Calculate lines per page
             line_height = 16  # Approximate line height
             lines_per_page = text_height // line_height
 
             # Split into pages
-            pages = []
-            for i in range(0, len(lines), lines_per_page):
-                page_lines = lines[i : i + lines_per_page]
-                page_text = "\n".join(page_lines)
-
-                # Create image
-                img = Image.new("RGB", (self.page_width, self.page_height), "white")
-                draw = ImageDraw.Draw(img)
-
-                # Draw text
-                y_pos = self.margin
-                for line in page_lines:
-                    draw.text((self.margin, y_pos), line, fill="black", font=font)
-                    y_pos += line_height
-
-                # Convert to bytes
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format="JPEG", quality=95)
-                img_bytes = img_buffer.getvalue()
+            page_lines = []
+            for line in self._iter_wrapped_lines(content, chars_per_line):
+                page_lines.append(line)
+                if len(page_lines) == lines_per_page:
+                    yield self._render_text_page(page_lines, font, line_height)
+                    yielded = True
+                    page_lines = []
 
-                pages.append((img_bytes, page_text))
+            if page_lines:
+                yield self._render_text_page(page_lines, font, line_height)
+                yielded = True
 
-            return pages if pages else [(self._create_empty_page(), "")]
+            if not yielded:
+                yield (self._create_empty_page(), "")
 
         except Exception as e:
             logger.error(f"Error converting text to pages: {str(e)}")
-            return [(self._create_empty_page(), content)]
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
+            yield (self._create_empty_page(), content)
+
+    def _iter_wrapped_lines(self, content: str, chars_per_line: int) -> Iterator[str]:
+        """Split content into lines, wrapping lines longer than chars_per_line."""
+        for line in content.split("\n"):
+            if not line.strip():
+                yield ""
+                continue
+
+            if len(line) <= chars_per_line:
+                yield line
+            else:
+                # Wrap long lines
+                while len(line) > chars_per_line:
+                    yield line[:chars_per_line]
+                    line = line[chars_per_line:]
+                if line:
+                    yield line
+
+    def _render_text_page(
+        self, page_lines: List[str], font, line_height: int
+    ) -> Tuple[bytes, str]:
+        """Render plain text lines as a page image."""
+        page_text = "\n".join(page_lines)
+
+        # Create image
+        img = Image.new("RGB", (self.page_width, self.page_height), "white")
+        draw = ImageDraw.Draw(img)
+
+        # Draw text
+        y_pos = self.margin
+        for line in page_lines:
+            draw.text((self.margin, y_pos), line, fill="black", font=font)
+            y_pos += line_height
+
+        # Convert to bytes
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format="JPEG", quality=95)
+        return img_buffer.getvalue(), page_text
 
     def convert_csv_to_pages(self, content: str) -> List[Tuple[bytes, str]]:
         """
@@ -120,46 +167,98 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
-        try:
-            import csv
+        return list(self.iter_csv_pages(content))
 
-            import pandas as pd
+    def iter_csv_pages(self, content: str) -> Iterator[Tuple[bytes, str]]:
+        """
+        Convert CSV content to page images and text, one page at a time.
 
-            # First try pandas for intelligent processing
-            try:
-                # Use pandas to read CSV with automatic type inference
-                df = pd.read_csv(
-                    io.StringIO(content),
-                    dtype_backend="numpy_nullable",  # Better null handling
-                    parse_dates=True,  # Automatic date parsing
-                )
+        Args:
+            content: CSV content as string
 
-                if df.empty:
-                    return [(self._create_empty_page(), "")]
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        yielded = False
+        try:
+            for page in self._iter_markdown_pages(self._iter_csv_markdown(content)):
+                yield page
+                yielded = True
 
-                # Generate high-quality markdown using pandas
-                formatted_text = self._format_csv_with_pandas(df, content)
+        except Exception as e:
+            logger.error(f"Error converting CSV to pages: {str(e)}")
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
+            yield (self._create_empty_page(), content)
 
-            except Exception as pandas_error:
-                logger.warning(
-                    f"Pandas CSV processing failed, falling back to basic parsing: {pandas_error}"
-                )
-                # Fallback to basic CSV parsing
-                csv_reader = csv.reader(io.StringIO(content))
-                rows = list(csv_reader)
+    def _iter_csv_markdown(self, content: str) -> Iterator[str]:
+        """
+        Yield CSV content as markdown table lines, reading chunk_rows rows at a time.
 
-                if not rows:
-                    return [(self._create_empty_page(), "")]
+        Only the first chunk keeps its table header. If pandas fails, the rows
+        not yet emitted are formatted with the csv module instead.
+        """
+        import csv
 
-                # Format as table text using improved method
-                formatted_text = self._format_csv_as_table(rows)
+        import pandas as pd
 
-            # Convert the enhanced markdown text to clean page images
-            return self._convert_markdown_to_pages(formatted_text)
+        rows_done = 0
+        try:
+            # Use pandas to read CSV with automatic type inference
+            reader = pd.read_csv(
+                io.StringIO(content),
+                dtype_backend="numpy_nullable",  # Better null handling
+                parse_dates=True,  # Automatic date parsing
+                chunksize=self.chunk_rows,
+            )
+            for chunk in reader:
+                if chunk.empty:
+                    continue
+                # Generate high-quality markdown using pandas
+                lines = self._format_csv_with_pandas(chunk).split("\n")
+                yield from lines if rows_done == 0 else self._strip_table_header(lines)
+                rows_done += len(chunk)
+            return
+
+        except Exception as pandas_error:
+            logger.warning(
+                f"Pandas CSV processing failed, falling back to basic parsing: {pandas_error}"
+            )
 
-        except Exception as e:
-            logger.error(f"Error converting CSV to pages: {str(e)}")
-            return [(self._create_empty_page(), content)]
+        # Fallback to basic CSV parsing for the rows pandas did not emit
+        csv_reader = csv.reader(io.StringIO(content))
+        header = next(csv_reader, None)
+        if header is None:
+            return
+        for _ in range(rows_done):
+            next(csv_reader, None)
+
+        first_chunk = rows_done == 0
+        rows = []
+        for row in csv_reader:
+            rows.append(row)
+            if len(rows) >= self.chunk_rows:
+                yield from self._format_csv_rows(header, rows, first_chunk)
+                first_chunk = False
+                rows = []
+        if rows or first_chunk:
+            yield from self._format_csv_rows(header, rows, first_chunk)
+
+    def _format_csv_rows(
+        self, header: List[str], rows: List[List[str]], includes_header: bool
+    ) -> List[str]:
+        """Format a chunk of CSV rows as markdown table lines."""
+        # Format improved table text
+        lines = self._format_csv_as_table([header] + rows).split("\n")
+        return lines if includes_header else self._strip_table_header(lines)
+
+    def _strip_table_header(self, lines: List[str]) -> List[str]:
+        """Drop the header row (and separator) from markdown table lines."""
+        if len(lines) > 1 and set(lines[1].strip()) <= set("|:- "):
+            return lines[2:]
+        return lines[1:]
 
     def convert_excel_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
         """
@@ -171,54 +270,112 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
-        try:
-            import pandas as pd
-
-            # Read Excel file
-            with tempfile.NamedTemporaryFile(suffix=".xlsx") as tmp_file:
-                tmp_file.write(file_bytes)
-                tmp_file.flush()
-
-                # Read all sheets and extract formatted data
-                excel_file = pd.ExcelFile(tmp_file.name)
-                formatted_elements = []
+        return list(self.iter_excel_pages(file_bytes))
 
-                for sheet_name in excel_file.sheet_names:
-                    df = pd.read_excel(tmp_file.name, sheet_name=sheet_name)
-
-                    if df.empty:
-                        continue
-
-                    # Add sheet header element
-                    formatted_elements.append(
-                        {
-                            "type": "sheet_header",
-                            "sheet_name": sheet_name,
-                            "space_before": 20,
-                            "space_after": 15,
-                        }
-                    )
+    def iter_excel_pages(self, file_bytes: bytes) -> Iterator[Tuple[bytes, str]]:
+        """
+        Convert Excel file to page images and text, one page at a time.
 
-                    # Convert DataFrame to formatted table data
-                    table_data = self._extract_excel_table_data(df)
+        The workbook is opened with openpyxl in read-only mode, so rows are
+        parsed from the file as they are formatted.
 
-                    if table_data:
-                        formatted_elements.append(
-                            {
-                                "type": "excel_table",
-                                "data": table_data,
-                                "sheet_name": sheet_name,
-                                "space_before": 10,
-                                "space_after": 20,
-                            }
-                        )
+        Args:
+            file_bytes: Excel file bytes
 
-                # Render formatted Excel content
-                return self._render_formatted_excel_content(formatted_elements)
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        yielded = False
+        try:
+            for page in self._iter_markdown_pages(
+                self._iter_excel_markdown(file_bytes)
+            ):
+                yield page
+                yielded = True
 
         except Exception as e:
             logger.error(f"Error converting Excel to pages: {str(e)}")
-            return [(self._create_empty_page(), "Error reading Excel file")]
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
+            yield (self._create_empty_page(), "Error reading Excel file")
+
+    def _iter_excel_markdown(self, file_bytes: bytes) -> Iterator[str]:
+        """Yield the sheets of a workbook as markdown, chunk_rows rows at a time."""
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(
+            io.BytesIO(file_bytes), read_only=True, data_only=True
+        )
+        try:
+            # Only add sheet names as headers if there are multiple sheets with data
+            sheets = [
+                sheet for sheet in workbook.worksheets if self._sheet_has_data(sheet)
+            ]
+            for sheet in sheets:
+                if len(sheets) > 1:
+                    yield f"## {sheet.title}"
+                    yield ""
+
+                rows = self._iter_sheet_rows(sheet)
+                header = self._excel_column_names(next(rows))
+                chunk = []
+                first_chunk = True
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= self.chunk_rows:
+                        yield from self._format_excel_rows(header, chunk, first_chunk)
+                        first_chunk = False
+                        chunk = []
+                if chunk:
+                    yield from self._format_excel_rows(header, chunk, first_chunk)
+                yield ""  # Add spacing between tables
+        finally:
+            workbook.close()
+
+    def _iter_sheet_rows(self, sheet) -> Iterator[tuple]:
+        """Yield the non-empty rows of a worksheet as tuples of cell values."""
+        for row in sheet.iter_rows(values_only=True):
+            if any(value is not None and value != "" for value in row):
+                yield row
+
+    def _sheet_has_data(self, sheet) -> bool:
+        """Return True if a worksheet has a header row and at least one data row."""
+        rows = self._iter_sheet_rows(sheet)
+        return next(rows, None) is not None and next(rows, None) is not None
+
+    def _excel_column_names(self, header_row: tuple) -> List[str]:
+        """Build unique column names from a header row, as pandas.read_excel does."""
+        names = []
+        seen = {}
+        for idx, value in enumerate(header_row):
+            name = f"Unnamed: {idx}" if value is None else str(value)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    def _format_excel_rows(
+        self, header: List[str], rows: List[tuple], includes_header: bool
+    ) -> List[str]:
+        """Format a chunk of worksheet rows as markdown table lines."""
+        import pandas as pd
+
+        width = len(header)
+        df = pd.DataFrame(
+            [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows],
+            columns=header,
+        )
+        table_data = self._extract_excel_table_data(df)
+        markdown = self._generate_enhanced_excel_markdown(
+            [{"type": "excel_table", "data": table_data}]
+        )
+        lines = markdown.rstrip("\n").split("\n")
+        return lines if includes_header else self._strip_table_header(lines)
 
     def convert_word_to_pages(self, file_bytes: bytes) -> List[Tuple[bytes, str]]:
         """
@@ -230,6 +387,19 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
+        return list(self.iter_word_pages(file_bytes))
+
+    def iter_word_pages(self, file_bytes: bytes) -> Iterator[Tuple[bytes, str]]:
+        """
+        Convert Word document to page images and text, one page at a time.
+
+        Args:
+            file_bytes: Word document bytes
+
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        yielded = False
         try:
             from docx import Document
 
@@ -240,15 +410,22 @@ class DocumentConverter:
 
                 doc = Document(tmp_file.name)
 
-                # Extract formatted elements
-                elements = self._extract_word_formatting(doc)
+            # Extract formatted elements
+            elements = self._extract_word_formatting(doc)
+            del doc
 
-                # Render with enhanced formatting
-                return self._render_formatted_word_content(elements)
+            # Render with enhanced formatting
+            for page in self._iter_formatted_word_pages(elements):
+                yield page
+                yielded = True
 
         except Exception as e:
             logger.error(f"Error converting Word to pages: {str(e)}")
-            return [(self._create_empty_page(), "Error reading Word document")]
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
+            yield (self._create_empty_page(), "Error reading Word document")
 
     def _extract_word_formatting(self, doc) -> List[dict]:
         """Extract formatted content from Word document."""
@@ -384,6 +561,13 @@ class DocumentConverter:
         self, elements: List[dict]
     ) -> List[Tuple[bytes, str]]:
         """Render formatted Word content with enhanced typography."""
+        return list(self._iter_formatted_word_pages(elements))
+
+    def _iter_formatted_word_pages(
+        self, elements: List[dict]
+    ) -> Iterator[Tuple[bytes, str]]:
+        """Render formatted Word content one page at a time."""
+        yielded = False
         try:
             # Load fonts
             fonts = self._load_fonts()
@@ -392,20 +576,24 @@ class DocumentConverter:
             pages_content = self._calculate_word_page_layout(elements)
 
             # Render pages
-            pages = []
             for page_elements in pages_content:
-                img_bytes, text = self._render_word_page(page_elements, fonts)
-                pages.append((img_bytes, text))
+                yield self._render_word_page(page_elements, fonts)
+                yielded = True
 
-            return pages if pages else [(self._create_empty_page(), "")]
+            if not yielded:
+                yield (self._create_empty_page(), "")
 
         except Exception as e:
             logger.error(f"Error rendering formatted Word content: {str(e)}")
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
             # Fallback to simple text rendering
             text_content = "\n".join(
                 [elem.get("text", "") for elem in elements if elem.get("text")]
             )
-            return self.convert_text_to_pages(text_content)
+            yield from self.iter_text_pages(text_content)
 
     def _load_fonts(self) -> dict:
         """Load available fonts with fallbacks."""
@@ -452,7 +640,7 @@ class DocumentConverter:
         for name, size in font_sizes.items():
             try:
                 if loaded_font:
-                    fonts[name] = ImageFont.truetype(loaded_font, size)
+                    fonts[name] = load_font(loaded_font, size)
                 else:
                     fonts[name] = ImageFont.load_default()
             except (OSError, IOError):
@@ -867,63 +1055,24 @@ class DocumentConverter:
             except Exception:
                 return []
 
-    def _render_formatted_excel_content(
-        self, elements: List[dict]
-    ) -> List[Tuple[bytes, str]]:
-        """
-        Render formatted Excel content as clean markdown pages.
-
-        Args:
-            elements: List of formatted Excel elements (sheet headers, tables)
-
-        Returns:
-            List of tuples (image_bytes, page_text)
-        """
-        try:
-            # Generate enhanced markdown text for Excel content
-            enhanced_text = self._generate_enhanced_excel_markdown(elements)
-
-            # Convert the enhanced markdown text to clean page images
-            return self._convert_markdown_to_pages(enhanced_text)
-
-        except Exception as e:
-            logger.error(f"Error rendering formatted Excel content: {str(e)}")
-            # Fallback to simple text rendering
-            text_content = []
-            for elem in elements:
-                if elem.get("type") == "sheet_header":
-                    text_content.append(
-                        f"=== Sheet: {elem.get('sheet_name', 'Unknown')} ==="
-                    )
-                elif elem.get("type") == "excel_table" and elem.get("data"):
-                    for row in elem["data"]:
-                        row_text = " | ".join([cell.get("text", "") for cell in row])
-                        text_content.append(row_text)
-
-            combined_text = "\n".join(text_content)
-            return self._convert_markdown_to_pages(combined_text)
-
     def _get_text_width(self, draw, text: str, font) -> int:
-        """Get text width using the appropriate PIL method."""
+        """Get text width from the cached per-font glyph and word widths."""
         try:
-            # Try new textbbox method (PIL 8.0.0+)
-            bbox = draw.textbbox((0, 0), text, font=font)
-            return bbox[2] - bbox[0]
-        except AttributeError:
-            try:
-                # Fallback to deprecated textsize method
-                return draw.textsize(text, font=font)[0]
-            except AttributeError:
-                # Ultimate fallback - estimate based on text length
-                return len(text) * 8  # Rough estimation
-
-    def _format_csv_with_pandas(self, df, original_content: str) -> str:
+            return self.text_layout.text_width(text, font)
+        except Exception:
+            # Ultimate fallback - estimate based on text length
+            return len(text) * 8  # Rough estimation
+
+    def _format_csv_with_pandas(
+        self, df, original_content: Optional[str] = None
+    ) -> str:
         """
         Format CSV using pandas - just the clean table without metadata.
 
         Args:
             df: pandas DataFrame
-            original_content: Original CSV content for fallback
+            original_content: Original CSV content for fallback; if None,
+                formatting errors are raised to the caller
 
         Returns:
             Clean markdown table formatted text
@@ -960,6 +1109,8 @@ class DocumentConverter:
 
         except Exception as e:
             logger.error(f"Error in pandas CSV formatting: {str(e)}")
+            if original_content is None:
+                raise
             # Fallback to basic CSV parsing
             import csv
 
@@ -1159,127 +1310,202 @@ class DocumentConverter:
         Returns:
             List of tuples (image_bytes, page_text)
         """
-        try:
-            # Use a monospace font for better markdown rendering
-            try:
-                font_normal = ImageFont.truetype("DejaVuSansMono.ttf", 12)
-                font_bold = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 12)
-                font_heading = ImageFont.truetype("DejaVuSansMono-Bold.ttf", 16)
-            except OSError:
-                font_normal = ImageFont.load_default()
-                font_bold = ImageFont.load_default()
-                font_heading = ImageFont.load_default()
+        return list(self._iter_markdown_pages(markdown_content.split("\n")))
 
-            # Calculate text area dimensions
-            text_width = self.page_width - (2 * self.margin)
-            text_height = self.page_height - (2 * self.margin)
+    def _iter_markdown_pages(
+        self, markdown_lines: Iterable[str]
+    ) -> Iterator[Tuple[bytes, str]]:
+        """
+        Render markdown lines as page images, one page at a time.
 
-            # Calculate lines per page with better spacing
-            line_height = 18  # Slightly more space for better readability
-            lines_per_page = text_height // line_height
+        Lines are consumed lazily. A page that starts in the middle of a table
+        repeats the table header and separator.
 
-            # Split the original markdown into pages while preserving table structure
-            original_lines = markdown_content.split("\n")
+        Args:
+            markdown_lines: Markdown lines (without line endings)
 
-            # Find table headers and separators in the original markdown
-            table_info = self._analyze_table_structure(original_lines)
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        # Use a monospace font for better markdown rendering
+        try:
+            fonts = {
+                "normal": load_font("DejaVuSansMono.ttf", 12),
+                "bold": load_font("DejaVuSansMono-Bold.ttf", 12),
+                "heading": load_font("DejaVuSansMono-Bold.ttf", 16),
+            }
+        except OSError:
+            default_font = ImageFont.load_default()
+            fonts = {
+                "normal": default_font,
+                "bold": default_font,
+                "heading": default_font,
+            }
+
+        # Calculate lines per page with better spacing
+        text_height = self.page_height - (2 * self.margin)
+        lines_per_page = text_height // self.MARKDOWN_LINE_HEIGHT
+
+        page_lines = []
+        page_table_header = None
+        yielded = False
+        for line, table_header in self._iter_table_lines(markdown_lines):
+            if not page_lines:
+                # Check if this page starts in the middle of a table
+                page_table_header = table_header
+            page_lines.append(line)
+            if len(page_lines) == lines_per_page:
+                yield self._render_markdown_page(page_lines, page_table_header, fonts)
+                yielded = True
+                page_lines = []
+
+        if page_lines or not yielded:
+            yield self._render_markdown_page(page_lines, page_table_header, fonts)
+
+    def _iter_table_lines(
+        self, lines: Iterable[str]
+    ) -> Iterator[Tuple[str, Optional[Tuple[str, str]]]]:
+        """
+        Pair each markdown line with the header of the table it continues.
 
-            pages = []
-            original_line_idx = 0
+        A table starts at a row followed by a separator line; the separator
+        and subsequent rows are continuations. Uses one line of lookahead.
 
-            while original_line_idx < len(original_lines):
-                # Get a chunk of original lines for this page
-                page_original_lines = original_lines[
-                    original_line_idx : original_line_idx + lines_per_page
-                ]
+        Yields:
+            Tuples (line, (header_line, separator_line) or None)
+        """
 
-                # Check if this page starts in the middle of a table
-                page_text_lines = self._ensure_table_headers(
-                    page_original_lines, table_info, original_line_idx
-                )
+        def is_table_row(line: str) -> bool:
+            line = line.strip()
+            return line.startswith("|") and "|" in line[1:]
+
+        table_header = None
+        in_separator = False
+        lines = iter(lines)
+        line = next(lines, None)
+        while line is not None:
+            next_line = next(lines, None)
+            if in_separator or (table_header and is_table_row(line)):
+                in_separator = False
+                yield line, table_header
+            else:
+                table_header = None
+                if (
+                    is_table_row(line)
+                    and next_line is not None
+                    and "---" in next_line
+                    and "|" in next_line
+                ):
+                    table_header = (line, next_line)
+                    in_separator = True
+                yield line, None
+            line = next_line
+
+    def _render_markdown_page(
+        self,
+        page_lines: List[str],
+        table_header: Optional[Tuple[str, str]],
+        fonts: dict,
+    ) -> Tuple[bytes, str]:
+        """
+        Render one page of markdown lines.
 
-                # Create the page text from processed markdown
-                page_text = "\n".join(page_text_lines)
+        Args:
+            page_lines: Markdown lines for this page
+            table_header: Header and separator to repeat if the page starts
+                inside a table
+            fonts: Dict with "normal", "bold" and "heading" fonts
 
-                # Create image with simple but clean formatting
-                img = Image.new("RGB", (self.page_width, self.page_height), "white")
-                draw = ImageDraw.Draw(img)
+        Returns:
+            Tuple (image_bytes, page_text)
+        """
+        page_text_lines = list(table_header or ()) + page_lines
 
-                # Render with simple text formatting (fast and preserves all content)
-                y_pos = self.margin
+        # Create the page text from processed markdown
+        page_text = "\n".join(page_text_lines)
 
-                for line in page_text_lines:
-                    if y_pos + line_height > self.page_height - self.margin:
-                        break  # Page is full
+        try:
+            # Calculate text area dimensions
+            text_width = self.page_width - (2 * self.margin)
+            line_height = self.MARKDOWN_LINE_HEIGHT
 
-                    # Simple formatting based on content
-                    if line.startswith("#"):
-                        # Heading - use bold font and remove markdown syntax
-                        text = line.lstrip("#").strip()
-                        font = font_heading
-                        color = "#2c3e50"
-                    elif line.startswith("- ") or line.startswith("* "):
-                        # List item - add bullet and indent
-                        text = "• " + line[2:].strip()
-                        font = font_normal
-                        color = "black"
-                        x_pos = self.margin + 20
-                    elif "**" in line:
-                        # Bold text - remove markdown and use bold font
-                        text = line.replace("**", "")
-                        font = font_bold
-                        color = "black"
-                    else:
-                        # Regular text
-                        text = line
-                        font = font_normal
-                        color = "black"
-
-                    # Default x position
-                    if not line.startswith("- ") and not line.startswith("* "):
-                        x_pos = self.margin
-
-                    # Handle long lines by wrapping
-                    wrapped_lines = self._wrap_text_to_width(
-                        text, font, text_width - (x_pos - self.margin), draw
-                    )
+            # Create image with simple but clean formatting
+            img = Image.new("RGB", (self.page_width, self.page_height), "white")
+            draw = ImageDraw.Draw(img)
+
+            # Render with simple text formatting (fast and preserves all content)
+            y_pos = self.margin
 
-                    for wrapped_line in wrapped_lines:
-                        if y_pos + line_height > self.page_height - self.margin:
-                            break  # Page is full
+            for line in page_text_lines:
+                if y_pos + line_height > self.page_height - self.margin:
+                    break  # Page is full
+
+                # Simple formatting based on content
+                if line.startswith("#"):
+                    # Heading - use bold font and remove markdown syntax
+                    text = line.lstrip("#").strip()
+                    font = fonts["heading"]
+                    color = "#2c3e50"
+                elif line.startswith("- ") or line.startswith("* "):
+                    # List item - add bullet and indent
+                    text = "• " + line[2:].strip()
+                    font = fonts["normal"]
+                    color = "black"
+                    x_pos = self.margin + 20
+                elif "**" in line:
+                    # Bold text - remove markdown and use bold font
+                    text = line.replace("**", "")
+                    font = fonts["bold"]
+                    color = "black"
+                else:
+                    # Regular text
+                    text = line
+                    font = fonts["normal"]
+                    color = "black"
 
-                        # Draw the text
-                        draw.text((x_pos, y_pos), wrapped_line, fill=color, font=font)
-                        y_pos += line_height
+                # Default x position
+                if not line.startswith("- ") and not line.startswith("* "):
+                    x_pos = self.margin
 
-                    # Add small spacing after headings
-                    if line.startswith("#"):
-                        y_pos += 6
+                # Handle long lines by wrapping
+                wrapped_lines = self._wrap_text_to_width(
+                    text, font, text_width - (x_pos - self.margin), draw
+                )
 
-                # Convert to bytes
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, format="JPEG", quality=95)
-                img_bytes = img_buffer.getvalue()
+                for wrapped_line in wrapped_lines:
+                    if y_pos + line_height > self.page_height - self.margin:
+                        break  # Page is full
 
-                pages.append((img_bytes, page_text))
-                original_line_idx += len(page_original_lines)
+                    # Draw the text
+                    draw.text((x_pos, y_pos), wrapped_line, fill=color, font=font)
+                    y_pos += line_height
 
-            return pages if pages else [(self._create_empty_page(), markdown_content)]
+                # Add small spacing after headings
+                if line.startswith("#"):
+                    y_pos += 6
+
+            # Convert to bytes
+            img_buffer = io.BytesIO()
+            img.save(img_buffer, format="JPEG", quality=95)
+            return img_buffer.getvalue(), page_text
 
         except Exception as e:
             logger.error(f"Error converting markdown to pages: {str(e)}")
-            # Fallback to basic text conversion
-            return self.convert_text_to_pages(markdown_content)
+            # Fall back to an empty page image with the markdown text
+            return self._create_empty_page(), page_text
 
     def _wrap_text_to_width(self, text: str, font, max_width: int, draw) -> List[str]:
         """
         Wrap text to fit within specified width.
 
+        Word widths are cached per font and summed, and words wider than the
+        line are broken, so wrapping is linear in the length of the text.
+
         Args:
             text: Text to wrap
             font: Font to use for measurement
             max_width: Maximum width in pixels
-            draw: PIL ImageDraw object for text measurement
+            draw: PIL ImageDraw object (unused, kept for compatibility)
 
         Returns:
             List of wrapped text lines
@@ -1287,114 +1513,7 @@ class DocumentConverter:
         if not text.strip():
             return [text]
 
-        words = text.split()
-        if not words:
-            return [text]
-
-        lines = []
-        current_line = []
-
-        for word in words:
-            # Test if adding this word would exceed width
-            test_line = " ".join(current_line + [word])
-            text_width = self._get_text_width(draw, test_line, font)
-
-            if text_width <= max_width or not current_line:
-                current_line.append(word)
-            else:
-                # Start new line
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-
-        # Add remaining words
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        return lines if lines else [text]
-
-    def _analyze_table_structure(self, lines: List[str]) -> dict:
-        """
-        Analyze the markdown content to find table headers and their positions.
-
-        Args:
-            lines: List of markdown lines
-
-        Returns:
-            Dictionary with table structure information
-        """
-        table_info = {
-            "headers": [],  # List of (line_idx, header_line, separator_line)
-            "table_ranges": [],  # List of (start_idx, end_idx) for each table
-        }
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Check if this is a table header (line with | followed by separator)
-            if (
-                line.startswith("|")
-                and "|" in line[1:]
-                and i + 1 < len(lines)
-                and "---" in lines[i + 1]
-                and "|" in lines[i + 1]
-            ):
-                header_line = lines[i]
-                separator_line = lines[i + 1]
-
-                # Find the end of this table
-                table_start = i
-                table_end = i + 1
-
-                # Look for more table rows
-                j = i + 2
-                while j < len(lines):
-                    next_line = lines[j].strip()
-                    if next_line.startswith("|") and "|" in next_line[1:]:
-                        table_end = j
-                        j += 1
-                    else:
-                        break
-
-                table_info["headers"].append((i, header_line, separator_line))
-                table_info["table_ranges"].append((table_start, table_end))
-
-                i = table_end + 1
-            else:
-                i += 1
-
-        return table_info
-
-    def _ensure_table_headers(
-        self, page_lines: List[str], table_info: dict, start_line_idx: int
-    ) -> List[str]:
-        """
-        Ensure that if a page starts in the middle of a table, it includes the table header.
-
-        Args:
-            page_lines: Lines for this page
-            table_info: Table structure information
-            start_line_idx: Starting line index in the original document
-
-        Returns:
-            Modified page lines with table headers if needed
-        """
-        if not page_lines or not table_info["table_ranges"]:
-            return page_lines
-
-        # Check if this page starts in the middle of a table
-        for table_start, table_end in table_info["table_ranges"]:
-            if table_start < start_line_idx <= table_end:
-                # This page starts in the middle of a table
-                # Find the corresponding header
-                for header_idx, header_line, separator_line in table_info["headers"]:
-                    if table_start <= header_idx <= table_end:
-                        # Add the header and separator to the beginning of the page
-                        result_lines = [header_line, separator_line] + page_lines
-                        return result_lines
-
-        return page_lines
+        return self.text_layout.wrap(text, font, max_width)
 
     def _create_empty_page(self) -> bytes:
         """Create an empty white page image."""
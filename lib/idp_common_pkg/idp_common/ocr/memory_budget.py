@@ -0,0 +1,178 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Memory-budgeted page admission for OCR.
+
+Page rendering dominates OCR memory: a pixmap holds ``width * height * 3``
+bytes, and the JPEG encode, optional preprocessing and upload keep further
+copies alive until the page finishes. With a fixed worker count, a few
+poster-size pages rendered at once can exceed the Lambda memory limit even
+though ordinary letter-size pages use only a few MB each.
+
+``MemoryBudget`` admits a page only while the summed footprint estimate of
+all in-flight pages stays within the budget. Pages wait (in worker threads)
+until enough earlier pages finish. A page larger than the whole budget is
+admitted alone, so it still gets processed without competing for memory.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# RGB pixmap bytes per pixel
+BYTES_PER_PIXEL = 3
+# Pixmap + encoded JPEG + preprocessing/upload copies held while a page is in flight
+PAGE_MEMORY_OVERHEAD = 2.5
+# Share of the Lambda memory size used as the default budget
+DEFAULT_BUDGET_FRACTION = 0.6
+
+
+def estimate_page_memory(
+    width: float,
+    height: float,
+    is_pdf: bool,
+    dpi: Optional[int] = None,
+    resize_config: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Estimate the peak memory used while rendering and processing one page.
+
+    Mirrors the size calculation in ``render_page_image``: PDF pages are
+    rendered at ``dpi`` (default 150) and images at their own size, then
+    scaled down (never up) to fit ``target_width`` x ``target_height``.
+
+    Args:
+        width: Page width (``page.rect.width``, in points for PDFs)
+        height: Page height (``page.rect.height``)
+        is_pdf: Whether the page belongs to a PDF
+        dpi: Rendering DPI for PDF pages
+        resize_config: Optional dict with target_width and target_height
+
+    Returns:
+        Estimated bytes
+    """
+    scale = (dpi or 150) / 72 if is_pdf else 1.0
+    pixel_width = width * scale
+    pixel_height = height * scale
+
+    if resize_config and pixel_width > 0 and pixel_height > 0:
+        target_width = resize_config.get("target_width")
+        target_height = resize_config.get("target_height")
+        if target_width and target_height:
+            factor = min(target_width / pixel_width, target_height / pixel_height)
+            if factor < 1.0:
+                pixel_width *= factor
+                pixel_height *= factor
+
+    return int(pixel_width * pixel_height * BYTES_PER_PIXEL * PAGE_MEMORY_OVERHEAD)
+
+
+def default_budget_mb() -> int:
+    """
+    Return the default budget: a share of the Lambda memory size, or 0 (unbounded)
+    outside Lambda.
+    """
+    lambda_memory = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+    if lambda_memory:
+        try:
+            return int(int(lambda_memory) * DEFAULT_BUDGET_FRACTION)
+        except ValueError:
+            logger.warning(f"Invalid AWS_LAMBDA_FUNCTION_MEMORY_SIZE: {lambda_memory}")
+    return 0
+
+
+class MemoryBudget:
+    """Admits work items while their summed memory estimate fits a budget."""
+
+    def __init__(self, budget_bytes: int):
+        """
+        Args:
+            budget_bytes: Maximum summed estimate of admitted items (0 = unbounded)
+        """
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._in_use = 0
+        self._in_flight = 0
+        self._peak = 0
+        self._waits = 0
+        self._oversized = 0
+        self._condition = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        """True if the budget limits admission."""
+        return self.budget_bytes > 0
+
+    def acquire(self, nbytes: int) -> None:
+        """
+        Block until nbytes fit in the budget.
+
+        An item larger than the whole budget is admitted once nothing else is
+        in flight.
+
+        Args:
+            nbytes: Estimated bytes for the item
+        """
+        nbytes = max(0, int(nbytes))
+        with self._condition:
+            if self.enabled:
+                waited = False
+                while self._in_flight and self._in_use + nbytes > self.budget_bytes:
+                    waited = True
+                    self._condition.wait()
+                if waited:
+                    self._waits += 1
+                if nbytes > self.budget_bytes:
+                    self._oversized += 1
+                    logger.warning(
+                        f"Page estimate {nbytes / 1048576:.0f} MB exceeds memory "
+                        f"budget {self.budget_bytes / 1048576:.0f} MB; "
+                        f"processing it alone"
+                    )
+            self._in_use += nbytes
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_use)
+
+    def release(self, nbytes: int) -> None:
+        """
+        Return nbytes to the budget.
+
+        Args:
+            nbytes: Value passed to acquire()
+        """
+        with self._condition:
+            self._in_use -= max(0, int(nbytes))
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[None]:
+        """Hold nbytes of the budget for the duration of the block."""
+        self.acquire(nbytes)
+        try:
+            yield
+        finally:
+            self.release(nbytes)
+
+    @property
+    def in_use(self) -> int:
+        """Bytes currently reserved."""
+        with self._condition:
+            return self._in_use
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the budget, current and peak reservations and wait counters."""
+        with self._condition:
+            return {
+                "budget_mb": round(self.budget_bytes / 1048576, 1),
+                "in_use_mb": round(self._in_use / 1048576, 1),
+                "peak_mb": round(self._peak / 1048576, 1),
+                "in_flight": self._in_flight,
+                "waits": self._waits,
+                "oversized": self._oversized,
+            }
@@ -0,0 +1,489 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Page rasterization engine for the OCR service.
+
+Rendering a PDF page (``get_pixmap`` + JPEG encode) is CPU bound and holds the
+GIL, and a single ``fitz.Document`` must not be shared between threads. This
+module provides a ``PageRasterizer`` that can render pages either in worker
+threads of the calling process (``thread`` mode, the historical behavior) or in
+a set of worker processes (``process`` mode). Each thread or process opens its
+own document handle and renders a contiguous page range. In process mode the
+workers open the document from a spooled temporary file and stream the encoded
+JPEG bytes back over a pipe as each page completes.
+
+Workers communicate through ``multiprocessing.Pipe`` rather than a
+``ProcessPoolExecutor`` because AWS Lambda does not provide ``/dev/shm``, which
+the pool's queues and semaphores require.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+VALID_RASTERIZATION_MODES = ["thread", "process"]
+
+
+def render_page_image(
+    page: "fitz.Page",
+    is_pdf: bool,
+    page_id: int,
+    dpi: Optional[int] = None,
+    resize_config: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """
+    Render a page to JPEG bytes at the optimal size to prevent memory issues.
+
+    If resize config is provided, images are extracted directly at target dimensions
+    to avoid creating oversized images that cause OutOfMemory errors.
+
+    Args:
+        page: PyMuPDF page object
+        is_pdf: Whether the document is a PDF file
+        page_id: Page number for logging
+        dpi: DPI used for PDF pages (defaults to 150)
+        resize_config: Optional dict with target_width and target_height
+
+    Returns:
+        Image bytes in JPEG format (at target size if resize config exists)
+    """
+    pix = None
+    try:
+        # Check if we should extract at target size to avoid memory issues
+        if resize_config:
+            target_width = resize_config.get("target_width")
+            target_height = resize_config.get("target_height")
+
+            if target_width and target_height:
+                # Get page dimensions to calculate scaling
+                page_rect = page.rect
+
+                if is_pdf:
+                    # For PDF files, calculate dimensions at specified DPI (default to 150 if None)
+                    dpi = dpi or 150
+                    original_width = int(page_rect.width * (dpi / 72))
+                    original_height = int(page_rect.height * (dpi / 72))
+                else:
+                    # For image files, use actual dimensions
+                    original_width = int(page_rect.width)
+                    original_height = int(page_rect.height)
+
+                # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
+                width_ratio = target_width / original_width
+                height_ratio = target_height / original_height
+                scale_factor = min(width_ratio, height_ratio)  # Preserve aspect ratio
+
+                # Only resize if scale_factor < 1.0 (never upscale)
+                if scale_factor < 1.0:
+                    # Extract at reduced size using matrix transformation
+                    if is_pdf:
+                        # For PDF, combine DPI scaling with size reduction
+                        dpi = dpi or 150
+                        base_scale = dpi / 72  # Convert PDF points to pixels
+                        final_scale = base_scale * scale_factor
+                        matrix = fitz.Matrix(final_scale, final_scale)
+                    else:
+                        # For images, just apply the scale factor
+                        matrix = fitz.Matrix(scale_factor, scale_factor)
+
+                    pix = page.get_pixmap(matrix=matrix)
+
+                    actual_width, actual_height = pix.width, pix.height
+                    logger.info(
+                        f"Extracted page {page_id} at target size: {actual_width}x{actual_height} (scale: {scale_factor:.3f})"
+                    )
+
+                else:
+                    # No resize needed - image is already smaller than targets
+                    if is_pdf:
+                        dpi = dpi or 150
+                        pix = page.get_pixmap(dpi=dpi)
+                    else:
+                        pix = page.get_pixmap()
+
+                    # Log actual extracted dimensions
+                    actual_width, actual_height = pix.width, pix.height
+                    logger.info(
+                        f"Page {page_id} already fits target size, extracted at: {actual_width}x{actual_height}"
+                    )
+            else:
+                # No valid target dimensions - use original extraction
+                if is_pdf:
+                    dpi = dpi or 150
+                    pix = page.get_pixmap(dpi=dpi)
+                else:
+                    pix = page.get_pixmap()
+
+                # Log actual extracted dimensions
+                actual_width, actual_height = pix.width, pix.height
+                logger.info(
+                    f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+                )
+        else:
+            # No resize config - extract at original size
+            if is_pdf:
+                dpi = dpi or 150
+                pix = page.get_pixmap(dpi=dpi)
+            else:
+                pix = page.get_pixmap()
+
+            # Log actual extracted dimensions
+            actual_width, actual_height = pix.width, pix.height
+            logger.info(
+                f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+            )
+
+        image_bytes = pix.tobytes("jpeg")
+        return image_bytes
+    finally:
+        # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
+        if pix is not None:
+            pix = None
+
+
+def _render_page_range_worker(
+    conn,
+    document_path: str,
+    filetype: str,
+    page_indices: Sequence[int],
+    dpi: Optional[int],
+    resize_config: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Worker process entry point: render the assigned pages and stream them back.
+
+    Each message sent over the pipe is a tuple of
+    ``(page_index, image_bytes, error_message)``. A final ``None`` marks the end
+    of the worker's page range.
+    """
+    pdf_document = None
+    try:
+        pdf_document = fitz.open(document_path, filetype=filetype)
+        for page_index in page_indices:
+            try:
+                page = pdf_document.load_page(page_index)
+                image_bytes = render_page_image(
+                    page, pdf_document.is_pdf, page_index + 1, dpi, resize_config
+                )
+                conn.send((page_index, image_bytes, None))
+            except Exception as e:
+                conn.send((page_index, None, str(e)))
+    except Exception as e:
+        # Could not open the document - report every assigned page as failed
+        for page_index in page_indices:
+            conn.send((page_index, None, f"Error opening document: {str(e)}"))
+    finally:
+        if pdf_document is not None:
+            pdf_document.close()
+        conn.send(None)
+        conn.close()
+
+
+def split_page_ranges(num_pages: int, num_workers: int) -> List[List[int]]:
+    """
+    Split page indices into contiguous ranges, one per worker.
+
+    Contiguous ranges keep each worker reading neighbouring objects in the PDF
+    and let early pages of every range reach OCR while later ones render.
+
+    Args:
+        num_pages: Total number of pages
+        num_workers: Number of worker processes
+
+    Returns:
+        List of page index lists (empty ranges are omitted)
+    """
+    num_workers = max(1, min(num_workers, num_pages))
+    base, remainder = divmod(num_pages, num_workers)
+    ranges = []
+    start = 0
+    for worker in range(num_workers):
+        size = base + (1 if worker < remainder else 0)
+        if size:
+            ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class PageRasterizer:
+    """Render document pages to JPEG bytes in threads or worker processes."""
+
+    def __init__(
+        self,
+        dpi: Optional[int] = 150,
+        resize_config: Optional[Dict[str, Any]] = None,
+        mode: str = "thread",
+        workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize the rasterizer.
+
+        Args:
+            dpi: DPI used for PDF pages
+            resize_config: Optional dict with target_width and target_height
+            mode: "thread" to render in the calling process, "process" to render
+                in worker processes with their own PyMuPDF handles
+            workers: Number of rendering workers (defaults to CPU count)
+            start_method: Optional multiprocessing start method ("fork", "spawn",
+                "forkserver"); defaults to the platform default
+
+        Raises:
+            ValueError: If an invalid mode is specified
+        """
+        mode = (mode or "thread").lower()
+        if mode not in VALID_RASTERIZATION_MODES:
+            raise ValueError(
+                f"Invalid rasterization mode: {mode}. Must be one of {VALID_RASTERIZATION_MODES}"
+            )
+        self.dpi = dpi
+        self.resize_config = resize_config
+        self.mode = mode
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.start_method = start_method
+
+    def render_page(self, pdf_document: "fitz.Document", page_index: int) -> bytes:
+        """
+        Render a single page of an already opened document in the calling thread.
+
+        Args:
+            pdf_document: PyMuPDF document object
+            page_index: Zero-based index of the page
+
+        Returns:
+            JPEG image bytes
+        """
+        page = pdf_document.load_page(page_index)
+        return render_page_image(
+            page, pdf_document.is_pdf, page_index + 1, self.dpi, self.resize_config
+        )
+
+    def iter_page_images(
+        self,
+        file_content: bytes,
+        filetype: str = "pdf",
+        page_indices: Optional[Sequence[int]] = None,
+    ) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """
+        Render pages and yield them as they complete.
+
+        Pages are yielded in completion order, not page order.
+
+        Args:
+            file_content: Raw document bytes
+            filetype: PyMuPDF filetype hint (e.g. "pdf")
+            page_indices: Zero-based pages to render (defaults to all pages)
+
+        Yields:
+            Tuples of (page_index, image_bytes, error_message). Exactly one of
+            image_bytes and error_message is set.
+        """
+        if self.mode == "process":
+            yield from self._iter_process(file_content, filetype, page_indices)
+        else:
+            yield from self._iter_thread(file_content, filetype, page_indices)
+
+    def _iter_thread(
+        self,
+        file_content: bytes,
+        filetype: str,
+        page_indices: Optional[Sequence[int]],
+    ) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """Render pages in worker threads, each with its own document handle."""
+        import concurrent.futures
+        import queue
+        import threading
+
+        if page_indices is None:
+            pdf_document = fitz.open(stream=file_content, filetype=filetype)
+            try:
+                page_indices = list(range(len(pdf_document)))
+            finally:
+                pdf_document.close()
+        page_indices = list(page_indices)
+        if not page_indices:
+            return
+
+        results: "queue.Queue" = queue.Queue()
+        stopped = threading.Event()
+
+        def render_range(assigned: List[int]) -> None:
+            pdf_document = None
+            try:
+                pdf_document = fitz.open(stream=file_content, filetype=filetype)
+                for page_index in assigned:
+                    if stopped.is_set():
+                        break
+                    try:
+                        image_bytes = self.render_page(pdf_document, page_index)
+                        results.put((page_index, image_bytes, None))
+                    except Exception as e:
+                        results.put((page_index, None, str(e)))
+            except Exception as e:
+                # Could not open the document - report every assigned page as failed
+                for page_index in assigned:
+                    results.put((page_index, None, f"Error opening document: {str(e)}"))
+            finally:
+                if pdf_document is not None:
+                    pdf_document.close()
+                results.put(None)
+
+        ranges = split_page_ranges(len(page_indices), self.workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            for page_range in ranges:
+                executor.submit(render_range, [page_indices[i] for i in page_range])
+            try:
+                remaining = len(ranges)
+                while remaining:
+                    message = results.get()
+                    if message is None:
+                        remaining -= 1
+                        continue
+                    yield message
+            finally:
+                # Stop workers early if the caller abandons the iterator
+                stopped.set()
+
+    def _iter_process(
+        self,
+        file_content: bytes,
+        filetype: str,
+        page_indices: Optional[Sequence[int]],
+    ) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """Render pages in worker processes, each with its own document handle."""
+        if page_indices is None:
+            pdf_document = fitz.open(stream=file_content, filetype=filetype)
+            try:
+                page_indices = list(range(len(pdf_document)))
+            finally:
+                pdf_document.close()
+        page_indices = list(page_indices)
+        if not page_indices:
+            return
+
+        # Spool the document to disk once so every worker can open it by path
+        # instead of pickling the full byte string into each process
+        spool = tempfile.NamedTemporaryFile(
+            prefix="idp-raster-", suffix=f".{filetype}", delete=False
+        )
+        try:
+            spool.write(file_content)
+            spool.close()
+
+            context = multiprocessing.get_context(self.start_method)
+            ranges = split_page_ranges(len(page_indices), self.workers)
+            processes = []
+            readers = []
+            # Pages each worker has not delivered yet, by its pipe
+            pending: Dict[Any, set] = {}
+            for page_range in ranges:
+                assigned = [page_indices[i] for i in page_range]
+                parent_conn, child_conn = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_render_page_range_worker,
+                    args=(
+                        child_conn,
+                        spool.name,
+                        filetype,
+                        assigned,
+                        self.dpi,
+                        self.resize_config,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                # Close the parent's copy of the write end so EOF is detected
+                child_conn.close()
+                processes.append(process)
+                readers.append(parent_conn)
+                pending[parent_conn] = set(assigned)
+
+            logger.info(
+                f"Rasterizing {len(page_indices)} pages with {len(processes)} worker processes"
+            )
+
+            try:
+                while readers:
+                    for conn in wait(readers):
+                        try:
+                            message = conn.recv()
+                        except EOFError:
+                            message = None
+                        if message is None:
+                            readers.remove(conn)
+                            conn.close()
+                            # A worker that died (OOM kill, crash in MuPDF)
+                            # closes its pipe without sending its remaining pages
+                            for page_index in sorted(pending.pop(conn)):
+                                yield page_index, None, "render worker exited"
+                            continue
+                        pending[conn].discard(message[0])
+                        yield message
+            finally:
+                for conn in readers:
+                    conn.close()
+                for process in processes:
+                    process.join(timeout=5)
+                    if process.is_alive():
+                        process.terminate()
+        finally:
+            try:
+                os.unlink(spool.name)
+            except OSError:
+                pass
+
+
+def benchmark_rasterization(
+    file_content: bytes,
+    modes: Sequence[str] = ("thread", "process"),
+    workers: Optional[int] = None,
+    dpi: Optional[int] = 150,
+    resize_config: Optional[Dict[str, Any]] = None,
+    filetype: str = "pdf",
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compare rasterization throughput across modes.
+
+    Args:
+        file_content: Raw PDF bytes to render
+        modes: Rasterization modes to benchmark
+        workers: Number of workers per mode
+        dpi: Render DPI
+        resize_config: Optional resize configuration
+        filetype: PyMuPDF filetype hint
+
+    Returns:
+        Dict keyed by mode with pages, errors, seconds and pages_per_second
+    """
+    results = {}
+    for mode in modes:
+        rasterizer = PageRasterizer(
+            dpi=dpi, resize_config=resize_config, mode=mode, workers=workers
+        )
+        pages = 0
+        errors = 0
+        t0 = time.time()
+        for _, image_bytes, error in rasterizer.iter_page_images(
+            file_content, filetype=filetype
+        ):
+            if error:
+                errors += 1
+            else:
+                pages += 1
+        elapsed = time.time() - t0
+        results[mode] = {
+            "pages": pages,
+            "errors": errors,
+            "seconds": elapsed,
+            "pages_per_second": pages / elapsed if elapsed > 0 else 0.0,
+        }
+    return results
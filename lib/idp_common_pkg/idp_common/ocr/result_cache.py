@@ -0,0 +1,168 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Content-addressed cache for Textract page results.
+
+Reprocessing a document, or ingesting the same form twice, renders pages whose
+bytes are identical to pages that were already sent to Textract. The cache key
+is a SHA-256 of the rendered page image plus the OCR settings that affect the
+response (API, feature types, preprocessing, DPI, sizing). A cache entry holds
+the S3 URIs of the Textract artifacts written for the first occurrence, so a hit
+is served by copying those objects instead of calling the API again.
+
+Entries live in one of the stores of ``idp_common.utils.cache_store``
+(DynamoDB, S3 or a local directory).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from idp_common import metrics
+from idp_common.utils.cache_store import (
+    CacheStore,
+    DynamoDBCacheStore,
+    LocalCacheStore,
+    S3CacheStore,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_DAYS = 30
+CACHE_KEY_PREFIX = "ocrcache#"
+
+
+def compute_cache_key(image_bytes: bytes, fingerprint: Dict[str, Any]) -> str:
+    """
+    Compute the content address of a page.
+
+    Args:
+        image_bytes: Rendered page image sent to OCR
+        fingerprint: OCR settings that change the OCR response
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(image_bytes)
+    return digest.hexdigest()
+
+
+def create_cache_store(cache_config: Dict[str, Any]) -> CacheStore:
+    """
+    Create a cache store from the ``ocr.cache`` configuration.
+
+    Args:
+        cache_config: Dict with "store" ("dynamodb", "s3" or "local") and the
+            store settings ("table_name", "bucket"/"prefix" or "directory")
+
+    Returns:
+        CacheStore instance
+    """
+    store_type = str(cache_config.get("store", "dynamodb")).lower()
+    if store_type == "dynamodb":
+        return DynamoDBCacheStore(
+            CACHE_KEY_PREFIX, "result", table_name=cache_config.get("table_name")
+        )
+    if store_type == "s3":
+        return S3CacheStore(
+            bucket=cache_config.get("bucket"),
+            prefix=cache_config.get("prefix") or "ocr-cache",
+        )
+    if store_type == "local":
+        return LocalCacheStore(directory=cache_config.get("directory") or ".ocr_cache")
+    raise ValueError(
+        f"Invalid OCR cache store: {store_type}. Must be one of: dynamodb, s3, local"
+    )
+
+
+class OcrResultCache:
+    """Cache lookups and writes with TTL handling and hit/miss counters."""
+
+    def __init__(self, store: CacheStore, ttl_days: float = DEFAULT_TTL_DAYS):
+        """
+        Args:
+            store: Backing entry store
+            ttl_days: Days an entry remains valid after it is written
+        """
+        self.store = store
+        self.ttl_seconds = int(float(ttl_days) * 86400)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._published = {"hits": 0, "misses": 0}
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry. Store errors are logged and treated as misses.
+
+        Args:
+            key: Cache key from compute_cache_key
+
+        Returns:
+            Cached entry or None
+        """
+        try:
+            entry = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"OCR cache lookup failed for {key}: {str(e)}")
+            entry = None
+            with self._lock:
+                self._errors += 1
+        if entry is None:
+            self.record_miss()
+        return entry
+
+    def record_hit(self) -> None:
+        """Count a lookup whose entry was used."""
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self) -> None:
+        """Count a lookup that fell through to OCR."""
+        with self._lock:
+            self._misses += 1
+
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Store an entry. Store errors are logged and ignored.
+
+        Args:
+            key: Cache key from compute_cache_key
+            entry: JSON-serializable entry
+        """
+        try:
+            self.store.put(key, entry, int(time.time()) + self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"OCR cache write failed for {key}: {str(e)}")
+            with self._lock:
+                self._errors += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return cumulative hit/miss counters and the hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def publish_metrics(self) -> None:
+        """Publish hits and misses since the previous call as CloudWatch metrics."""
+        with self._lock:
+            hits = self._hits - self._published["hits"]
+            misses = self._misses - self._published["misses"]
+            self._published = {"hits": self._hits, "misses": self._misses}
+        if hits or misses:
+            metrics.put_metric("OCRCacheHits", hits)
+            metrics.put_metric("OCRCacheMisses", misses)
@@ -10,22 +10,54 @@ processing of multiple pages.
 """
 
 import concurrent.futures
+import hashlib
+import json
 import logging
 import os
+import re
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import boto3
 import fitz  # PyMuPDF
 from botocore.config import Config
 
 from idp_common import bedrock, image, s3, utils
-from idp_common.models import Document, Page, Status
+from idp_common.models import Document, Page, Status, image_variant_key
+from idp_common.ocr import text_layer, textract_async, textract_parser
+from idp_common.ocr.concurrency import get_textract_governor
 from idp_common.ocr.document_converter import DocumentConverter
+from idp_common.ocr.memory_budget import (
+    MemoryBudget,
+    default_budget_mb,
+    estimate_page_memory,
+)
+from idp_common.ocr.rasterizer import PageRasterizer, render_page_image
+from idp_common.ocr.result_cache import (
+    DEFAULT_TTL_DAYS,
+    OcrResultCache,
+    compute_cache_key,
+    create_cache_store,
+)
+from idp_common.ocr.upload_pipeline import (
+    DEFAULT_QUEUE_DEPTH,
+    DEFAULT_UPLOAD_WORKERS,
+    UploadPipeline,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _content_digest(content: Any) -> str:
+    """SHA-256 of an artifact as passed to s3.write_content."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    elif not isinstance(content, (bytes, bytearray)):
+        content = json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
 class OcrService:
     """Service for OCR processing of documents using AWS Textract or Amazon Bedrock."""
 
@@ -48,7 +80,9 @@ class OcrService:
         Args:
             region: AWS region for services
             config: Configuration dictionary containing all OCR settings
-            backend: OCR backend to use ("textract", "bedrock", or "none")
+            backend: OCR backend to use ("textract", "auto", "bedrock", or "none").
+                "auto" uses the native PDF text layer where it is usable and
+                Textract for the remaining (image-only) pages
             max_workers: Maximum number of concurrent workers for page processing
 
             Deprecated parameters (use config instead):
@@ -84,6 +118,15 @@ class OcrService:
             self.bedrock_config = bedrock_config
             self.preprocessing_config = preprocessing_config
             self.enhanced_features = enhanced_features
+            self.rasterization_config = {}
+            self.text_layer_config = {}
+            self.upload_config = {}
+            self.cache_config = {}
+            self.textract_async_config = {}
+            self.concurrency_config = {}
+            self.memory_config = {}
+            self.markdown_parser = "native"
+            self.image_variant_sizes = []
         else:
             # New pattern - extract from config
             self.region = region or os.environ.get("AWS_REGION", "us-east-1")
@@ -201,9 +244,50 @@ class OcrService:
                 and preprocessing_value.lower() == "true"
             ):
                 self.preprocessing_config = {"enabled": True}
+            elif isinstance(preprocessing_value, dict) and str(
+                preprocessing_value.get("enabled", True)
+            ).lower() in ["true", "1"]:
+                # Pipeline configuration with optional engine and steps
+                self.preprocessing_config = {**preprocessing_value, "enabled": True}
             else:
                 self.preprocessing_config = None
 
+            # Extract per-stage page image variants written next to image.jpg
+            self.image_variant_sizes = self._resolve_image_variant_sizes(
+                image_config.get("variants", "auto")
+            )
+
+            # Extract page rasterization configuration ("thread" or "process")
+            self.rasterization_config = ocr_config.get("rasterization", {}) or {}
+
+            # Extract text layer thresholds used by the "auto" backend
+            self.text_layer_config = ocr_config.get("text_layer", {}) or {}
+
+            # Extract pipelined artifact upload configuration
+            self.upload_config = ocr_config.get("upload", {}) or {}
+
+            # Extract Textract result cache configuration
+            self.cache_config = ocr_config.get("cache", {}) or {}
+
+            # Extract asynchronous Textract job configuration
+            self.textract_async_config = ocr_config.get("textract_async", {}) or {}
+
+            # Extract Textract concurrency configuration ("fixed" or "aimd")
+            self.concurrency_config = ocr_config.get("concurrency", {}) or {}
+
+            # Extract page memory budget configuration
+            self.memory_config = ocr_config.get("memory", {}) or {}
+
+            # Extract markdown parser ("native" single-pass parser or "textractor")
+            self.markdown_parser = str(
+                ocr_config.get("markdown_parser", "native") or "native"
+            ).lower()
+            if self.markdown_parser not in ["native", "textractor"]:
+                raise ValueError(
+                    f"Invalid markdown_parser: {self.markdown_parser}. "
+                    f"Must be one of: native, textractor"
+                )
+
             # Extract Bedrock configuration
             if self.backend == "bedrock":
                 if all(
@@ -232,13 +316,31 @@ class OcrService:
             )
 
         # Validate backend
-        if self.backend not in ["textract", "bedrock", "none"]:
+        if self.backend not in ["textract", "auto", "bedrock", "none"]:
             raise ValueError(
-                f"Invalid backend: {backend}. Must be 'textract', 'bedrock', or 'none'"
+                f"Invalid backend: {backend}. Must be 'textract', 'auto', 'bedrock', or 'none'"
+            )
+
+        # Build the OCR image preprocessing pipeline once (validates steps)
+        self.preprocessing_pipeline = None
+        if self.preprocessing_config and self.preprocessing_config.get("enabled"):
+            from idp_common.image.preprocessing import PreprocessingPipeline
+
+            self.preprocessing_pipeline = PreprocessingPipeline.from_config(
+                self.preprocessing_config
+            )
+            logger.info(
+                f"OCR image preprocessing: {self.preprocessing_pipeline.engine} "
+                f"{[name for name, _ in self.preprocessing_pipeline.steps]}"
             )
 
-        # Initialize clients based on backend
-        if self.backend == "textract":
+        # Page threads; raised to the governor's maximum in "aimd" mode
+        self.page_workers = self.max_workers
+        self.textract_governor = None
+
+        # Initialize clients based on backend ("auto" falls back to Textract
+        # for pages without a usable text layer, so it needs the same client)
+        if self.backend in ["textract", "auto"]:
             # Define valid Textract feature types
             VALID_FEATURES = ["TABLES", "FORMS", "SIGNATURES", "LAYOUT"]
 
@@ -260,16 +362,69 @@ class OcrService:
                     f"OCR Service initialized with features: {self.enhanced_features}"
                 )
 
+            # Textract calls are either bounded by the page thread pool ("fixed")
+            # or by the process-wide AIMD governor ("aimd")
+            concurrency_mode = str(self.concurrency_config.get("mode", "fixed")).lower()
+            if concurrency_mode not in ["fixed", "aimd"]:
+                raise ValueError(
+                    f"Invalid concurrency mode: {concurrency_mode}. "
+                    f"Must be one of: fixed, aimd"
+                )
+            if concurrency_mode == "aimd":
+                governor_settings = {
+                    name: float(self.concurrency_config[key])
+                    for name, key in [
+                        ("initial_limit", "initial"),
+                        ("min_limit", "min"),
+                        ("max_limit", "max"),
+                    ]
+                    if self.concurrency_config.get(key) is not None
+                }
+                self.textract_governor = get_textract_governor(**governor_settings)
+                # Run enough page threads for the governor to reach its maximum
+                self.page_workers = max(
+                    int(self.max_workers), int(self.textract_governor.max_limit)
+                )
+                # Throttles must reach the governor rather than being retried
+                # inside botocore; the governor also retries the server,
+                # connection and timeout errors botocore would have retried
+                retries = {"total_max_attempts": 1, "mode": "standard"}
+            else:
+                retries = {"max_attempts": 100, "mode": "adaptive"}
+
             # Initialize Textract client with adaptive retries
             adaptive_config = Config(
-                retries={"max_attempts": 100, "mode": "adaptive"},
-                max_pool_connections=self.max_workers * 3,
+                retries=retries,
+                max_pool_connections=int(self.page_workers) * 3,
             )
             self.textract_client = boto3.client(
                 "textract", region_name=self.region, config=adaptive_config
             )
 
-            logger.info("OCR Service initialized with Textract backend")
+            if self.backend == "auto":
+                self.text_layer_thresholds = {
+                    "min_chars": int(
+                        self.text_layer_config.get(
+                            "min_chars", text_layer.DEFAULT_MIN_CHARS
+                        )
+                    ),
+                    "min_font_coverage": float(
+                        self.text_layer_config.get(
+                            "min_font_coverage", text_layer.DEFAULT_MIN_FONT_COVERAGE
+                        )
+                    ),
+                    "max_garbage_ratio": float(
+                        self.text_layer_config.get(
+                            "max_garbage_ratio", text_layer.DEFAULT_MAX_GARBAGE_RATIO
+                        )
+                    ),
+                }
+                logger.info(
+                    f"OCR Service initialized with auto backend (text layer "
+                    f"thresholds: {self.text_layer_thresholds}, Textract fallback)"
+                )
+            else:
+                logger.info("OCR Service initialized with Textract backend")
         elif self.backend == "bedrock":
             # Enhanced features not used with Bedrock
             self.enhanced_features = False
@@ -313,6 +468,135 @@ class OcrService:
         # Initialize document converter for non-PDF formats
         self.document_converter = DocumentConverter(dpi=self.dpi or 150)
 
+        # Initialize page rasterizer. "thread" renders inside the page worker
+        # threads (default); "process" renders in worker processes that each
+        # open their own PyMuPDF handle and stream JPEG bytes back.
+        rasterization_workers = self.rasterization_config.get("workers")
+        self.rasterizer = PageRasterizer(
+            dpi=self.dpi or 150,
+            resize_config=self.resize_config,
+            mode=self.rasterization_config.get("mode", "thread"),
+            workers=int(rasterization_workers) if rasterization_workers else None,
+            start_method=self.rasterization_config.get("start_method"),
+        )
+        logger.info(
+            f"Page rasterization mode: {self.rasterizer.mode} "
+            f"({self.rasterizer.workers} workers)"
+        )
+
+        # Pages are admitted into rendering only while their summed memory
+        # estimate fits the budget (0 = unbounded)
+        budget_mb = self.memory_config.get("budget_mb")
+        if budget_mb is None or budget_mb == "":
+            budget_mb = default_budget_mb()
+        self.memory_budget = MemoryBudget(int(float(budget_mb)) * 1024 * 1024)
+        if self.memory_budget.enabled:
+            logger.info(f"Page memory budget: {int(float(budget_mb))} MB")
+
+        # Page artifacts are written through a bounded upload queue drained by a
+        # dedicated thread pool so page workers return to OCR immediately
+        pipelined = self.upload_config.get("pipelined", True)
+        self.upload_pipelined = not (
+            pipelined is False
+            or (isinstance(pipelined, str) and pipelined.lower() == "false")
+        )
+        self.upload_workers = int(
+            self.upload_config.get("workers") or DEFAULT_UPLOAD_WORKERS
+        )
+        self.upload_queue_depth = int(
+            self.upload_config.get("queue_depth") or DEFAULT_QUEUE_DEPTH
+        )
+        self._upload_pipeline: Optional[UploadPipeline] = None
+        # SHA-256 of each artifact written for the current document, by S3 URI
+        self._artifact_digests: Dict[str, str] = {}
+        # Result cache entries waiting for their page's queued uploads, by page id
+        self._pending_cache_entries: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # PyMuPDF handles must not be shared between threads, so each page worker
+        # opens its own handle of the current document, by thread ident
+        self._document_source: Optional[Tuple[bytes, str]] = None
+        self._thread_documents: Dict[int, fitz.Document] = {}
+        self._thread_documents_lock = threading.Lock()
+
+        # Content-addressed cache of Textract page results, keyed by the rendered
+        # page image and the OCR settings (disabled by default)
+        self.result_cache: Optional[OcrResultCache] = None
+        cache_enabled = self.cache_config.get("enabled", False)
+        if self.backend in ("textract", "auto") and (
+            cache_enabled is True
+            or (isinstance(cache_enabled, str) and cache_enabled.lower() == "true")
+        ):
+            self.result_cache = OcrResultCache(
+                create_cache_store(self.cache_config),
+                ttl_days=self.cache_config.get("ttl_days") or DEFAULT_TTL_DAYS,
+            )
+            logger.info(
+                f"OCR result cache enabled using "
+                f"{self.cache_config.get('store', 'dynamodb')} store"
+            )
+
+        # PDFs with at least page_threshold pages are sent to Textract as a single
+        # asynchronous job instead of one synchronous call per page (0 disables)
+        self.async_page_threshold = int(
+            self.textract_async_config.get("page_threshold") or 0
+        )
+        self.async_poll_interval = float(
+            self.textract_async_config.get("poll_interval")
+            or textract_async.DEFAULT_POLL_INTERVAL
+        )
+        self.async_timeout = float(
+            self.textract_async_config.get("timeout") or textract_async.DEFAULT_TIMEOUT
+        )
+
+    def _resolve_image_variant_sizes(self, value: Any) -> List[Tuple[int, int]]:
+        """
+        Resolve the page image variant sizes to write during OCR.
+
+        Args:
+            value: "auto" to use the target sizes configured for classification,
+                extraction and assessment; a list of {target_width, target_height}
+                dicts or "<width>x<height>" strings; or false to disable
+
+        Returns:
+            Distinct (target_width, target_height) pairs
+        """
+        if value is None or value is False or str(value).lower() in ("false", ""):
+            return []
+
+        if value is True or str(value).lower() in ("auto", "true"):
+            candidates = [
+                (self.config.get(stage) or {}).get("image") or {}
+                for stage in ("classification", "extraction", "assessment")
+            ]
+        elif isinstance(value, list):
+            candidates = value
+        else:
+            raise ValueError(
+                f"Invalid image variants configuration: {value}. "
+                f"Must be 'auto', false or a list of sizes"
+            )
+
+        sizes = []
+        for candidate in candidates:
+            if isinstance(candidate, dict):
+                key = image_variant_key(
+                    candidate.get("target_width"), candidate.get("target_height")
+                )
+            else:
+                width, _, height = str(candidate).lower().partition("x")
+                key = image_variant_key(width, height)
+            if key is None:
+                continue
+            width, height = (int(v) for v in key.split("x"))
+            if (width, height) not in sizes:
+                sizes.append((width, height))
+
+        if sizes:
+            logger.info(
+                "Writing page image variants: "
+                + ", ".join(f"{w}x{h}" for w, h in sizes)
+            )
+        return sizes
+
     def process_document(self, document: Document) -> Document:
         """
         Process a document with OCR and update the Document model.
@@ -345,100 +629,104 @@ class OcrService:
             return document
 
         # Detect file type and process accordingly
+        page_results: Dict[int, Tuple[Dict[str, str], Dict[str, Any]]] = {}
+        self._artifact_digests = {}
+        self._pending_cache_entries = {}
+        self._start_upload_pipeline()
         try:
             file_type = self._detect_file_type(document.input_key, file_content)
             logger.info(f"Detected file type: {file_type}")
 
             if file_type in ["txt", "csv", "xlsx", "docx"]:
-                # Process non-PDF documents
-                pages_data = self._process_non_pdf_document(file_type, file_content)
-                document.num_pages = len(pages_data)
-
-                # Process each page
-                for page_index, (image_bytes, page_text) in enumerate(pages_data):
-                    page_id = str(page_index + 1)
-                    try:
-                        ocr_result, page_metering = self._process_converted_page(
-                            page_index,
-                            image_bytes,
-                            page_text,
-                            document.output_bucket,
-                            document.input_key,
-                        )
-
-                        # Create Page object and add to document
-                        document.pages[page_id] = Page(
-                            page_id=page_id,
-                            image_uri=ocr_result["image_uri"],
-                            raw_text_uri=ocr_result["raw_text_uri"],
-                            parsed_text_uri=ocr_result["parsed_text_uri"],
-                            text_confidence_uri=ocr_result["text_confidence_uri"],
-                        )
+                # Process non-PDF documents: pages are converted one at a time
+                # and handed to the page workers as they are rendered
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.page_workers
+                ) as executor:
+                    future_to_page = self._submit_converted_pages(
+                        executor,
+                        file_type,
+                        file_content,
+                        document.output_bucket,
+                        document.input_key,
+                    )
+                    document.num_pages = len(future_to_page)
 
-                        # Merge metering data
-                        document.metering = utils.merge_metering_data(
-                            document.metering, page_metering
-                        )
+                    for future in concurrent.futures.as_completed(future_to_page):
+                        page_index = future_to_page[future]
+                        try:
+                            page_results[page_index] = future.result()
 
-                    except Exception as e:
-                        import traceback
+                        except Exception as e:
+                            import traceback
 
-                        error_msg = f"Error processing page {page_index + 1}: {str(e)}"
-                        stack_trace = traceback.format_exc()
-                        logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
-                        document.errors.append(f"{error_msg} (see logs for full trace)")
+                            error_msg = (
+                                f"Error processing page {page_index + 1}: {str(e)}"
+                            )
+                            stack_trace = traceback.format_exc()
+                            logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
+                            document.errors.append(
+                                f"{error_msg} (see logs for full trace)"
+                            )
             else:
                 # Process PDF/image documents using existing logic
+                # This handle is only used by this thread; page workers open
+                # their own through _thread_document
                 pdf_document = fitz.open(stream=file_content, filetype=file_type)
                 num_pages = len(pdf_document)
                 document.num_pages = num_pages
+                self._document_source = (file_content, file_type)
 
                 with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=self.max_workers
+                    max_workers=self.page_workers
                 ) as executor:
                     # Pass original file content for image files
                     original_content = file_content if not pdf_document.is_pdf else None
 
-                    future_to_page = {
-                        executor.submit(
-                            self._process_single_page,
-                            i,
-                            pdf_document,
-                            document.output_bucket,
-                            document.input_key,
-                            original_content,
-                        ): i
-                        for i in range(num_pages)
-                    }
-
-                    # Start memory monitoring in background thread
+                    # Start memory monitoring in background thread (before
+                    # submitting, which renders pages in the prerendered path)
                     memory_monitor_shutdown = self._start_memory_monitoring()
-                    completed_pages = 0
 
                     try:
+                        if self._use_async_textract(pdf_document, num_pages):
+                            # Send the whole PDF to Textract as one asynchronous job
+                            future_to_page = self._submit_async_textract_pages(
+                                executor,
+                                document.input_bucket,
+                                document.input_key,
+                                num_pages,
+                                document.output_bucket,
+                                document.input_key,
+                            )
+                        elif self.rasterizer.mode == "process" and pdf_document.is_pdf:
+                            # Render in worker processes and hand each page to the
+                            # OCR threads as soon as its image bytes arrive
+                            future_to_page = self._submit_prerendered_pages(
+                                executor,
+                                pdf_document,
+                                file_content,
+                                file_type,
+                                num_pages,
+                                document.output_bucket,
+                                document.input_key,
+                            )
+                        else:
+                            future_to_page = {
+                                executor.submit(
+                                    self._call_with_thread_document,
+                                    self._process_single_page,
+                                    i,
+                                    output_bucket=document.output_bucket,
+                                    prefix=document.input_key,
+                                    original_file_content=original_content,
+                                ): i
+                                for i in range(num_pages)
+                            }
+
                         for future in concurrent.futures.as_completed(future_to_page):
                             page_index = future_to_page[future]
-                            page_id = str(page_index + 1)
                             try:
-                                ocr_result, page_metering = future.result()
-
-                                # Create Page object and add to document
-                                document.pages[page_id] = Page(
-                                    page_id=page_id,
-                                    image_uri=ocr_result["image_uri"],
-                                    raw_text_uri=ocr_result["raw_text_uri"],
-                                    parsed_text_uri=ocr_result["parsed_text_uri"],
-                                    text_confidence_uri=ocr_result[
-                                        "text_confidence_uri"
-                                    ],
-                                )
-
-                                # Merge metering data
-                                document.metering = utils.merge_metering_data(
-                                    document.metering, page_metering
-                                )
-
-                                completed_pages += 1
+                                page_results[page_index] = future.result()
 
                             except Exception as e:
                                 import traceback
@@ -457,8 +745,28 @@ class OcrService:
                         # Stop memory monitoring
                         memory_monitor_shutdown.set()
 
+                self._close_thread_documents()
                 pdf_document.close()
 
+            # Wait for queued artifact uploads before building Page objects so a
+            # page is only referenced once all of its artifacts exist in S3
+            upload_errors = self._finish_upload_pipeline()
+            self._add_page_results(document, page_results, upload_errors)
+
+            if self.memory_budget.enabled:
+                logger.info(f"Page memory budget stats: {self.memory_budget.stats}")
+
+            if self.result_cache is not None:
+                logger.info(f"OCR result cache stats: {self.result_cache.stats}")
+                self.result_cache.publish_metrics()
+
+            if self.textract_governor is not None:
+                logger.info(
+                    f"Textract concurrency governor stats: "
+                    f"{self.textract_governor.stats}"
+                )
+                self.textract_governor.publish_metrics()
+
             # Sort the pages dictionary by ascending page number
             logger.info(f"Sorting {len(document.pages)} pages by page number")
 
@@ -482,6 +790,10 @@ class OcrService:
             logger.error(f"{error_msg}\nStack trace:\n{stack_trace}")
             document.errors.append(f"{error_msg} (see logs for full trace)")
             document.status = Status.FAILED
+        finally:
+            # Make sure upload threads are stopped if processing failed midway
+            self._finish_upload_pipeline()
+            self._close_thread_documents()
 
         t2 = time.time()
         logger.info(f"OCR processing completed in {t2 - t0:.2f} seconds")
@@ -490,6 +802,213 @@ class OcrService:
         )
         return document
 
+    def _thread_document(self) -> fitz.Document:
+        """Return the calling thread's own handle of the current document."""
+        thread_id = threading.get_ident()
+        with self._thread_documents_lock:
+            pdf_document = self._thread_documents.get(thread_id)
+        if pdf_document is None:
+            file_content, file_type = self._document_source
+            pdf_document = fitz.open(stream=file_content, filetype=file_type)
+            with self._thread_documents_lock:
+                self._thread_documents[thread_id] = pdf_document
+        return pdf_document
+
+    def _call_with_thread_document(self, fn: Callable, *args: Any, **kwargs: Any):
+        """Call fn with the calling thread's document handle as pdf_document."""
+        return fn(*args, pdf_document=self._thread_document(), **kwargs)
+
+    def _close_thread_documents(self) -> None:
+        """Close the page workers' document handles of the current document."""
+        with self._thread_documents_lock:
+            documents = list(self._thread_documents.values())
+            self._thread_documents = {}
+        self._document_source = None
+        for pdf_document in documents:
+            pdf_document.close()
+
+    def _start_upload_pipeline(self) -> None:
+        """Start the artifact upload pipeline for the current document, if enabled."""
+        if self.upload_pipelined:
+            self._upload_pipeline = UploadPipeline(
+                max_workers=self.upload_workers,
+                queue_depth=self.upload_queue_depth,
+            )
+
+    def _finish_upload_pipeline(self) -> List[Dict[str, str]]:
+        """
+        Drain and stop the upload pipeline for the current document.
+
+        Returns:
+            List of failed uploads as dicts with "key" and "error"
+        """
+        pipeline = self._upload_pipeline
+        self._upload_pipeline = None
+        if pipeline is None:
+            return []
+        return pipeline.close()
+
+    def _write_artifact(
+        self,
+        content: Any,
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Write a page artifact to S3, through the upload pipeline when it is running.
+
+        Args:
+            content: Content to write (bytes, str or JSON-serializable dict/list)
+            bucket: S3 bucket
+            key: S3 key
+            content_type: Optional content type
+        """
+        # Page content hashes are built from these, so no stage re-reads the content
+        self._artifact_digests[f"s3://{bucket}/{key}"] = _content_digest(content)
+        pipeline = self._upload_pipeline
+        if pipeline is not None:
+            # Blocks only when the queue is full, bounding pending upload memory
+            pipeline.submit(content, bucket, key, content_type)
+        else:
+            s3.write_content(content, bucket, key, content_type=content_type)
+
+    def _write_page_image(
+        self,
+        img_bytes: bytes,
+        bucket: str,
+        image_key: str,
+        content_type: str = "image/jpeg",
+    ) -> Dict[str, str]:
+        """
+        Write a page image and its configured resized variants.
+
+        Variants are resized from the already rendered page image with one
+        decode, so downstream stages can fetch an image at their own target
+        size instead of resizing image.jpg themselves. Sizes the image already
+        fits within are skipped.
+
+        Args:
+            img_bytes: Page image bytes
+            bucket: S3 bucket
+            image_key: S3 key of the page image (e.g. "<prefix>/pages/1/image.jpg")
+            content_type: Content type of the page image
+
+        Returns:
+            Dict mapping variant keys ("<width>x<height>") to S3 URIs
+        """
+        self._write_artifact(img_bytes, bucket, image_key, content_type=content_type)
+        if not self.image_variant_sizes:
+            return {}
+
+        try:
+            resized = image.resize_image_variants(img_bytes, self.image_variant_sizes)
+        except Exception as e:
+            logger.warning(f"Could not create image variants for {image_key}: {e}")
+            return {}
+
+        base, ext = image_key.rsplit(".", 1)
+        variants = {}
+        for (width, height), variant_bytes in resized.items():
+            key = image_variant_key(width, height)
+            variant_key = f"{base}_{key}.{ext}"
+            self._write_artifact(
+                variant_bytes, bucket, variant_key, content_type=content_type
+            )
+            variants[key] = f"s3://{bucket}/{variant_key}"
+        return variants
+
+    @staticmethod
+    def _image_uris(
+        bucket: str, image_key: str, image_variants: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Return the page result fields for a page image and its variants."""
+        result: Dict[str, Any] = {"image_uri": f"s3://{bucket}/{image_key}"}
+        if image_variants:
+            result["image_variants"] = image_variants
+        return result
+
+    def _page_content_hash(self, ocr_result: Dict[str, Any]) -> Optional[str]:
+        """
+        Hash the content downstream stages read for a page.
+
+        Args:
+            ocr_result: Page result with parsed_text_uri and image_uri
+
+        Returns:
+            SHA-256 of the parsed text and page image, or None if either was
+            not written for this document (e.g. restored from the result cache)
+        """
+        if ocr_result.get("content_hash"):
+            return ocr_result["content_hash"]
+        digest = hashlib.sha256()
+        for uri in (ocr_result.get("parsed_text_uri"), ocr_result.get("image_uri")):
+            digest.update(b"\0")
+            if uri:
+                artifact_digest = self._artifact_digests.get(uri)
+                if artifact_digest is None:
+                    return None
+                digest.update(artifact_digest.encode("ascii"))
+        return digest.hexdigest()
+
+    def _add_page_results(
+        self,
+        document: Document,
+        page_results: Dict[int, Tuple[Dict[str, str], Dict[str, Any]]],
+        upload_errors: List[Dict[str, str]],
+    ) -> None:
+        """
+        Create Page objects and merge metering for successfully processed pages.
+
+        Pages with failed artifact uploads are reported as errors instead, and
+        only pages whose uploads succeeded are saved to the result cache.
+
+        Args:
+            document: Document to update
+            page_results: Dict mapping zero-based page index to (result, metering)
+            upload_errors: Failed uploads returned by the upload pipeline
+        """
+        failed_uploads: Dict[str, str] = {}
+        for upload_error in upload_errors:
+            match = re.search(r"/pages/(\d+)/[^/]+$", upload_error["key"])
+            if match:
+                failed_uploads.setdefault(match.group(1), upload_error["error"])
+            else:
+                document.errors.append(
+                    f"Error uploading {upload_error['key']}: {upload_error['error']}"
+                )
+
+        for page_index, (ocr_result, page_metering) in page_results.items():
+            page_id = str(page_index + 1)
+            pending_cache_entry = self._pending_cache_entries.pop(page_id, None)
+            if page_id in failed_uploads:
+                error_msg = (
+                    f"Error uploading artifacts for page {page_id}: "
+                    f"{failed_uploads[page_id]}"
+                )
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                continue
+
+            # Create Page object and add to document
+            document.pages[page_id] = Page(
+                page_id=page_id,
+                image_uri=ocr_result["image_uri"],
+                raw_text_uri=ocr_result["raw_text_uri"],
+                parsed_text_uri=ocr_result["parsed_text_uri"],
+                text_confidence_uri=ocr_result["text_confidence_uri"],
+                image_variants=ocr_result.get("image_variants") or {},
+                content_hash=self._page_content_hash(ocr_result),
+            )
+
+            if pending_cache_entry is not None:
+                self.result_cache.save(*pending_cache_entry)
+
+            # Merge metering data
+            document.metering = utils.merge_metering_data(
+                document.metering, page_metering
+            )
+
     def _feature_combo(self):
         """Return the pricing feature combination string based on enhanced_features.
 
@@ -555,6 +1074,33 @@ class OcrService:
         Returns:
             Tuple of (page_result_dict, metering_data)
         """
+        with self.memory_budget.reserve(
+            self._estimate_page_memory(pdf_document, page_index)
+        ):
+            return self._process_single_page_admitted(
+                page_index, pdf_document, output_bucket, prefix, original_file_content
+            )
+
+    def _estimate_page_memory(
+        self, pdf_document: fitz.Document, page_index: int
+    ) -> int:
+        """Estimate the memory needed to render and process one page."""
+        if not self.memory_budget.enabled:
+            return 0
+        rect = pdf_document.load_page(page_index).rect
+        return estimate_page_memory(
+            rect.width, rect.height, pdf_document.is_pdf, self.dpi, self.resize_config
+        )
+
+    def _process_single_page_admitted(
+        self,
+        page_index: int,
+        pdf_document: fitz.Document,
+        output_bucket: str,
+        prefix: str,
+        original_file_content: Optional[bytes] = None,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Process a single page once it has been admitted by the memory budget."""
         # Check if this is an image file (not a PDF)
         # PyMuPDF loads images as single-page documents
         if not pdf_document.is_pdf and page_index == 0:
@@ -572,12 +1118,128 @@ class OcrService:
             return self._process_single_page_bedrock(
                 page_index, pdf_document, output_bucket, prefix
             )
+        elif self.backend == "auto":
+            return self._process_single_page_auto(
+                page_index, pdf_document, output_bucket, prefix
+            )
         else:
             # Textract backend (default)
             return self._process_single_page_textract(
                 page_index, pdf_document, output_bucket, prefix
             )
 
+    def _submit_prerendered_pages(
+        self,
+        executor: concurrent.futures.Executor,
+        pdf_document: fitz.Document,
+        file_content: bytes,
+        file_type: str,
+        num_pages: int,
+        output_bucket: str,
+        prefix: str,
+    ) -> Dict[concurrent.futures.Future, int]:
+        """
+        Rasterize pages in worker processes and submit each rendered page for OCR.
+
+        Each page is submitted as soon as its image arrives, once the memory
+        budget admits it. While the budget is exhausted this loop waits, so the
+        render workers stall on their pipes instead of piling up page images
+        ahead of OCR. The reservation is released when the page finishes.
+
+        Args:
+            executor: Thread pool running the OCR/upload work for each page
+            pdf_document: PyMuPDF document opened by the caller, used only by
+                this thread to estimate page memory
+            file_content: Raw PDF bytes
+            file_type: PyMuPDF filetype hint
+            num_pages: Number of pages in the document
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Dict mapping each page future to its zero-based page index
+        """
+        future_to_page = {}
+        for page_index, img_bytes, error in self.rasterizer.iter_page_images(
+            file_content, filetype=file_type, page_indices=range(num_pages)
+        ):
+            if error:
+                future_to_page[self._failed_render_future(error)] = page_index
+                continue
+            nbytes = self._estimate_page_memory(pdf_document, page_index)
+            self.memory_budget.acquire(nbytes)
+            try:
+                future = executor.submit(
+                    self._process_prerendered_page,
+                    page_index,
+                    img_bytes,
+                    output_bucket,
+                    prefix,
+                )
+            except Exception:
+                self.memory_budget.release(nbytes)
+                raise
+            future.add_done_callback(
+                lambda _, nbytes=nbytes: self.memory_budget.release(nbytes)
+            )
+            future_to_page[future] = page_index
+
+        # Every page must be reported, even if the rasterizer lost track of it
+        missing = set(range(num_pages)) - set(future_to_page.values())
+        for page_index in sorted(missing):
+            future_to_page[self._failed_render_future("page was not rendered")] = (
+                page_index
+            )
+        return future_to_page
+
+    @staticmethod
+    def _failed_render_future(error: str) -> concurrent.futures.Future:
+        """Return a future failed with a page rasterization error."""
+        failed = concurrent.futures.Future()
+        failed.set_exception(RuntimeError(f"Page rasterization failed: {error}"))
+        return failed
+
+    def _process_prerendered_page(
+        self,
+        page_index: int,
+        img_bytes: bytes,
+        output_bucket: str,
+        prefix: str,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Process a page whose image was already rendered by the rasterizer.
+
+        Args:
+            page_index: Zero-based index of the page
+            img_bytes: Rendered JPEG image bytes
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Tuple of (page_result_dict, metering_data)
+        """
+        if self.backend == "none":
+            return self._process_single_page_none(
+                page_index, None, output_bucket, prefix, page_image=img_bytes
+            )
+        elif self.backend == "bedrock":
+            return self._process_single_page_bedrock(
+                page_index, None, output_bucket, prefix, page_image=img_bytes
+            )
+        elif self.backend == "auto":
+            # The text layer is read from this thread's own document handle
+            return self._process_single_page_auto(
+                page_index,
+                self._thread_document(),
+                output_bucket,
+                prefix,
+                page_image=img_bytes,
+            )
+        else:
+            return self._process_single_page_textract(
+                page_index, None, output_bucket, prefix, page_image=img_bytes
+            )
+
     def _process_image_file_direct(
         self,
         pdf_document: fitz.Document,
@@ -801,7 +1463,9 @@ class OcrService:
 
         # Store image with appropriate format
         image_key = f"{prefix}/pages/{page_id}/image.{img_ext}"
-        s3.write_content(img_data, output_bucket, image_key, content_type=content_type)
+        image_variants = self._write_page_image(
+            img_data, output_bucket, image_key, content_type=content_type
+        )
 
         t1 = time.time()
         logger.debug(
@@ -818,7 +1482,7 @@ class OcrService:
 
             # Store empty raw OCR response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_artifact(
                 empty_ocr_response,
                 output_bucket,
                 raw_text_key,
@@ -831,7 +1495,7 @@ class OcrService:
             }
 
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_artifact(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
@@ -841,7 +1505,7 @@ class OcrService:
             # Store empty parsed text result
             parsed_result = {"text": ""}
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_artifact(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
@@ -851,14 +1515,7 @@ class OcrService:
         elif self.backend == "bedrock":
             # Process with Bedrock
             # Apply preprocessing if enabled
-            ocr_img_data = img_data
-            if self.preprocessing_config and self.preprocessing_config.get("enabled"):
-                from idp_common.image import apply_adaptive_binarization
-
-                ocr_img_data = apply_adaptive_binarization(ocr_img_data)
-                logger.debug(
-                    "Applied adaptive binarization preprocessing for Bedrock OCR"
-                )
+            ocr_img_data = self._preprocess_image(img_data)
 
             # Prepare image for Bedrock
             image_content = image.prepare_bedrock_image_attachment(ocr_img_data)
@@ -884,7 +1541,7 @@ class OcrService:
 
             # Store raw Bedrock response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_artifact(
                 response_with_metering["response"],
                 output_bucket,
                 raw_text_key,
@@ -897,7 +1554,7 @@ class OcrService:
             }
 
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_artifact(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
@@ -907,7 +1564,7 @@ class OcrService:
             # Store parsed text result
             parsed_result = {"text": extracted_text}
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_artifact(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
@@ -917,19 +1574,14 @@ class OcrService:
         else:
             # Process with Textract (default)
             # Apply preprocessing if enabled
-            ocr_img_data = img_data
-            if self.preprocessing_config and self.preprocessing_config.get("enabled"):
-                from idp_common.image import apply_adaptive_binarization
-
-                ocr_img_data = apply_adaptive_binarization(ocr_img_data)
-                logger.debug("Applied adaptive binarization preprocessing for OCR")
+            ocr_img_data = self._preprocess_image(img_data)
 
             # Process with OCR
             if isinstance(self.enhanced_features, list) and self.enhanced_features:
                 textract_result = self._analyze_document(ocr_img_data, page_id)
             else:
-                textract_result = self.textract_client.detect_document_text(
-                    Document={"Bytes": ocr_img_data}
+                textract_result = self._call_textract(
+                    "detect_document_text", Document={"Bytes": ocr_img_data}
                 )
 
             # Extract metering data
@@ -942,7 +1594,7 @@ class OcrService:
 
             # Store raw Textract response
             raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-            s3.write_content(
+            self._write_artifact(
                 textract_result,
                 output_bucket,
                 raw_text_key,
@@ -952,7 +1604,7 @@ class OcrService:
             # Generate and store text confidence data
             text_confidence_data = self._generate_text_confidence_data(textract_result)
             text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-            s3.write_content(
+            self._write_artifact(
                 text_confidence_data,
                 output_bucket,
                 text_confidence_key,
@@ -962,7 +1614,7 @@ class OcrService:
             # Parse and store text content
             parsed_result = self._parse_textract_response(textract_result, page_id)
             parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-            s3.write_content(
+            self._write_artifact(
                 parsed_result,
                 output_bucket,
                 parsed_text_key,
@@ -977,7 +1629,7 @@ class OcrService:
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
             "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
             "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
+            **self._image_uris(output_bucket, image_key, image_variants),
         }
 
         return result, metering
@@ -1004,7 +1656,10 @@ class OcrService:
                     memory_info = process.memory_info()
                     memory_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
 
-                    logger.info(f"Memory usage: {memory_mb:.1f} MB")
+                    logger.info(
+                        f"Memory usage: {memory_mb:.1f} MB "
+                        f"(page budget: {self.memory_budget.stats})"
+                    )
 
                     # Warning if memory usage is getting high
                     if memory_mb > 3500:
@@ -1030,18 +1685,23 @@ class OcrService:
     def _process_single_page_textract(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        pdf_document: Optional[fitz.Document],
         output_bucket: str,
         prefix: str,
+        page_image: Optional[bytes] = None,
+        image_fields: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
         Process a single page using AWS Textract.
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            pdf_document: PyMuPDF document object (unused if page_image is given)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
+            page_image: Optional pre-rendered JPEG bytes from the rasterizer
+            image_fields: Page result image fields if page_image was already
+                written to S3, in which case it is not written again
 
         Returns:
             Tuple of (page_result_dict, metering_data)
@@ -1050,47 +1710,50 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image - now returns image at optimal size directly
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        if page_image is None:
+            page = pdf_document.load_page(page_index)
+            img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        else:
+            img_bytes = page_image
 
         # Upload processed image to S3 (already at target size if resize config exists)
-        image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        if image_fields is None:
+            image_key = f"{prefix}/pages/{page_id}/image.jpg"
+            image_variants = self._write_page_image(img_bytes, output_bucket, image_key)
+            image_fields = self._image_uris(output_bucket, image_key, image_variants)
 
         t1 = time.time()
         logger.debug(
             f"Time for image processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
-        # Use the extracted image directly for OCR (no additional resize needed)
-        ocr_img_bytes = img_bytes
+        # Serve identical pages from the result cache instead of calling Textract
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = compute_cache_key(img_bytes, self._cache_fingerprint())
+            cached_result = self._restore_cached_page(
+                cache_key, output_bucket, prefix, page_id
+            )
+            if cached_result is not None:
+                cached_result.update(image_fields)
+                return cached_result, {"OCR/cache/hit": {"pages": 1}}
 
         # Apply preprocessing if enabled (only for OCR processing, not saved image)
-        if self.preprocessing_config and self.preprocessing_config.get("enabled"):
-            from idp_common.image import apply_adaptive_binarization
-
-            ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
-            logger.debug(
-                f"Applied adaptive binarization preprocessing for OCR processing (page {page_id})"
-            )
+        ocr_img_bytes = self._preprocess_image(img_bytes, page_id)
 
         # Process with OCR using potentially resized image
         if isinstance(self.enhanced_features, list) and self.enhanced_features:
             textract_result = self._analyze_document(ocr_img_bytes, page_id)
         else:
-            textract_result = self.textract_client.detect_document_text(
-                Document={"Bytes": ocr_img_bytes}
+            textract_result = self._call_textract(
+                "detect_document_text", Document={"Bytes": ocr_img_bytes}
             )
 
-        # Aggressive memory cleanup - clear large image variables immediately after OCR
+        # Release the image buffers before parsing; the memory budget, not
+        # garbage collection, bounds how many pages hold images at once
         img_bytes = None
         ocr_img_bytes = None
 
-        # Force garbage collection after processing large images
-        import gc
-
-        gc.collect()
-
         # Extract metering data
         feature_combo = self._feature_combo()
         metering = {
@@ -1099,173 +1762,593 @@ class OcrService:
             }
         }
 
-        # Store raw Textract response
-        raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
-            textract_result,
-            output_bucket,
-            raw_text_key,
-            content_type="application/json",
-        )
-
-        # Generate and store text confidence data for efficient assessment
-        text_confidence_data = self._generate_text_confidence_data(textract_result)
-        text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
-            text_confidence_data,
-            output_bucket,
-            text_confidence_key,
-            content_type="application/json",
-        )
-
-        # Parse and store text content with markdown
-        parsed_result = self._parse_textract_response(textract_result, page_id)
-        parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
-            parsed_result,
-            output_bucket,
-            parsed_text_key,
-            content_type="application/json",
+        # Store raw response, text confidence data and parsed text
+        result = self._write_textract_artifacts(
+            textract_result, output_bucket, prefix, page_id
         )
+        result.update(image_fields)
 
         t2 = time.time()
         logger.debug(f"Time for Textract (page {page_id}): {t2 - t1:.6f} seconds")
 
-        # Create and return page result
-        result = {
-            "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
-            "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
-            "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
-        }
+        if cache_key is not None:
+            entry = {
+                "raw_text_uri": result["raw_text_uri"],
+                "parsed_text_uri": result["parsed_text_uri"],
+                "text_confidence_uri": result["text_confidence_uri"],
+                "metering": metering,
+            }
+            if self._upload_pipeline is not None:
+                # The artifacts are still queued; _add_page_results saves the
+                # entry once the pipeline confirms they were uploaded
+                self._pending_cache_entries[str(page_id)] = (cache_key, entry)
+            else:
+                self.result_cache.save(cache_key, entry)
 
         return result, metering
 
-    def _extract_page_image(self, page: fitz.Page, is_pdf: bool, page_id: int) -> bytes:
+    def _preprocess_image(
+        self, img_bytes: bytes, page_id: Optional[int] = None
+    ) -> bytes:
+        """Apply the configured preprocessing to an image sent to OCR."""
+        if self.preprocessing_pipeline is None:
+            return img_bytes
+        t0 = time.time()
+        processed = self.preprocessing_pipeline.process(img_bytes)
+        logger.debug(
+            f"Applied image preprocessing for OCR"
+            f"{f' (page {page_id})' if page_id else ''} in {time.time() - t0:.3f}s"
+        )
+        return processed
+
+    def _call_textract(self, operation: str, **kwargs) -> Dict[str, Any]:
         """
-        Extract image bytes from a page at optimal size to prevent memory issues.
+        Call a synchronous Textract operation, under the AIMD governor if enabled.
 
-        If resize config is provided, images are extracted directly at target dimensions
-        to avoid creating oversized images that cause OutOfMemory errors.
+        Args:
+            operation: Textract client method name
+            **kwargs: API parameters
+
+        Returns:
+            Textract API response
+        """
+        api = getattr(self.textract_client, operation)
+        if self.textract_governor is None:
+            return api(**kwargs)
+        return self.textract_governor.call(api, **kwargs)
+
+    def _write_textract_artifacts(
+        self,
+        textract_result: Dict[str, Any],
+        output_bucket: str,
+        prefix: str,
+        page_id: int,
+    ) -> Dict[str, str]:
+        """
+        Write the rawText, textConfidence and result artifacts for a Textract page.
 
         Args:
-            page: PyMuPDF page object
-            is_pdf: Whether the document is a PDF file
-            page_id: Page number for logging
+            textract_result: Single-page Textract response
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+            page_id: One-based page number
 
         Returns:
-            Image bytes in JPEG format (at target size if resize config exists)
+            Dict with raw_text_uri, parsed_text_uri and text_confidence_uri
         """
-        pix = None
-        try:
-            # Check if we should extract at target size to avoid memory issues
-            if self.resize_config:
-                target_width = self.resize_config.get("target_width")
-                target_height = self.resize_config.get("target_height")
+        # Store raw Textract response
+        raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
+        self._write_artifact(
+            textract_result,
+            output_bucket,
+            raw_text_key,
+            content_type="application/json",
+        )
 
-                if target_width and target_height:
-                    # Get page dimensions to calculate scaling
-                    page_rect = page.rect
+        # Index the blocks once for both the confidence data and the markdown
+        index = textract_parser.TextractBlockIndex(textract_result)
 
-                    if is_pdf:
-                        # For PDF files, calculate dimensions at specified DPI (default to 150 if None)
-                        dpi = self.dpi or 150
-                        original_width = int(page_rect.width * (dpi / 72))
-                        original_height = int(page_rect.height * (dpi / 72))
-                    else:
-                        # For image files, use actual dimensions
-                        original_width = int(page_rect.width)
-                        original_height = int(page_rect.height)
-
-                    # Apply same logic as image.resize_image - preserve aspect ratio, never upscale
-                    width_ratio = target_width / original_width
-                    height_ratio = target_height / original_height
-                    scale_factor = min(
-                        width_ratio, height_ratio
-                    )  # Preserve aspect ratio
-
-                    # Only resize if scale_factor < 1.0 (never upscale)
-                    if scale_factor < 1.0:
-                        # Extract at reduced size using matrix transformation
-                        if is_pdf:
-                            # For PDF, combine DPI scaling with size reduction
-                            dpi = self.dpi or 150
-                            base_scale = dpi / 72  # Convert PDF points to pixels
-                            final_scale = base_scale * scale_factor
-                            matrix = fitz.Matrix(final_scale, final_scale)
-                        else:
-                            # For images, just apply the scale factor
-                            matrix = fitz.Matrix(scale_factor, scale_factor)
+        # Generate and store text confidence data for efficient assessment
+        text_confidence_data = self._generate_text_confidence_data(
+            textract_result, index=index
+        )
+        text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
+        self._write_artifact(
+            text_confidence_data,
+            output_bucket,
+            text_confidence_key,
+            content_type="application/json",
+        )
 
-                        pix = page.get_pixmap(matrix=matrix)
+        # Parse and store text content with markdown
+        parsed_result = self._parse_textract_response(
+            textract_result, page_id, index=index
+        )
+        parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
+        self._write_artifact(
+            parsed_result,
+            output_bucket,
+            parsed_text_key,
+            content_type="application/json",
+        )
 
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Extracted page {page_id} at target size: {actual_width}x{actual_height} (scale: {scale_factor:.3f})"
-                        )
+        return {
+            "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
+            "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
+            "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
+        }
 
-                    else:
-                        # No resize needed - image is already smaller than targets
-                        if is_pdf:
-                            dpi = self.dpi or 150
-                            pix = page.get_pixmap(dpi=dpi)
-                        else:
-                            pix = page.get_pixmap()
+    def _use_async_textract(self, pdf_document: fitz.Document, num_pages: int) -> bool:
+        """
+        Decide whether a document is sent to Textract as one asynchronous job.
 
-                        # Log actual extracted dimensions
-                        actual_width, actual_height = pix.width, pix.height
-                        logger.info(
-                            f"Page {page_id} already fits target size, extracted at: {actual_width}x{actual_height}"
-                        )
-                else:
-                    # No valid target dimensions - use original extraction
-                    if is_pdf:
-                        dpi = self.dpi or 150
-                        pix = page.get_pixmap(dpi=dpi)
-                    else:
-                        pix = page.get_pixmap()
+        Async jobs read the original PDF from S3, so they are only used for PDFs
+        with the plain "textract" backend and no image preprocessing.
+        """
+        return (
+            self.async_page_threshold > 0
+            and num_pages >= self.async_page_threshold
+            and self.backend == "textract"
+            and pdf_document.is_pdf
+            and not (
+                self.preprocessing_config and self.preprocessing_config.get("enabled")
+            )
+        )
 
-                    # Log actual extracted dimensions
-                    actual_width, actual_height = pix.width, pix.height
-                    logger.info(
-                        f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
-                    )
+    def _submit_async_textract_pages(
+        self,
+        executor: concurrent.futures.ThreadPoolExecutor,
+        input_bucket: str,
+        input_key: str,
+        num_pages: int,
+        output_bucket: str,
+        prefix: str,
+    ) -> Dict[concurrent.futures.Future, int]:
+        """
+        Process a PDF with one asynchronous Textract job.
+
+        Page images are rendered and uploaded by the executor while the job runs.
+        Once the job completes, each page's blocks are written as the usual
+        per-page artifacts. If the job cannot be started or fails, pages fall
+        back to synchronous per-page Textract calls; after a failed job these
+        reuse the page images already uploaded.
+
+        Args:
+            executor: Thread pool running page work
+            input_bucket: S3 bucket of the source PDF
+            input_key: S3 key of the source PDF
+            num_pages: Number of pages in the document
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Dict mapping each page future to its zero-based page index
+        """
+        feature_types = (
+            self.enhanced_features
+            if isinstance(self.enhanced_features, list) and self.enhanced_features
+            else None
+        )
+        blocks_by_page = None
+        try:
+            job_id = textract_async.start_job(
+                self.textract_client, input_bucket, input_key, feature_types
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not start async Textract job, using synchronous calls: {str(e)}"
+            )
+            job_id = None
+
+        if job_id is None:
+            return {
+                executor.submit(
+                    self._call_with_thread_document,
+                    self._process_single_page_textract,
+                    i,
+                    output_bucket=output_bucket,
+                    prefix=prefix,
+                ): i
+                for i in range(num_pages)
+            }
+
+        # Render and upload page images while Textract works on the document
+        image_futures = [
+            executor.submit(
+                self._call_with_thread_document,
+                self._upload_page_image,
+                i,
+                output_bucket=output_bucket,
+                prefix=prefix,
+            )
+            for i in range(num_pages)
+        ]
+
+        try:
+            blocks_by_page = textract_async.wait_for_job(
+                self.textract_client,
+                job_id,
+                analysis=feature_types is not None,
+                poll_interval=self.async_poll_interval,
+                timeout=self.async_timeout,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Async Textract job {job_id} did not complete, "
+                f"using synchronous calls: {str(e)}"
+            )
+
+        if blocks_by_page is None:
+            # The fallback reads the page images back instead of rendering and
+            # uploading them again, so they must have reached S3
+            concurrent.futures.wait(image_futures)
+            if self._upload_pipeline is not None:
+                self._upload_pipeline.drain()
+
+        # Page futures are queued after all image futures, so the image each one
+        # waits for is already running or finished
+        future_to_page = {}
+        for i in range(num_pages):
+            if blocks_by_page is None:
+                future = executor.submit(
+                    self._process_async_fallback_page,
+                    i,
+                    image_futures[i],
+                    output_bucket,
+                    prefix,
+                )
             else:
-                # No resize config - extract at original size
-                if is_pdf:
-                    dpi = self.dpi or 150
-                    pix = page.get_pixmap(dpi=dpi)
-                else:
-                    pix = page.get_pixmap()
+                future = executor.submit(
+                    self._process_async_textract_page,
+                    i,
+                    blocks_by_page.get(i + 1),
+                    image_futures[i],
+                    output_bucket,
+                    prefix,
+                )
+            future_to_page[future] = i
+        return future_to_page
 
-                # Log actual extracted dimensions
-                actual_width, actual_height = pix.width, pix.height
-                logger.info(
-                    f"Page {page_id} extracted at original size: {actual_width}x{actual_height}"
+    def _upload_page_image(
+        self,
+        page_index: int,
+        pdf_document: fitz.Document,
+        output_bucket: str,
+        prefix: str,
+    ) -> Dict[str, Any]:
+        """
+        Render a page and write its image artifacts, returning the page result
+        image fields.
+        """
+        page_id = page_index + 1
+        with self.memory_budget.reserve(
+            self._estimate_page_memory(pdf_document, page_index)
+        ):
+            page = pdf_document.load_page(page_index)
+            img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+            image_key = f"{prefix}/pages/{page_id}/image.jpg"
+            image_variants = self._write_page_image(img_bytes, output_bucket, image_key)
+        return self._image_uris(output_bucket, image_key, image_variants)
+
+    def _process_async_fallback_page(
+        self,
+        page_index: int,
+        image_future: concurrent.futures.Future,
+        output_bucket: str,
+        prefix: str,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Process a page of a failed asynchronous Textract job synchronously.
+
+        The page image uploaded while the job ran is read back from S3; the page
+        is only rendered again if that upload or read failed.
+
+        Args:
+            page_index: Zero-based index of the page
+            image_future: Future of the page image upload
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Tuple of (page_result_dict, metering_data)
+        """
+        try:
+            image_fields = image_future.result()
+            page_image = s3.get_binary_content(image_fields["image_uri"])
+        except Exception as e:
+            logger.warning(
+                f"Could not reuse the image of page {page_index + 1}, "
+                f"rendering it again: {str(e)}"
+            )
+            return self._call_with_thread_document(
+                self._process_single_page_textract,
+                page_index,
+                output_bucket=output_bucket,
+                prefix=prefix,
+            )
+        return self._process_single_page_textract(
+            page_index,
+            None,
+            output_bucket,
+            prefix,
+            page_image=page_image,
+            image_fields=image_fields,
+        )
+
+    def _process_async_textract_page(
+        self,
+        page_index: int,
+        page_blocks: Optional[List[Dict[str, Any]]],
+        image_future: concurrent.futures.Future,
+        output_bucket: str,
+        prefix: str,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Write the artifacts for one page of an asynchronous Textract job.
+
+        Args:
+            page_index: Zero-based index of the page
+            page_blocks: Blocks for this page, or None if the job returned none
+            image_future: Future of the page image upload
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Tuple of (page_result_dict, metering_data)
+        """
+        page_id = page_index + 1
+        if not page_blocks:
+            raise RuntimeError(
+                f"Async Textract job returned no blocks for page {page_id}"
+            )
+
+        textract_result = textract_async.page_response(page_blocks)
+        result = self._write_textract_artifacts(
+            textract_result, output_bucket, prefix, page_id
+        )
+        result.update(image_future.result())
+
+        # Async jobs are billed per page at the same rate as synchronous calls
+        metering = {
+            f"OCR/textract/{self._get_api_name()}{self._feature_combo()}": {"pages": 1}
+        }
+        return result, metering
+
+    def _cache_fingerprint(self) -> Dict[str, Any]:
+        """Return the OCR settings that are part of the result cache key."""
+        features = (
+            sorted(self.enhanced_features)
+            if isinstance(self.enhanced_features, list)
+            else []
+        )
+        return {
+            "api": self._get_api_name(),
+            "features": features,
+            "preprocessing": (
+                {
+                    "engine": self.preprocessing_pipeline.engine,
+                    "steps": self.preprocessing_pipeline.steps,
+                }
+                if self.preprocessing_pipeline is not None
+                else False
+            ),
+            "dpi": self.dpi,
+            "resize": self.resize_config,
+        }
+
+    def _restore_cached_page(
+        self, cache_key: str, output_bucket: str, prefix: str, page_id: int
+    ) -> Optional[Dict[str, str]]:
+        """
+        Copy cached Textract artifacts for a page into this document's prefix.
+
+        Args:
+            cache_key: Content address of the page
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+            page_id: One-based page number
+
+        Returns:
+            Dict with raw_text_uri, parsed_text_uri and text_confidence_uri, or
+            None on a cache miss or if the cached artifacts can no longer be read
+        """
+        entry = self.result_cache.lookup(cache_key)
+        if entry is None:
+            return None
+
+        artifacts = {
+            "raw_text_uri": "rawText.json",
+            "text_confidence_uri": "textConfidence.json",
+            "parsed_text_uri": "result.json",
+        }
+        result = {}
+        try:
+            for uri_name, filename in artifacts.items():
+                source_bucket, source_key = entry[uri_name][len("s3://") :].split(
+                    "/", 1
                 )
+                target_key = f"{prefix}/pages/{page_id}/{filename}"
+                if (source_bucket, source_key) == (output_bucket, target_key):
+                    # Reprocessing the same document: artifacts are already in place
+                    self.s3_client.head_object(Bucket=source_bucket, Key=source_key)
+                else:
+                    self.s3_client.copy_object(
+                        Bucket=output_bucket,
+                        Key=target_key,
+                        CopySource={"Bucket": source_bucket, "Key": source_key},
+                        ContentType="application/json",
+                        MetadataDirective="REPLACE",
+                    )
+                result[uri_name] = f"s3://{output_bucket}/{target_key}"
+        except Exception as e:
+            logger.warning(
+                f"Cached OCR artifacts for page {page_id} unavailable, "
+                f"running OCR instead: {str(e)}"
+            )
+            self.result_cache.record_miss()
+            return None
 
-            image_bytes = pix.tobytes("jpeg")
-            return image_bytes
-        finally:
-            # Aggressive cleanup of PyMuPDF pixmap to prevent memory leaks
-            if pix is not None:
-                pix = None
+        self.result_cache.record_hit()
+        logger.info(f"OCR result cache hit for page {page_id}")
+        return result
 
-    def _process_single_page_bedrock(
+    def _process_single_page_auto(
         self,
         page_index: int,
         pdf_document: fitz.Document,
         output_bucket: str,
         prefix: str,
+        page_image: Optional[bytes] = None,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
-        Process a single page using Amazon Bedrock LLM.
+        Process a single page using its native text layer, or Textract if unusable.
 
         Args:
             page_index: Zero-based index of the page
             pdf_document: PyMuPDF document object
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
+            page_image: Optional pre-rendered JPEG bytes from the rasterizer
+
+        Returns:
+            Tuple of (page_result_dict, metering_data)
+        """
+        page_id = page_index + 1
+        page = pdf_document.load_page(page_index)
+        quality = text_layer.analyze_text_layer(page, **self.text_layer_thresholds)
+
+        if not quality.usable:
+            logger.info(
+                f"Page {page_id}: using Textract ({quality.reason}, "
+                f"chars={quality.char_count}, font_coverage={quality.font_coverage:.2f}, "
+                f"garbage_ratio={quality.garbage_ratio:.3f})"
+            )
+            return self._process_single_page_textract(
+                page_index, pdf_document, output_bucket, prefix, page_image=page_image
+            )
+
+        logger.info(
+            f"Page {page_id}: using native text layer (chars={quality.char_count}, "
+            f"font_coverage={quality.font_coverage:.2f}, "
+            f"garbage_ratio={quality.garbage_ratio:.3f})"
+        )
+        return self._process_single_page_text_layer(
+            page_index, pdf_document, output_bucket, prefix, page_image=page_image
+        )
+
+    def _process_single_page_text_layer(
+        self,
+        page_index: int,
+        pdf_document: fitz.Document,
+        output_bucket: str,
+        prefix: str,
+        page_image: Optional[bytes] = None,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Process a single page from its embedded PDF text layer without calling OCR.
+
+        Args:
+            page_index: Zero-based index of the page
+            pdf_document: PyMuPDF document object
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+            page_image: Optional pre-rendered JPEG bytes from the rasterizer
+
+        Returns:
+            Tuple of (page_result_dict, metering_data)
+        """
+        t0 = time.time()
+        page_id = page_index + 1
+        page = pdf_document.load_page(page_index)
+
+        # The page image is still needed by classification, extraction and the UI
+        if page_image is None:
+            img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        else:
+            img_bytes = page_image
+
+        image_key = f"{prefix}/pages/{page_id}/image.jpg"
+        image_variants = self._write_page_image(img_bytes, output_bucket, image_key)
+        img_bytes = None
+
+        # Build a Textract-compatible response so downstream consumers are unchanged
+        text_layer_result = text_layer.build_textract_response(page)
+
+        raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
+        self._write_artifact(
+            text_layer_result,
+            output_bucket,
+            raw_text_key,
+            content_type="application/json",
+        )
+
+        text_confidence_data = self._generate_text_confidence_data(text_layer_result)
+        text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
+        self._write_artifact(
+            text_confidence_data,
+            output_bucket,
+            text_confidence_key,
+            content_type="application/json",
+        )
+
+        parsed_result = {"text": text_layer.text_from_response(text_layer_result)}
+        parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
+        self._write_artifact(
+            parsed_result,
+            output_bucket,
+            parsed_text_key,
+            content_type="application/json",
+        )
+
+        t1 = time.time()
+        logger.debug(f"Time for text layer (page {page_id}): {t1 - t0:.6f} seconds")
+
+        # Record the path taken so cost reporting can tell skipped OCR pages apart
+        metering = {"OCR/text_layer/native": {"pages": 1}}
+
+        result = {
+            "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
+            "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
+            "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
+            **self._image_uris(output_bucket, image_key, image_variants),
+        }
+
+        return result, metering
+
+    def _extract_page_image(self, page: fitz.Page, is_pdf: bool, page_id: int) -> bytes:
+        """
+        Extract image bytes from a page at optimal size to prevent memory issues.
+
+        If resize config is provided, images are extracted directly at target dimensions
+        to avoid creating oversized images that cause OutOfMemory errors.
+
+        Args:
+            page: PyMuPDF page object
+            is_pdf: Whether the document is a PDF file
+            page_id: Page number for logging
+
+        Returns:
+            Image bytes in JPEG format (at target size if resize config exists)
+        """
+        return render_page_image(page, is_pdf, page_id, self.dpi, self.resize_config)
+
+    def _process_single_page_bedrock(
+        self,
+        page_index: int,
+        pdf_document: Optional[fitz.Document],
+        output_bucket: str,
+        prefix: str,
+        page_image: Optional[bytes] = None,
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Process a single page using Amazon Bedrock LLM.
+
+        Args:
+            page_index: Zero-based index of the page
+            pdf_document: PyMuPDF document object (unused if page_image is given)
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+            page_image: Optional pre-rendered JPEG bytes from the rasterizer
 
         Returns:
             Tuple of (page_result_dict, metering_data)
@@ -1274,29 +2357,23 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image - now returns image at optimal size directly
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        if page_image is None:
+            page = pdf_document.load_page(page_index)
+            img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        else:
+            img_bytes = page_image
 
         # Upload processed image to S3 (already at target size if resize config exists)
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        image_variants = self._write_page_image(img_bytes, output_bucket, image_key)
 
         t1 = time.time()
         logger.debug(
             f"Time for image processing (page {page_id}): {t1 - t0:.6f} seconds"
         )
 
-        # Use the extracted image directly for OCR (no additional resize needed)
-        ocr_img_bytes = img_bytes
-
         # Apply preprocessing if enabled (only for OCR processing, not saved image)
-        if self.preprocessing_config and self.preprocessing_config.get("enabled"):
-            from idp_common.image import apply_adaptive_binarization
-
-            ocr_img_bytes = apply_adaptive_binarization(ocr_img_bytes)
-            logger.debug(
-                f"Applied adaptive binarization preprocessing for Bedrock OCR processing (page {page_id})"
-            )
+        ocr_img_bytes = self._preprocess_image(img_bytes, page_id)
 
         # Prepare image for Bedrock
         image_content = image.prepare_bedrock_image_attachment(ocr_img_bytes)
@@ -1325,7 +2402,7 @@ class OcrService:
 
         # Store raw Bedrock response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_artifact(
             response_with_metering["response"],
             output_bucket,
             raw_text_key,
@@ -1339,7 +2416,7 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_artifact(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1349,7 +2426,7 @@ class OcrService:
         # Store parsed text result
         parsed_result = {"text": extracted_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_artifact(
             parsed_result,
             output_bucket,
             parsed_text_key,
@@ -1361,7 +2438,7 @@ class OcrService:
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
             "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
             "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
+            **self._image_uris(output_bucket, image_key, image_variants),
         }
 
         return result, metering
@@ -1369,18 +2446,20 @@ class OcrService:
     def _process_single_page_none(
         self,
         page_index: int,
-        pdf_document: fitz.Document,
+        pdf_document: Optional[fitz.Document],
         output_bucket: str,
         prefix: str,
+        page_image: Optional[bytes] = None,
     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
         """
         Process a single page with no OCR (image-only processing).
 
         Args:
             page_index: Zero-based index of the page
-            pdf_document: PyMuPDF document object
+            pdf_document: PyMuPDF document object (unused if page_image is given)
             output_bucket: S3 bucket to store results
             prefix: S3 prefix for storing results
+            page_image: Optional pre-rendered JPEG bytes from the rasterizer
 
         Returns:
             Tuple of (page_result_dict, metering_data)
@@ -1389,12 +2468,15 @@ class OcrService:
         page_id = page_index + 1
 
         # Extract page image at specified DPI (consistent with other backends)
-        page = pdf_document.load_page(page_index)
-        img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        if page_image is None:
+            page = pdf_document.load_page(page_index)
+            img_bytes = self._extract_page_image(page, pdf_document.is_pdf, page_id)
+        else:
+            img_bytes = page_image
 
         # Upload image to S3
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(img_bytes, output_bucket, image_key, content_type="image/jpeg")
+        image_variants = self._write_page_image(img_bytes, output_bucket, image_key)
 
         t1 = time.time()
         logger.debug(
@@ -1406,7 +2488,7 @@ class OcrService:
 
         # Store empty raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_artifact(
             empty_ocr_response,
             output_bucket,
             raw_text_key,
@@ -1419,7 +2501,7 @@ class OcrService:
         }
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_artifact(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1429,7 +2511,7 @@ class OcrService:
         # Store empty parsed text result
         parsed_result = {"text": ""}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_artifact(
             parsed_result,
             output_bucket,
             parsed_text_key,
@@ -1449,7 +2531,7 @@ class OcrService:
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
             "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
             "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
+            **self._image_uris(output_bucket, image_key, image_variants),
         }
 
         return result, metering
@@ -1478,8 +2560,10 @@ class OcrService:
         )
 
         try:
-            response = self.textract_client.analyze_document(
-                Document={"Bytes": document_bytes}, FeatureTypes=self.enhanced_features
+            response = self._call_textract(
+                "analyze_document",
+                Document={"Bytes": document_bytes},
+                FeatureTypes=self.enhanced_features,
             )
 
             # Log the types of response blocks received
@@ -1514,7 +2598,9 @@ class OcrService:
         )
 
     def _generate_text_confidence_data(
-        self, raw_ocr_data: Dict[str, Any]
+        self,
+        raw_ocr_data: Dict[str, Any],
+        index: Optional[textract_parser.TextractBlockIndex] = None,
     ) -> Dict[str, Any]:
         """
         Generate text confidence data from raw OCR to reduce token usage while preserving essential information.
@@ -1528,6 +2614,8 @@ class OcrService:
 
         Args:
             raw_ocr_data: Raw Textract API response
+            index: Optional prebuilt block index, whose LINE blocks are used
+                instead of rescanning all blocks
 
         Returns:
             Text confidence data as markdown table with ~80-90% token reduction
@@ -1535,7 +2623,7 @@ class OcrService:
         # Start building the markdown table with explicit left alignment
         markdown_lines = ["| Text | Confidence |", "|:-----|:-----------|"]
 
-        blocks = raw_ocr_data.get("Blocks", [])
+        blocks = index.lines if index is not None else raw_ocr_data.get("Blocks", [])
 
         for block in blocks:
             if block.get("BlockType") == "LINE" and block.get("Text"):
@@ -1556,27 +2644,60 @@ class OcrService:
         return {"text": markdown_table}
 
     def _parse_textract_response(
-        self, response: Dict[str, Any], page_id: int = None
+        self,
+        response: Dict[str, Any],
+        page_id: int = None,
+        index: Optional[textract_parser.TextractBlockIndex] = None,
     ) -> Dict[str, str]:
         """
         Parse Textract response into text.
 
+        Uses the in-package single-pass parser unless markdown_parser is
+        "textractor"; textractor is also the fallback if the native parser fails.
+
         Args:
             response: Raw Textract API response
             page_id: Optional page number for logging purposes
+            index: Optional prebuilt block index shared with other consumers
 
         Returns:
             Dictionary with 'text' key containing extracted text
         """
-        from textractor.parsers import response_parser
-
         # Create page identifier for logging
         page_info = f" for page {page_id}" if page_id else ""
 
         # Log enhanced features at debug level
         logger.debug(f"Enhanced features{page_info}: {self.enhanced_features}")
 
+        if self.markdown_parser == "native":
+            try:
+                text = textract_parser.to_markdown(response, index=index)
+                logger.debug(f"Successfully extracted markdown text{page_info}")
+                return {"text": text}
+            except Exception as e:
+                logger.warning(
+                    f"Native Textract parsing failed{page_info}, "
+                    f"falling back to textractor: {str(e)}"
+                )
+
+        return self._parse_with_textractor(response, page_info)
+
+    def _parse_with_textractor(
+        self, response: Dict[str, Any], page_info: str
+    ) -> Dict[str, str]:
+        """
+        Parse Textract response into text with textractor.
+
+        Args:
+            response: Raw Textract API response
+            page_info: Page identifier suffix for log messages
+
+        Returns:
+            Dictionary with 'text' key containing extracted text
+        """
         try:
+            from textractor.parsers import response_parser
+
             # Parse the response with textractor - debug level
             logger.debug(f"Parsing Textract response{page_info} with textractor")
             parsed_response = response_parser.parse(response)
@@ -1690,42 +2811,110 @@ class OcrService:
         Returns:
             List of tuples (image_bytes, page_text)
         """
+        return list(self._iter_non_pdf_pages(file_type, content))
+
+    def _iter_non_pdf_pages(
+        self, file_type: str, content: bytes
+    ) -> Iterator[Tuple[bytes, str]]:
+        """
+        Convert a non-PDF document to pages, one page at a time.
+
+        Args:
+            file_type: Type of the file
+            content: File content bytes
+
+        Yields:
+            Tuples (image_bytes, page_text)
+        """
+        yielded = False
         try:
             if file_type == "txt":
                 text_content = content.decode("utf-8")
-                return self.document_converter.convert_text_to_pages(text_content)
+                pages = self.document_converter.iter_text_pages(text_content)
 
             elif file_type == "csv":
                 text_content = content.decode("utf-8")
-                return self.document_converter.convert_csv_to_pages(text_content)
+                pages = self.document_converter.iter_csv_pages(text_content)
 
             elif file_type == "xlsx":
-                return self.document_converter.convert_excel_to_pages(content)
+                pages = self.document_converter.iter_excel_pages(content)
 
             elif file_type == "docx":
-                return self.document_converter.convert_word_to_pages(content)
+                pages = self.document_converter.iter_word_pages(content)
 
             else:
                 # Fallback to text
                 try:
                     text_content = content.decode("utf-8")
-                    return self.document_converter.convert_text_to_pages(text_content)
+                    pages = self.document_converter.iter_text_pages(text_content)
                 except UnicodeDecodeError:
-                    return [
+                    pages = [
                         (
                             self.document_converter._create_empty_page(),
                             "Error: Unable to process file",
                         )
                     ]
 
+            for page in pages:
+                yield page
+                yielded = True
+
         except Exception as e:
             logger.error(f"Error processing {file_type} document: {str(e)}")
-            return [
-                (
-                    self.document_converter._create_empty_page(),
-                    f"Error processing {file_type} document",
+            if yielded:
+                # Pages were already handed out; stopping quietly would
+                # truncate the document
+                raise
+            yield (
+                self.document_converter._create_empty_page(),
+                f"Error processing {file_type} document",
+            )
+
+    def _submit_converted_pages(
+        self,
+        executor: concurrent.futures.Executor,
+        file_type: str,
+        content: bytes,
+        output_bucket: str,
+        prefix: str,
+    ) -> Dict[concurrent.futures.Future, int]:
+        """
+        Convert a non-PDF document and submit each page as soon as it is rendered.
+
+        At most two pages per page worker are rendered but not yet processed,
+        so memory stays flat however many pages the document has.
+
+        Args:
+            executor: Thread pool processing the converted pages
+            file_type: Type of the file
+            content: File content bytes
+            output_bucket: S3 bucket to store results
+            prefix: S3 prefix for storing results
+
+        Returns:
+            Dict mapping each page future to its zero-based page index
+        """
+        pending = threading.BoundedSemaphore(max(1, self.page_workers) * 2)
+        future_to_page = {}
+        for page_index, (image_bytes, page_text) in enumerate(
+            self._iter_non_pdf_pages(file_type, content)
+        ):
+            pending.acquire()
+            try:
+                future = executor.submit(
+                    self._process_converted_page,
+                    page_index,
+                    image_bytes,
+                    page_text,
+                    output_bucket,
+                    prefix,
                 )
-            ]
+            except BaseException:
+                pending.release()
+                raise
+            future.add_done_callback(lambda _: pending.release())
+            future_to_page[future] = page_index
+        return future_to_page
 
     def _process_converted_page(
         self,
@@ -1753,9 +2942,7 @@ class OcrService:
 
         # Upload image to S3
         image_key = f"{prefix}/pages/{page_id}/image.jpg"
-        s3.write_content(
-            image_bytes, output_bucket, image_key, content_type="image/jpeg"
-        )
+        image_variants = self._write_page_image(image_bytes, output_bucket, image_key)
 
         # Create OCR response structure for compatibility
         ocr_response = {
@@ -1774,7 +2961,7 @@ class OcrService:
 
         # Store raw OCR response
         raw_text_key = f"{prefix}/pages/{page_id}/rawText.json"
-        s3.write_content(
+        self._write_artifact(
             ocr_response,
             output_bucket,
             raw_text_key,
@@ -1793,7 +2980,7 @@ class OcrService:
         text_confidence_data = {"text": markdown_table}
 
         text_confidence_key = f"{prefix}/pages/{page_id}/textConfidence.json"
-        s3.write_content(
+        self._write_artifact(
             text_confidence_data,
             output_bucket,
             text_confidence_key,
@@ -1803,7 +2990,7 @@ class OcrService:
         # Store parsed text result
         parsed_result = {"text": page_text}
         parsed_text_key = f"{prefix}/pages/{page_id}/result.json"
-        s3.write_content(
+        self._write_artifact(
             parsed_result,
             output_bucket,
             parsed_text_key,
@@ -1823,7 +3010,7 @@ class OcrService:
             "raw_text_uri": f"s3://{output_bucket}/{raw_text_key}",
             "parsed_text_uri": f"s3://{output_bucket}/{parsed_text_key}",
             "text_confidence_uri": f"s3://{output_bucket}/{text_confidence_key}",
-            "image_uri": f"s3://{output_bucket}/{image_key}",
+            **self._image_uris(output_bucket, image_key, image_variants),
         }
 
         return result, metering
@@ -0,0 +1,267 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Native PDF text-layer support for the OCR service's "auto" backend.
+
+Born-digital PDF pages already carry an embedded text layer, so running them
+through Textract only adds latency and cost. This module scores a page's
+PyMuPDF text layer (character count, font coverage and garbage ratio) and, for
+pages that pass, builds a Textract-compatible response so the usual
+``rawText.json``/``textConfidence.json``/``result.json`` artifacts can be
+produced without calling the OCR API.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Confidence assigned to text taken directly from the PDF text layer.
+# Matches the value used for converted (txt/csv/xlsx/docx) documents.
+TEXT_LAYER_CONFIDENCE = 99.0
+
+DEFAULT_MIN_CHARS = 50
+DEFAULT_MIN_FONT_COVERAGE = 0.9
+DEFAULT_MAX_GARBAGE_RATIO = 0.05
+
+# The 14 standard PDF fonts are always available to viewers, so their text
+# extracts reliably even when not embedded.
+STANDARD_FONTS = {
+    "courier",
+    "courier-bold",
+    "courier-oblique",
+    "courier-boldoblique",
+    "helvetica",
+    "helvetica-bold",
+    "helvetica-oblique",
+    "helvetica-boldoblique",
+    "times-roman",
+    "times-bold",
+    "times-italic",
+    "times-bolditalic",
+    "symbol",
+    "zapfdingbats",
+}
+
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")
+
+
+@dataclass
+class TextLayerQuality:
+    """Quality metrics for the embedded text layer of a single page."""
+
+    char_count: int = 0
+    font_coverage: float = 0.0
+    garbage_ratio: float = 1.0
+    usable: bool = False
+    reason: str = ""
+
+
+def _normalize_font_name(name: str) -> str:
+    """Strip the subset prefix (e.g. ``ABCDEF+``) and lowercase a font name."""
+    return _SUBSET_PREFIX.sub("", name or "").lower()
+
+
+def _is_garbage_char(char: str) -> bool:
+    """Return True for characters that indicate a broken ToUnicode mapping."""
+    if char == "\ufffd":
+        return True
+    category = unicodedata.category(char)
+    # Control (Cc), private use (Co), unassigned (Cn) and surrogates (Cs)
+    return category in ("Cc", "Co", "Cn", "Cs")
+
+
+def _reliable_fonts(page) -> set:
+    """Return normalized names of fonts on the page whose text extracts reliably."""
+    reliable = set()
+    for font in page.get_fonts():
+        # (xref, ext, type, basefont, name, encoding, ...)
+        ext, font_type, basefont = font[1], font[2], font[3]
+        normalized = _normalize_font_name(basefont)
+        if font_type == "Type3":
+            # Type3 glyphs are procedures with no reliable unicode mapping
+            continue
+        if ext != "n/a" or normalized in STANDARD_FONTS:
+            reliable.add(normalized)
+    return reliable
+
+
+def analyze_text_layer(
+    page,
+    min_chars: int = DEFAULT_MIN_CHARS,
+    min_font_coverage: float = DEFAULT_MIN_FONT_COVERAGE,
+    max_garbage_ratio: float = DEFAULT_MAX_GARBAGE_RATIO,
+) -> TextLayerQuality:
+    """
+    Score the embedded text layer of a page.
+
+    Args:
+        page: PyMuPDF page object
+        min_chars: Minimum number of non-whitespace characters
+        min_font_coverage: Minimum fraction of characters drawn with embedded or
+            standard fonts
+        max_garbage_ratio: Maximum fraction of replacement/control/private-use
+            characters
+
+    Returns:
+        TextLayerQuality with the metrics and whether the text layer is usable
+    """
+    quality = TextLayerQuality()
+    try:
+        text_dict = page.get_text("dict")
+    except Exception as e:
+        quality.reason = f"text extraction failed: {str(e)}"
+        return quality
+
+    reliable_fonts = _reliable_fonts(page)
+    total_chars = 0
+    covered_chars = 0
+    garbage_chars = 0
+    for block in text_dict.get("blocks", []):
+        if block.get("type", 0) != 0:
+            continue
+        for line in block.get("lines", []):
+            for span in line.get("spans", []):
+                text = "".join(span.get("text", "").split())
+                if not text:
+                    continue
+                total_chars += len(text)
+                garbage_chars += sum(1 for char in text if _is_garbage_char(char))
+                if _normalize_font_name(span.get("font", "")) in reliable_fonts:
+                    covered_chars += len(text)
+
+    quality.char_count = total_chars
+    if total_chars:
+        quality.font_coverage = covered_chars / total_chars
+        quality.garbage_ratio = garbage_chars / total_chars
+
+    if total_chars < min_chars:
+        quality.reason = f"only {total_chars} characters (min {min_chars})"
+    elif quality.font_coverage < min_font_coverage:
+        quality.reason = (
+            f"font coverage {quality.font_coverage:.2f} (min {min_font_coverage})"
+        )
+    elif quality.garbage_ratio > max_garbage_ratio:
+        quality.reason = (
+            f"garbage ratio {quality.garbage_ratio:.3f} (max {max_garbage_ratio})"
+        )
+    else:
+        quality.usable = True
+        quality.reason = "text layer usable"
+    return quality
+
+
+def _geometry(
+    bbox: Tuple[float, float, float, float], page_width: float, page_height: float
+) -> Dict[str, Any]:
+    """Convert an absolute bbox to Textract's normalized Geometry structure."""
+    x0, y0, x1, y1 = bbox
+    left = max(0.0, min(1.0, x0 / page_width))
+    top = max(0.0, min(1.0, y0 / page_height))
+    right = max(0.0, min(1.0, x1 / page_width))
+    bottom = max(0.0, min(1.0, y1 / page_height))
+    return {
+        "BoundingBox": {
+            "Width": right - left,
+            "Height": bottom - top,
+            "Left": left,
+            "Top": top,
+        },
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": right, "Y": top},
+            {"X": right, "Y": bottom},
+            {"X": left, "Y": bottom},
+        ],
+    }
+
+
+def build_textract_response(page) -> Dict[str, Any]:
+    """
+    Build a Textract ``DetectDocumentText``-compatible response from a page's text layer.
+
+    The response contains a PAGE block plus LINE and WORD blocks with normalized
+    geometry and CHILD relationships, so downstream consumers (text confidence
+    generation, assessment bounding boxes, the UI) treat it like Textract output.
+
+    Args:
+        page: PyMuPDF page object
+
+    Returns:
+        Textract-style response dictionary
+    """
+    rect = page.rect
+    page_width = rect.width or 1.0
+    page_height = rect.height or 1.0
+
+    # words: (x0, y0, x1, y1, word, block_no, line_no, word_no) in reading order
+    lines: Dict[Tuple[int, int], List[Tuple]] = {}
+    for word in page.get_text("words", sort=True):
+        lines.setdefault((word[5], word[6]), []).append(word)
+
+    page_block = {
+        "BlockType": "PAGE",
+        "Id": "page-1",
+        "Page": 1,
+        "Geometry": _geometry((0, 0, page_width, page_height), page_width, page_height),
+        "Relationships": [{"Type": "CHILD", "Ids": []}],
+    }
+    blocks = [page_block]
+
+    for line_number, words in enumerate(lines.values(), start=1):
+        line_id = f"line-{line_number}"
+        word_ids = []
+        word_blocks = []
+        for word_number, word in enumerate(words, start=1):
+            word_id = f"{line_id}-word-{word_number}"
+            word_ids.append(word_id)
+            word_blocks.append(
+                {
+                    "BlockType": "WORD",
+                    "Id": word_id,
+                    "Page": 1,
+                    "Text": word[4],
+                    "TextType": "PRINTED",
+                    "Confidence": TEXT_LAYER_CONFIDENCE,
+                    "Geometry": _geometry(word[:4], page_width, page_height),
+                }
+            )
+        line_bbox = (
+            min(w[0] for w in words),
+            min(w[1] for w in words),
+            max(w[2] for w in words),
+            max(w[3] for w in words),
+        )
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": line_id,
+                "Page": 1,
+                "Text": " ".join(w[4] for w in words),
+                "TextType": "PRINTED",
+                "Confidence": TEXT_LAYER_CONFIDENCE,
+                "Geometry": _geometry(line_bbox, page_width, page_height),
+                "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+            }
+        )
+        blocks.extend(word_blocks)
+        page_block["Relationships"][0]["Ids"].append(line_id)
+
+    return {
+        "DocumentMetadata": {"Pages": 1},
+        "Blocks": blocks,
+        "TextLayer": True,
+    }
+
+
+def text_from_response(response: Dict[str, Any]) -> str:
+    """Join the LINE blocks of a text-layer response into page text."""
+    return "\n".join(
+        block["Text"]
+        for block in response.get("Blocks", [])
+        if block.get("BlockType") == "LINE" and block.get("Text")
+    )
@@ -0,0 +1,207 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Text measurement and line wrapping for rendering converted documents.
+
+Measuring a line with ``ImageDraw.textbbox`` lays out every glyph again, so
+wrapping a line word by word by re-measuring the growing line is quadratic in
+its length. ``TextLayout`` instead caches advance widths per font (words and
+single glyphs) and accumulates line widths additively:
+
+- a word is measured once per font and reused for every later occurrence
+- a line's width is the sum of its word widths plus the space widths between them
+- a token wider than the line is split at the longest prefix that fits, found
+  by binary search over cumulative glyph widths
+
+Kerning between words is ignored, which can shift a break by at most one word
+compared to measuring the whole line.
+"""
+
+import bisect
+import itertools
+import logging
+from functools import lru_cache
+from typing import Dict, List
+
+from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# Words cached per font before the cache is reset
+DEFAULT_MAX_CACHED_WORDS = 50000
+
+
+@lru_cache(maxsize=64)
+def load_font(name: str, size: int):
+    """
+    Load a TrueType font once per process.
+
+    Reusing the same font object lets width caches carry over between pages
+    and documents.
+
+    Args:
+        name: Font file name or path
+        size: Font size in points
+
+    Returns:
+        FreeTypeFont
+
+    Raises:
+        OSError: If the font cannot be loaded
+    """
+    return ImageFont.truetype(name, size)
+
+
+class FontMetrics:
+    """Cached advance widths for one font."""
+
+    def __init__(self, font, max_cached_words: int = DEFAULT_MAX_CACHED_WORDS):
+        """
+        Args:
+            font: PIL font
+            max_cached_words: Word widths kept before the cache is reset
+        """
+        self.font = font
+        self.max_cached_words = max_cached_words
+        self._words: Dict[str, float] = {}
+        self._glyphs: Dict[str, float] = {}
+        self.space_width = self._measure(" ")
+
+    def _measure(self, text: str) -> float:
+        """Measure the advance width of text with the font."""
+        try:
+            return float(self.font.getlength(text))
+        except AttributeError:
+            # Fonts without getlength (Pillow < 8.0): use the ink box
+            bbox = self.font.getbbox(text)
+            return float(bbox[2] - bbox[0])
+
+    def glyph_width(self, char: str) -> float:
+        """Return the cached advance width of a single character."""
+        width = self._glyphs.get(char)
+        if width is None:
+            width = self._glyphs[char] = self._measure(char)
+        return width
+
+    def word_width(self, word: str) -> float:
+        """Return the cached advance width of a word."""
+        width = self._words.get(word)
+        if width is None:
+            if len(self._words) >= self.max_cached_words:
+                self._words.clear()
+            width = self._words[word] = self._measure(word)
+        return width
+
+    def text_width(self, text: str) -> float:
+        """Return the width of text as the sum of its words and spaces."""
+        words = text.split(" ")
+        return (
+            sum(self.word_width(word) for word in words if word)
+            + (len(words) - 1) * self.space_width
+        )
+
+    def split_token(self, token: str, max_width: float) -> List[str]:
+        """
+        Split a token wider than max_width into pieces that each fit.
+
+        Each break is the longest prefix whose cumulative glyph width fits,
+        found by binary search. Every piece has at least one character.
+
+        Args:
+            token: Text without spaces
+            max_width: Available width in pixels
+
+        Returns:
+            List of pieces
+        """
+        offsets = list(itertools.accumulate(self.glyph_width(char) for char in token))
+        pieces = []
+        start = 0
+        consumed = 0.0
+        while start < len(token):
+            end = bisect.bisect_right(offsets, consumed + max_width, lo=start)
+            end = max(end, start + 1)
+            pieces.append(token[start:end])
+            consumed = offsets[end - 1]
+            start = end
+        return pieces
+
+
+class TextLayout:
+    """Measures and wraps text with per-font width caches."""
+
+    def __init__(self, max_cached_words: int = DEFAULT_MAX_CACHED_WORDS):
+        """
+        Args:
+            max_cached_words: Word widths kept per font before its cache is reset
+        """
+        self.max_cached_words = max_cached_words
+        # Keyed by id(); the metrics hold a reference so the id stays valid
+        self._metrics: Dict[int, FontMetrics] = {}
+
+    def metrics(self, font) -> FontMetrics:
+        """Return the width cache for a font."""
+        metrics = self._metrics.get(id(font))
+        if metrics is None or metrics.font is not font:
+            metrics = FontMetrics(font, self.max_cached_words)
+            self._metrics[id(font)] = metrics
+        return metrics
+
+    def text_width(self, text: str, font) -> int:
+        """
+        Return the width of text in pixels.
+
+        Args:
+            text: Text to measure
+            font: PIL font
+
+        Returns:
+            Width rounded to whole pixels
+        """
+        return int(round(self.metrics(font).text_width(text)))
+
+    def wrap(self, text: str, font, max_width: float) -> List[str]:
+        """
+        Wrap text to fit within max_width.
+
+        Words are separated by single spaces in the output. Tokens wider than
+        max_width are broken across lines.
+
+        Args:
+            text: Text to wrap
+            font: PIL font
+            max_width: Maximum width in pixels
+
+        Returns:
+            List of wrapped text lines
+        """
+        words = text.split()
+        if not words:
+            return [text]
+
+        metrics = self.metrics(font)
+        space = metrics.space_width
+        lines = []
+        current: List[str] = []
+        current_width = 0.0
+
+        for word in words:
+            width = metrics.word_width(word)
+            if current and current_width + space + width <= max_width:
+                current.append(word)
+                current_width += space + width
+                continue
+
+            # Start new line
+            if current:
+                lines.append(" ".join(current))
+            if width > max_width and len(word) > 1:
+                *complete, word = metrics.split_token(word, max_width)
+                lines.extend(complete)
+                width = metrics.word_width(word)
+            current = [word]
+            current_width = width
+
+        lines.append(" ".join(current))
+        return lines
@@ -0,0 +1,163 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Asynchronous multi-page Textract jobs for large PDFs.
+
+Synchronous ``DetectDocumentText``/``AnalyzeDocument`` calls are made once per
+page, so large documents run into the per-second TPS quota. The asynchronous
+``StartDocumentTextDetection``/``StartDocumentAnalysis`` APIs process the whole
+PDF from S3 as one job. This module starts such a job, polls it to completion,
+collects the paginated ``Blocks`` and splits them into single-page responses
+shaped like the synchronous API output, so the OCR service can write the same
+per-page artifacts.
+"""
+
+import copy
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_TIMEOUT = 600.0
+# Start polling quickly so small jobs are not held back by the full interval
+INITIAL_POLL_INTERVAL = 1.0
+MAX_RESULTS = 1000
+
+
+class TextractJobError(Exception):
+    """Raised when an asynchronous Textract job fails or does not finish in time."""
+
+    def __init__(self, message: str, job_id: Optional[str] = None):
+        super().__init__(message)
+        self.job_id = job_id
+
+
+def start_job(
+    textract_client,
+    bucket: str,
+    key: str,
+    feature_types: Optional[List[str]] = None,
+) -> str:
+    """
+    Start an asynchronous Textract job for a document in S3.
+
+    Args:
+        textract_client: Boto3 Textract client
+        bucket: S3 bucket containing the document
+        key: S3 key of the document
+        feature_types: Analysis features. When empty, text detection is used.
+
+    Returns:
+        Textract JobId
+    """
+    document_location = {"S3Object": {"Bucket": bucket, "Name": key}}
+    if feature_types:
+        response = textract_client.start_document_analysis(
+            DocumentLocation=document_location, FeatureTypes=feature_types
+        )
+    else:
+        response = textract_client.start_document_text_detection(
+            DocumentLocation=document_location
+        )
+    job_id = response["JobId"]
+    logger.info(f"Started Textract job {job_id} for s3://{bucket}/{key}")
+    return job_id
+
+
+def wait_for_job(
+    textract_client,
+    job_id: str,
+    analysis: bool,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    timeout: float = DEFAULT_TIMEOUT,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Poll a Textract job until it completes and collect its blocks by page.
+
+    Args:
+        textract_client: Boto3 Textract client
+        job_id: JobId returned by start_job
+        analysis: True for StartDocumentAnalysis jobs, False for text detection
+        poll_interval: Maximum seconds between status checks
+        timeout: Seconds to wait before giving up
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        Dict mapping one-based page number to that page's blocks
+
+    Raises:
+        TextractJobError: If the job fails or does not finish within timeout
+    """
+    get_results = (
+        textract_client.get_document_analysis
+        if analysis
+        else textract_client.get_document_text_detection
+    )
+    deadline = time.monotonic() + timeout
+    interval = min(INITIAL_POLL_INTERVAL, poll_interval)
+
+    while True:
+        response = get_results(JobId=job_id, MaxResults=MAX_RESULTS)
+        status = response.get("JobStatus")
+        if status != "IN_PROGRESS":
+            break
+        if time.monotonic() + interval > deadline:
+            raise TextractJobError(
+                f"Textract job {job_id} did not finish within {timeout:.0f}s", job_id
+            )
+        sleep(interval)
+        interval = min(interval * 2, poll_interval)
+
+    if status == "FAILED":
+        raise TextractJobError(
+            f"Textract job {job_id} failed: {response.get('StatusMessage', 'unknown')}",
+            job_id,
+        )
+    if status == "PARTIAL_SUCCESS":
+        logger.warning(
+            f"Textract job {job_id} partially succeeded: {response.get('Warnings', [])}"
+        )
+
+    blocks_by_page: Dict[int, List[Dict[str, Any]]] = {}
+    num_result_pages = 0
+    while True:
+        num_result_pages += 1
+        for block in response.get("Blocks", []):
+            blocks_by_page.setdefault(block.get("Page", 1), []).append(block)
+        next_token = response.get("NextToken")
+        if not next_token:
+            break
+        response = get_results(
+            JobId=job_id, MaxResults=MAX_RESULTS, NextToken=next_token
+        )
+
+    logger.info(
+        f"Textract job {job_id} {status}: {len(blocks_by_page)} pages "
+        f"from {num_result_pages} result pages"
+    )
+    return blocks_by_page
+
+
+def page_response(blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a single-page response shaped like the synchronous Textract APIs.
+
+    Block page numbers are reset to 1 because each page's artifacts are written
+    and parsed independently, exactly as for synchronous calls.
+
+    Args:
+        blocks: Blocks of one page from wait_for_job
+
+    Returns:
+        Textract-style response dictionary
+    """
+    page_blocks = []
+    for block in blocks:
+        block = copy.copy(block)
+        block["Page"] = 1
+        page_blocks.append(block)
+    return {"DocumentMetadata": {"Pages": 1}, "Blocks": page_blocks}
@@ -0,0 +1,217 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Single-pass Textract block parser.
+
+``TextractBlockIndex`` indexes a page's ``Blocks`` by Id once and records
+which WORD/SELECTION_ELEMENT blocks belong to a table or a key-value pair.
+``to_markdown`` then walks the LINE blocks in reading order and emits each
+line as text, or, for the first line touching a table or form field, the whole
+table (as a markdown table) or key-value pair. The same index also serves the
+text confidence data, so a page's blocks are only scanned once.
+
+This replaces ``textractor``'s ``response_parser.parse(...).to_markdown()`` in
+the OCR hot path; ``textractor`` remains available as a fallback parser.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SELECTED = "[X]"
+NOT_SELECTED = "[ ]"
+
+# Markdown prefixes for LAYOUT blocks (only present with the LAYOUT feature)
+HEADING_PREFIXES = {
+    "LAYOUT_TITLE": "# ",
+    "LAYOUT_SECTION_HEADER": "## ",
+}
+
+
+class TextractBlockIndex:
+    """Blocks of a single-page Textract response indexed for one-pass rendering."""
+
+    def __init__(self, response: Dict[str, Any]):
+        """
+        Args:
+            response: Textract API response (one page)
+        """
+        self.blocks_by_id: Dict[str, Dict[str, Any]] = {}
+        self.lines: List[Dict[str, Any]] = []
+        self.tables: List[Dict[str, Any]] = []
+        self.keys: List[Dict[str, Any]] = []
+        self.heading_prefixes: Dict[str, str] = {}
+        # WORD/SELECTION_ELEMENT Id -> Id of the TABLE or KEY block that owns it
+        self.owner_by_word: Dict[str, str] = {}
+
+        headings = []
+        for block in response.get("Blocks", []):
+            block_id = block.get("Id")
+            if block_id:
+                self.blocks_by_id[block_id] = block
+            block_type = block.get("BlockType")
+            if block_type == "LINE":
+                self.lines.append(block)
+            elif block_type == "TABLE":
+                self.tables.append(block)
+            elif block_type == "KEY_VALUE_SET" and "KEY" in block.get(
+                "EntityTypes", []
+            ):
+                self.keys.append(block)
+            elif block_type in HEADING_PREFIXES:
+                headings.append(block)
+
+        for table in self.tables:
+            for cell in self.related(table):
+                if cell.get("BlockType") == "CELL":
+                    for word_id in self.related_ids(cell):
+                        self.owner_by_word[word_id] = table["Id"]
+        for key in self.keys:
+            for word_id in self.related_ids(key):
+                self.owner_by_word[word_id] = key["Id"]
+            for value in self.related(key, "VALUE"):
+                for word_id in self.related_ids(value):
+                    self.owner_by_word[word_id] = key["Id"]
+        for heading in headings:
+            for line_id in self.related_ids(heading):
+                self.heading_prefixes[line_id] = HEADING_PREFIXES[heading["BlockType"]]
+
+    @staticmethod
+    def related_ids(block: Dict[str, Any], relationship: str = "CHILD") -> List[str]:
+        """Return the Ids of a block's relationships of the given type."""
+        ids = []
+        for rel in block.get("Relationships", []) or []:
+            if rel.get("Type") == relationship:
+                ids.extend(rel.get("Ids", []))
+        return ids
+
+    def related(
+        self, block: Dict[str, Any], relationship: str = "CHILD"
+    ) -> List[Dict[str, Any]]:
+        """Return a block's related blocks of the given type."""
+        return [
+            self.blocks_by_id[block_id]
+            for block_id in self.related_ids(block, relationship)
+            if block_id in self.blocks_by_id
+        ]
+
+    def text(self, block: Dict[str, Any]) -> str:
+        """Return the text of a CELL or KEY/VALUE block from its child words."""
+        parts = []
+        for child in self.related(block):
+            if child.get("BlockType") == "WORD":
+                parts.append(child.get("Text", ""))
+            elif child.get("BlockType") == "SELECTION_ELEMENT":
+                selected = child.get("SelectionStatus") == "SELECTED"
+                parts.append(SELECTED if selected else NOT_SELECTED)
+        return " ".join(part for part in parts if part)
+
+
+def _escape_cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def table_to_markdown(index: TextractBlockIndex, table: Dict[str, Any]) -> str:
+    """
+    Render a TABLE block as a markdown table with its first row as header.
+
+    Merged cells keep their text in the top-left position only.
+    """
+    cells = [cell for cell in index.related(table) if cell.get("BlockType") == "CELL"]
+    if not cells:
+        return ""
+    num_rows = max(c.get("RowIndex", 1) + c.get("RowSpan", 1) - 1 for c in cells)
+    num_cols = max(c.get("ColumnIndex", 1) + c.get("ColumnSpan", 1) - 1 for c in cells)
+    grid = [[""] * num_cols for _ in range(num_rows)]
+    for cell in cells:
+        grid[cell.get("RowIndex", 1) - 1][cell.get("ColumnIndex", 1) - 1] = (
+            _escape_cell(index.text(cell))
+        )
+
+    rows = ["| " + " | ".join(row) + " |" for row in grid]
+    rows.insert(1, "|" + "|".join(["---"] * num_cols) + "|")
+    return "\n".join(rows)
+
+
+def key_value_to_markdown(index: TextractBlockIndex, key: Dict[str, Any]) -> str:
+    """Render a KEY block and its VALUE blocks as one line."""
+    key_text = index.text(key)
+    value_text = " ".join(
+        text for text in (index.text(v) for v in index.related(key, "VALUE")) if text
+    )
+    return f"{key_text} {value_text}".strip()
+
+
+def to_markdown(
+    response: Optional[Dict[str, Any]] = None,
+    index: Optional[TextractBlockIndex] = None,
+) -> str:
+    """
+    Render a single-page Textract response as markdown in one pass.
+
+    Plain lines are joined with newlines, consecutive key-value pairs are
+    rendered one per line, and tables become markdown tables. Different kinds
+    of elements are separated by a blank line.
+
+    Args:
+        response: Textract API response (ignored if index is given)
+        index: Prebuilt TextractBlockIndex to reuse
+
+    Returns:
+        Markdown text ("" for a page without text)
+    """
+    if index is None:
+        index = TextractBlockIndex(response or {})
+
+    # (kind, text) where kind is "line", "kv" or "table"
+    elements: List[tuple] = []
+    emitted = set()
+
+    def emit_owner(owner_id: str) -> None:
+        if owner_id in emitted:
+            return
+        emitted.add(owner_id)
+        owner = index.blocks_by_id[owner_id]
+        if owner.get("BlockType") == "TABLE":
+            elements.append(("table", table_to_markdown(index, owner)))
+        else:
+            elements.append(("kv", key_value_to_markdown(index, owner)))
+
+    for line in index.lines:
+        word_ids = index.related_ids(line)
+        owners = [index.owner_by_word.get(word_id) for word_id in word_ids]
+        if not any(owners):
+            text = line.get("Text", "")
+            if text:
+                prefix = index.heading_prefixes.get(line.get("Id"), "")
+                elements.append(("line", prefix + text))
+            continue
+
+        # Words outside any table/form field stay in the text flow
+        free_words = []
+        for word_id, owner_id in zip(word_ids, owners):
+            if owner_id:
+                emit_owner(owner_id)
+            elif word_id in index.blocks_by_id:
+                free_words.append(index.blocks_by_id[word_id].get("Text", ""))
+        if any(free_words):
+            elements.append(("line", " ".join(w for w in free_words if w)))
+
+    # Tables and fields whose words are not part of any LINE
+    for block in index.tables + index.keys:
+        emit_owner(block["Id"])
+
+    chunks = []
+    previous_kind = None
+    for kind, text in elements:
+        if not text:
+            continue
+        if chunks and (kind == "table" or kind != previous_kind):
+            chunks.append("\n\n")
+        elif chunks:
+            chunks.append("\n")
+        chunks.append(text)
+        previous_kind = kind
+    return "".join(chunks)
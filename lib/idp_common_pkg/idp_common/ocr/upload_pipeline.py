@@ -0,0 +1,167 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Pipelined S3 upload stage for OCR page artifacts.
+
+Each OCR page produces four artifacts (image, rawText.json, textConfidence.json,
+result.json). Writing them inline keeps the page worker blocked on S3 round trips
+when it could be feeding the next OCR call. ``UploadPipeline`` moves those writes
+onto a bounded queue drained by a dedicated pool of upload threads. Page workers
+enqueue and return immediately; when the queue is full they block, which bounds
+the memory held by pending uploads.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from idp_common import s3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 10
+DEFAULT_QUEUE_DEPTH = 64
+
+_STOP = object()
+
+
+def _default_write(content: Any, bucket: str, key: str, content_type: Optional[str]):
+    # Resolve at call time so tests patching idp_common.s3.write_content apply
+    s3.write_content(content, bucket, key, content_type=content_type)
+
+
+class UploadPipeline:
+    """Bounded queue of S3 writes drained by a pool of upload threads."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        write_fn: Optional[Callable[[Any, str, str, Optional[str]], None]] = None,
+    ):
+        """
+        Initialize and start the upload pipeline.
+
+        Args:
+            max_workers: Number of upload threads
+            queue_depth: Maximum number of pending uploads before submit() blocks
+            write_fn: Function performing a single write, called as
+                write_fn(content, bucket, key, content_type). Defaults to
+                idp_common.s3.write_content.
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.queue_depth = max(1, int(queue_depth))
+        self._write_fn = write_fn or _default_write
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        self._errors: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._uploaded = 0
+        self._blocked_seconds = 0.0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"ocr-upload-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.debug(
+            f"Upload pipeline started with {self.max_workers} workers, "
+            f"queue depth {self.queue_depth}"
+        )
+
+    def submit(
+        self,
+        content: Any,
+        bucket: str,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Enqueue a write. Blocks while the queue is full (backpressure).
+
+        Args:
+            content: Content to write (bytes, str or JSON-serializable dict/list)
+            bucket: S3 bucket
+            key: S3 key
+            content_type: Optional content type
+        """
+        if self._closed:
+            raise RuntimeError("Upload pipeline is closed")
+        t0 = time.time()
+        self._queue.put((content, bucket, key, content_type))
+        waited = time.time() - t0
+        if waited > 0.001:
+            with self._lock:
+                self._blocked_seconds += waited
+
+    def drain(self) -> List[Dict[str, str]]:
+        """
+        Wait until every queued write has completed.
+
+        Returns:
+            List of failed writes as dicts with "key" and "error"
+        """
+        self._queue.join()
+        with self._lock:
+            return list(self._errors)
+
+    def close(self) -> List[Dict[str, str]]:
+        """
+        Drain the queue and stop the upload threads.
+
+        Returns:
+            List of failed writes as dicts with "key" and "error"
+        """
+        if self._closed:
+            with self._lock:
+                return list(self._errors)
+        errors = self.drain()
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        logger.info(
+            f"Upload pipeline closed: {self._uploaded} uploads, {len(errors)} errors, "
+            f"{self._blocked_seconds:.2f}s producer wait on full queue"
+        )
+        return errors
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return upload counters for logging and metrics."""
+        with self._lock:
+            return {
+                "uploaded": self._uploaded,
+                "errors": len(self._errors),
+                "pending": self._queue.qsize(),
+                "blocked_seconds": self._blocked_seconds,
+            }
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                content, bucket, key, content_type = item
+                item = None  # release the payload as soon as the write finishes
+                try:
+                    self._write_fn(content, bucket, key, content_type)
+                    with self._lock:
+                        self._uploaded += 1
+                except Exception as e:
+                    logger.error(f"Upload failed for s3://{bucket}/{key}: {str(e)}")
+                    with self._lock:
+                        self._errors.append({"key": key, "error": str(e)})
+            finally:
+                self._queue.task_done()
+
+    def __enter__(self) -> "UploadPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -11,6 +11,7 @@ The service includes advanced markdown formatting capabilities for generated sum
 including table of contents, citation formatting, and navigation aids.
 """
 
+import asyncio
 import concurrent.futures
 import copy
 import json
@@ -20,7 +21,7 @@ import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from idp_common import bedrock, s3, utils
-from idp_common.models import Document, Status
+from idp_common.models import Document, Section, Status
 from idp_common.summarization.markdown_formatter import SummaryMarkdownFormatter
 from idp_common.summarization.models import DocumentSummarizationResult, DocumentSummary
 from idp_common.utils import extract_json_from_text
@@ -132,6 +133,30 @@ class SummarizationService:
             context="Summarization",
         )
 
+    async def _invoke_bedrock_model_async(
+        self, content: List[Dict[str, Any]], config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Invoke Bedrock model with standard parameters using the async client.
+
+        Args:
+            content: Content to send to the model
+            config: Configuration with model parameters
+
+        Returns:
+            Dictionary with response and metering data
+        """
+        return await bedrock.invoke_model_async(
+            model_id=config["model_id"],
+            system_prompt=config["system_prompt"],
+            content=content,
+            temperature=config["temperature"],
+            top_k=config["top_k"],
+            top_p=config["top_p"],
+            max_tokens=config["max_tokens"],
+            context="Summarization",
+        )
+
     def _create_error_summary(self, error_message: str) -> DocumentSummary:
         """
         Create a standard error summary with error information.
@@ -161,6 +186,61 @@ class SummarizationService:
             logger.warning("Empty text provided for summarization")
             return self._create_error_summary("Empty text provided")
 
+        content, config = self._prepare_summarization_request(text)
+
+        logger.info("Summarizing text with Bedrock")
+
+        # Invoke Bedrock model
+        try:
+            response_with_metering = self._invoke_bedrock_model(
+                content=content, config=config
+            )
+            return self._parse_summary(response_with_metering)
+
+        except Exception as e:
+            logger.error(f"Error summarizing text: {str(e)}")
+            raise
+
+    async def process_text_async(self, text: str) -> DocumentSummary:
+        """
+        Summarize text content using the async Bedrock client.
+
+        Args:
+            text: Text content to summarize
+
+        Returns:
+            DocumentSummary: Summary of the text content with flexible structure
+        """
+        if not text:
+            logger.warning("Empty text provided for summarization")
+            return self._create_error_summary("Empty text provided")
+
+        content, config = self._prepare_summarization_request(text)
+
+        logger.info("Summarizing text with Bedrock (async)")
+
+        try:
+            response_with_metering = await self._invoke_bedrock_model_async(
+                content=content, config=config
+            )
+            return self._parse_summary(response_with_metering)
+
+        except Exception as e:
+            logger.error(f"Error summarizing text: {str(e)}")
+            raise
+
+    def _prepare_summarization_request(
+        self, text: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Build the summarization request for text content.
+
+        Args:
+            text: Text content to summarize
+
+        Returns:
+            Tuple of the message content and the summarization configuration
+        """
         # Get summarization configuration
         config = self._get_summarization_config()
 
@@ -171,59 +251,57 @@ class SummarizationService:
             required_placeholders=["DOCUMENT_TEXT"],
         )
 
-        content = [{"text": task_prompt}]
-
-        logger.info("Summarizing text with Bedrock")
-
-        # Invoke Bedrock model
-        try:
-            response_with_metering = self._invoke_bedrock_model(
-                content=content, config=config
-            )
+        return [{"text": task_prompt}], config
 
-            response = response_with_metering["response"]
-            metering = response_with_metering["metering"]
+    def _parse_summary(self, response_with_metering: Dict[str, Any]) -> DocumentSummary:
+        """
+        Parse the model response into a DocumentSummary.
 
-            # Extract summarization result
-            summary_text = response["output"]["message"]["content"][0].get("text", "")
+        Args:
+            response_with_metering: Bedrock response with metering information
 
-            # Try to extract JSON from the response
-            try:
-                summary_json = extract_json_from_text(summary_text)
-                summary_data = json.loads(summary_json)
+        Returns:
+            DocumentSummary: Summary with the parsed content and metering
+        """
+        response = response_with_metering["response"]
+        metering = response_with_metering["metering"]
 
-                # If the summary is in the expected format with a "summary" field containing markdown
-                if "summary" in summary_data:
-                    # TODO: Uncomment this when needed
-                    # The summary field contains the markdown content
-                    # markdown_summary = summary_data["summary"]
+        # Extract summarization result
+        summary_text = response["output"]["message"]["content"][0].get("text", "")
 
-                    # Create summary with the parsed data
-                    return DocumentSummary(
-                        content=summary_data, metadata={"metering": metering}
-                    )
-                else:
-                    # Create summary with whatever fields were returned
-                    return DocumentSummary(
-                        content=summary_data, metadata={"metering": metering}
-                    )
+        # Try to extract JSON from the response
+        try:
+            summary_json = extract_json_from_text(summary_text)
+            summary_data = json.loads(summary_json)
 
-            except Exception as e:
-                logger.warning(f"Failed to parse JSON from response: {e}")
-                # Fallback to using the raw text as a single content field
-                error_content = {
-                    "error": "Summary parsing failed",
-                    "content": summary_text,
-                }
+            # If the summary is in the expected format with a "summary" field containing markdown
+            if "summary" in summary_data:
+                # TODO: Uncomment this when needed
+                # The summary field contains the markdown content
+                # markdown_summary = summary_data["summary"]
 
+                # Create summary with the parsed data
+                return DocumentSummary(
+                    content=summary_data, metadata={"metering": metering}
+                )
+            else:
+                # Create summary with whatever fields were returned
                 return DocumentSummary(
-                    content=error_content,
-                    metadata={"error": str(e), "metering": metering},
+                    content=summary_data, metadata={"metering": metering}
                 )
 
         except Exception as e:
-            logger.error(f"Error summarizing text: {str(e)}")
-            raise
+            logger.warning(f"Failed to parse JSON from response: {e}")
+            # Fallback to using the raw text as a single content field
+            error_content = {
+                "error": "Summary parsing failed",
+                "content": summary_text,
+            }
+
+            return DocumentSummary(
+                content=error_content,
+                metadata={"error": str(e), "metering": metering},
+            )
 
     def process_document_section(
         self, document: Document, section_id: str
@@ -238,15 +316,105 @@ class SummarizationService:
         Returns:
             Tuple[Document, Dict[str, Any]]: Updated Document object with section summary and section-specific metering data
         """
+        section = self._get_section_to_summarize(document, section_id)
+        if section is None:
+            return document, {}
+
+        try:
+            all_text = self._read_section_text(document, section)
+
+            if not all_text:
+                logger.warning(f"No text content found in section {section_id}")
+                document = self._update_document_status(
+                    document,
+                    success=False,
+                    error_message=f"No text content found in section {section_id}",
+                )
+                return document, {}
+
+            # Generate summary
+            summary = self.process_text(all_text)
+
+            section_metering = self._store_section_summary(document, section, summary)
+
+        except Exception as e:
+            error_msg = f"Error summarizing section {section_id}: {str(e)}"
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+            return document, {}
+
+        return document, section_metering
+
+    async def process_document_section_async(
+        self, document: Document, section_id: str
+    ) -> Tuple[Document, Dict[str, Any]]:
+        """
+        Summarize a specific section of a document using the async Bedrock client.
+        S3 reads and writes run in the default executor.
+
+        Args:
+            document: Document object containing the section to summarize
+            section_id: ID of the section to summarize
+
+        Returns:
+            Tuple[Document, Dict[str, Any]]: Updated Document object with section summary and section-specific metering data
+        """
+        section = self._get_section_to_summarize(document, section_id)
+        if section is None:
+            return document, {}
+
+        loop = asyncio.get_running_loop()
+        try:
+            all_text = await loop.run_in_executor(
+                None, self._read_section_text, document, section
+            )
+
+            if not all_text:
+                logger.warning(f"No text content found in section {section_id}")
+                document = self._update_document_status(
+                    document,
+                    success=False,
+                    error_message=f"No text content found in section {section_id}",
+                )
+                return document, {}
+
+            summary = await self.process_text_async(all_text)
+
+            section_metering = await loop.run_in_executor(
+                None, self._store_section_summary, document, section, summary
+            )
+
+        except Exception as e:
+            error_msg = f"Error summarizing section {section_id}: {str(e)}"
+            logger.error(error_msg)
+            document.errors.append(error_msg)
+            return document, {}
+
+        return document, section_metering
+
+    def _get_section_to_summarize(
+        self, document: Document, section_id: str
+    ) -> Optional[Section]:
+        """
+        Find the section to summarize, recording an error on the document if it
+        is missing or has no pages.
+
+        Args:
+            document: Document object containing the section to summarize
+            section_id: ID of the section to summarize
+
+        Returns:
+            The section, or None if it cannot be summarized
+        """
         # Validate input document
         if not document:
             logger.error("No document provided")
-            return document, {}
+            return None
 
         if not document.sections:
             logger.error("Document has no sections to process")
             document.errors.append("Document has no sections to process")
-            return document, {}
+            return None
 
         # Find the section with the given ID
         section = None
@@ -259,121 +427,118 @@ class SummarizationService:
             error_msg = f"Section {section_id} not found in document"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document, {}
-
-        # Extract information about the section
-        class_label = section.classification
-        output_bucket = document.output_bucket
-        output_prefix = document.input_key
-        output_key = f"{output_prefix}/sections/{section.section_id}/summary.json"
-        output_md_key = f"{output_prefix}/sections/{section.section_id}/summary.md"
-        output_uri = f"s3://{output_bucket}/{output_key}"
-        output_md_uri = f"s3://{output_bucket}/{output_md_key}"
+            return None
 
         # Check if the section has required pages
         if not section.page_ids:
             error_msg = f"Section {section_id} has no page IDs"
             logger.error(error_msg)
             document.errors.append(error_msg)
-            return document, {}
+            return None
+
+        return section
+
+    def _read_section_text(self, document: Document, section: Section) -> str:
+        """
+        Read the text of a section's pages in page order, tagged with page numbers.
+
+        Args:
+            document: Document object containing the section
+            section: Section to read
+
+        Returns:
+            Section text
+        """
+        section_id = section.section_id
 
         # Sort pages by page number
         sorted_page_ids = sorted(section.page_ids, key=int)
         start_page = int(sorted_page_ids[0])
         end_page = int(sorted_page_ids[-1])
         logger.info(
-            f"Summarizing section {section_id}, class {class_label}: pages {start_page}-{end_page}"
+            f"Summarizing section {section_id}, class {section.classification}: pages {start_page}-{end_page}"
         )
 
-        try:
-            # TODO: Uncomment this when needed
-            # Start timing
-            # start_time = time.time()
-
-            # Read document text from all pages in order
-            all_text = ""
-            for page_id in sorted_page_ids:
-                if page_id not in document.pages:
-                    error_msg = f"Page {page_id} not found in document"
-                    logger.error(error_msg)
-                    document.errors.append(error_msg)
-                    continue
-
-                page = document.pages[page_id]
-                text_path = page.parsed_text_uri
-                page_text = s3.get_text_content(text_path)
-                all_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
-
-            if not all_text:
-                logger.warning(f"No text content found in section {section_id}")
-                document = self._update_document_status(
-                    document,
-                    success=False,
-                    error_message=f"No text content found in section {section_id}",
-                )
-                return document, {}
+        # Read document text from all pages in order
+        all_text = ""
+        for page_id in sorted_page_ids:
+            if page_id not in document.pages:
+                error_msg = f"Page {page_id} not found in document"
+                logger.error(error_msg)
+                document.errors.append(error_msg)
+                continue
+
+            page = document.pages[page_id]
+            text_path = page.parsed_text_uri
+            page_text = s3.get_text_content(text_path)
+            all_text += f"<page-number>{page_id}</page-number>\n{page_text}\n\n"
 
-            # Generate summary
-            summary = self.process_text(all_text)
+        return all_text
 
-            # TODO: Uncomment this when needed
-            # Calculate execution time
-            # execution_time = time.time() - start_time
+    def _store_section_summary(
+        self, document: Document, section: Section, summary: DocumentSummary
+    ) -> Dict[str, Any]:
+        """
+        Write a section summary as JSON and markdown to S3 and record the URIs
+        on the section.
 
-            # TODO: Uncomment this when needed
-            # Create summarization result object
-            # summarization_result = DocumentSummarizationResult(
-            #     document_id=document.id, summary=summary, execution_time=execution_time
-            # )
-
-            # Store results in S3
-            # Store JSON result
-            s3.write_content(
-                content=summary.content,
-                bucket=output_bucket,
-                key=output_key,
-                content_type="application/json",
-            )
+        Args:
+            document: Document object containing the section
+            section: Section that was summarized
+            summary: Summary of the section
 
-            # Generate and store markdown report using our custom formatter
-            # Create a single-section document for the formatter
-            single_section = {section_id: summary.content}
-            formatter = SummaryMarkdownFormatter(
-                document, single_section, is_section=True, include_toc=True
-            )
-            markdown_report = formatter.format_all()
+        Returns:
+            Metering data of the summary
+        """
+        section_id = section.section_id
+        output_bucket = document.output_bucket
+        output_prefix = document.input_key
+        output_key = f"{output_prefix}/sections/{section.section_id}/summary.json"
+        output_md_key = f"{output_prefix}/sections/{section.section_id}/summary.md"
+        output_uri = f"s3://{output_bucket}/{output_key}"
+        output_md_uri = f"s3://{output_bucket}/{output_md_key}"
 
-            s3.write_content(
-                content=markdown_report,
-                bucket=output_bucket,
-                key=output_md_key,
-                content_type="text/markdown",
-            )
+        # Store results in S3
+        # Store JSON result
+        s3.write_content(
+            content=summary.content,
+            bucket=output_bucket,
+            key=output_key,
+            content_type="application/json",
+        )
 
-            # Update section with summary URI
-            # Initialize attributes if it's None
-            if section.attributes is None:
-                section.attributes = {}
+        # Generate and store markdown report using our custom formatter
+        # Create a single-section document for the formatter
+        single_section = {section_id: summary.content}
+        formatter = SummaryMarkdownFormatter(
+            document, single_section, is_section=True, include_toc=True
+        )
+        markdown_report = formatter.format_all()
 
-            section.attributes["summary_uri"] = output_uri
-            section.attributes["summary_md_uri"] = output_md_uri
+        s3.write_content(
+            content=markdown_report,
+            bucket=output_bucket,
+            key=output_md_key,
+            content_type="text/markdown",
+        )
 
-            # Extract metering data to return separately
-            section_metering = {}
-            if "metering" in summary.metadata:
-                section_metering = summary.metadata["metering"]
+        # Update section with summary URI
+        # Initialize attributes if it's None
+        if section.attributes is None:
+            section.attributes = {}
 
-            logger.info(
-                f"Section {section_id} summarized successfully. Summary stored at: {output_uri}"
-            )
+        section.attributes["summary_uri"] = output_uri
+        section.attributes["summary_md_uri"] = output_md_uri
 
-        except Exception as e:
-            error_msg = f"Error summarizing section {section_id}: {str(e)}"
-            logger.error(error_msg)
-            document.errors.append(error_msg)
-            return document, {}
+        # Extract metering data to return separately
+        section_metering = {}
+        if "metering" in summary.metadata:
+            section_metering = summary.metadata["metering"]
 
-        return document, section_metering
+        logger.info(
+            f"Section {section_id} summarized successfully. Summary stored at: {output_uri}"
+        )
+        return section_metering
 
     def process_document(
         self, document: Document, store_results: bool = True
@@ -0,0 +1,223 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Key-value stores for the persistent caches (OCR results, Bedrock responses).
+
+Every store keeps JSON entries with an expiry time:
+
+- ``MemoryCacheStore``: in-process LRU
+- ``LocalCacheStore``: one JSON file per entry in a directory (tests, notebooks)
+- ``DynamoDBCacheStore``: items in a table (the tracking table by default)
+  using its ``ExpiresAfter`` TTL attribute
+- ``S3CacheStore``: one JSON object per entry under a bucket prefix
+
+Bytes values in an entry are stored base64-encoded and restored on read.
+"""
+
+import base64
+import copy
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import boto3
+
+DEFAULT_MEMORY_ENTRIES = 256
+
+
+def encode_entry(entry: Dict[str, Any]) -> str:
+    """Serialize an entry to JSON, encoding bytes values as base64."""
+    return json.dumps(
+        entry,
+        default=lambda v: (
+            {"__bytes__": base64.b64encode(v).decode("ascii")}
+            if isinstance(v, (bytes, bytearray))
+            else str(v)
+        ),
+    )
+
+
+def decode_entry(data: str) -> Dict[str, Any]:
+    """Deserialize an entry written by encode_entry."""
+    return json.loads(
+        data,
+        object_hook=lambda d: (
+            base64.b64decode(d["__bytes__"]) if set(d) == {"__bytes__"} else d
+        ),
+    )
+
+
+class CacheStore(ABC):
+    """Base class for cache entry stores."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under key, or None if absent or expired."""
+
+    @abstractmethod
+    def put(self, key: str, entry: Dict[str, Any], expires_at: int) -> None:
+        """Store entry under key until the epoch second expires_at."""
+
+
+class MemoryCacheStore(CacheStore):
+    """Least-recently-used entries held in process memory."""
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Args:
+            max_entries: Number of entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers get their own copy so they cannot modify the cached entry
+        return copy.deepcopy(entry)
+
+    def put(self, key: str, entry: Dict[str, Any], expires_at: int) -> None:
+        entry = copy.deepcopy(entry)
+        with self._lock:
+            self._entries[key] = (entry, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class LocalCacheStore(CacheStore):
+    """Entries stored as JSON files in a local directory."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory holding the cache entries (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = decode_entry(f.read())
+        except FileNotFoundError:
+            return None
+        if data.get("expires_at", 0) <= time.time():
+            return None
+        return data["entry"]
+
+    def put(self, key: str, entry: Dict[str, Any], expires_at: int) -> None:
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(encode_entry({"entry": entry, "expires_at": expires_at}))
+        os.replace(tmp_path, self._path(key))
+
+
+class DynamoDBCacheStore(CacheStore):
+    """Entries stored as DynamoDB items with an ExpiresAfter TTL attribute."""
+
+    def __init__(
+        self,
+        key_prefix: str,
+        sort_key: str,
+        table_name: Optional[str] = None,
+        region: Optional[str] = None,
+    ):
+        """
+        Args:
+            key_prefix: Prefix of the partition key (e.g. "ocrcache#")
+            sort_key: Sort key value of every entry
+            table_name: Table name. Defaults to the TRACKING_TABLE environment variable.
+            region: AWS region. Defaults to the AWS_REGION environment variable.
+        """
+        self.key_prefix = key_prefix
+        self.sort_key = sort_key
+        self.table_name = table_name or os.environ.get("TRACKING_TABLE")
+        if not self.table_name:
+            raise ValueError(
+                "Cache table name must be provided or set in TRACKING_TABLE environment variable"
+            )
+        region = region or os.environ.get("AWS_REGION")
+        self.table = boto3.resource("dynamodb", region_name=region).Table(
+            self.table_name
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self.table.get_item(
+            Key={"PK": f"{self.key_prefix}{key}", "SK": self.sort_key}
+        )
+        item = response.get("Item")
+        # DynamoDB deletes expired items lazily, so check the TTL ourselves
+        if not item or int(item.get("ExpiresAfter", 0)) <= time.time():
+            return None
+        return decode_entry(item["entry"])
+
+    def put(self, key: str, entry: Dict[str, Any], expires_at: int) -> None:
+        self.table.put_item(
+            Item={
+                "PK": f"{self.key_prefix}{key}",
+                "SK": self.sort_key,
+                "entry": encode_entry(entry),
+                "cached_at": str(int(time.time())),
+                "ExpiresAfter": expires_at,
+            }
+        )
+
+
+class S3CacheStore(CacheStore):
+    """Entries stored as JSON objects under an S3 prefix."""
+
+    def __init__(self, bucket: str, prefix: str, region: Optional[str] = None):
+        """
+        Args:
+            bucket: Bucket holding the cache entries
+            prefix: Key prefix for cache entries
+            region: AWS region. Defaults to the AWS_REGION environment variable.
+        """
+        if not bucket:
+            raise ValueError("Cache bucket must be provided for the s3 store")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.s3_client = boto3.client(
+            "s3", region_name=region or os.environ.get("AWS_REGION")
+        )
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        data = decode_entry(response["Body"].read().decode("utf-8"))
+        if data.get("expires_at", 0) <= time.time():
+            return None
+        return data["entry"]
+
+    def put(self, key: str, entry: Dict[str, Any], expires_at: int) -> None:
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=encode_entry({"entry": entry, "expires_at": expires_at}).encode(
+                "utf-8"
+            ),
+            ContentType="application/json",
+        )
@@ -0,0 +1,208 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Process-lifetime cache of few-shot example prompt content.
+
+Few-shot examples are part of the configuration, but building their prompt
+content lists S3 prefixes and downloads every example image. Without a cache
+that happens for every page (classification) and every section (extraction).
+``FewShotContentCache`` keeps the finished content items, text and Bedrock image
+attachments, in memory for the lifetime of the process, so warm Lambda
+invocations build prompts without network calls.
+
+Entries are keyed by a hash of the example configuration they were built from,
+so a configuration change is a cache miss and the old entries age out of the
+LRU. Concurrent requests for the same key build it once. Settings come from
+``configure_few_shot_cache`` or the environment:
+
+- ``FEW_SHOT_CACHE_MAX_ENTRIES``: number of entries kept (default 32, 0 disables
+  the cache)
+- ``FEW_SHOT_CACHE_TTL_SECONDS``: optional maximum age of an entry, to pick up
+  example images replaced in S3 under the same path
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+def compute_few_shot_key(*parts: Any) -> str:
+    """
+    Compute the cache key for few-shot content.
+
+    Args:
+        parts: JSON-serializable values the content is built from (example
+            configuration, class name, settings that affect loading)
+
+    Returns:
+        SHA-256 hex digest of the parts
+    """
+    canonical = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FewShotContentCache:
+    """In-memory LRU of few-shot content lists."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of entries kept
+            ttl_seconds: Optional maximum age of an entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, content = entry
+            if (
+                self.ttl_seconds is not None
+                and time.monotonic() - created > self.ttl_seconds
+            ):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], Tuple[List[Dict[str, Any]], bool]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the content for a key, building it on a miss.
+
+        Args:
+            key: Cache key from compute_few_shot_key
+            build: Builds the content; returns (content, cacheable). Content
+                built with failures (e.g. an image that could not be loaded)
+                should not be cached, so the next request retries
+
+        Returns:
+            A new list of the content items. The items are shared and must
+            not be modified
+        """
+        if self.max_entries <= 0:
+            return build()[0]
+
+        content = self._lookup(key)
+        if content is not None:
+            return list(content)
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            # Another thread may have built it while this one waited
+            content = self._lookup(key)
+            if content is not None:
+                return list(content)
+            with self._lock:
+                self.misses += 1
+            try:
+                content, cacheable = build()
+            finally:
+                with self._lock:
+                    self._build_locks.pop(key, None)
+            if cacheable:
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), content)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return list(content)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with entries, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_few_shot_cache: Optional[FewShotContentCache] = None
+_few_shot_cache_lock = threading.Lock()
+
+
+def configure_few_shot_cache(cache: Optional[FewShotContentCache]) -> None:
+    """
+    Set the process-wide few-shot content cache.
+
+    Args:
+        cache: Cache to use, or None to load the settings from the environment
+            on next use
+    """
+    global _few_shot_cache
+    with _few_shot_cache_lock:
+        _few_shot_cache = cache
+
+
+def get_few_shot_cache() -> FewShotContentCache:
+    """
+    Get the process-wide few-shot content cache.
+
+    Returns:
+        FewShotContentCache configured from the environment unless one was
+        set with configure_few_shot_cache
+    """
+    global _few_shot_cache
+    with _few_shot_cache_lock:
+        if _few_shot_cache is None:
+            max_entries = DEFAULT_MAX_ENTRIES
+            ttl_seconds = None
+            try:
+                max_entries = int(
+                    os.environ.get("FEW_SHOT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+                )
+                if os.environ.get("FEW_SHOT_CACHE_TTL_SECONDS"):
+                    ttl_seconds = float(os.environ["FEW_SHOT_CACHE_TTL_SECONDS"])
+            except ValueError:
+                logger.warning(
+                    "Invalid FEW_SHOT_CACHE_MAX_ENTRIES or FEW_SHOT_CACHE_TTL_SECONDS value, using defaults"
+                )
+            _few_shot_cache = FewShotContentCache(max_entries, ttl_seconds)
+        return _few_shot_cache
+
+
+def reset_few_shot_cache() -> None:
+    """Discard the process-wide cache (used by tests)."""
+    configure_few_shot_cache(None)
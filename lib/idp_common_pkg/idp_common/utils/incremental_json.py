@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Incremental parsing of a JSON object streamed by a model.
+
+``IncrementalJsonParser`` is fed text deltas as they arrive and returns each
+top-level attribute of the object as soon as its value is complete, so callers
+can act on the first attributes (or reject malformed output) long before
+generation finishes. Like ``extract_json_from_text`` it skips any text before
+the object, such as prose or a ```json fence, and ignores text after it.
+"""
+
+import json
+import re
+from typing import Any, List, Tuple
+
+
+class MalformedJsonError(ValueError):
+    """Raised when streamed output can no longer form a valid JSON object."""
+
+
+class IncrementalJsonParser:
+    """Yields completed top-level attributes of a streamed JSON object."""
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        # Start of the candidate object and of its current member
+        self._object_start = None
+        self._member_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.attributes: List[Tuple[str, Any]] = []
+        self.complete = False
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """
+        Add a text delta.
+
+        Args:
+            delta: Next piece of the model output
+
+        Returns:
+            (name, value) pairs of the attributes completed by this delta
+
+        Raises:
+            MalformedJsonError: If an attribute of the object cannot be parsed
+        """
+        self._text += delta
+        completed = []
+        while self._pos < len(self._text) and not self.complete:
+            char = self._text[self._pos]
+            self._pos += 1
+
+            if self._object_start is None:
+                if char == "{":
+                    self._object_start = self._member_start = self._pos
+                    self._depth = 1
+                continue
+
+            if self._escape:
+                self._escape = False
+            elif self._in_string:
+                if char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._end_member(self._pos - 1))
+                    self.complete = self._object_start is not None
+            elif char == "," and self._depth == 1:
+                completed.extend(self._end_member(self._pos - 1))
+        return completed
+
+    def _end_member(self, end: int) -> List[Tuple[str, Any]]:
+        """Parse the member that ends at the given position."""
+        member = self._text[self._member_start : end].strip()
+        self._member_start = end + 1
+        if not member and self._depth == 0 and not self.attributes:
+            # Empty object
+            return []
+        try:
+            parsed = list(_parse_member(member).items())
+        except ValueError as e:
+            if self.attributes:
+                raise MalformedJsonError(
+                    f"Malformed attribute after {self.attributes[-1][0]!r}: {member[:200]}"
+                ) from e
+            # Nothing parsed yet, so this brace was probably prose; look for
+            # the object after it
+            self._pos = self._object_start
+            self._object_start = self._member_start = None
+            self._depth = 0
+            self._in_string = self._escape = False
+            return []
+        self.attributes.extend(parsed)
+        return parsed
+
+    def result(self) -> dict:
+        """
+        Get the attributes parsed so far as a dict.
+
+        Returns:
+            Dict of the completed attributes
+        """
+        return dict(self.attributes)
+
+
+def _parse_member(member: str) -> dict:
+    """Parse one '"name": value' member, tolerating whitespace in strings."""
+    for candidate in (
+        member,
+        " ".join(line.strip() for line in member.splitlines()),
+        re.sub(r"\s+", " ", member),
+    ):
+        try:
+            parsed = json.loads("{" + candidate + "}", strict=False)
+        except ValueError:
+            continue
+        if len(parsed) == 1:
+            return parsed
+    raise ValueError(f"Not a single JSON object member: {member[:200]}")
@@ -0,0 +1,475 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Retry policy for calls to model endpoints.
+
+The Bedrock client and the SageMaker classifier retry throttling and timeout
+errors with exponential backoff. Under sustained throttling every worker
+thread keeps retrying, which multiplies the load on an endpoint that is
+already over quota. A ``RetryPolicy`` adds three optional safeguards around
+those retry loops:
+
+- Retry budget: each call deposits ``retry_ratio`` tokens and each retry
+  spends one, so retries stay under that fraction of calls (plus a floor of
+  ``min_retries_per_second``). Once the budget is spent errors are raised
+  instead of retried.
+- Circuit breaker (per model or endpoint): after ``failure_threshold``
+  consecutive retryable failures, calls fail fast with ``CircuitOpenError``
+  for ``recovery_seconds``; then a single probe call decides whether the
+  circuit closes again.
+- Hedged requests: when an attempt runs longer than the ``hedge_percentile``
+  latency of recent successful attempts, an identical second request is sent
+  and the first response wins. Hedges are paid from the retry budget.
+
+Policies are process-wide per name (see ``get_retry_policy``) and configured
+with ``configure_retry_policy`` or the ``RETRY_POLICY`` environment variable.
+Every safeguard is off unless configured, e.g.::
+
+    RETRY_POLICY='{"retry_ratio": 0.1, "failure_threshold": 5, "recovery_seconds": 30, "hedge_percentile": 0.95}'
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(
+            f"Circuit open for {key}; calls rejected for another {retry_after:.1f}s"
+        )
+        self.key = key
+        self.retry_after = retry_after
+
+
+class RetryBudget:
+    """Caps retries at a fraction of calls, shared by all callers of a policy."""
+
+    def __init__(
+        self,
+        retry_ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+    ):
+        """
+        Initialize a retry budget.
+
+        Args:
+            retry_ratio: Retries allowed per call
+            min_retries_per_second: Retries allowed regardless of call volume
+            max_tokens: Most retries that can be banked for a burst
+        """
+        self.retry_ratio = retry_ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + (now - self._updated) * self.min_retries_per_second,
+        )
+        self._updated = now
+
+    def record_call(self) -> None:
+        """Deposit the retry allowance of one call."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.retry_ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Spend one retry if the budget allows it.
+
+        Returns:
+            True if the retry may go ahead
+        """
+        with self._lock:
+            self._refill()
+            # Tolerate rounding, so ten deposits of 0.1 pay for one retry
+            if self._tokens < 1 - 1e-9:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Fails calls fast after repeated retryable failures of one key."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, key: str, failure_threshold: int, recovery_seconds: float):
+        """
+        Initialize a circuit breaker.
+
+        Args:
+            key: Model or endpoint the circuit protects
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_seconds: Time the circuit stays open before a probe call
+        """
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go ahead.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with its
+                probe call still in flight
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            remaining = self._opened_at + self.recovery_seconds - now
+            if remaining <= 0:
+                # Open long enough, or the last probe never reported back
+                logger.info(f"Circuit for {self.key} half open, sending probe call")
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return
+            raise CircuitOpenError(self.key, max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        """Close the circuit after the endpoint responded."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.key} closed")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a retryable failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    f"Circuit for {self.key} open after {self._failures} consecutive "
+                    f"failures; rejecting calls for {self.recovery_seconds}s"
+                )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Recent latencies of successful calls to one key."""
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        """
+        Initialize a latency tracker.
+
+        Args:
+            window: Number of recent latencies kept
+            min_samples: Latencies needed before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            percentile: Percentile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None until min_samples latencies are recorded
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(percentile * len(samples)))
+        return samples[index]
+
+
+class RetryPolicy:
+    """Retry budget, per-key circuit breakers and request hedging for one caller."""
+
+    def __init__(
+        self,
+        name: str,
+        retry_ratio: Optional[float] = None,
+        min_retries_per_second: float = 1.0,
+        max_retry_tokens: float = 10.0,
+        failure_threshold: Optional[int] = None,
+        recovery_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+        latency_window: int = 100,
+        min_latency_samples: int = 20,
+    ):
+        """
+        Initialize a retry policy.
+
+        Args:
+            name: Name of the policy, used in log messages
+            retry_ratio: Retries allowed per call (None disables the retry budget)
+            min_retries_per_second: Retries allowed regardless of call volume
+            max_retry_tokens: Most retries that can be banked for a burst
+            failure_threshold: Consecutive failures that open a circuit
+                (None disables circuit breakers)
+            recovery_seconds: Time a circuit stays open before a probe call
+            hedge_percentile: Latency percentile after which a hedged request
+                is sent (None disables hedging)
+            latency_window: Number of recent latencies kept per key
+            min_latency_samples: Latencies needed per key before hedging starts
+        """
+        self.name = name
+        self.retry_budget = (
+            RetryBudget(retry_ratio, min_retries_per_second, max_retry_tokens)
+            if retry_ratio is not None
+            else None
+        )
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.hedge_percentile = hedge_percentile
+        self.latency_window = latency_window
+        self.min_latency_samples = min_latency_samples
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, key: str) -> Optional[CircuitBreaker]:
+        if self.failure_threshold is None:
+            return None
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    key, self.failure_threshold, self.recovery_seconds
+                )
+            return self._breakers[key]
+
+    def _tracker(self, key: str) -> Optional[LatencyTracker]:
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if key not in self._trackers:
+                self._trackers[key] = LatencyTracker(
+                    self.latency_window, self.min_latency_samples
+                )
+            return self._trackers[key]
+
+    def record_call(self) -> None:
+        """Record a new call (not a retry), adding to the retry budget."""
+        if self.retry_budget is not None:
+            self.retry_budget.record_call()
+
+    def before_attempt(self, key: str) -> None:
+        """
+        Check the circuit of a key before an attempt.
+
+        Raises:
+            CircuitOpenError: If calls to the key are currently rejected
+        """
+        breaker = self._breaker(key)
+        if breaker is not None:
+            breaker.before_call()
+
+    def record_success(self, key: str, latency: Optional[float] = None) -> None:
+        """
+        Record that the endpoint responded.
+
+        Args:
+            key: Model or endpoint
+            latency: Duration of a successful attempt, used for hedging
+        """
+        breaker = self._breaker(key)
+        if breaker is not None:
+            breaker.record_success()
+        tracker = self._tracker(key)
+        if tracker is not None and latency is not None:
+            tracker.record(latency)
+
+    def record_failure(self, key: str) -> None:
+        """Record a retryable failure (throttling or timeout) of a key."""
+        breaker = self._breaker(key)
+        if breaker is not None:
+            breaker.record_failure()
+
+    def can_retry(self) -> bool:
+        """
+        Spend retry budget for one retry.
+
+        Returns:
+            True if the retry may go ahead
+        """
+        if self.retry_budget is None:
+            return True
+        if self.retry_budget.try_spend():
+            return True
+        logger.warning(f"Retry budget for {self.name} exhausted")
+        return False
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """
+        Get the time after which an attempt on a key is hedged.
+
+        Returns:
+            Delay in seconds, or None if the attempt is not hedged
+        """
+        tracker = self._tracker(key)
+        if tracker is None:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    def call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run one attempt, hedging it if it outlasts the latency percentile.
+
+        Args:
+            key: Model or endpoint
+            fn: Idempotent function making the request
+
+        Returns:
+            Result of the first request to succeed
+        """
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return fn()
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        try:
+            futures = [executor.submit(fn)]
+            done, _ = concurrent.futures.wait(futures, timeout=delay)
+            if not done and self.can_retry():
+                logger.info(f"Hedging request to {key} after {delay:.2f}s")
+                futures.append(executor.submit(fn))
+            pending = set(futures)
+            while True:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                if not pending:
+                    # All requests failed, surface the first one's error
+                    return futures[0].result()
+        finally:
+            # Don't wait for a losing request still in flight
+            executor.shutdown(wait=False)
+
+    async def call_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run one attempt, hedging it if it outlasts the latency percentile.
+
+        Args:
+            key: Model or endpoint
+            fn: Function returning a new awaitable for an idempotent request
+
+        Returns:
+            Result of the first request to succeed; the other is cancelled
+        """
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return await fn()
+
+        tasks = [asyncio.ensure_future(fn())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.can_retry():
+                logger.info(f"Hedging request to {key} after {delay:.2f}s")
+                tasks.append(asyncio.ensure_future(fn()))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not pending:
+                    return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+_policy_settings: Optional[Dict[str, Any]] = None
+_policies: Dict[str, RetryPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def configure_retry_policy(settings: Dict[str, Any]) -> None:
+    """
+    Set the retry policy settings, replacing any existing policies.
+
+    Args:
+        settings: RetryPolicy keyword arguments, e.g.
+            {"retry_ratio": 0.1, "failure_threshold": 5, "hedge_percentile": 0.95}
+    """
+    global _policy_settings
+    with _policies_lock:
+        _policy_settings = dict(settings or {})
+        _policies.clear()
+
+
+def _load_policy_settings() -> None:
+    """Load the policy settings from the environment unless already configured."""
+    global _policy_settings
+    if _policy_settings is not None:
+        return
+    _policy_settings = {}
+    settings_env = os.environ.get("RETRY_POLICY", "")
+    if settings_env:
+        try:
+            _policy_settings = json.loads(settings_env)
+        except ValueError:
+            logger.warning(
+                f"Invalid RETRY_POLICY value: {settings_env}. Expected a JSON object"
+            )
+
+
+def get_retry_policy(name: str) -> RetryPolicy:
+    """
+    Get the process-wide retry policy for a caller.
+
+    Args:
+        name: Caller name, e.g. "bedrock" or "sagemaker"; each name has its own
+            retry budget and circuit breakers
+
+    Returns:
+        RetryPolicy
+    """
+    with _policies_lock:
+        if name not in _policies:
+            _load_policy_settings()
+            _policies[name] = RetryPolicy(name, **_policy_settings)
+        return _policies[name]
+
+
+def reset_retry_policies() -> None:
+    """Discard all policies and configured settings (used by tests)."""
+    global _policy_settings
+    with _policies_lock:
+        _policy_settings = None
+        _policies.clear()
@@ -22,6 +22,7 @@ extras_require = {
     # Image handling dependencies
     "image": [
         "Pillow==11.2.1",
+        "numpy==1.26.4",  # For vectorized OCR image preprocessing
     ],
     # OCR module dependencies
     "ocr": [
@@ -36,6 +37,7 @@ extras_require = {
     # Classification module dependencies
     "classification": [
         "Pillow==11.2.1",  # For image handling
+        "numpy==1.26.4",  # For the local pre-classifier index
     ],
     # Extraction module dependencies
     "extraction": [
@@ -50,6 +52,15 @@ extras_require = {
         "munkres>=1.1.4",  # For Hungarian algorithm
         "numpy==1.26.4",  # For numeric operations
     ],
+    # Criteria validation module dependencies
+    "criteria_validation": [
+        "s3fs==2023.12.2",  # For S3 file system operations
+        "aiohttp>=3.9.0",  # For the async Bedrock client
+    ],
+    # Async Bedrock client dependencies
+    "async": [
+        "aiohttp>=3.9.0",
+    ],
     # Reporting module dependencies
     "reporting": [
         "pyarrow==20.0.0",  # For Parquet conversion
@@ -72,6 +83,7 @@ extras_require = {
         "PyYAML==6.0.2",
         "openpyxl==3.1.5",
         "python-docx==1.2.0",
+        "aiohttp>=3.9.0",
     ],
     # Development dependencies
     "dev": [
@@ -102,6 +114,7 @@ extras_require = {
         "strands-agents-tools>=0.2.2",
         "bedrock-agentcore>=0.1.1",
         "regex>=2024.0.0,<2026.0.0",
+        "aiohttp>=3.9.0",
     ],
 }
 
@@ -8,6 +8,8 @@ Pytest configuration file for the IDP Common package tests.
 import sys
 from unittest.mock import MagicMock
 
+import pytest
+
 # Mock external dependencies that may not be available in test environments
 # These mocks need to be set up before any imports that might use these packages
 
@@ -24,3 +26,13 @@ sys.modules["bedrock_agentcore.tools.code_interpreter_client"] = MagicMock()
 
 # PIL module is now used directly for document conversion functionality
 # No mocking needed as PIL is a required dependency for the OCR module
+
+
+@pytest.fixture(autouse=True)
+def stub_metrics_publisher():
+    """Publish metrics to a stub CloudWatch client instead of AWS."""
+    from idp_common.metrics import MetricsPublisher, configure_metrics_publisher
+
+    configure_metrics_publisher(MetricsPublisher(client_factory=MagicMock))
+    yield
+    configure_metrics_publisher(None)
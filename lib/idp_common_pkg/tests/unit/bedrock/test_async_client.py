@@ -0,0 +1,320 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the asyncio-native Bedrock client.
+"""
+
+import asyncio
+import base64
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock import rate_limiter, response_cache
+from idp_common.bedrock.async_client import AsyncBedrockClient, _to_json
+from idp_common.bedrock.response_cache import ResponseCache
+from idp_common.utils.cache_store import MemoryCacheStore
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+RESPONSE = {
+    "output": {"message": {"content": [{"text": "answer"}]}},
+    "usage": {"inputTokens": 100, "outputTokens": 20, "totalTokens": 120},
+}
+
+
+@pytest.fixture(autouse=True)
+def aws_env(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_SESSION_TOKEN", raising=False)
+    monkeypatch.delenv("BEDROCK_RESPONSE_CACHE", raising=False)
+    monkeypatch.delenv("BEDROCK_RATE_LIMITS", raising=False)
+    monkeypatch.delenv("GUARDRAIL_ID_AND_VERSION", raising=False)
+    response_cache.reset_response_cache()
+    rate_limiter.reset_rate_limiters()
+    yield
+    response_cache.reset_response_cache()
+    rate_limiter.reset_rate_limiters()
+
+
+def _client(**kwargs):
+    client = AsyncBedrockClient(region="us-east-1", metrics_enabled=False, **kwargs)
+    client._calculate_backoff = lambda retry_count: 0
+    return client
+
+
+def _throttle():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+        "Converse",
+    )
+
+
+class _FakeResponse:
+    def __init__(self, status, payload, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._payload = json.dumps(payload).encode("utf-8")
+
+    async def read(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _FakeSession:
+    closed = False
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def post(self, url, data=None, headers=None):
+        self.calls.append((url, data, headers))
+        return self.response
+
+
+@pytest.mark.unit
+class TestToJson:
+    def test_encodes_bytes_and_drops_none(self):
+        params = {
+            "messages": [{"content": [{"image": {"source": {"bytes": b"abc"}}}]}],
+            "additionalModelRequestFields": None,
+        }
+
+        assert _to_json(params) == {
+            "messages": [
+                {
+                    "content": [
+                        {
+                            "image": {
+                                "source": {"bytes": base64.b64encode(b"abc").decode()}
+                            }
+                        }
+                    ]
+                }
+            ]
+        }
+
+
+@pytest.mark.unit
+class TestConverse:
+    def test_sends_signed_request(self):
+        client = _client()
+        session = _FakeSession(_FakeResponse(200, RESPONSE, {"x-amzn-RequestId": "r1"}))
+        client._get_session = lambda: session
+
+        params = client._build_converse_params(
+            MODEL_ID, "system", [{"text": "hello"}], temperature=0.0
+        )
+        result = asyncio.run(client._converse(params))
+
+        assert result["output"] == RESPONSE["output"]
+        assert result["ResponseMetadata"] == {"RequestId": "r1", "HTTPStatusCode": 200}
+
+        url, body, headers = session.calls[0]
+        assert str(url) == (
+            "https://bedrock-runtime.us-east-1.amazonaws.com"
+            "/model/us.amazon.nova-pro-v1%3A0/converse"
+        )
+        assert headers["Authorization"].startswith("AWS4-HMAC-SHA256")
+        assert "/us-east-1/bedrock/aws4_request" in headers["Authorization"]
+        sent = json.loads(body)
+        assert "modelId" not in sent
+        assert sent["messages"][0]["content"] == [{"text": "hello"}]
+
+    def test_error_response_raises_client_error(self):
+        client = _client()
+        client._get_session = lambda: _FakeSession(
+            _FakeResponse(
+                429,
+                {"message": "Too many requests"},
+                {"x-amzn-ErrorType": "ThrottlingException:http://internal/"},
+            )
+        )
+        params = client._build_converse_params(MODEL_ID, "system", [{"text": "hi"}])
+
+        with pytest.raises(ClientError) as exc_info:
+            asyncio.run(client._converse(params))
+
+        error = exc_info.value.response["Error"]
+        assert error == {"Code": "ThrottlingException", "Message": "Too many requests"}
+
+
+@pytest.mark.unit
+class TestInvokeModelAsync:
+    def test_returns_response_with_metering(self):
+        client = _client()
+        client._converse = AsyncMock(return_value=dict(RESPONSE))
+
+        result = asyncio.run(
+            client.invoke_model_async(
+                MODEL_ID, "system", [{"text": "hello"}], context="Classification"
+            )
+        )
+
+        assert result["response"]["output"] == RESPONSE["output"]
+        assert result["metering"] == {
+            f"Classification/bedrock/{MODEL_ID}": RESPONSE["usage"]
+        }
+
+    def test_retries_throttling(self):
+        client = _client()
+        client._converse = AsyncMock(side_effect=[_throttle(), dict(RESPONSE)])
+
+        result = asyncio.run(
+            client.invoke_model_async(MODEL_ID, "system", [{"text": "hello"}])
+        )
+
+        assert result["response"]["usage"] == RESPONSE["usage"]
+        assert client._converse.await_count == 2
+
+    def test_raises_after_max_retries(self):
+        client = _client()
+        client._converse = AsyncMock(side_effect=_throttle())
+
+        with pytest.raises(ClientError):
+            asyncio.run(
+                client.invoke_model_async(
+                    MODEL_ID, "system", [{"text": "hello"}], max_retries=2
+                )
+            )
+
+        assert client._converse.await_count == 3
+
+    def test_retries_timeouts(self):
+        client = _client()
+        client._converse = AsyncMock(
+            side_effect=[asyncio.TimeoutError(), dict(RESPONSE)]
+        )
+
+        asyncio.run(client.invoke_model_async(MODEL_ID, "system", [{"text": "hi"}]))
+
+        assert client._converse.await_count == 2
+
+    def test_non_retryable_error_is_raised(self):
+        client = _client()
+        client._converse = AsyncMock(
+            side_effect=ClientError(
+                {"Error": {"Code": "ValidationException", "Message": "bad"}},
+                "Converse",
+            )
+        )
+
+        with pytest.raises(ClientError):
+            asyncio.run(client.invoke_model_async(MODEL_ID, "system", [{"text": "x"}]))
+
+        assert client._converse.await_count == 1
+
+    def test_cachepoint_tags_are_converted(self):
+        client = _client()
+        client._converse = AsyncMock(return_value=dict(RESPONSE))
+        model_id = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+        asyncio.run(
+            client.invoke_model_async(
+                model_id, "system", [{"text": "static<<CACHEPOINT>>dynamic"}]
+            )
+        )
+
+        params = client._converse.await_args.args[0]
+        assert params["messages"][0]["content"] == [
+            {"text": "static"},
+            {"cachePoint": {"type": "default"}},
+            {"text": "dynamic"},
+        ]
+
+    def test_response_cache_serves_repeated_request(self):
+        cache = ResponseCache([MemoryCacheStore()])
+        client = _client(response_cache=cache)
+        client._converse = AsyncMock(return_value=dict(RESPONSE))
+
+        async def invoke_twice():
+            first = await client.invoke_model_async(
+                MODEL_ID, "system", [{"text": "hello"}], context="Extraction"
+            )
+            second = await client.invoke_model_async(
+                MODEL_ID, "system", [{"text": "hello"}], context="Extraction"
+            )
+            return first, second
+
+        first, second = asyncio.run(invoke_twice())
+
+        assert client._converse.await_count == 1
+        assert second["response"]["output"] == first["response"]["output"]
+        assert f"Extraction/bedrock_cache/{MODEL_ID}" in second["metering"]
+
+    def test_rate_limiter_reservation_is_reconciled(self):
+        rate_limiter.configure_rate_limits({MODEL_ID: {"tokens_per_minute": 10000}})
+        limiter = rate_limiter.get_rate_limiter(MODEL_ID)
+        client = _client()
+        client._converse = AsyncMock(return_value=dict(RESPONSE))
+
+        asyncio.run(client.invoke_model_async(MODEL_ID, "system", [{"text": "hi"}]))
+
+        # Actual usage (100 input + 20 output tokens) replaces the estimate
+        assert limiter._tokens == pytest.approx(10000 - 120, abs=1)
+
+    def test_concurrent_requests_share_one_thread(self):
+        client = _client()
+        in_flight = 0
+        peak = 0
+
+        async def converse(params):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return dict(RESPONSE)
+
+        client._converse = converse
+
+        async def invoke_many():
+            return await asyncio.gather(
+                *[
+                    client.invoke_model_async(
+                        MODEL_ID, "system", [{"text": f"page {i}"}], temperature=0.5
+                    )
+                    for i in range(50)
+                ]
+            )
+
+        results = asyncio.run(invoke_many())
+
+        assert len(results) == 50
+        assert peak == 50
+
+    def test_close_releases_session(self):
+        client = _client()
+        session = MagicMock(closed=False)
+        session.close = AsyncMock()
+
+        async def open_and_close():
+            closer = asyncio.get_running_loop().create_future()
+            client._sessions[asyncio.get_running_loop()] = (session, closer)
+            await client.close()
+            assert closer.cancelled()
+
+        asyncio.run(open_and_close())
+
+        session.close.assert_awaited_once()
+
+    def test_session_is_closed_with_its_loop(self):
+        pytest.importorskip("aiohttp")
+        client = _client()
+
+        async def open_session():
+            return client._get_session()
+
+        session = asyncio.run(open_session())
+
+        assert session.closed
+        assert len(client._sessions) == 0
@@ -0,0 +1,174 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for Bedrock batch inference jobs.
+"""
+
+import base64
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock.batch import (
+    BatchInferenceJob,
+    BatchRecordError,
+    BedrockBatchRunner,
+    LocalBatchRunner,
+    build_model_input,
+    parse_model_output,
+)
+from idp_common.bedrock.client import BedrockClient
+
+CLAUDE = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+NOVA = "us.amazon.nova-pro-v1:0"
+
+
+def _client():
+    return BedrockClient(region="us-east-1", metrics_enabled=False)
+
+
+def _converse_params(model_id, content, **kwargs):
+    return _client()._build_converse_params(
+        model_id=model_id, system_prompt="system", content=content, **kwargs
+    )
+
+
+def _claude_output(text):
+    return {
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+@pytest.mark.unit
+class TestModelInput:
+    def test_claude_request_body(self):
+        params = _converse_params(
+            CLAUDE,
+            [
+                {"text": "static<<CACHEPOINT>>dynamic"},
+                {"image": {"format": "png", "source": {"bytes": b"img"}}},
+            ],
+            top_k=5,
+            max_tokens=1000,
+        )
+
+        body = build_model_input(params)
+
+        assert body["anthropic_version"] == "bedrock-2023-05-31"
+        assert body["system"] == "system"
+        assert body["max_tokens"] == 1000
+        assert body["top_k"] == 5
+        content = body["messages"][0]["content"]
+        # cachePoint blocks are dropped
+        assert [block["type"] for block in content] == ["text", "text", "image"]
+        assert content[2]["source"] == {
+            "type": "base64",
+            "media_type": "image/png",
+            "data": base64.b64encode(b"img").decode(),
+        }
+        json.dumps(body)
+
+    def test_nova_request_body(self):
+        params = _converse_params(NOVA, [{"text": "hi"}], top_k=5, max_tokens=1000)
+
+        body = build_model_input(params)
+
+        assert body["schemaVersion"] == "messages-v1"
+        assert body["system"] == [{"text": "system"}]
+        assert body["inferenceConfig"] == {
+            "temperature": 0.0,
+            "top_p": 0.1,
+            "max_new_tokens": 1000,
+            "top_k": 5,
+        }
+
+    def test_unsupported_model(self):
+        params = _converse_params("meta.llama3-70b-instruct-v1:0", [{"text": "hi"}])
+
+        with pytest.raises(ValueError):
+            build_model_input(params)
+
+    def test_claude_output_in_converse_shape(self):
+        response = parse_model_output(_claude_output("answer"))
+
+        assert response["output"]["message"]["content"] == [{"text": "answer"}]
+        assert response["usage"]["totalTokens"] == 15
+
+
+@pytest.mark.unit
+class TestBatchInferenceJob:
+    def test_local_round_trip(self, tmp_path):
+        job = BatchInferenceJob(
+            CLAUDE,
+            str(tmp_path / "input" / "records.jsonl"),
+            str(tmp_path / "output"),
+            context="Classification",
+            client=_client(),
+        )
+        job.add(
+            "doc#1", model_id=CLAUDE, system_prompt="system", content=[{"text": "a"}]
+        )
+        job.add(
+            "doc#2", model_id=CLAUDE, system_prompt="system", content=[{"text": "b"}]
+        )
+
+        def respond(model_id, model_input):
+            text = model_input["messages"][0]["content"][0]["text"]
+            if text == "b":
+                raise ValueError("bad record")
+            return _claude_output(f"answer {text}")
+
+        runner = LocalBatchRunner(respond)
+        job_id = job.submit(runner)
+
+        assert job.get_status(runner) == "Completed"
+        # A later invocation only needs the job's locations and ID
+        results = BatchInferenceJob(
+            CLAUDE, job.input_uri, job.output_uri, "Classification", job_id=job_id
+        ).get_results()
+        assert results["doc#1"]["response"]["output"]["message"]["content"] == [
+            {"text": "answer a"}
+        ]
+        assert results["doc#1"]["metering"] == {
+            f"Classification/bedrock_batch/{CLAUDE}": {
+                "inputTokens": 10,
+                "outputTokens": 5,
+                "totalTokens": 15,
+                "cacheReadInputTokens": 0,
+                "cacheWriteInputTokens": 0,
+            }
+        }
+        assert isinstance(results["doc#2"], BatchRecordError)
+
+    def test_records_must_share_model_and_context(self):
+        job = BatchInferenceJob(CLAUDE, "in.jsonl", "out", context="Extraction")
+
+        with pytest.raises(ValueError):
+            job.add("1", model_id=NOVA, system_prompt="s", content=[{"text": "a"}])
+        with pytest.raises(ValueError):
+            job.add(
+                "1",
+                model_id=CLAUDE,
+                system_prompt="s",
+                content=[{"text": "a"}],
+                context="Classification",
+            )
+
+    def test_bedrock_runner_submits_job(self):
+        runner = BedrockBatchRunner(role_arn="arn:aws:iam::123:role/batch")
+        runner._client = MagicMock()
+        runner._client.create_model_invocation_job.return_value = {
+            "jobArn": "arn:aws:bedrock:us-east-1:123:model-invocation-job/abc123"
+        }
+
+        job_id = runner.submit("job", CLAUDE, "s3://b/in.jsonl", "s3://b/out/")
+
+        assert job_id == "abc123"
+        kwargs = runner._client.create_model_invocation_job.call_args.kwargs
+        assert kwargs["inputDataConfig"]["s3InputDataConfig"]["s3Uri"] == (
+            "s3://b/in.jsonl"
+        )
+        assert kwargs["roleArn"] == "arn:aws:iam::123:role/batch"
@@ -0,0 +1,224 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the Bedrock client-side rate limiters.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock import rate_limiter
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.rate_limiter import (
+    DynamoDBRateLimiter,
+    Reservation,
+    TokenBucketRateLimiter,
+    estimate_input_tokens,
+)
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+
+@pytest.fixture(autouse=True)
+def reset_limiters(monkeypatch):
+    monkeypatch.delenv("BEDROCK_RATE_LIMITS", raising=False)
+    monkeypatch.delenv("BEDROCK_RATE_LIMIT_TABLE", raising=False)
+    rate_limiter.reset_rate_limiters()
+    yield
+    rate_limiter.reset_rate_limiters()
+
+
+def _converse_response(input_tokens, output_tokens):
+    return {
+        "output": {"message": {"content": [{"text": "ok"}]}},
+        "usage": {
+            "inputTokens": input_tokens,
+            "outputTokens": output_tokens,
+            "totalTokens": input_tokens + output_tokens,
+        },
+    }
+
+
+@pytest.mark.unit
+class TestEstimateInputTokens:
+    def test_counts_text_and_images(self):
+        params = {
+            "system": [{"text": "x" * 400}],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"text": "y" * 800},
+                        {"image": {"format": "jpeg", "source": {"bytes": b""}}},
+                        {"cachePoint": {"type": "default"}},
+                    ],
+                }
+            ],
+        }
+        assert estimate_input_tokens(params) == 300 + rate_limiter.TOKENS_PER_IMAGE
+
+
+@pytest.mark.unit
+class TestTokenBucketRateLimiter:
+    def test_waits_when_requests_exhausted(self):
+        limiter = TokenBucketRateLimiter(MODEL_ID, requests_per_minute=2)
+        with patch.object(rate_limiter.time, "sleep") as mock_sleep:
+            limiter.acquire(0)
+            limiter.acquire(0)
+            mock_sleep.assert_not_called()
+
+            # Pretend the sleep refilled the bucket
+            def refill(seconds):
+                limiter._requests += 1
+
+            mock_sleep.side_effect = refill
+            limiter.acquire(0)
+
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args.args[0] == pytest.approx(30, rel=0.01)
+
+    def test_acquire_async_waits_without_blocking(self):
+        limiter = TokenBucketRateLimiter(MODEL_ID, requests_per_minute=60)
+        limiter._requests = 0
+        waits = []
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            limiter._requests = 1
+
+        with patch("asyncio.sleep", fake_sleep):
+            reservation = asyncio.run(limiter.acquire_async(100))
+
+        assert reservation.tokens == 100
+        assert waits and waits[0] == pytest.approx(1.0, abs=0.05)
+
+    def test_reconcile_refunds_and_debits_tokens(self):
+        limiter = TokenBucketRateLimiter(MODEL_ID, tokens_per_minute=1000)
+        reservation = limiter.acquire(600)
+        assert limiter._tokens == pytest.approx(400, abs=1)
+
+        limiter.reconcile(reservation, 100)
+        assert limiter._tokens == pytest.approx(900, abs=1)
+
+        reservation = limiter.acquire(100)
+        limiter.reconcile(reservation, 1500)
+        assert limiter._tokens < 0
+
+    def test_request_larger_than_quota_is_clamped(self):
+        limiter = TokenBucketRateLimiter(MODEL_ID, tokens_per_minute=1000)
+        reservation = limiter.acquire(5000)
+        assert reservation.tokens == 1000
+
+
+@pytest.mark.unit
+class TestDynamoDBRateLimiter:
+    def _limiter(self):
+        with patch.object(rate_limiter.boto3, "resource"):
+            limiter = DynamoDBRateLimiter(
+                MODEL_ID,
+                "table",
+                requests_per_minute=10,
+                tokens_per_minute=1000,
+                region="us-east-1",
+            )
+        limiter.table = MagicMock()
+        return limiter
+
+    def test_acquire_adds_to_current_window(self):
+        limiter = self._limiter()
+        reservation = limiter.acquire(200)
+
+        kwargs = limiter.table.update_item.call_args.kwargs
+        assert kwargs["Key"]["PK"] == f"bedrock_rate#{MODEL_ID}"
+        assert kwargs["Key"]["SK"] == str(reservation.window)
+        assert kwargs["ExpressionAttributeValues"][":rpm"] == 10
+        assert kwargs["ExpressionAttributeValues"][":token_room"] == 800
+        assert reservation.tokens == 200
+
+    def test_full_window_waits_for_next(self):
+        limiter = self._limiter()
+        full = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}},
+            "UpdateItem",
+        )
+        limiter.table.update_item.side_effect = [full, {}]
+        with patch.object(rate_limiter.time, "sleep") as mock_sleep:
+            limiter.acquire(10)
+        mock_sleep.assert_called_once()
+        assert limiter.table.update_item.call_count == 2
+
+    def test_table_errors_fail_open(self):
+        limiter = self._limiter()
+        limiter.table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ResourceNotFoundException", "Message": ""}},
+            "UpdateItem",
+        )
+        reservation = limiter.acquire(10)
+        assert reservation.window is None
+        limiter.reconcile(reservation, 500)
+
+    def test_reconcile_adds_token_delta(self):
+        limiter = self._limiter()
+        limiter.reconcile(Reservation(tokens=200, window=5), 350)
+        kwargs = limiter.table.update_item.call_args.kwargs
+        assert kwargs["Key"]["SK"] == "5"
+        assert kwargs["ExpressionAttributeValues"] == {":delta": 150}
+
+
+@pytest.mark.unit
+class TestRateLimiterRegistry:
+    def test_unconfigured_model_has_no_limiter(self):
+        assert rate_limiter.get_rate_limiter(MODEL_ID) is None
+
+    def test_limits_from_environment(self, monkeypatch):
+        monkeypatch.setenv(
+            "BEDROCK_RATE_LIMITS",
+            '{"%s": {"requests_per_minute": 5, "tokens_per_minute": 100}}' % MODEL_ID,
+        )
+        limiter = rate_limiter.get_rate_limiter(MODEL_ID)
+        assert isinstance(limiter, TokenBucketRateLimiter)
+        assert limiter.requests_per_minute == 5
+        assert rate_limiter.get_rate_limiter(MODEL_ID) is limiter
+
+    def test_table_selects_dynamodb_limiter(self):
+        rate_limiter.configure_rate_limits(
+            {MODEL_ID: {"requests_per_minute": 5}}, table_name="table"
+        )
+        with patch.object(rate_limiter.boto3, "resource"):
+            limiter = rate_limiter.get_rate_limiter(MODEL_ID)
+        assert isinstance(limiter, DynamoDBRateLimiter)
+
+
+@pytest.mark.unit
+class TestBedrockClientRateLimiting:
+    def test_invoke_reconciles_with_actual_usage(self):
+        rate_limiter.configure_rate_limits({MODEL_ID: {"tokens_per_minute": 10000}})
+        client = BedrockClient(region="us-east-1", metrics_enabled=False)
+        client._client = MagicMock()
+        client._client.converse.return_value = _converse_response(300, 200)
+
+        client.invoke_model(
+            model_id=MODEL_ID, system_prompt="s", content=[{"text": "hello"}]
+        )
+
+        limiter = rate_limiter.get_rate_limiter(MODEL_ID)
+        assert limiter._tokens == pytest.approx(10000 - 500, abs=1)
+
+    def test_failed_attempt_refunds_tokens(self):
+        rate_limiter.configure_rate_limits({MODEL_ID: {"tokens_per_minute": 10000}})
+        client = BedrockClient(region="us-east-1", metrics_enabled=False)
+        client._client = MagicMock()
+        client._client.converse.side_effect = ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "bad"}}, "Converse"
+        )
+
+        with pytest.raises(ClientError):
+            client.invoke_model(
+                model_id=MODEL_ID, system_prompt="s", content=[{"text": "x" * 4000}]
+            )
+
+        limiter = rate_limiter.get_rate_limiter(MODEL_ID)
+        assert limiter._tokens == pytest.approx(10000, abs=1)
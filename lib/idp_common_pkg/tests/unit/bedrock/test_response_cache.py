@@ -0,0 +1,186 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the Bedrock response cache.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from idp_common.bedrock import response_cache
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.response_cache import (
+    ResponseCache,
+    compute_cache_key,
+)
+from idp_common.utils.cache_store import LocalCacheStore, MemoryCacheStore
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+
+@pytest.fixture(autouse=True)
+def reset_cache(monkeypatch):
+    monkeypatch.delenv("BEDROCK_RESPONSE_CACHE", raising=False)
+    response_cache.reset_response_cache()
+    yield
+    response_cache.reset_response_cache()
+
+
+def _params(text="hello", image=b"page-1", temperature=0.0):
+    return {
+        "modelId": MODEL_ID,
+        "system": [{"text": "system"}],
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"text": text},
+                    {"image": {"format": "jpeg", "source": {"bytes": image}}},
+                ],
+            }
+        ],
+        "inferenceConfig": {"temperature": temperature},
+        "additionalModelRequestFields": None,
+    }
+
+
+def _client_with_response():
+    client = BedrockClient(region="us-east-1", metrics_enabled=False)
+    client._client = MagicMock()
+    client._client.converse.return_value = {
+        "output": {"message": {"content": [{"text": "answer"}]}},
+        "usage": {"inputTokens": 100, "outputTokens": 20, "totalTokens": 120},
+        "ResponseMetadata": {"RequestId": "abc"},
+    }
+    return client
+
+
+@pytest.mark.unit
+class TestComputeCacheKey:
+    def test_stable_for_identical_requests(self):
+        assert compute_cache_key(MODEL_ID, _params()) == compute_cache_key(
+            MODEL_ID, _params()
+        )
+
+    def test_changes_with_content_image_and_config(self):
+        base = compute_cache_key(MODEL_ID, _params())
+        assert compute_cache_key(MODEL_ID, _params(text="other")) != base
+        assert compute_cache_key(MODEL_ID, _params(image=b"page-2")) != base
+        assert compute_cache_key(MODEL_ID, _params(temperature=0.5)) != base
+        assert compute_cache_key("other-model", _params()) != base
+        guarded = dict(_params(), guardrailConfig={"guardrailIdentifier": "g"})
+        assert compute_cache_key(MODEL_ID, guarded) != base
+
+
+@pytest.mark.unit
+class TestResponseStores:
+    def test_memory_store_evicts_least_recently_used(self):
+        store = MemoryCacheStore(max_entries=2)
+        expires_at = int(time.time()) + 60
+        store.put("a", {"v": 1}, expires_at)
+        store.put("b", {"v": 2}, expires_at)
+        store.get("a")
+        store.put("c", {"v": 3}, expires_at)
+        assert store.get("b") is None
+        assert store.get("a") == {"v": 1}
+
+    def test_memory_store_returns_copies(self):
+        store = MemoryCacheStore()
+        store.put("a", {"v": [1]}, int(time.time()) + 60)
+        store.get("a")["v"].append(2)
+        assert store.get("a") == {"v": [1]}
+
+    def test_local_store_round_trip_and_expiry(self, tmp_path):
+        store = LocalCacheStore(str(tmp_path))
+        store.put("a", {"bytes": b"\x00\x01", "text": "x"}, int(time.time()) + 60)
+        assert store.get("a") == {"bytes": b"\x00\x01", "text": "x"}
+        store.put("b", {"text": "old"}, int(time.time()) - 1)
+        assert store.get("b") is None
+
+    def test_tiered_lookup_fills_faster_tiers(self, tmp_path):
+        memory = MemoryCacheStore()
+        local = LocalCacheStore(str(tmp_path))
+        local.put("k", {"v": 1}, int(time.time()) + 60)
+        cache = ResponseCache([memory, local])
+
+        assert cache.lookup("k") == {"v": 1}
+        assert memory.get("k") == {"v": 1}
+        assert cache.lookup("missing") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_store_errors_are_misses(self):
+        broken = MagicMock()
+        broken.get.side_effect = Exception("unavailable")
+        broken.put.side_effect = Exception("unavailable")
+        cache = ResponseCache([broken])
+        assert cache.lookup("k") is None
+        cache.save("k", {"v": 1})
+        assert cache.stats["errors"] == 2
+
+    def test_environment_configures_tiers(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("BEDROCK_RESPONSE_CACHE", "memory, local")
+        monkeypatch.setenv("BEDROCK_RESPONSE_CACHE_DIR", str(tmp_path))
+        cache = response_cache.get_response_cache()
+        assert [type(s) for s in cache.stores] == [MemoryCacheStore, LocalCacheStore]
+
+
+@pytest.mark.unit
+class TestBedrockClientResponseCache:
+    def test_second_identical_call_is_served_from_cache(self):
+        cache = ResponseCache([MemoryCacheStore()])
+        client = _client_with_response()
+        client.response_cache = cache
+
+        first = client.invoke_model(
+            model_id=MODEL_ID,
+            system_prompt="s",
+            content=[{"text": "q"}],
+            context="Extraction",
+        )
+        second = client.invoke_model(
+            model_id=MODEL_ID,
+            system_prompt="s",
+            content=[{"text": "q"}],
+            context="Extraction",
+        )
+
+        assert client._client.converse.call_count == 1
+        assert first["metering"] == {
+            f"Extraction/bedrock/{MODEL_ID}": {
+                "inputTokens": 100,
+                "outputTokens": 20,
+                "totalTokens": 120,
+            }
+        }
+        assert second["metering"] == {
+            f"Extraction/bedrock_cache/{MODEL_ID}": {
+                "hits": 1,
+                "cachedInputTokens": 100,
+                "cachedOutputTokens": 20,
+            }
+        }
+        assert second["response"]["output"] == first["response"]["output"]
+        assert "ResponseMetadata" not in second["response"]
+
+    def test_nonzero_temperature_is_not_cached(self):
+        client = _client_with_response()
+        client.response_cache = ResponseCache([MemoryCacheStore()])
+        for _ in range(2):
+            client.invoke_model(
+                model_id=MODEL_ID,
+                system_prompt="s",
+                content=[{"text": "q"}],
+                temperature=0.7,
+            )
+        assert client._client.converse.call_count == 2
+
+    def test_cache_disabled_by_default(self):
+        client = _client_with_response()
+        for _ in range(2):
+            client.invoke_model(
+                model_id=MODEL_ID, system_prompt="s", content=[{"text": "q"}]
+            )
+        assert client._client.converse.call_count == 2
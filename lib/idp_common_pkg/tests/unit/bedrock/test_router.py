@@ -0,0 +1,233 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for latency-aware Bedrock request routing.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock import router as router_module
+from idp_common.bedrock.async_client import AsyncBedrockClient
+from idp_common.bedrock.client import BedrockClient
+from idp_common.bedrock.response_cache import ResponseCache, compute_cache_key
+from idp_common.bedrock.router import ModelRouter, Target, get_router
+from idp_common.utils.cache_store import MemoryCacheStore
+
+NOVA = "us.amazon.nova-pro-v1:0"
+CLAUDE = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+EAST = Target("us-east-1", NOVA)
+WEST = Target("us-west-2", NOVA)
+FALLBACK = Target("us-east-1", CLAUDE)
+
+RESPONSE = {
+    "output": {"message": {"content": [{"text": "answer"}]}},
+    "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15},
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_routing(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    for name in (
+        "BEDROCK_ROUTING",
+        "BEDROCK_RESPONSE_CACHE",
+        "BEDROCK_RATE_LIMITS",
+        "RETRY_POLICY",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    router_module.reset_routers()
+    yield
+    router_module.reset_routers()
+
+
+def _throttle():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+        "Converse",
+    )
+
+
+def _pool(*targets):
+    return [{"region": t.region, "model_id": t.model_id} for t in targets]
+
+
+@pytest.mark.unit
+class TestModelRouter:
+    def test_prefers_pool_order(self):
+        router = ModelRouter([EAST, WEST])
+        assert router.choose() == EAST
+
+    def test_throttled_target_is_skipped(self):
+        router = ModelRouter([EAST, WEST])
+        router.record_throttle(EAST)
+
+        assert router.choose() == WEST
+        assert router.has_alternative(EAST)
+
+    def test_much_slower_target_is_passed_over(self):
+        router = ModelRouter([EAST, WEST], latency_tolerance=1.5)
+        router.record_success(EAST, 10.0)
+        router.record_success(WEST, 2.0)
+
+        assert router.choose() == WEST
+
+    def test_slightly_slower_preferred_target_is_kept(self):
+        router = ModelRouter([EAST, WEST], latency_tolerance=1.5)
+        router.record_success(EAST, 2.5)
+        router.record_success(WEST, 2.0)
+
+        assert router.choose() == EAST
+
+    def test_all_cooling_down_returns_first_to_recover(self):
+        router = ModelRouter([EAST, WEST])
+        router.record_throttle(EAST)
+        router.record_throttle(EAST)
+        router.record_throttle(WEST)
+
+        assert router.choose() == WEST
+        assert not router.has_alternative(WEST)
+
+    def test_success_clears_cooldown_and_tracks_rates(self):
+        router = ModelRouter([EAST, WEST], smoothing=0.5)
+        router.record_error(EAST)
+        router.record_success(EAST, 1.0)
+
+        stats = router.get_stats()[0]
+        assert stats["healthy"]
+        assert stats["error_rate"] == pytest.approx(0.25)
+        assert stats["latency"] == 1.0
+
+
+@pytest.mark.unit
+class TestGetRouter:
+    def test_no_pool_means_no_router(self):
+        assert get_router("Extraction", EAST) is None
+
+    def test_requested_target_is_prepended(self, monkeypatch):
+        monkeypatch.setenv(
+            "BEDROCK_ROUTING", json.dumps({"Extraction": _pool(WEST, FALLBACK)})
+        )
+
+        router = get_router("Extraction", EAST)
+
+        assert router.targets == [EAST, WEST, FALLBACK]
+        assert get_router("Extraction", EAST) is router
+
+    def test_pool_order_kept_when_requested_target_listed(self):
+        router_module.configure_routing({"Extraction": _pool(WEST, EAST)})
+
+        assert get_router("Extraction", EAST).targets == [WEST, EAST]
+
+    def test_invalid_environment_is_ignored(self, monkeypatch):
+        monkeypatch.setenv("BEDROCK_ROUTING", "not json")
+
+        assert get_router("Extraction", EAST) is None
+
+
+@pytest.mark.unit
+class TestBedrockClientRouting:
+    def _client(self):
+        client = BedrockClient(region="us-east-1", metrics_enabled=False)
+        client._calculate_backoff = MagicMock(return_value=5)
+        client._client = MagicMock()
+        return client
+
+    def test_throttled_request_fails_over_to_other_region(self):
+        router_module.configure_routing({"Extraction": _pool(EAST, WEST)})
+        client = self._client()
+        client._client.converse.side_effect = _throttle()
+        west_client = MagicMock()
+        west_client.converse.return_value = dict(RESPONSE)
+        client._regional_clients["us-west-2"] = west_client
+
+        with patch("idp_common.bedrock.client.time.sleep") as sleep:
+            result = client.invoke_model(
+                NOVA, "system", [{"text": "hi"}], context="Extraction"
+            )
+
+        assert west_client.converse.call_count == 1
+        assert result["metering"] == {f"Extraction/bedrock/{NOVA}": RESPONSE["usage"]}
+        # Failing over to a healthy target does not back off
+        sleep.assert_called_once_with(0)
+        assert get_router("Extraction", EAST).choose() == WEST
+
+    def test_fallback_model_is_metered_and_rebuilt(self):
+        router_module.configure_routing({"Extraction": _pool(EAST, FALLBACK)})
+        client = self._client()
+        calls = []
+
+        def converse(**params):
+            calls.append(params)
+            if params["modelId"] == NOVA:
+                raise _throttle()
+            return dict(RESPONSE)
+
+        client._client.converse.side_effect = converse
+
+        with patch("idp_common.bedrock.client.time.sleep"):
+            result = client.invoke_model(
+                NOVA,
+                "system",
+                [{"text": "static<<CACHEPOINT>>dynamic"}],
+                context="Extraction",
+            )
+
+        assert [c["modelId"] for c in calls] == [NOVA, CLAUDE]
+        assert f"Extraction/bedrock/{CLAUDE}" in result["metering"]
+        # Fallback parameters are built from the original prompt and content
+        assert {"cachePoint": {"type": "default"}} in calls[1]["messages"][0]["content"]
+
+    def test_fallback_response_is_cached_under_serving_model(self):
+        router_module.configure_routing({"Extraction": _pool(EAST, FALLBACK)})
+        client = self._client()
+        client.response_cache = ResponseCache([MemoryCacheStore()])
+
+        def converse(**params):
+            if params["modelId"] == NOVA:
+                raise _throttle()
+            return dict(RESPONSE)
+
+        client._client.converse.side_effect = converse
+
+        with patch("idp_common.bedrock.client.time.sleep"):
+            client.invoke_model(NOVA, "system", [{"text": "hi"}], context="Extraction")
+
+        def key(model_id):
+            return compute_cache_key(
+                model_id,
+                client._build_converse_params(model_id, "system", [{"text": "hi"}]),
+            )
+
+        assert client.response_cache.lookup(key(NOVA)) is None
+        assert client.response_cache.lookup(key(CLAUDE))["output"] == RESPONSE["output"]
+
+    def test_unrouted_context_uses_requested_model(self):
+        router_module.configure_routing({"Extraction": _pool(WEST)})
+        client = self._client()
+        client._client.converse.return_value = dict(RESPONSE)
+
+        client.invoke_model(NOVA, "system", [{"text": "hi"}], context="Classification")
+
+        assert client._client.converse.call_args.kwargs["modelId"] == NOVA
+
+    def test_async_client_routes_to_target_region(self):
+        router_module.configure_routing({"Extraction": _pool(EAST, WEST)})
+        client = AsyncBedrockClient(region="us-east-1", metrics_enabled=False)
+        client._calculate_backoff = lambda retry_count: 0
+        client._converse = AsyncMock(side_effect=[_throttle(), dict(RESPONSE)])
+
+        asyncio.run(
+            client.invoke_model_async(
+                NOVA, "system", [{"text": "hi"}], context="Extraction"
+            )
+        )
+
+        assert client._converse.await_args_list[0].kwargs == {"region": "us-east-1"}
+        assert client._converse.await_args_list[1].kwargs == {"region": "us-west-2"}
@@ -0,0 +1,201 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for streaming Bedrock converse calls.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import EventStreamError
+from idp_common.bedrock.client import BedrockClient, StreamAborted
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+USAGE = {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15}
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    for name in (
+        "BEDROCK_ROUTING",
+        "BEDROCK_RESPONSE_CACHE",
+        "BEDROCK_RATE_LIMITS",
+        "RETRY_POLICY",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _events(*deltas):
+    events = [{"messageStart": {"role": "assistant"}}]
+    events += [
+        {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": d}}}
+        for d in deltas
+    ]
+    events += [
+        {"contentBlockStop": {"contentBlockIndex": 0}},
+        {"messageStop": {"stopReason": "end_turn"}},
+        {"metadata": {"usage": USAGE, "metrics": {"latencyMs": 120}}},
+    ]
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(events)
+    return {"stream": stream, "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+def _client():
+    client = BedrockClient(region="us-east-1", metrics_enabled=False)
+    client._client = MagicMock()
+    return client
+
+
+@pytest.mark.unit
+class TestConverseStream:
+    def test_stream_matches_converse_response(self):
+        client = _client()
+        client.client.converse_stream.return_value = _events('{"a": ', "1}")
+        deltas = []
+
+        result = client.invoke_model(
+            MODEL_ID,
+            "system",
+            [{"text": "hi"}],
+            context="Extraction",
+            stream_handler=deltas.append,
+        )
+
+        assert deltas == ['{"a": ', "1}"]
+        assert client.extract_text_from_response(result) == '{"a": 1}'
+        assert result["response"]["stopReason"] == "end_turn"
+        assert result["metering"] == {f"Extraction/bedrock/{MODEL_ID}": USAGE}
+        client.client.converse.assert_not_called()
+
+    def test_reasoning_blocks_are_kept(self):
+        client = _client()
+        response = _events("answer")
+        events = list(response["stream"].__iter__.return_value)
+        events.insert(
+            1,
+            {
+                "contentBlockDelta": {
+                    "contentBlockIndex": 0,
+                    "delta": {"reasoningContent": {"text": "thinking"}},
+                }
+            },
+        )
+        for event in events:
+            if (
+                "contentBlockDelta" in event
+                and "text" in event["contentBlockDelta"]["delta"]
+            ):
+                event["contentBlockDelta"]["contentBlockIndex"] = 1
+        response["stream"].__iter__.return_value = iter(events)
+        client.client.converse_stream.return_value = response
+
+        result = client.invoke_model(
+            MODEL_ID, "system", [{"text": "hi"}], stream_handler=lambda d: None
+        )
+
+        content = result["response"]["output"]["message"]["content"]
+        assert content[0]["reasoningContent"]["reasoningText"]["text"] == "thinking"
+        assert content[1] == {"text": "answer"}
+
+    def test_handler_error_aborts_stream(self):
+        client = _client()
+        response = _events("{bad", "never sent")
+        client.client.converse_stream.return_value = response
+
+        def handler(delta):
+            raise ValueError("malformed")
+
+        with pytest.raises(StreamAborted) as exc_info:
+            client.invoke_model(
+                MODEL_ID,
+                "system",
+                [{"text": "hi"}],
+                context="Extraction",
+                stream_handler=handler,
+            )
+
+        aborted = exc_info.value
+        assert aborted.text == "{bad"
+        assert isinstance(aborted.__cause__, ValueError)
+        response["stream"].close.assert_called_once()
+        assert client.client.converse_stream.call_count == 1
+        usage = aborted.metering[f"Extraction/bedrock/{MODEL_ID}"]
+        assert usage["outputTokens"] == 1
+        assert usage["inputTokens"] > 0
+
+
+def _failing_events(*deltas):
+    def events():
+        yield {"messageStart": {"role": "assistant"}}
+        for d in deltas:
+            yield {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": d}}}
+        raise EventStreamError(
+            {
+                "Error": {
+                    "Code": "throttlingException",
+                    "Message": "Too many tokens",
+                }
+            },
+            "ConverseStream",
+        )
+
+    stream = MagicMock()
+    stream.__iter__.side_effect = events
+    return {"stream": stream, "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+@pytest.mark.unit
+class TestStreamRetries:
+    def _client(self):
+        client = _client()
+        client._calculate_backoff = lambda retry_count: 0
+        return client
+
+    def test_mid_stream_throttling_is_retried(self):
+        client = self._client()
+        client.client.converse_stream.side_effect = [
+            _failing_events(),
+            _events("ok"),
+        ]
+
+        result = client.invoke_model(
+            MODEL_ID, "system", [{"text": "hi"}], stream_handler=lambda d: None
+        )
+
+        assert client.extract_text_from_response(result) == "ok"
+        assert client.client.converse_stream.call_count == 2
+
+    def test_handler_is_reset_before_retry_after_output(self):
+        client = self._client()
+        client.client.converse_stream.side_effect = [
+            _failing_events('{"a": '),
+            _events('{"a": ', "1}"),
+        ]
+        deltas = []
+
+        def handler(delta):
+            deltas.append(delta)
+
+        handler.reset = deltas.clear
+
+        client.invoke_model(
+            MODEL_ID, "system", [{"text": "hi"}], stream_handler=handler
+        )
+
+        assert "".join(deltas) == '{"a": 1}'
+
+    def test_no_retry_after_output_without_reset(self):
+        client = self._client()
+        client.client.converse_stream.side_effect = [
+            _failing_events('{"a": '),
+            _events('{"a": ', "1}"),
+        ]
+
+        with pytest.raises(EventStreamError):
+            client.invoke_model(
+                MODEL_ID, "system", [{"text": "hi"}], stream_handler=lambda d: None
+            )
+        assert client.client.converse_stream.call_count == 1
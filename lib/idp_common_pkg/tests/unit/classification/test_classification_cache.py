@@ -0,0 +1,204 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the content-addressed page classification cache.
+"""
+
+import copy
+from unittest.mock import patch
+
+import boto3
+import pytest
+from idp_common.classification.models import (
+    DocumentClassification,
+    PageClassification,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Status
+from moto import mock_aws
+
+TABLE = "tracking-table"
+MODEL = "us.amazon.nova-pro-v1:0"
+
+CONFIG = {
+    "classes": [
+        {"name": "invoice", "description": "An invoice"},
+        {"name": "letter", "description": "A letter"},
+    ],
+    "classification": {
+        "model": MODEL,
+        "system_prompt": "You are a document classification assistant.",
+        "task_prompt": "Classify {DOCUMENT_TEXT} as one of {CLASS_NAMES_AND_DESCRIPTIONS}",
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def aws(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        boto3.resource("dynamodb", region_name="us-east-1").create_table(
+            TableName=TABLE,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="bucket")
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            s3_client.put_object(Bucket="bucket", Key=name, Body=name.encode())
+        with patch(
+            "idp_common.classification.cache.s3.get_s3_client", return_value=s3_client
+        ):
+            yield s3_client
+
+
+def _service(config=CONFIG):
+    return ClassificationService(
+        region="us-east-1", config=copy.deepcopy(config), cache_table=TABLE
+    )
+
+
+def _document(document_id, execution, texts, hashed=True):
+    document = Document(
+        id=document_id,
+        input_key=f"{document_id}.pdf",
+        status=Status.CLASSIFYING,
+        workflow_execution_arn=f"arn:aws:states:us-east-1:123456789012:execution:sm:{execution}",
+    )
+    for page_id, text in enumerate(texts, start=1):
+        document.pages[str(page_id)] = Page(
+            page_id=str(page_id),
+            parsed_text_uri=f"s3://bucket/{text}",
+            # Recorded by OCR when it writes the page artifacts
+            content_hash=f"sha-{text}" if hashed else None,
+        )
+    return document
+
+
+def _classify_page(page_id, text_uri=None, **kwargs):
+    if text_uri.endswith("c.txt"):
+        raise RuntimeError("throttled")
+    return PageClassification(
+        page_id=page_id,
+        classification=DocumentClassification(
+            doc_type="invoice" if text_uri.endswith("a.txt") else "letter",
+            metadata={
+                "document_boundary": "start",
+                "metering": {
+                    f"Classification/bedrock/{MODEL}": {
+                        "inputTokens": 100,
+                        "outputTokens": 10,
+                    }
+                },
+            },
+        ),
+        text_uri=text_uri,
+    )
+
+
+def _cached_items():
+    table = boto3.resource("dynamodb", region_name="us-east-1").Table(TABLE)
+    return table.scan()["Items"]
+
+
+@pytest.mark.unit
+class TestPageClassificationCache:
+    def test_completed_pages_are_cached_when_another_fails(self):
+        service = _service()
+        document = _document("doc-1", "run-1", ["a.txt", "b.txt", "c.txt"])
+
+        with patch.object(service, "classify_page", side_effect=_classify_page):
+            service.classify_document(document)
+
+        items = _cached_items()
+        assert sorted(item["page_id"] for item in items) == ["1", "2"]
+        assert all(item["PK"].startswith("classcache#page#") for item in items)
+
+    def test_other_document_with_same_content_hits(self):
+        service = _service()
+        with patch.object(service, "classify_page", side_effect=_classify_page):
+            service.classify_document(_document("doc-1", "run-1", ["a.txt", "b.txt"]))
+
+        # A duplicate upload: same page content, other document and execution
+        document = _document("doc-2", "run-2", ["b.txt", "a.txt", "a.txt"])
+        with patch.object(service, "classify_page") as mock_classify:
+            result = _service().classify_document(document)
+
+        mock_classify.assert_not_called()
+        assert [result.pages[p].classification for p in ["1", "2", "3"]] == [
+            "letter",
+            "invoice",
+            "invoice",
+        ]
+        assert result.pages["2"].parsed_text_uri == "s3://bucket/a.txt"
+        # Billed in the other execution, so reported as cache hits
+        assert result.metering == {
+            f"Classification/bedrock_cache/{MODEL}": {
+                "hits": 3,
+                "cachedInputTokens": 300,
+                "cachedOutputTokens": 30,
+            }
+        }
+
+    def test_retry_of_same_execution_keeps_metering(self):
+        service = _service()
+        document = _document("doc-1", "run-1", ["a.txt", "c.txt"])
+        with patch.object(service, "classify_page", side_effect=_classify_page):
+            service.classify_document(document)
+
+        retry = _document("doc-1", "run-1", ["a.txt", "c.txt"])
+        with patch.object(
+            service, "classify_page", side_effect=_classify_page
+        ) as mock_classify:
+            result = service.classify_document(retry)
+
+        assert mock_classify.call_count == 1
+        assert result.metering[f"Classification/bedrock/{MODEL}"]["inputTokens"] == 100
+
+    def test_configuration_change_misses(self):
+        service = _service()
+        with patch.object(service, "classify_page", side_effect=_classify_page):
+            service.classify_document(_document("doc-1", "run-1", ["a.txt"]))
+
+        config = copy.deepcopy(CONFIG)
+        config["classification"]["task_prompt"] += " carefully"
+        changed = _service(config)
+        with patch.object(
+            changed, "classify_page", side_effect=_classify_page
+        ) as mock_classify:
+            changed.classify_document(_document("doc-2", "run-2", ["a.txt"]))
+
+        assert mock_classify.call_count == 1
+
+    def test_pages_without_content_hash_use_etags(self, aws):
+        service = _service()
+        with patch.object(service, "classify_page", side_effect=_classify_page):
+            service.classify_document(
+                _document("doc-1", "run-1", ["a.txt"], hashed=False)
+            )
+
+        with patch.object(service, "classify_page") as mock_classify:
+            service.classify_document(
+                _document("doc-1", "run-1", ["a.txt"], hashed=False)
+            )
+        mock_classify.assert_not_called()
+
+        # Rewritten object, new ETag
+        aws.put_object(Bucket="bucket", Key="a.txt", Body=b"changed")
+        with patch.object(
+            service, "classify_page", side_effect=_classify_page
+        ) as mock_classify:
+            service.classify_document(
+                _document("doc-2", "run-1", ["a.txt"], hashed=False)
+            )
+        assert mock_classify.call_count == 1
@@ -11,7 +11,9 @@ Unit tests for the ClassificationService class.
 import pytest
 
 # Import standard library modules first
+import asyncio
 import json
+import re
 from textwrap import dedent
 from unittest.mock import ANY, MagicMock, patch
 
@@ -24,6 +26,7 @@ from idp_common.classification.models import (
 )
 from idp_common.classification.service import ClassificationService
 from idp_common.models import Document, Page, Status
+from idp_common.utils import resilience
 
 
 @pytest.mark.unit
@@ -376,6 +379,48 @@ class TestClassificationService:
                 in result.classification.metadata["error"]
             )
 
+    @patch("boto3.client")
+    def test_classify_page_sagemaker_retry_budget_exhausted(
+        self, mock_boto_client, mock_config
+    ):
+        """Test SageMaker classification stops retrying when the retry budget is spent."""
+        mock_sm_client = MagicMock()
+        mock_boto_client.return_value = mock_sm_client
+        mock_sm_client.invoke_endpoint.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Slow down"}},
+            "InvokeEndpoint",
+        )
+
+        with patch.dict(
+            "os.environ",
+            {
+                "SAGEMAKER_ENDPOINT_NAME": "test-endpoint",
+                "RETRY_POLICY": json.dumps(
+                    {
+                        "retry_ratio": 0,
+                        "min_retries_per_second": 0,
+                        "max_retry_tokens": 0,
+                    }
+                ),
+            },
+        ):
+            resilience.reset_retry_policies()
+            try:
+                service = ClassificationService(
+                    region="us-west-2", config=mock_config, backend="sagemaker"
+                )
+                result = service.classify_page_sagemaker(
+                    page_id="1",
+                    image_uri="s3://bucket/image.jpg",
+                    raw_text_uri="s3://bucket/raw.json",
+                )
+            finally:
+                resilience.reset_retry_policies()
+
+        assert result.classification.doc_type == "unclassified"
+        assert "Retry budget exhausted" in result.classification.metadata["error"]
+        assert mock_sm_client.invoke_endpoint.call_count == 1
+
     @patch("boto3.client")
     def test_classify_page_sagemaker_throttling_retry(
         self, mock_boto_client, mock_config
@@ -563,6 +608,61 @@ class TestClassificationService:
         assert result.sections[2].classification == "invoice"
         assert result.sections[2].page_ids == ["3"]
 
+    def test_classify_document_async(self, service):
+        """Test page-by-page document classification with coroutines."""
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        doc.pages["1"] = Page(page_id="1", image_uri="s3://bucket/image1.jpg")
+        doc.pages["2"] = Page(page_id="2", image_uri="s3://bucket/image2.jpg")
+        doc.pages["3"] = Page(page_id="3", image_uri="s3://bucket/image3.jpg")
+        doc_types = {"1": "invoice", "2": "invoice", "3": "receipt"}
+
+        async def classify_page_async(page_id, **kwargs):
+            return PageClassification(
+                page_id=page_id,
+                classification=DocumentClassification(
+                    doc_type=doc_types[page_id],
+                    metadata={"metering": {"model": {"inputTokens": 10}}},
+                ),
+            )
+
+        with patch.object(
+            service, "classify_page_async", side_effect=classify_page_async
+        ):
+            result = asyncio.run(service.classify_document_async(doc))
+
+        assert result.status == Status.CLASSIFYING
+        assert [s.classification for s in result.sections] == ["invoice", "receipt"]
+        assert result.sections[0].page_ids == ["1", "2"]
+        assert result.pages["3"].classification == "receipt"
+        assert result.metering == {"model": {"inputTokens": 30}}
+
+    def test_classify_document_async_records_page_failures(self, service):
+        """Test that a failed page is recorded like in the threaded path."""
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        doc.pages["1"] = Page(page_id="1", image_uri="s3://bucket/image1.jpg")
+        doc.pages["2"] = Page(page_id="2", image_uri="s3://bucket/image2.jpg")
+
+        async def classify_page_async(page_id, **kwargs):
+            if page_id == "2":
+                raise RuntimeError("throttled")
+            return PageClassification(
+                page_id=page_id,
+                classification=DocumentClassification(doc_type="invoice"),
+            )
+
+        with patch.object(
+            service, "classify_page_async", side_effect=classify_page_async
+        ):
+            result = asyncio.run(service.classify_document_async(doc))
+
+        assert result.pages["2"].classification == "error (backoff/retry)"
+        assert "Error classifying page 2: throttled" in result.errors
+        assert "2" in result.metadata["failed_page_exceptions"]
+
     def test_classify_document_single_class_optimization(self, single_class_config):
         """Test document classification optimization when only one class is defined."""
         with (
@@ -803,6 +903,300 @@ class TestClassificationService:
         assert result.pages["2"].classification == "receipt"
         assert result.pages["3"].classification == "receipt"
 
+    def _holistic_window_service(self, mock_config, size, overlap):
+        mock_config["classification"]["classificationMethod"] = (
+            "textbasedHolisticClassification"
+        )
+        mock_config["classification"]["holisticWindowSize"] = size
+        mock_config["classification"]["holisticWindowOverlap"] = overlap
+        with patch("boto3.Session"):
+            return ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+
+    def _holistic_window_response(self, prompt, documents):
+        """Segment the pages in a window prompt by their (document, class) truth."""
+        pages = [
+            int(p) for p in re.findall(r"<page-number>(\d+)</page-number>", prompt)
+        ]
+        segments = []
+        for page in pages:
+            if segments and documents[page] == documents[segments[-1][0]]:
+                segments[-1][1] = page
+            else:
+                segments.append([page, page])
+        text = json.dumps(
+            {
+                "segments": [
+                    {
+                        "ordinal_start_page": start,
+                        "ordinal_end_page": end,
+                        "type": documents[start][1],
+                    }
+                    for start, end in segments
+                ]
+            }
+        )
+        return {
+            "response": {"output": {"message": {"content": [{"text": text}]}}},
+            "metering": {"Classification/bedrock/model": {"inputTokens": len(pages)}},
+        }
+
+    @patch("idp_common.s3.get_text_content")
+    def test_holistic_classify_document_windows(self, mock_get_text, mock_config):
+        """Test that overlapping windows are stitched into document sections."""
+        service = self._holistic_window_service(mock_config, size=4, overlap=2)
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for page in range(1, 11):
+            doc.pages[str(page)] = Page(
+                page_id=str(page), parsed_text_uri=f"s3://bucket/text{page}.txt"
+            )
+        mock_get_text.side_effect = lambda uri: f"text of {uri}"
+        # Two consecutive invoices, then a letter
+        documents = {page: (1, "invoice") for page in range(1, 4)}
+        documents.update({page: (2, "invoice") for page in range(4, 8)})
+        documents.update({page: (3, "letter") for page in range(8, 11)})
+        prompts = []
+
+        def invoke(content, config):
+            prompts.append(content[0]["text"])
+            return self._holistic_window_response(content[0]["text"], documents)
+
+        with patch.object(service, "_invoke_bedrock_model", side_effect=invoke):
+            result = service.holistic_classify_document(doc)
+
+        # Windows 1-4, 3-6, 5-8 and 7-10
+        assert len(prompts) == 4
+        assert "text of s3://bucket/text6.txt" in prompts[1]
+        assert [s.page_ids for s in result.sections] == [
+            ["1", "2", "3"],
+            ["4", "5", "6", "7"],
+            ["8", "9", "10"],
+        ]
+        assert [s.classification for s in result.sections] == [
+            "invoice",
+            "invoice",
+            "letter",
+        ]
+        assert result.metering == {"Classification/bedrock/model": {"inputTokens": 16}}
+
+    @patch("idp_common.s3.get_text_content")
+    def test_holistic_classify_document_windows_async(self, mock_get_text, mock_config):
+        """Test that a window's first page does not start a section by itself."""
+        service = self._holistic_window_service(mock_config, size=3, overlap=0)
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for page in range(1, 6):
+            doc.pages[str(page)] = Page(
+                page_id=str(page), parsed_text_uri=f"s3://bucket/text{page}.txt"
+            )
+        mock_get_text.return_value = "page text"
+        documents = {page: (1, "receipt") for page in range(1, 6)}
+
+        async def invoke(content, config):
+            return self._holistic_window_response(content[0]["text"], documents)
+
+        with patch.object(
+            service, "_invoke_bedrock_model_async", side_effect=invoke
+        ) as mock_invoke:
+            result = asyncio.run(service.holistic_classify_document_async(doc))
+
+        assert mock_invoke.call_count == 2
+        assert [s.page_ids for s in result.sections] == [["1", "2", "3", "4", "5"]]
+
+    def _holistic_window_doc(self, num_pages):
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for page in range(1, num_pages + 1):
+            doc.pages[str(page)] = Page(
+                page_id=str(page), parsed_text_uri=f"s3://bucket/text{page}.txt"
+            )
+        return doc
+
+    @patch("idp_common.s3.get_text_content")
+    def test_holistic_window_unparseable_result_is_retried(
+        self, mock_get_text, mock_config
+    ):
+        """A window whose result cannot be parsed is classified again."""
+        service = self._holistic_window_service(mock_config, size=3, overlap=0)
+        doc = self._holistic_window_doc(6)
+        mock_get_text.return_value = "page text"
+        documents = {
+            page: (page, "invoice" if page % 2 else "letter") for page in range(1, 7)
+        }
+        calls = []
+
+        def invoke(content, config):
+            prompt = content[0]["text"]
+            calls.append(prompt)
+            response = self._holistic_window_response(prompt, documents)
+            second_window = "<page-number>4</page-number>" in prompt
+            if second_window and sum(prompt == c for c in calls) == 1:
+                response["response"]["output"]["message"]["content"][0]["text"] = (
+                    "not json"
+                )
+            return response
+
+        with patch.object(service, "_invoke_bedrock_model", side_effect=invoke):
+            result = service.holistic_classify_document(doc)
+
+        assert len(calls) == 3
+        assert result.status != Status.FAILED
+        assert [s.page_ids for s in result.sections] == [[str(p)] for p in range(1, 7)]
+        # Metering counts the failed attempt as well as the retry
+        assert result.metering == {"Classification/bedrock/model": {"inputTokens": 9}}
+
+    @patch("idp_common.s3.get_text_content")
+    def test_holistic_window_pages_left_unclassified_fail_document(
+        self, mock_get_text, mock_config
+    ):
+        """Pages no window assigns a class are reported and fail the document."""
+        service = self._holistic_window_service(mock_config, size=3, overlap=0)
+        doc = self._holistic_window_doc(6)
+        mock_get_text.return_value = "page text"
+        documents = {page: (1, "invoice") for page in range(1, 7)}
+
+        async def invoke(content, config):
+            response = self._holistic_window_response(content[0]["text"], documents)
+            if "<page-number>4</page-number>" in content[0]["text"]:
+                response["response"]["output"]["message"]["content"][0]["text"] = (
+                    "not json"
+                )
+            return response
+
+        with patch.object(
+            service, "_invoke_bedrock_model_async", side_effect=invoke
+        ) as mock_invoke:
+            result = asyncio.run(service.holistic_classify_document_async(doc))
+
+        assert mock_invoke.call_count == 3
+        assert result.status == Status.FAILED
+        assert any("['4', '5', '6']" in error for error in result.errors)
+
+    @patch("idp_common.s3.get_text_content")
+    def test_classify_document_with_batch_job(self, mock_get_text, service, tmp_path):
+        """Test page classification through a batch job."""
+        from idp_common.bedrock import BatchInferenceJob, LocalBatchRunner
+
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        doc.pages["1"] = Page(page_id="1", parsed_text_uri="s3://bucket/text1.txt")
+        doc.pages["2"] = Page(page_id="2", parsed_text_uri="s3://bucket/text2.txt")
+        mock_get_text.side_effect = lambda uri: f"text of {uri}"
+        batch = BatchInferenceJob(
+            service.bedrock_model,
+            str(tmp_path / "input.jsonl"),
+            str(tmp_path / "output"),
+            context="Classification",
+        )
+
+        record_ids = service.prepare_batch(doc, batch)
+
+        def respond(model_id, model_input):
+            doc_type = "invoice" if "text1" in json.dumps(model_input) else "letter"
+            return {
+                "content": [{"type": "text", "text": json.dumps({"class": doc_type})}],
+                "usage": {"input_tokens": 10, "output_tokens": 5},
+            }
+
+        batch.submit(LocalBatchRunner(respond))
+        result = service.complete_batch(doc, batch.get_results())
+
+        assert record_ids == ["test-doc#classification#1", "test-doc#classification#2"]
+        assert [s.classification for s in result.sections] == ["invoice", "letter"]
+        usage = result.metering[f"Classification/bedrock_batch/{service.bedrock_model}"]
+        assert usage["inputTokens"] == 20
+
+    @patch("idp_common.s3.get_text_content")
+    def test_classify_document_with_page_groups(self, mock_get_text, mock_config):
+        """Test classifying several pages per request with single-page fallback."""
+        mock_config["classification"]["pagesPerRequest"] = 3
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        for page_id in ["1", "2", "3", "4"]:
+            doc.pages[page_id] = Page(
+                page_id=page_id, parsed_text_uri=f"s3://bucket/text{page_id}.txt"
+            )
+        mock_get_text.side_effect = lambda uri: f"text of {uri}"
+        requests = []
+
+        def invoke(content, config):
+            prompt = "".join(item.get("text", "") for item in content)
+            requests.append(prompt)
+            if "3 consecutive pages" in prompt:
+                # Page 3 is missing from the output
+                text = json.dumps(
+                    [
+                        {"page": 1, "class": "invoice", "document_boundary": "start"},
+                        {"page": "2", "class": "invoice", "document_boundary": "START"},
+                    ]
+                )
+            else:
+                text = json.dumps({"class": "letter"})
+            return {
+                "response": {"output": {"message": {"content": [{"text": text}]}}},
+                "metering": {"Classification/bedrock/model": {"inputTokens": 10}},
+            }
+
+        with patch.object(service, "_invoke_bedrock_model", side_effect=invoke):
+            result = service.classify_document(doc)
+
+        group_prompt = next(p for p in requests if "consecutive pages" in p)
+        assert "<page-number>2</page-number>\ntext of s3://bucket/text2.txt" in (
+            group_prompt
+        )
+        # One request for pages 1-3, fallbacks for page 3 and the single page 4
+        assert len(requests) == 3
+        assert [s.page_ids for s in result.sections] == [["1"], ["2"], ["3", "4"]]
+        assert [s.classification for s in result.sections] == [
+            "invoice",
+            "invoice",
+            "letter",
+        ]
+        assert result.metering == {"Classification/bedrock/model": {"inputTokens": 30}}
+
+    @patch("idp_common.s3.get_text_content")
+    def test_classify_document_async_with_page_groups(self, mock_get_text, mock_config):
+        """Test that the async path matches unnumbered entries by position."""
+        mock_config["classification"]["pagesPerRequest"] = 2
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-west-2", config=mock_config, backend="bedrock"
+            )
+        doc = Document(
+            id="test-doc", input_key="test-document.pdf", status=Status.CLASSIFYING
+        )
+        doc.pages["1"] = Page(page_id="1", parsed_text_uri="s3://bucket/text1.txt")
+        doc.pages["2"] = Page(page_id="2", parsed_text_uri="s3://bucket/text2.txt")
+        mock_get_text.return_value = "page text"
+        text = json.dumps({"pages": [{"class": "receipt"}, {"class": "letter"}]})
+
+        async def invoke(content, config):
+            return {
+                "response": {"output": {"message": {"content": [{"text": text}]}}},
+                "metering": {"Classification/bedrock/model": {"inputTokens": 10}},
+            }
+
+        with patch.object(
+            service, "_invoke_bedrock_model_async", side_effect=invoke
+        ) as mock_invoke:
+            result = asyncio.run(service.classify_document_async(doc))
+
+        assert mock_invoke.call_count == 1
+        assert result.pages["1"].classification == "receipt"
+        assert result.pages["2"].classification == "letter"
+        assert result.metering == {"Classification/bedrock/model": {"inputTokens": 10}}
+
     def test_group_consecutive_pages_with_boundary(self, service):
         """Pages with boundary flag start new sections even with same doc type."""
         results = [
@@ -0,0 +1,235 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the local nearest-neighbor pre-classifier.
+"""
+
+import random
+from textwrap import dedent
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification import pre_classifier as pre_classifier_module
+from idp_common.classification.pre_classifier import (
+    HashingTextFeaturizer,
+    PreClassifier,
+    PreClassifierIndex,
+)
+from idp_common.classification.service import ClassificationService
+from idp_common.models import Document, Page, Section, Status
+
+np = pytest.importorskip("numpy")
+
+W2 = "Form W-2 Wage and Tax Statement employer identification number wages tips other compensation federal income tax withheld {n}"
+INVOICE = "INVOICE invoice number {n} bill to ship to quantity unit price amount subtotal total due payment terms"
+LETTER = "Dear Sir or Madam, I am writing to let you know about the meeting on {n}. Sincerely yours"
+INVOICE_TERMS = "Terms and conditions: late payments incur interest of {n} percent per month, returns accepted within thirty days"
+
+EXAMPLES = [
+    ("W2", W2.format(n=1111), True),
+    ("W2", W2.format(n=2222), True),
+    ("invoice", INVOICE.format(n=3333), True),
+    ("invoice", INVOICE.format(n=4444), True),
+    ("letter", LETTER.format(n=5555), True),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_pre_classifier():
+    pre_classifier_module.reset_loaded_indexes()
+    with patch.object(pre_classifier_module.metrics, "put_metric") as put_metric:
+        yield put_metric
+    pre_classifier_module.reset_loaded_indexes()
+
+
+@pytest.mark.unit
+class TestPreClassifierIndex:
+    def test_digits_do_not_change_features(self):
+        featurizer = HashingTextFeaturizer()
+        vectors = featurizer.transform([W2.format(n=12), W2.format(n=98765)])
+
+        assert float(vectors[0] @ vectors[1]) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("method", ["centroid", "knn"])
+    def test_predicts_nearest_class(self, method):
+        index = PreClassifierIndex.build(EXAMPLES)
+
+        predictions = index.predict(
+            [INVOICE.format(n=9), "completely unrelated words"], method=method, k=2
+        )
+
+        assert predictions[0].label == "invoice"
+        assert predictions[0].similarity > 0.9
+        assert predictions[0].margin > 0.5
+        assert predictions[1].similarity < 0.2
+
+    def test_save_and_load(self, tmp_path):
+        index = PreClassifierIndex.build(EXAMPLES, HashingTextFeaturizer(512))
+        path = str(tmp_path / "config" / "index.npz")
+
+        index.save(path)
+        loaded = PreClassifierIndex.load(path)
+
+        assert loaded.labels == index.labels
+        assert loaded.starts == index.starts
+        assert loaded.featurizer.dimensions == 512
+        assert np.array_equal(loaded.vectors, index.vectors)
+
+    @pytest.mark.parametrize("method", ["centroid", "knn"])
+    def test_predicts_boundary_from_examples(self, method):
+        index = PreClassifierIndex.build(
+            [
+                ("W2", W2.format(n=1111), True),
+                ("invoice", INVOICE.format(n=3333), True),
+                ("invoice", INVOICE_TERMS.format(n=3), False),
+                ("letter", LETTER.format(n=5555)),
+            ]
+        )
+
+        predictions = index.predict(
+            [W2.format(n=9), INVOICE.format(n=9), INVOICE_TERMS.format(n=9), LETTER],
+            method=method,
+            k=1,
+        )
+
+        assert [p.boundary for p in predictions] == [
+            "start",
+            "start",
+            "continue",
+            None,
+        ]
+
+    def test_examples_from_documents_record_first_pages(self):
+        document = Document(id="doc")
+        for page_id in ["1", "2", "3"]:
+            document.pages[page_id] = Page(
+                page_id=page_id,
+                classification="invoice",
+                parsed_text_uri=f"s3://bucket/{page_id}.txt",
+            )
+        document.sections = [
+            Section(section_id="1", classification="invoice", page_ids=["1", "2"]),
+            Section(section_id="2", classification="invoice", page_ids=["3"]),
+        ]
+
+        with patch.object(pre_classifier_module.s3, "get_text_content") as get_text:
+            get_text.return_value = "text"
+            examples = list(pre_classifier_module.examples_from_documents([document]))
+
+        assert [start for _, _, start in examples] == [True, False, True]
+
+
+@pytest.mark.unit
+class TestPreClassifier:
+    def test_confident_page_is_classified(self, reset_pre_classifier):
+        pre_classifier = PreClassifier(PreClassifierIndex.build(EXAMPLES))
+
+        prediction = pre_classifier.classify(W2.format(n=7))
+
+        assert prediction.label == "W2"
+        assert pre_classifier.stats()["short_circuits"] == 1
+        reset_pre_classifier.assert_any_call("PreClassifierShortCircuits", 1)
+
+    def test_unknown_boundary_goes_to_llm_unless_defaulted(self):
+        index = PreClassifierIndex.build((label, text) for label, text, _ in EXAMPLES)
+
+        assert PreClassifier(index).classify(W2.format(n=7)) is None
+        prediction = PreClassifier(index, default_boundary="continue").classify(
+            W2.format(n=7)
+        )
+        assert prediction.label == "W2"
+        assert prediction.boundary == "continue"
+
+    def test_unconfident_or_unknown_class_goes_to_llm(self):
+        index = PreClassifierIndex.build(EXAMPLES)
+
+        assert PreClassifier(index).classify("completely unrelated words") is None
+        assert (
+            PreClassifier(index, valid_labels=["invoice"]).classify(W2.format(n=7))
+            is None
+        )
+
+    def test_audit_records_agreement(self, reset_pre_classifier):
+        pre_classifier = PreClassifier(
+            PreClassifierIndex.build(EXAMPLES),
+            audit_sample_rate=0.5,
+            rng=random.Random(0),
+        )
+        texts = {f"s3://bucket/{n}.txt": W2.format(n=n) for n in range(20)}
+
+        classified = {
+            key: pre_classifier.classify(text, audit_key=key)
+            for key, text in texts.items()
+        }
+        audited = [key for key, prediction in classified.items() if not prediction]
+        for key in audited:
+            pre_classifier.complete_audit(key, "W2" if key != audited[0] else "letter")
+
+        stats = pre_classifier.stats()
+        assert 0 < len(audited) < 20
+        assert stats["short_circuits"] == 20 - len(audited)
+        assert stats["audits"] == len(audited)
+        assert stats["agreements"] == len(audited) - 1
+        reset_pre_classifier.assert_any_call("PreClassifierAgreement", 0)
+
+
+@pytest.mark.unit
+class TestClassificationServicePreClassifier:
+    def _service(self, index_uri):
+        config = {
+            "classes": [
+                {"name": "W2", "description": "A W-2 form"},
+                {"name": "invoice", "description": "An invoice"},
+                {"name": "letter", "description": "A letter"},
+            ],
+            "classification": {
+                "model": "us.amazon.nova-pro-v1:0",
+                "system_prompt": "You are a document classification assistant.",
+                "task_prompt": dedent("""
+                    Classify this page into one of {CLASS_NAMES_AND_DESCRIPTIONS}
+                    {DOCUMENT_TEXT}
+                """),
+                "preClassifier": {"enabled": True, "indexUri": index_uri},
+            },
+        }
+        with patch("boto3.Session"):
+            return ClassificationService(region="us-west-2", config=config)
+
+    @patch("idp_common.s3.get_text_content")
+    def test_confident_page_skips_llm(self, mock_get_text, tmp_path):
+        index_uri = str(tmp_path / "index.npz")
+        PreClassifierIndex.build(EXAMPLES).save(index_uri)
+        service = self._service(index_uri)
+        mock_get_text.return_value = INVOICE.format(n=42)
+
+        with patch.object(service, "_invoke_bedrock_model") as mock_invoke:
+            result = service.classify_page("1", text_uri="s3://bucket/1.txt")
+
+        mock_invoke.assert_not_called()
+        assert result.classification.doc_type == "invoice"
+        assert result.classification.metadata["pre_classified"]
+        assert result.classification.confidence > 0.9
+
+    @patch("idp_common.s3.get_text_content")
+    def test_consecutive_single_page_documents_are_split(self, mock_get_text, tmp_path):
+        index_uri = str(tmp_path / "index.npz")
+        PreClassifierIndex.build(EXAMPLES).save(index_uri)
+        service = self._service(index_uri)
+        mock_get_text.side_effect = lambda uri: INVOICE.format(n=uri[-5])
+        document = Document(id="doc", status=Status.CLASSIFYING)
+        for page_id in ["1", "2"]:
+            document.pages[page_id] = Page(
+                page_id=page_id, parsed_text_uri=f"s3://bucket/{page_id}.txt"
+            )
+
+        with patch.object(service, "_invoke_bedrock_model") as mock_invoke:
+            result = service.classify_document(document)
+
+        mock_invoke.assert_not_called()
+        assert [section.page_ids for section in result.sections] == [["1"], ["2"]]
+
+    def test_missing_index_disables_pre_classification(self, tmp_path):
+        service = self._service(str(tmp_path / "missing.npz"))
+
+        assert service.pre_classifier is None
@@ -11,8 +11,9 @@ Unit tests for the ExtractionService class.
 import pytest
 
 # Import standard library modules first
+import asyncio
 from textwrap import dedent
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 # PIL is now used directly - no mocking needed
 
@@ -386,6 +387,54 @@ class TestExtractionService:
         assert written_content["inference_result"]["total_amount"] == "$100.00"
         assert written_content["metadata"]["parsing_succeeded"] is True
 
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.bedrock.invoke_model_async", new_callable=AsyncMock)
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_async(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_invoke_model_async,
+        mock_prepare_bedrock_image,
+        mock_prepare_image,
+        mock_get_text_content,
+        service,
+        sample_document,
+    ):
+        """Test processing a document section with the async Bedrock client."""
+        mock_get_text_content.side_effect = ["Page 1 text", "Page 2 text"]
+        mock_prepare_image.side_effect = [b"image1_data", b"image2_data"]
+        mock_prepare_bedrock_image.side_effect = [
+            {"image": "image1_base64"},
+            {"image": "image2_base64"},
+        ]
+        mock_invoke_model_async.return_value = {
+            "response": {
+                "output": {
+                    "message": {"content": [{"text": '{"invoice_number": "INV-123"}'}]}
+                }
+            },
+            "metering": {"Extraction/bedrock/model": {"inputTokens": 500}},
+        }
+
+        result = asyncio.run(
+            service.process_document_section_async(sample_document, "1")
+        )
+
+        assert (
+            result.sections[0].extraction_result_uri
+            == "s3://output-bucket/test-document.pdf/sections/1/result.json"
+        )
+        assert len(result.errors) == 0
+        mock_invoke_model_async.assert_awaited_once()
+        assert mock_invoke_model_async.await_args.kwargs["context"] == "Extraction"
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"]["invoice_number"] == "INV-123"
+        assert result.metering == {"Extraction/bedrock/model": {"inputTokens": 500}}
+
     @patch("idp_common.s3.get_text_content")
     @patch("idp_common.image.prepare_image")
     @patch("idp_common.image.prepare_bedrock_image_attachment")
@@ -440,6 +489,216 @@ class TestExtractionService:
         )
         assert written_content["metadata"]["parsing_succeeded"] is False
 
+    @staticmethod
+    def _stream(deltas):
+        """Build an invoke_model stand-in that streams the given text deltas."""
+        from idp_common.bedrock import StreamAborted
+
+        def invoke_model(**request):
+            text = ""
+            for delta in deltas:
+                text += delta
+                try:
+                    request["stream_handler"](delta)
+                except Exception as e:
+                    aborted = StreamAborted(text, {"outputTokens": 3})
+                    aborted.metering = {"Extraction/bedrock/model": {"outputTokens": 3}}
+                    raise aborted from e
+            return {
+                "response": {"output": {"message": {"content": [{"text": text}]}}},
+                "metering": {"Extraction/bedrock/model": {"outputTokens": 500}},
+            }
+
+        return invoke_model
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.bedrock.invoke_model")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_streaming(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_invoke_model,
+        mock_prepare_bedrock_image,
+        mock_prepare_image,
+        mock_get_text_content,
+        mock_config,
+        sample_document,
+    ):
+        """Test that streamed output gives the same result as a non-streaming call."""
+        mock_config["extraction"]["streaming"] = {"enabled": True}
+        service = ExtractionService(region="us-west-2", config=mock_config)
+        mock_get_text_content.side_effect = ["Page 1 text", "Page 2 text"]
+        mock_prepare_image.side_effect = [b"image1_data", b"image2_data"]
+        mock_prepare_bedrock_image.side_effect = [
+            {"image": "image1_base64"},
+            {"image": "image2_base64"},
+        ]
+        mock_invoke_model.side_effect = self._stream(
+            [
+                '```json\n{"invoice_number": "IN',
+                'V-123", "total_',
+                'amount": "$100.00"}\n```',
+            ]
+        )
+
+        result = service.process_document_section(sample_document, "1")
+
+        assert len(result.errors) == 0
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"] == {
+            "invoice_number": "INV-123",
+            "total_amount": "$100.00",
+        }
+        assert written_content["metadata"]["parsing_succeeded"] is True
+        assert result.metering == {"Extraction/bedrock/model": {"outputTokens": 500}}
+        metric_names = [c.args[0] for c in mock_put_metric.call_args_list]
+        assert metric_names.count("ExtractionTimeToFirstAttribute") == 1
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.bedrock.invoke_model")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_streaming_fails_fast(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_invoke_model,
+        mock_prepare_bedrock_image,
+        mock_prepare_image,
+        mock_get_text_content,
+        mock_config,
+        sample_document,
+    ):
+        """Test that malformed streamed output stops generation early."""
+        mock_config["extraction"]["streaming"] = {"enabled": True}
+        service = ExtractionService(region="us-west-2", config=mock_config)
+        mock_get_text_content.side_effect = ["Page 1 text", "Page 2 text"]
+        mock_prepare_image.side_effect = [b"image1_data", b"image2_data"]
+        mock_prepare_bedrock_image.side_effect = [
+            {"image": "image1_base64"},
+            {"image": "image2_base64"},
+        ]
+        mock_invoke_model.side_effect = self._stream(
+            ['{"invoice_number": "INV-123", total: 1,', ' "never": "sent"}']
+        )
+
+        result = service.process_document_section(sample_document, "1")
+
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"] == {
+            "raw_output": '{"invoice_number": "INV-123", total: 1,'
+        }
+        assert written_content["metadata"]["parsing_succeeded"] is False
+        assert result.metering == {"Extraction/bedrock/model": {"outputTokens": 3}}
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.bedrock.invoke_model")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_process_document_section_streaming_retry_resets_parser(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_invoke_model,
+        mock_prepare_bedrock_image,
+        mock_prepare_image,
+        mock_get_text_content,
+        mock_config,
+        sample_document,
+    ):
+        """Test that a stream retried after partial output is parsed from the start."""
+        mock_config["extraction"]["streaming"] = {"enabled": True}
+        service = ExtractionService(region="us-west-2", config=mock_config)
+        mock_get_text_content.side_effect = ["Page 1 text", "Page 2 text"]
+        mock_prepare_image.side_effect = [b"image1_data", b"image2_data"]
+        mock_prepare_bedrock_image.side_effect = [
+            {"image": "image1_base64"},
+            {"image": "image2_base64"},
+        ]
+        stream = self._stream(
+            ['{"invoice_number": "INV-123", "total_amount": "$100.00"}']
+        )
+
+        def invoke_model(**request):
+            # The first attempt fails mid-stream and the client retries
+            request["stream_handler"]('{"invoice_number": "INV-1')
+            request["stream_handler"].reset()
+            return stream(**request)
+
+        mock_invoke_model.side_effect = invoke_model
+
+        service.process_document_section(sample_document, "1")
+
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"] == {
+            "invoice_number": "INV-123",
+            "total_amount": "$100.00",
+        }
+        assert written_content["metadata"]["parsing_succeeded"] is True
+
+    @patch("idp_common.s3.get_text_content")
+    @patch("idp_common.image.prepare_image")
+    @patch("idp_common.image.prepare_bedrock_image_attachment")
+    @patch("idp_common.s3.write_content")
+    @patch("idp_common.metrics.put_metric")
+    def test_extraction_with_batch_job(
+        self,
+        mock_put_metric,
+        mock_write_content,
+        mock_prepare_bedrock_image,
+        mock_prepare_image,
+        mock_get_text_content,
+        service,
+        sample_document,
+        tmp_path,
+    ):
+        """Test that batch results are written like on-demand results."""
+        from idp_common.bedrock import BatchInferenceJob, LocalBatchRunner
+
+        mock_get_text_content.side_effect = ["Page 1 text", "Page 2 text"]
+        mock_prepare_image.side_effect = [b"image1_data", b"image2_data"]
+        mock_prepare_bedrock_image.side_effect = [
+            {"image": {"format": "jpeg", "source": {"bytes": b"image1"}}},
+            {"image": {"format": "jpeg", "source": {"bytes": b"image2"}}},
+        ]
+        model_id = service.config["extraction"]["model"]
+        batch = BatchInferenceJob(
+            model_id,
+            str(tmp_path / "input.jsonl"),
+            str(tmp_path / "output"),
+            context="Extraction",
+        )
+
+        assert service.prepare_batch(sample_document, batch) == [
+            "test-doc#extraction#1"
+        ]
+        mock_write_content.assert_not_called()
+
+        batch.submit(
+            LocalBatchRunner(
+                lambda model_id, model_input: {
+                    "content": [
+                        {"type": "text", "text": '{"invoice_number": "INV-123"}'}
+                    ],
+                    "usage": {"input_tokens": 10, "output_tokens": 5},
+                }
+            )
+        )
+        result = service.complete_batch(sample_document, batch.get_results())
+
+        written_content = mock_write_content.call_args[0][0]
+        assert written_content["inference_result"] == {"invoice_number": "INV-123"}
+        assert written_content["metadata"]["parsing_succeeded"] is True
+        assert f"Extraction/bedrock_batch/{model_id}" in result.metering
+
     @patch("idp_common.metrics.put_metric")
     def test_process_document_section_missing_section(
         self, mock_put_metric, service, sample_document
@@ -0,0 +1,195 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the NumPy image preprocessing pipeline.
+"""
+
+import io
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from idp_common.image import preprocessing
+from idp_common.image.preprocessing import (
+    PreprocessingPipeline,
+    benchmark_preprocessing,
+    binarize,
+    deskew,
+    estimate_skew_angle,
+    normalize_contrast,
+    preprocess_image,
+)
+
+# Other test modules replace PIL with a MagicMock in sys.modules; load the real
+# package (and its format plugins) for these tests
+with patch.dict(sys.modules):
+    for _name in [n for n in sys.modules if n == "PIL" or n.startswith("PIL.")]:
+        del sys.modules[_name]
+    from PIL import Image, ImageDraw, ImageFilter
+
+    Image.init()
+    REAL_PIL_MODULES = {
+        name: module
+        for name, module in sys.modules.items()
+        if name == "PIL" or name.startswith("PIL.")
+    }
+
+
+@pytest.fixture(autouse=True)
+def real_pil():
+    with (
+        patch.dict(sys.modules, REAL_PIL_MODULES),
+        patch.object(preprocessing, "Image", Image),
+        patch.object(preprocessing, "ImageFilter", ImageFilter),
+    ):
+        yield
+
+
+def _page(width=600, height=800, gradient=True):
+    """Synthetic page with text-like bars on an unevenly lit background."""
+    image = Image.new("L", (width, height), 210)
+    draw = ImageDraw.Draw(image)
+    for y in range(60, height - 60, 30):
+        for x in range(40, width - 60, 24):
+            draw.rectangle([x, y, x + 14, y + 10], fill=40)
+    array = np.asarray(image).astype(np.float64)
+    if gradient:
+        array += np.linspace(-50, 30, width)[None, :]
+    return np.clip(array, 0, 255).astype(np.uint8)
+
+
+def _jpeg(array):
+    output = io.BytesIO()
+    Image.fromarray(array).save(output, format="JPEG")
+    return output.getvalue()
+
+
+@pytest.mark.unit
+class TestPreprocessingSteps:
+    """Tests for the individual array steps."""
+
+    def test_binarize_matches_pillow_threshold(self):
+        """Integral-image thresholding matches the Pillow box blur threshold."""
+        gray = _page()
+        blurred = np.asarray(Image.fromarray(gray).filter(ImageFilter.BoxBlur(7)))
+        expected = np.where(gray.astype(int) > blurred.astype(int) - 10, 255, 0)
+
+        result = binarize(gray, block_size=15, c=10)
+
+        assert result.dtype == np.uint8
+        assert set(np.unique(result)) <= {0, 255}
+        # Pillow rounds the blurred mean to uint8, so a few pixels can differ
+        assert (result == expected).mean() > 0.999
+
+    def test_binarize_handles_large_sums(self):
+        """Images whose pixel sum overflows int32 use int64 sums."""
+        gray = np.full((3000, 3000), 255, dtype=np.uint8)
+        assert binarize(gray).min() == 255
+
+    def test_normalize_contrast_stretches_range(self):
+        """The intensity range is stretched to 0-255."""
+        gray = np.linspace(100, 150, 10000).astype(np.uint8).reshape(100, 100)
+        result = normalize_contrast(gray, 0, 100)
+        assert result.min() == 0
+        assert result.max() == 255
+
+    def test_normalize_contrast_flat_image_unchanged(self):
+        """A single-intensity image is returned unchanged."""
+        gray = np.full((10, 10), 128, dtype=np.uint8)
+        assert normalize_contrast(gray) is gray
+
+    @pytest.mark.parametrize("angle", [-3.0, 2.0])
+    def test_estimate_skew_angle(self, angle):
+        """The estimated skew undoes a known rotation."""
+        page = Image.fromarray(_page(gradient=False))
+        rotated = np.asarray(page.rotate(angle, fillcolor=255))
+        assert estimate_skew_angle(rotated) == pytest.approx(-angle, abs=0.5)
+
+    def test_deskew_straight_page_unchanged(self):
+        """A page without skew is not rotated."""
+        gray = _page(gradient=False)
+        assert deskew(gray) is gray
+
+
+@pytest.mark.unit
+class TestPreprocessingPipeline:
+    """Tests for pipeline composition, configuration and fallback."""
+
+    def test_default_pipeline_binarizes(self):
+        """The default pipeline produces a binarized JPEG."""
+        result = preprocess_image(_jpeg(_page()))
+        with Image.open(io.BytesIO(result)) as image:
+            assert image.format == "JPEG"
+            assert image.mode == "L"
+            pixels = np.asarray(image)
+        # JPEG artifacts aside, pixels are near black or white
+        assert np.mean((pixels < 40) | (pixels > 215)) > 0.95
+
+    def test_steps_from_config(self):
+        """Steps are applied in the configured order with their parameters."""
+        pipeline = PreprocessingPipeline.from_config(
+            {
+                "enabled": True,
+                "steps": [
+                    "normalize",
+                    {"name": "denoise", "size": 3},
+                    {"name": "binarize", "block_size": 21, "c": 5},
+                ],
+            }
+        )
+        calls = []
+        functions = {
+            name: (lambda name: lambda gray, **kw: calls.append((name, kw)) or gray)(
+                name
+            )
+            for name in preprocessing.STEP_FUNCTIONS
+        }
+        with patch.dict(preprocessing.STEP_FUNCTIONS, functions):
+            pipeline.process(_jpeg(_page()))
+        assert calls == [
+            ("normalize", {}),
+            ("denoise", {"size": 3}),
+            ("binarize", {"block_size": 21, "c": 5}),
+        ]
+
+    def test_disabled_config(self):
+        """A disabled configuration builds no pipeline."""
+        assert PreprocessingPipeline.from_config({"enabled": False}) is None
+        assert PreprocessingPipeline.from_config(None) is None
+
+    def test_invalid_step_and_engine(self):
+        """Unknown steps and engines are rejected."""
+        with pytest.raises(ValueError, match="Invalid preprocessing step"):
+            PreprocessingPipeline(steps=["sharpen"])
+        with pytest.raises(ValueError, match="Invalid preprocessing engine"):
+            PreprocessingPipeline(engine="opencv")
+
+    def test_pillow_engine_and_fallback(self):
+        """The Pillow implementation is used when selected or when NumPy fails."""
+        with patch(
+            "idp_common.image.apply_adaptive_binarization", return_value=b"pillow"
+        ) as mock_pillow:
+            assert PreprocessingPipeline(engine="pillow").process(b"img") == b"pillow"
+            # Not decodable, so the NumPy pipeline falls back
+            assert PreprocessingPipeline().process(b"not an image") == b"pillow"
+            # Without binarization the fallback keeps the original image
+            assert (
+                PreprocessingPipeline(steps=["normalize"]).process(b"not an image")
+                == b"not an image"
+            )
+        assert mock_pillow.call_count == 2
+
+    def test_missing_numpy_uses_pillow(self):
+        """Without NumPy the pipeline uses the Pillow engine."""
+        with patch.object(preprocessing, "np", None):
+            assert PreprocessingPipeline().engine == "pillow"
+
+    def test_benchmark_reports_cost_per_megapixel(self):
+        """The benchmark reports time per megapixel for each engine."""
+        results = benchmark_preprocessing(_jpeg(_page(1000, 1000)), repeat=1)
+        assert set(results) == {"numpy", "pillow"}
+        for stats in results.values():
+            assert stats["megapixels"] == 1.0
+            assert stats["ms_per_megapixel"] > 0
@@ -0,0 +1,216 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the buffered metrics publisher.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from idp_common import metrics
+from idp_common.metrics.publisher import MetricsPublisher
+
+
+@pytest.fixture(autouse=True)
+def reset_publisher():
+    metrics.reset_metrics_publisher()
+    yield
+    metrics.reset_metrics_publisher()
+
+
+@pytest.mark.unit
+class TestMetricsPublisher:
+    def test_buffered_mode_aggregates_into_one_call(self):
+        client = MagicMock()
+        publisher = MetricsPublisher(mode="buffered", client_factory=lambda: client)
+
+        for _ in range(3):
+            publisher.put("BedrockRequestsTotal", 1)
+        publisher.put("BedrockRequestLatency", 120, "Milliseconds")
+        publisher.put("BedrockRequestLatency", 80, "Milliseconds")
+        client.put_metric_data.assert_not_called()
+
+        publisher.flush()
+
+        client.put_metric_data.assert_called_once()
+        data = {
+            d["MetricName"]: d
+            for d in client.put_metric_data.call_args.kwargs["MetricData"]
+        }
+        assert data["BedrockRequestsTotal"]["Values"] == [1.0]
+        assert data["BedrockRequestsTotal"]["Counts"] == [3.0]
+        assert sorted(data["BedrockRequestLatency"]["Values"]) == [80.0, 120.0]
+        assert data["BedrockRequestLatency"]["Unit"] == "Milliseconds"
+        publisher.close()
+
+    def test_flush_with_empty_buffer_makes_no_call(self):
+        client = MagicMock()
+        publisher = MetricsPublisher(mode="buffered", client_factory=lambda: client)
+        publisher.flush()
+        client.put_metric_data.assert_not_called()
+
+    def test_dimensions_and_namespaces_are_kept_apart(self):
+        client = MagicMock()
+        publisher = MetricsPublisher(mode="buffered", client_factory=lambda: client)
+        publisher.put("Pages", 1, dimensions=[{"Name": "Stage", "Value": "OCR"}])
+        publisher.put("Pages", 1, dimensions=[{"Name": "Stage", "Value": "Extract"}])
+        publisher.put("Pages", 1, namespace="Other")
+        publisher.flush()
+
+        calls = {
+            c.kwargs["Namespace"]: c.kwargs["MetricData"]
+            for c in client.put_metric_data.call_args_list
+        }
+        assert len(calls["GENAIDP"]) == 2
+        assert len(calls["Other"]) == 1
+
+    def test_sync_mode_publishes_immediately(self):
+        client = MagicMock()
+        publisher = MetricsPublisher(mode="sync", client_factory=lambda: client)
+        publisher.put("InputTokens", 42)
+        client.put_metric_data.assert_called_once()
+
+    def test_background_thread_flushes_when_buffer_is_full(self):
+        client = MagicMock()
+        publisher = MetricsPublisher(
+            mode="buffered",
+            flush_interval=30,
+            max_buffered=2,
+            client_factory=lambda: client,
+        )
+        publisher.put("A", 1)
+        publisher.put("B", 1)
+        publisher._thread.join(timeout=0.5)
+        client.put_metric_data.assert_called_once()
+        publisher.close()
+
+    def test_emf_mode_prints_embedded_metric_format(self):
+        lines = []
+        publisher = MetricsPublisher(mode="emf", emit=lines.append)
+        publisher.put("InputTokens", 10, dimensions=[{"Name": "Model", "Value": "m"}])
+        publisher.put("InputTokens", 20, dimensions=[{"Name": "Model", "Value": "m"}])
+        publisher.put("OutputTokens", 5, dimensions=[{"Name": "Model", "Value": "m"}])
+        publisher.flush()
+
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert sorted(record["InputTokens"]) == [10.0, 20.0]
+        assert record["OutputTokens"] == [5.0]
+        assert record["Model"] == "m"
+        definition = record["_aws"]["CloudWatchMetrics"][0]
+        assert definition["Namespace"] == "GENAIDP"
+        assert definition["Dimensions"] == [["Model"]]
+        assert {m["Name"] for m in definition["Metrics"]} == {
+            "InputTokens",
+            "OutputTokens",
+        }
+
+    def test_emf_mode_splits_long_value_lists(self):
+        lines = []
+        publisher = MetricsPublisher(mode="emf", emit=lines.append)
+        for i in range(150):
+            publisher.put("Latency", i, "Milliseconds")
+        publisher.flush()
+
+        assert len(lines) == 2
+        values = [v for line in lines for v in json.loads(line)["Latency"]]
+        assert sorted(values) == [float(i) for i in range(150)]
+
+    def test_publish_errors_are_logged_not_raised(self):
+        client = MagicMock()
+        client.put_metric_data.side_effect = Exception("boom")
+        publisher = MetricsPublisher(mode="buffered", client_factory=lambda: client)
+        publisher.put("A", 1)
+        publisher.flush()
+
+    def test_failed_batch_is_published_by_next_flush(self):
+        client = MagicMock()
+        client.put_metric_data.side_effect = [Exception("boom"), None]
+        publisher = MetricsPublisher(mode="buffered", client_factory=lambda: client)
+        publisher.put("A", 1)
+        publisher.put("A", 1)
+        publisher.flush()
+        publisher.flush()
+
+        assert client.put_metric_data.call_count == 2
+        retried = client.put_metric_data.call_args.kwargs["MetricData"]
+        assert retried[0]["Counts"] == [2.0]
+
+    def test_sync_mode_drops_failed_datapoints(self):
+        client = MagicMock()
+        client.put_metric_data.side_effect = [Exception("boom"), None]
+        publisher = MetricsPublisher(mode="sync", client_factory=lambda: client)
+        publisher.put("A", 1)
+        assert publisher._buffered == 0
+
+        publisher.put("A", 2)
+
+        assert client.put_metric_data.call_count == 2
+        sent = client.put_metric_data.call_args.kwargs["MetricData"]
+        assert sent[0]["Values"] == [2.0]
+        assert sent[0]["Counts"] == [1.0]
+
+    def test_requeued_datapoints_are_bounded(self):
+        client = MagicMock()
+        client.put_metric_data.side_effect = Exception("boom")
+        publisher = MetricsPublisher(
+            mode="buffered", max_retained=3, client_factory=lambda: client
+        )
+        publisher.put("A", 1)
+        publisher.put("A", 2)
+        publisher.flush()
+        assert publisher._buffered == 2
+
+        publisher.put("A", 3)
+        publisher.put("A", 4)
+        publisher.flush()
+        assert publisher._buffered == 0
+
+    def test_invalid_mode_raises(self):
+        with pytest.raises(ValueError):
+            MetricsPublisher(mode="bogus")
+
+
+@pytest.mark.unit
+class TestPutMetric:
+    def test_put_metric_publishes_immediately_by_default(self, monkeypatch):
+        monkeypatch.delenv("METRIC_PUBLISH_MODE", raising=False)
+        client = MagicMock()
+        with patch.object(metrics, "get_cloudwatch_client", return_value=client):
+            metrics.put_metric("BedrockRequestsTotal", 1)
+
+        client.put_metric_data.assert_called_once()
+
+    def test_put_metric_buffers_until_flush(self, monkeypatch):
+        monkeypatch.setenv("METRIC_NAMESPACE", "TestNamespace")
+        monkeypatch.setenv("METRIC_PUBLISH_MODE", "buffered")
+        client = MagicMock()
+        with patch.object(metrics, "get_cloudwatch_client", return_value=client):
+            metrics.put_metric("BedrockRequestsTotal", 1)
+            metrics.put_metric("BedrockRequestsTotal", 1)
+            client.put_metric_data.assert_not_called()
+            metrics.flush()
+
+        client.put_metric_data.assert_called_once()
+        kwargs = client.put_metric_data.call_args.kwargs
+        assert kwargs["Namespace"] == "TestNamespace"
+        assert kwargs["MetricData"][0]["Counts"] == [2.0]
+
+    def test_flush_after_flushes_when_handler_raises(self, monkeypatch):
+        monkeypatch.delenv("METRIC_PUBLISH_MODE", raising=False)
+        client = MagicMock()
+
+        @metrics.flush_after
+        def handler(event, context):
+            metrics.put_metric("Failures", 1)
+            metrics.put_metric("Failures", 1)
+            # Buffered inside the handler
+            client.put_metric_data.assert_not_called()
+            raise RuntimeError("failed")
+
+        with patch.object(metrics, "get_cloudwatch_client", return_value=client):
+            with pytest.raises(RuntimeError):
+                handler({}, None)
+        client.put_metric_data.assert_called_once()
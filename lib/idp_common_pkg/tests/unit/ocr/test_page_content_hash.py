@@ -0,0 +1,85 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the page content hash recorded by OCR.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.models import Document
+from idp_common.ocr.service import OcrService
+
+
+def _service():
+    with patch("boto3.client"):
+        service = OcrService(config={"ocr": {"image": {"variants": False}}})
+    service.s3_client = MagicMock()
+    return service
+
+
+def _page_result(service, page_text):
+    with patch("idp_common.s3.write_content"):
+        service._write_artifact(b"image", "out", "doc/pages/1/image.jpg")
+        service._write_artifact(
+            {"text": page_text}, "out", "doc/pages/1/result.json", "application/json"
+        )
+    return {
+        "image_uri": "s3://out/doc/pages/1/image.jpg",
+        "raw_text_uri": "s3://out/doc/pages/1/rawText.json",
+        "parsed_text_uri": "s3://out/doc/pages/1/result.json",
+        "text_confidence_uri": "s3://out/doc/pages/1/textConfidence.json",
+    }
+
+
+@pytest.mark.unit
+class TestPageContentHash:
+    def test_hash_depends_only_on_written_content(self):
+        hashes = []
+        for page_text in ["Invoice", "Invoice", "Letter"]:
+            service = _service()
+            document = Document(id="doc")
+            service._add_page_results(
+                document, {0: (_page_result(service, page_text), {})}, []
+            )
+            hashes.append(document.pages["1"].content_hash)
+
+        assert hashes[0] and hashes[0] == hashes[1]
+        assert hashes[2] != hashes[0]
+
+    def test_pages_not_written_have_no_hash(self):
+        service = _service()
+        document = Document(id="doc")
+        ocr_result = {
+            "image_uri": "s3://out/doc/pages/1/image.jpg",
+            "raw_text_uri": "s3://out/doc/pages/1/rawText.json",
+            "parsed_text_uri": "s3://out/doc/pages/1/result.json",
+            "text_confidence_uri": "s3://out/doc/pages/1/textConfidence.json",
+        }
+
+        service._add_page_results(document, {0: (ocr_result, {})}, [])
+
+        assert document.pages["1"].content_hash is None
+
+    def test_hash_survives_serialization(self):
+        service = _service()
+        document = Document(id="doc")
+        service._add_page_results(
+            document, {0: (_page_result(service, "Invoice"), {})}, []
+        )
+
+        restored = Document.from_dict(document.to_dict())
+
+        assert restored.pages["1"].content_hash == document.pages["1"].content_hash
@@ -0,0 +1,232 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for page image variants written once at OCR time.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import io
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+import idp_common.image as idp_image
+from idp_common.models import Document, Page, image_variant_key
+from idp_common.ocr.service import OcrService
+
+# Other test modules replace PIL with a MagicMock in sys.modules; load the real
+# package (and its format plugins) for the resize tests
+with patch.dict(sys.modules):
+    for _name in [n for n in sys.modules if n == "PIL" or n.startswith("PIL.")]:
+        del sys.modules[_name]
+    from PIL import Image
+
+    Image.init()
+    REAL_PIL_MODULES = {
+        name: module
+        for name, module in sys.modules.items()
+        if name == "PIL" or name.startswith("PIL.")
+    }
+
+
+@pytest.fixture
+def real_pil():
+    with (
+        patch.dict(sys.modules, REAL_PIL_MODULES),
+        patch.object(idp_image, "Image", Image),
+    ):
+        yield
+
+
+def _jpeg(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 40)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+def _service(config):
+    with patch("boto3.client"):
+        service = OcrService(config=config)
+    service.s3_client = MagicMock()
+    return service
+
+
+@pytest.mark.unit
+class TestResizeImageVariants:
+    """Tests for resizing one decoded image to several sizes."""
+
+    def test_variants_match_resize_image(self, real_pil):
+        """Each variant is byte-identical to resizing the original separately."""
+        original = _jpeg(1600, 2000)
+        sizes = [(951, 1268), (500, 500), (2000, 3000)]
+
+        variants = idp_image.resize_image_variants(original, sizes)
+
+        # The image already fits within 2000x3000, so no variant is needed
+        assert set(variants) == {(951, 1268), (500, 500)}
+        for (width, height), data in variants.items():
+            assert data == idp_image.resize_image(original, width, height)
+
+
+@pytest.mark.unit
+class TestPageImageVariants:
+    """Tests for the Page image variant fields."""
+
+    def test_variant_key(self):
+        """Keys are built from numeric dimensions only."""
+        assert image_variant_key(951, "1268") == "951x1268"
+        assert image_variant_key("", 1268) is None
+        assert image_variant_key(None, None) is None
+        assert image_variant_key(0, 100) is None
+
+    def test_get_image_uri(self):
+        """The matching variant is used, falling back to the page image."""
+        page = Page(
+            page_id="1",
+            image_uri="s3://b/p/1/image.jpg",
+            image_variants={"951x1268": "s3://b/p/1/image_951x1268.jpg"},
+        )
+        assert page.get_image_uri("951", "1268") == "s3://b/p/1/image_951x1268.jpg"
+        assert page.get_image_uri(500, 500) == "s3://b/p/1/image.jpg"
+        assert page.get_image_uri("", "") == "s3://b/p/1/image.jpg"
+
+    def test_round_trip(self):
+        """Variants survive serialization; pages without them are unchanged."""
+        document = Document(id="doc")
+        document.pages["1"] = Page(
+            page_id="1",
+            image_uri="s3://b/p/1/image.jpg",
+            image_variants={"951x1268": "s3://b/p/1/image_951x1268.jpg"},
+        )
+        document.pages["2"] = Page(page_id="2", image_uri="s3://b/p/2/image.jpg")
+
+        data = document.to_dict()
+        assert "image_variants" not in data["pages"]["2"]
+
+        restored = Document.from_dict(data)
+        assert restored.pages["1"].image_variants == {
+            "951x1268": "s3://b/p/1/image_951x1268.jpg"
+        }
+        assert restored.pages["2"].image_variants == {}
+
+
+@pytest.mark.unit
+class TestOcrImageVariants:
+    """Tests for writing variants from the OCR service."""
+
+    def test_auto_sizes_from_stage_config(self):
+        """By default the distinct sizes configured for the stages are used."""
+        service = _service(
+            {
+                "ocr": {},
+                "classification": {
+                    "image": {"target_width": "951", "target_height": "1268"}
+                },
+                "extraction": {"image": {"target_width": 951, "target_height": 1268}},
+                "assessment": {"image": {"target_width": "", "target_height": ""}},
+            }
+        )
+        assert service.image_variant_sizes == [(951, 1268)]
+
+    def test_explicit_and_disabled_sizes(self):
+        """Sizes can be listed explicitly or disabled."""
+        service = _service(
+            {
+                "ocr": {
+                    "image": {
+                        "variants": [
+                            "800x600",
+                            {"target_width": 400, "target_height": 300},
+                        ]
+                    }
+                },
+                "classification": {
+                    "image": {"target_width": 951, "target_height": 1268}
+                },
+            }
+        )
+        assert service.image_variant_sizes == [(800, 600), (400, 300)]
+
+        service = _service(
+            {
+                "ocr": {"image": {"variants": False}},
+                "classification": {
+                    "image": {"target_width": 951, "target_height": 1268}
+                },
+            }
+        )
+        assert service.image_variant_sizes == []
+
+        with pytest.raises(ValueError, match="Invalid image variants"):
+            _service({"ocr": {"image": {"variants": "sometimes"}}})
+
+    def test_write_page_image(self):
+        """The page image and each variant are written next to each other."""
+        service = _service({"ocr": {"image": {"variants": ["500x500", "100x100"]}}})
+        with (
+            patch.object(
+                idp_image,
+                "resize_image_variants",
+                return_value={(500, 500): b"medium", (100, 100): b"small"},
+            ) as mock_resize,
+            patch("idp_common.s3.write_content") as mock_write,
+        ):
+            variants = service._write_page_image(
+                b"full", "out", "doc/pages/1/image.jpg"
+            )
+
+        mock_resize.assert_called_once_with(b"full", [(500, 500), (100, 100)])
+        assert variants == {
+            "500x500": "s3://out/doc/pages/1/image_500x500.jpg",
+            "100x100": "s3://out/doc/pages/1/image_100x100.jpg",
+        }
+        written = {call.args[2]: call.args[0] for call in mock_write.call_args_list}
+        assert written == {
+            "doc/pages/1/image.jpg": b"full",
+            "doc/pages/1/image_500x500.jpg": b"medium",
+            "doc/pages/1/image_100x100.jpg": b"small",
+        }
+
+    def test_variant_failure_keeps_page_image(self):
+        """A resize failure leaves the page image without variants."""
+        service = _service({"ocr": {"image": {"variants": ["500x500"]}}})
+        with (
+            patch.object(
+                idp_image, "resize_image_variants", side_effect=OSError("bad image")
+            ),
+            patch("idp_common.s3.write_content") as mock_write,
+        ):
+            variants = service._write_page_image(
+                b"full", "out", "doc/pages/1/image.jpg"
+            )
+
+        assert variants == {}
+        mock_write.assert_called_once()
+
+    def test_page_results_record_variants(self):
+        """Variants returned by page processing are recorded on the Page."""
+        service = _service({"ocr": {}})
+        document = Document(id="doc")
+        ocr_result = {
+            "image_uri": "s3://out/doc/pages/1/image.jpg",
+            "raw_text_uri": "s3://out/doc/pages/1/rawText.json",
+            "parsed_text_uri": "s3://out/doc/pages/1/result.json",
+            "text_confidence_uri": "s3://out/doc/pages/1/textConfidence.json",
+            "image_variants": {"500x500": "s3://out/doc/pages/1/image_500x500.jpg"},
+        }
+
+        service._add_page_results(document, {0: (ocr_result, {})}, [])
+
+        assert document.pages["1"].get_image_uri(500, 500) == (
+            "s3://out/doc/pages/1/image_500x500.jpg"
+        )
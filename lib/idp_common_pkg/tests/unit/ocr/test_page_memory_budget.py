@@ -0,0 +1,186 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for memory-budgeted page admission.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.models import Document
+from idp_common.ocr import service as ocr_service
+from idp_common.ocr.memory_budget import (
+    BYTES_PER_PIXEL,
+    PAGE_MEMORY_OVERHEAD,
+    MemoryBudget,
+    default_budget_mb,
+    estimate_page_memory,
+)
+from idp_common.ocr.service import OcrService
+
+MB = 1024 * 1024
+
+
+@pytest.mark.unit
+class TestEstimatePageMemory:
+    """Tests for the page footprint estimate."""
+
+    def test_pdf_page_at_dpi(self):
+        """PDF points are converted to pixels at the rendering DPI."""
+        estimate = estimate_page_memory(612, 792, is_pdf=True, dpi=150)
+        expected = 1275 * 1650 * BYTES_PER_PIXEL * PAGE_MEMORY_OVERHEAD
+        assert estimate == pytest.approx(expected, rel=1e-6)
+
+    def test_resize_caps_pixels(self):
+        """A poster page is estimated at its resized dimensions."""
+        poster = estimate_page_memory(2592, 3456, is_pdf=True, dpi=300)
+        resized = estimate_page_memory(
+            2592,
+            3456,
+            is_pdf=True,
+            dpi=300,
+            resize_config={"target_width": 1000, "target_height": 1000},
+        )
+        assert poster > 100 * MB
+        assert resized <= 1000 * 1000 * BYTES_PER_PIXEL * PAGE_MEMORY_OVERHEAD
+
+    def test_resize_never_upscales(self):
+        """Small images keep their own size."""
+        resize = {"target_width": 4000, "target_height": 4000}
+        assert estimate_page_memory(
+            100, 100, is_pdf=False, resize_config=resize
+        ) == estimate_page_memory(100, 100, is_pdf=False)
+
+    def test_default_budget_from_lambda_memory(self):
+        """The default budget is a share of the Lambda memory size."""
+        with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "10240"}):
+            assert default_budget_mb() == 6144
+        with patch.dict("os.environ", {}, clear=True):
+            assert default_budget_mb() == 0
+
+
+@pytest.mark.unit
+class TestMemoryBudget:
+    """Tests for admission against the budget."""
+
+    def test_blocks_until_released(self):
+        """An item that does not fit waits for earlier items to finish."""
+        budget = MemoryBudget(10 * MB)
+        budget.acquire(6 * MB)
+        admitted = threading.Event()
+
+        def waiter():
+            with budget.reserve(6 * MB):
+                admitted.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        assert not admitted.wait(0.1)
+        budget.release(6 * MB)
+        thread.join(5)
+        assert admitted.is_set()
+        assert budget.stats["waits"] == 1
+        assert budget.in_use == 0
+
+    def test_oversized_item_runs_alone(self):
+        """An item larger than the budget is admitted when nothing else runs."""
+        budget = MemoryBudget(10 * MB)
+        with budget.reserve(50 * MB):
+            assert budget.in_use == 50 * MB
+        stats = budget.stats
+        assert stats["oversized"] == 1
+        assert stats["peak_mb"] == 50.0
+
+    def test_zero_budget_is_unbounded(self):
+        """A zero budget never blocks."""
+        budget = MemoryBudget(0)
+        for _ in range(5):
+            budget.acquire(1024 * MB)
+        assert not budget.enabled
+        assert budget.stats["in_flight"] == 5
+
+
+@pytest.mark.unit
+class TestOcrServiceMemoryBudget:
+    """Tests for page admission in OcrService."""
+
+    def _pdf(self, num_pages, width, height):
+        pdf_doc = MagicMock()
+        pdf_doc.is_pdf = True
+        pdf_doc.__len__.return_value = num_pages
+        page = MagicMock()
+        page.rect.width = width
+        page.rect.height = height
+        pdf_doc.load_page.return_value = page
+        return pdf_doc
+
+    def test_budget_config(self):
+        """budget_mb sets the budget; without it the Lambda default is used."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"memory": {"budget_mb": 512}}})
+            assert service.memory_budget.budget_bytes == 512 * MB
+            with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_MEMORY_SIZE": "3008"}):
+                service = OcrService(config={"ocr": {}})
+            assert service.memory_budget.budget_bytes == 1804 * MB
+
+    def test_pages_admitted_within_budget(self):
+        """Only as many pages as fit in the budget are processed at once."""
+        with patch("boto3.client"):
+            service = OcrService(
+                config={"ocr": {"max_workers": 8, "memory": {"budget_mb": 1}}}
+            )
+        pdf_doc = self._pdf(6, 612, 792)
+        # Budget with room for two and a half letter pages
+        page_bytes = service._estimate_page_memory(pdf_doc, 0)
+        service.memory_budget = MemoryBudget(int(page_bytes * 2.5))
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def process_page(page_index, *args, **kwargs):
+            with lock:
+                active.append(page_index)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(page_index)
+            uri = f"s3://out/doc.pdf/pages/{page_index + 1}"
+            return {
+                "image_uri": f"{uri}/image.jpg",
+                "raw_text_uri": f"{uri}/rawText.json",
+                "parsed_text_uri": f"{uri}/result.json",
+                "text_confidence_uri": f"{uri}/textConfidence.json",
+            }, {}
+
+        document = Document(
+            id="doc", input_bucket="in", input_key="doc.pdf", output_bucket="out"
+        )
+        service.s3_client = MagicMock()
+        service.s3_client.get_object.return_value = {"Body": MagicMock()}
+        with (
+            patch.object(ocr_service, "fitz") as mock_fitz,
+            patch.object(
+                service, "_process_single_page_textract", side_effect=process_page
+            ),
+        ):
+            mock_fitz.open.return_value = pdf_doc
+            result = service.process_document(document)
+
+        assert sorted(result.pages) == ["1", "2", "3", "4", "5", "6"]
+        assert max(peak) == 2
+        assert service.memory_budget.stats["peak_mb"] * MB <= page_bytes * 2 + MB
+        assert service.memory_budget.in_use == 0
@@ -0,0 +1,261 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the OCR page rasterizer.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.ocr import rasterizer
+from idp_common.ocr.memory_budget import MemoryBudget
+from idp_common.ocr.rasterizer import PageRasterizer, split_page_ranges
+from idp_common.ocr.service import OcrService
+
+
+def _fake_render_worker(conn, document_path, filetype, page_indices, dpi, resize):
+    """Stand-in worker that streams deterministic bytes instead of rendering."""
+    with open(document_path, "rb") as f:
+        assert f.read() == b"%PDF-fake"
+    for page_index in page_indices:
+        if page_index == 3:
+            conn.send((page_index, None, "boom"))
+        else:
+            conn.send((page_index, f"page-{page_index}".encode(), None))
+    conn.send(None)
+    conn.close()
+
+
+def _dying_render_worker(conn, document_path, filetype, page_indices, dpi, resize):
+    """Stand-in worker that is killed after sending the first page of its range."""
+    conn.send((page_indices[0], b"first", None))
+    if 3 in page_indices:
+        os._exit(1)
+    for page_index in page_indices[1:]:
+        conn.send((page_index, b"rest", None))
+    conn.send(None)
+    conn.close()
+
+
+@pytest.mark.unit
+class TestPageRasterizer:
+    """Tests for the PageRasterizer class."""
+
+    def test_split_page_ranges_contiguous(self):
+        """Pages are split into contiguous, balanced ranges."""
+        assert split_page_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+    def test_split_page_ranges_more_workers_than_pages(self):
+        """Workers beyond the page count are not assigned empty ranges."""
+        assert split_page_ranges(2, 8) == [[0], [1]]
+
+    def test_invalid_mode(self):
+        """An unknown mode is rejected."""
+        with pytest.raises(ValueError, match="Invalid rasterization mode"):
+            PageRasterizer(mode="gpu")
+
+    def test_render_page_uses_dpi(self):
+        """Thread-mode rendering uses the configured DPI for PDF pages."""
+        mock_page = MagicMock()
+        mock_page.get_pixmap.return_value.tobytes.return_value = b"jpeg"
+        mock_doc = MagicMock()
+        mock_doc.is_pdf = True
+        mock_doc.load_page.return_value = mock_page
+
+        result = PageRasterizer(dpi=200).render_page(mock_doc, 0)
+
+        assert result == b"jpeg"
+        mock_page.get_pixmap.assert_called_once_with(dpi=200)
+        mock_page.get_pixmap.return_value.tobytes.assert_called_once_with("jpeg")
+
+    def test_iter_thread_mode(self):
+        """Thread mode yields every page, each worker with its own document handle."""
+        docs = []
+
+        def open_document(*args, **kwargs):
+            mock_doc = MagicMock()
+            mock_doc.__len__.return_value = 3
+            mock_doc.is_pdf = True
+            mock_page = MagicMock()
+            mock_page.get_pixmap.return_value.tobytes.return_value = b"jpeg"
+            mock_doc.load_page.return_value = mock_page
+            docs.append(mock_doc)
+            return mock_doc
+
+        with patch.object(rasterizer, "fitz") as mock_fitz:
+            mock_fitz.open.side_effect = open_document
+            results = list(
+                PageRasterizer(mode="thread", workers=2).iter_page_images(b"%PDF")
+            )
+
+        assert sorted(index for index, _, _ in results) == [0, 1, 2]
+        assert all(image == b"jpeg" and error is None for _, image, error in results)
+        # One handle to count the pages, then one per worker range
+        assert len(docs) == 3
+        loaded = [
+            sorted(call.args[0] for call in doc.load_page.call_args_list)
+            for doc in docs[1:]
+        ]
+        assert sorted(loaded) == [[0, 1], [2]]
+        assert all(doc.close.call_count == 1 for doc in docs)
+
+    def test_iter_process_mode_streams_pages(self):
+        """Process mode streams bytes and per-page errors back from workers."""
+        with patch.object(rasterizer, "_render_page_range_worker", _fake_render_worker):
+            raster = PageRasterizer(mode="process", workers=2, start_method="fork")
+            results = list(raster.iter_page_images(b"%PDF-fake", page_indices=range(5)))
+
+        by_page = {index: (image, error) for index, image, error in results}
+        assert sorted(by_page) == [0, 1, 2, 3, 4]
+        assert by_page[0] == (b"page-0", None)
+        assert by_page[4] == (b"page-4", None)
+        assert by_page[3] == (None, "boom")
+
+    def test_dead_worker_reports_undelivered_pages(self):
+        """Pages a killed worker never sent are yielded as errors."""
+        with patch.object(
+            rasterizer, "_render_page_range_worker", _dying_render_worker
+        ):
+            raster = PageRasterizer(mode="process", workers=2, start_method="fork")
+            results = list(raster.iter_page_images(b"%PDF-fake", page_indices=range(6)))
+
+        by_page = {index: (image, error) for index, image, error in results}
+        assert sorted(by_page) == [0, 1, 2, 3, 4, 5]
+        assert by_page[3] == (b"first", None)
+        assert by_page[4] == (None, "render worker exited")
+        assert by_page[5] == (None, "render worker exited")
+        assert by_page[1] == (b"rest", None)
+
+    def test_worker_reports_open_failure(self):
+        """A worker that cannot open the document reports each page as failed."""
+        conn = MagicMock()
+        with patch.object(rasterizer, "fitz") as mock_fitz:
+            mock_fitz.open.side_effect = Exception("corrupt")
+            rasterizer._render_page_range_worker(
+                conn, "/tmp/missing.pdf", "pdf", [0, 1], 150, None
+            )
+
+        sent = [call.args[0] for call in conn.send.call_args_list]
+        assert sent[0][0] == 0 and "corrupt" in sent[0][2]
+        assert sent[1][0] == 1 and "corrupt" in sent[1][2]
+        assert sent[-1] is None
+        conn.close.assert_called_once()
+
+
+@pytest.mark.unit
+class TestOcrServiceRasterization:
+    """Tests for OcrService integration with the rasterizer."""
+
+    def test_default_mode_is_thread(self):
+        """Without configuration the historical thread mode is kept."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {}})
+        assert service.rasterizer.mode == "thread"
+
+    def test_process_mode_from_config(self):
+        """Process mode and worker count are read from ocr.rasterization."""
+        config = {"ocr": {"rasterization": {"mode": "process", "workers": "3"}}}
+        with patch("boto3.client"):
+            service = OcrService(config=config)
+        assert service.rasterizer.mode == "process"
+        assert service.rasterizer.workers == 3
+
+    def test_submit_prerendered_pages(self):
+        """Rendered pages go to the OCR threads; render errors become failed futures."""
+        import concurrent.futures
+
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"rasterization": {"mode": "process"}}})
+
+        service.rasterizer = MagicMock()
+        service.rasterizer.iter_page_images.return_value = iter(
+            [(1, b"img-2", None), (0, None, "bad page")]
+        )
+
+        with patch.object(
+            service, "_process_single_page_textract", return_value=("r", {})
+        ) as mock_textract:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                future_to_page = service._submit_prerendered_pages(
+                    executor, MagicMock(), b"%PDF", "pdf", 2, "bucket", "prefix"
+                )
+                outcomes = {}
+                for future, page_index in future_to_page.items():
+                    try:
+                        outcomes[page_index] = future.result()
+                    except RuntimeError as e:
+                        outcomes[page_index] = str(e)
+
+        assert outcomes[1] == ("r", {})
+        assert "bad page" in outcomes[0]
+        mock_textract.assert_called_once_with(
+            1, None, "bucket", "prefix", page_image=b"img-2"
+        )
+
+    def test_submit_prerendered_pages_reports_missing_pages(self):
+        """Pages the rasterizer never yielded become failed futures."""
+        import concurrent.futures
+
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"rasterization": {"mode": "process"}}})
+
+        service.rasterizer = MagicMock()
+        service.rasterizer.iter_page_images.return_value = iter([(0, b"img-1", None)])
+
+        with patch.object(
+            service, "_process_single_page_textract", return_value=("r", {})
+        ):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                future_to_page = service._submit_prerendered_pages(
+                    executor, MagicMock(), b"%PDF", "pdf", 3, "bucket", "prefix"
+                )
+
+        assert sorted(future_to_page.values()) == [0, 1, 2]
+        failed = [f for f, i in future_to_page.items() if i != 0]
+        assert all(isinstance(f.exception(), RuntimeError) for f in failed)
+
+    def test_prerendered_pages_are_admitted_by_memory_budget(self):
+        """Rendered pages wait for the memory budget and release it when done."""
+        import concurrent.futures
+
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"rasterization": {"mode": "process"}}})
+
+        service.memory_budget = MemoryBudget(10)
+        service.rasterizer = MagicMock()
+        service.rasterizer.iter_page_images.return_value = iter(
+            [(0, b"img-1", None), (1, b"img-2", None), (2, b"img-3", None)]
+        )
+        in_use = []
+
+        def process(page_index, *args, **kwargs):
+            in_use.append(service.memory_budget.in_use)
+            return "r", {}
+
+        with patch.object(service, "_estimate_page_memory", return_value=10):
+            with patch.object(
+                service, "_process_single_page_textract", side_effect=process
+            ):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                    future_to_page = service._submit_prerendered_pages(
+                        executor, MagicMock(), b"%PDF", "pdf", 3, "bucket", "prefix"
+                    )
+                    for future in future_to_page:
+                        future.result()
+
+        # The budget fits one page, so pages were processed one at a time
+        assert in_use == [10, 10, 10]
+        assert service.memory_budget.in_use == 0
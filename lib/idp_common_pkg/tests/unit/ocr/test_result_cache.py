@@ -0,0 +1,238 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the content-addressed OCR result cache.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.ocr.result_cache import (
+    OcrResultCache,
+    compute_cache_key,
+    create_cache_store,
+)
+from idp_common.ocr.service import OcrService
+from idp_common.utils.cache_store import LocalCacheStore
+
+TEXTRACT_RESPONSE = {
+    "DocumentMetadata": {"Pages": 1},
+    "Blocks": [
+        {"BlockType": "LINE", "Text": "Hello", "Confidence": 99.5, "Id": "l1"},
+    ],
+}
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """Tests for cache keys, stores and counters."""
+
+    def test_cache_key_includes_fingerprint(self):
+        """The same image with different OCR settings gets a different key."""
+        key = compute_cache_key(b"img", {"api": "detect_document_text"})
+        assert key == compute_cache_key(b"img", {"api": "detect_document_text"})
+        assert key != compute_cache_key(b"img", {"api": "analyze_document"})
+        assert key != compute_cache_key(b"img2", {"api": "detect_document_text"})
+
+    def test_local_store_ttl(self, tmp_path):
+        """Entries are returned until they expire."""
+        store = LocalCacheStore(str(tmp_path))
+        store.put("fresh", {"a": 1}, int(time.time()) + 60)
+        store.put("stale", {"a": 2}, int(time.time()) - 1)
+        assert store.get("fresh") == {"a": 1}
+        assert store.get("stale") is None
+        assert store.get("missing") is None
+
+    def test_invalid_store(self):
+        """An unknown store type is rejected."""
+        with pytest.raises(ValueError, match="Invalid OCR cache store"):
+            create_cache_store({"store": "redis"})
+
+    def test_stats_and_store_errors(self, tmp_path):
+        """Store failures count as misses and hit rate is tracked."""
+        cache = OcrResultCache(LocalCacheStore(str(tmp_path)), ttl_days=1)
+        cache.save("k", {"raw_text_uri": "s3://b/k"})
+        assert cache.lookup("k") == {"raw_text_uri": "s3://b/k"}
+        cache.record_hit()
+        assert cache.lookup("other") is None
+
+        broken = MagicMock()
+        broken.get.side_effect = Exception("throttled")
+        cache.store = broken
+        assert cache.lookup("k") is None
+
+        stats = cache.stats
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["errors"] == 1
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_publish_metrics_reports_deltas(self, tmp_path):
+        """Each publish reports only lookups since the previous publish."""
+        cache = OcrResultCache(LocalCacheStore(str(tmp_path)))
+        cache.record_hit()
+        cache.record_miss()
+        with patch("idp_common.metrics.put_metric") as mock_put:
+            cache.publish_metrics()
+            cache.record_hit()
+            cache.publish_metrics()
+        assert [c.args for c in mock_put.call_args_list] == [
+            ("OCRCacheHits", 1),
+            ("OCRCacheMisses", 1),
+            ("OCRCacheHits", 1),
+            ("OCRCacheMisses", 0),
+        ]
+
+
+@pytest.mark.unit
+class TestOcrServiceCache:
+    """Tests for OcrService integration with the result cache."""
+
+    def _service(self, tmp_path, **cache_config):
+        config = {
+            "ocr": {
+                "backend": "textract",
+                "cache": {
+                    "enabled": True,
+                    "store": "local",
+                    "directory": str(tmp_path),
+                    **cache_config,
+                },
+            }
+        }
+        with patch("boto3.client") as mock_client:
+            textract = MagicMock()
+            textract.detect_document_text.return_value = TEXTRACT_RESPONSE
+            mock_client.return_value = textract
+            service = OcrService(config=config)
+        service.textract_client = textract
+        service.s3_client = MagicMock()
+        return service
+
+    def test_disabled_by_default(self):
+        """Without configuration no cache is created."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"backend": "textract"}})
+        assert service.result_cache is None
+
+    def test_miss_then_hit_copies_artifacts(self, tmp_path):
+        """A repeated page is served by copying the first page's artifacts."""
+        service = self._service(tmp_path)
+
+        with patch("idp_common.s3.write_content"):
+            first, first_metering = service._process_single_page_textract(
+                0, None, "bucket", "doc-a.pdf", page_image=b"same-bytes"
+            )
+            second, second_metering = service._process_single_page_textract(
+                2, None, "bucket", "doc-b.pdf", page_image=b"same-bytes"
+            )
+
+        service.textract_client.detect_document_text.assert_called_once()
+        assert first_metering == {"OCR/textract/detect_document_text": {"pages": 1}}
+        assert second_metering == {"OCR/cache/hit": {"pages": 1}}
+        assert second == {
+            "raw_text_uri": "s3://bucket/doc-b.pdf/pages/3/rawText.json",
+            "text_confidence_uri": "s3://bucket/doc-b.pdf/pages/3/textConfidence.json",
+            "parsed_text_uri": "s3://bucket/doc-b.pdf/pages/3/result.json",
+            "image_uri": "s3://bucket/doc-b.pdf/pages/3/image.jpg",
+        }
+        copies = service.s3_client.copy_object.call_args_list
+        assert len(copies) == 3
+        assert copies[0].kwargs["CopySource"] == {
+            "Bucket": "bucket",
+            "Key": "doc-a.pdf/pages/1/rawText.json",
+        }
+        assert service.result_cache.stats["hits"] == 1
+        assert service.result_cache.stats["misses"] == 1
+
+    def test_reprocess_same_prefix_skips_copy(self, tmp_path):
+        """Reprocessing the same document reuses artifacts already in place."""
+        service = self._service(tmp_path)
+
+        with patch("idp_common.s3.write_content"):
+            service._process_single_page_textract(
+                0, None, "bucket", "doc.pdf", page_image=b"page"
+            )
+            _, metering = service._process_single_page_textract(
+                0, None, "bucket", "doc.pdf", page_image=b"page"
+            )
+
+        assert metering == {"OCR/cache/hit": {"pages": 1}}
+        service.s3_client.copy_object.assert_not_called()
+        assert service.s3_client.head_object.call_count == 3
+
+    def test_missing_artifacts_fall_back_to_textract(self, tmp_path):
+        """If cached artifacts were deleted the page is OCRed again."""
+        service = self._service(tmp_path)
+        service.s3_client.copy_object.side_effect = Exception("NoSuchKey")
+
+        with patch("idp_common.s3.write_content"):
+            service._process_single_page_textract(
+                0, None, "bucket", "doc-a.pdf", page_image=b"page"
+            )
+            _, metering = service._process_single_page_textract(
+                0, None, "bucket", "doc-b.pdf", page_image=b"page"
+            )
+
+        assert metering == {"OCR/textract/detect_document_text": {"pages": 1}}
+        assert service.textract_client.detect_document_text.call_count == 2
+        assert service.result_cache.stats["hits"] == 0
+
+    def test_feature_change_invalidates(self, tmp_path):
+        """Changing the Textract features produces a cache miss."""
+        service = self._service(tmp_path)
+
+        with patch("idp_common.s3.write_content"):
+            service._process_single_page_textract(
+                0, None, "bucket", "doc-a.pdf", page_image=b"page"
+            )
+            service.enhanced_features = ["TABLES"]
+            with patch.object(
+                service, "_analyze_document", return_value=TEXTRACT_RESPONSE
+            ) as mock_analyze:
+                _, metering = service._process_single_page_textract(
+                    0, None, "bucket", "doc-b.pdf", page_image=b"page"
+                )
+
+        mock_analyze.assert_called_once()
+        assert metering == {"OCR/textract/analyze_document-Tables": {"pages": 1}}
+
+    def test_pipelined_entries_saved_after_uploads_confirmed(self, tmp_path):
+        """Entries wait for the upload pipeline and skip pages whose upload failed."""
+        service = self._service(tmp_path)
+        service._start_upload_pipeline()
+        document = MagicMock(errors=[], pages={}, metering={})
+
+        with patch("idp_common.s3.write_content"):
+            ok = service._process_single_page_textract(
+                0, None, "bucket", "doc.pdf", page_image=b"ok-page"
+            )
+            failed = service._process_single_page_textract(
+                1, None, "bucket", "doc.pdf", page_image=b"failed-page"
+            )
+            assert not list(tmp_path.glob("*.json"))
+
+            upload_errors = service._finish_upload_pipeline()
+            upload_errors.append(
+                {"key": "doc.pdf/pages/2/rawText.json", "error": "AccessDenied"}
+            )
+            service._add_page_results(document, {0: ok, 1: failed}, upload_errors)
+
+        assert list(document.pages) == ["1"]
+        fingerprint = service._cache_fingerprint()
+        store = service.result_cache.store
+        assert store.get(compute_cache_key(b"ok-page", fingerprint)) is not None
+        assert store.get(compute_cache_key(b"failed-page", fingerprint)) is None
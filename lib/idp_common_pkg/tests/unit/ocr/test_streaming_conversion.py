@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for streaming non-PDF pages into the page workers.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import threading
+import time
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.models import Document, Status
+from idp_common.ocr.service import OcrService
+
+
+def _service(page_workers=2):
+    with patch("boto3.client"):
+        service = OcrService(config={"ocr": {}})
+    service.page_workers = page_workers
+    service.s3_client = MagicMock()
+    return service
+
+
+def _result(page_index):
+    uri = f"s3://out/doc.csv/pages/{page_index + 1}"
+    return {
+        "image_uri": f"{uri}/image.jpg",
+        "raw_text_uri": f"{uri}/rawText.json",
+        "parsed_text_uri": f"{uri}/result.json",
+        "text_confidence_uri": f"{uri}/textConfidence.json",
+    }, {"OCR/converted/document_conversion": {"pages": 1}}
+
+
+@pytest.mark.unit
+class TestStreamingConversion:
+    """Tests for concurrent, bounded processing of converted pages."""
+
+    def test_pages_processed_while_converting(self):
+        """Converted pages are processed concurrently with bounded look-ahead."""
+        service = _service(page_workers=2)
+        lock = threading.Lock()
+        state = {"converted": 0, "processed": 0, "ahead": [], "active": 0, "peak": 0}
+
+        def fake_pages(content):
+            for i in range(20):
+                with lock:
+                    state["converted"] += 1
+                    state["ahead"].append(state["converted"] - state["processed"])
+                yield b"img", f"page {i}"
+
+        def process_page(page_index, image_bytes, page_text, bucket, prefix):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+                state["processed"] += 1
+            return _result(page_index)
+
+        document = Document(
+            id="doc", input_bucket="in", input_key="doc.csv", output_bucket="out"
+        )
+        service.s3_client.get_object.return_value = {"Body": BytesIO(b"a,b\n1,2\n")}
+        with (
+            patch.object(
+                service.document_converter, "iter_csv_pages", side_effect=fake_pages
+            ),
+            patch.object(
+                service, "_process_converted_page", side_effect=process_page
+            ) as mock_process,
+        ):
+            result = service.process_document(document)
+
+        assert result.status != Status.FAILED
+        assert result.num_pages == 20
+        assert list(result.pages) == [str(i) for i in range(1, 21)]
+        assert mock_process.call_args_list[3].args[2] == "page 3"
+        assert state["peak"] == 2
+        # At most two pages per worker are held before they are processed
+        assert max(state["ahead"]) <= 2 * 2 + 1
+
+    def test_conversion_error_yields_error_page(self):
+        """A converter failure before the first page produces an error page."""
+        service = _service()
+
+        with patch.object(
+            service.document_converter,
+            "iter_excel_pages",
+            side_effect=ValueError("bad workbook"),
+        ):
+            pages = service._process_non_pdf_document("xlsx", b"not a workbook")
+
+        assert len(pages) == 1
+        assert pages[0][1] == "Error processing xlsx document"
+
+    def test_conversion_error_after_first_page_fails_document(self):
+        """A converter failure after pages were submitted fails the document."""
+        service = _service()
+
+        def fake_pages(content):
+            yield b"img", "page 0"
+            raise ValueError("bad row in chunk 40")
+
+        document = Document(
+            id="doc", input_bucket="in", input_key="doc.csv", output_bucket="out"
+        )
+        service.s3_client.get_object.return_value = {"Body": BytesIO(b"a,b\n1,2\n")}
+        with (
+            patch.object(
+                service.document_converter, "iter_csv_pages", side_effect=fake_pages
+            ),
+            patch.object(
+                service,
+                "_process_converted_page",
+                side_effect=lambda i, *args: _result(i),
+            ),
+        ):
+            result = service.process_document(document)
+
+        assert result.status == Status.FAILED
+        assert any("bad row in chunk 40" in error for error in result.errors)
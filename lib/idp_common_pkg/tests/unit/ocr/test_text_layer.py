@@ -0,0 +1,194 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the native text layer ("auto" OCR backend) support.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.ocr import text_layer
+from idp_common.ocr.service import OcrService
+
+
+def _make_page(spans, fonts, words=None, width=612.0, height=792.0):
+    """Build a fake PyMuPDF page with the given text spans, fonts and words."""
+    page = MagicMock()
+    page.rect.width = width
+    page.rect.height = height
+    page.get_fonts.return_value = fonts
+
+    def get_text(option="text", sort=False):
+        if option == "dict":
+            return {
+                "blocks": [
+                    {
+                        "type": 0,
+                        "lines": [
+                            {"spans": [{"text": text, "font": font}]}
+                            for text, font in spans
+                        ],
+                    }
+                ]
+            }
+        if option == "words":
+            return words or []
+        return "\n".join(text for text, _ in spans)
+
+    page.get_text.side_effect = get_text
+    return page
+
+
+EMBEDDED_FONT = [(10, "ttf", "TrueType", "ABCDEF+Arial", "F1", "WinAnsiEncoding")]
+
+
+@pytest.mark.unit
+class TestAnalyzeTextLayer:
+    """Tests for text layer quality scoring."""
+
+    def test_usable_digital_page(self):
+        """A page with enough clean text in embedded fonts is usable."""
+        page = _make_page(
+            [("Loan application for John Smith " * 3, "Arial")], EMBEDDED_FONT
+        )
+        quality = text_layer.analyze_text_layer(page)
+        assert quality.usable
+        assert quality.font_coverage == 1.0
+        assert quality.garbage_ratio == 0.0
+
+    def test_image_only_page(self):
+        """A page without a text layer falls back to OCR."""
+        page = _make_page([], [])
+        quality = text_layer.analyze_text_layer(page)
+        assert not quality.usable
+        assert quality.char_count == 0
+        assert "characters" in quality.reason
+
+    def test_standard_font_counts_as_covered(self):
+        """Non-embedded base-14 fonts still extract reliably."""
+        fonts = [(5, "n/a", "Type1", "Helvetica", "F1", "WinAnsiEncoding")]
+        page = _make_page([("x" * 80, "Helvetica")], fonts)
+        assert text_layer.analyze_text_layer(page).usable
+
+    def test_low_font_coverage(self):
+        """Text drawn with Type3 or non-embedded custom fonts is rejected."""
+        fonts = [(7, "n/a", "Type3", "CustomGlyphs", "F2", "")]
+        page = _make_page([("y" * 80, "CustomGlyphs")], fonts)
+        quality = text_layer.analyze_text_layer(page)
+        assert not quality.usable
+        assert "font coverage" in quality.reason
+
+    def test_garbage_text(self):
+        """Replacement and private-use characters indicate a broken mapping."""
+        text = "valid text " * 5 + "\ufffd\ue000" * 10
+        page = _make_page([(text, "Arial")], EMBEDDED_FONT)
+        quality = text_layer.analyze_text_layer(page, max_garbage_ratio=0.05)
+        assert not quality.usable
+        assert quality.garbage_ratio > 0.05
+        assert "garbage ratio" in quality.reason
+
+
+@pytest.mark.unit
+class TestBuildTextractResponse:
+    """Tests for building Textract-compatible output from the text layer."""
+
+    def test_lines_and_words(self):
+        """Words are grouped into LINE blocks with normalized geometry."""
+        words = [
+            (61.2, 79.2, 122.4, 99.0, "Hello", 0, 0, 0),
+            (130.0, 79.2, 190.0, 99.0, "World", 0, 0, 1),
+            (61.2, 120.0, 100.0, 140.0, "Second", 0, 1, 0),
+        ]
+        page = _make_page([], [], words=words)
+        response = text_layer.build_textract_response(page)
+
+        lines = [b for b in response["Blocks"] if b["BlockType"] == "LINE"]
+        word_blocks = [b for b in response["Blocks"] if b["BlockType"] == "WORD"]
+        assert [line["Text"] for line in lines] == ["Hello World", "Second"]
+        assert len(word_blocks) == 3
+        assert lines[0]["Confidence"] == text_layer.TEXT_LAYER_CONFIDENCE
+        assert lines[0]["Geometry"]["BoundingBox"]["Left"] == pytest.approx(0.1)
+        assert lines[0]["Geometry"]["BoundingBox"]["Top"] == pytest.approx(0.1)
+        assert lines[0]["Relationships"][0]["Ids"] == [
+            "line-1-word-1",
+            "line-1-word-2",
+        ]
+        page_block = response["Blocks"][0]
+        assert page_block["BlockType"] == "PAGE"
+        assert page_block["Relationships"][0]["Ids"] == ["line-1", "line-2"]
+        assert text_layer.text_from_response(response) == "Hello World\nSecond"
+
+
+@pytest.mark.unit
+class TestAutoBackend:
+    """Tests for the OcrService "auto" backend."""
+
+    def test_init_auto_backend(self):
+        """The auto backend creates a Textract client for fallback pages."""
+        config = {"ocr": {"backend": "auto", "text_layer": {"min_chars": "10"}}}
+        with patch("boto3.client") as mock_client:
+            service = OcrService(config=config)
+        assert service.backend == "auto"
+        assert service.text_layer_thresholds["min_chars"] == 10
+        assert "textract" in [call.args[0] for call in mock_client.call_args_list]
+
+    def test_auto_uses_text_layer(self):
+        """Pages with a usable text layer skip Textract and meter the native path."""
+        words = [(10, 10, 50, 20, "Invoice", 0, 0, 0)]
+        page = _make_page([("Invoice total due " * 5, "Arial")], EMBEDDED_FONT, words)
+        pdf_doc = MagicMock()
+        pdf_doc.is_pdf = True
+        pdf_doc.load_page.return_value = page
+
+        with patch("boto3.client") as mock_client:
+            textract = MagicMock()
+            mock_client.return_value = textract
+            service = OcrService(config={"ocr": {"backend": "auto"}})
+
+        with patch("idp_common.s3.write_content") as mock_write:
+            result, metering = service._process_single_page(
+                0, pdf_doc, "bucket", "prefix"
+            )
+
+        assert metering == {"OCR/text_layer/native": {"pages": 1}}
+        textract.detect_document_text.assert_not_called()
+        assert mock_write.call_count == 4
+        written = {call.args[2]: call.args[0] for call in mock_write.call_args_list}
+        assert written["prefix/pages/1/result.json"] == {"text": "Invoice"}
+        assert (
+            "| Invoice | 99.0 |"
+            in written["prefix/pages/1/textConfidence.json"]["text"]
+        )
+        assert result["image_uri"] == "s3://bucket/prefix/pages/1/image.jpg"
+
+    def test_auto_falls_back_to_textract(self):
+        """Image-only pages are sent to Textract."""
+        page = _make_page([], [])
+        pdf_doc = MagicMock()
+        pdf_doc.is_pdf = True
+        pdf_doc.load_page.return_value = page
+
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"backend": "auto"}})
+
+        with patch.object(
+            service, "_process_single_page_textract", return_value=("r", "m")
+        ) as mock_textract:
+            result = service._process_single_page(0, pdf_doc, "bucket", "prefix")
+
+        assert result == ("r", "m")
+        mock_textract.assert_called_once_with(
+            0, pdf_doc, "bucket", "prefix", page_image=None
+        )
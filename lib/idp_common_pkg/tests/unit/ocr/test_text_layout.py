@@ -0,0 +1,103 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for cached text measurement and line wrapping.
+"""
+
+import pytest
+from idp_common.ocr.text_layout import TextLayout
+
+# Proportional advance widths, like a real font
+GLYPH_WIDTHS = {" ": 4, "i": 3, "l": 3, "m": 11, "w": 11}
+
+
+class FakeFont:
+    """Font whose advance width is the sum of per-character widths."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def getlength(self, text):
+        self.calls += 1
+        return sum(GLYPH_WIDTHS.get(char, 7) for char in text)
+
+
+def _greedy_wrap(text, font, max_width):
+    """Reference wrap that re-measures the whole candidate line for each word."""
+    lines, current = [], []
+    for word in text.split():
+        if font.getlength(" ".join(current + [word])) <= max_width or not current:
+            current.append(word)
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+    lines.append(" ".join(current))
+    return lines
+
+
+@pytest.mark.unit
+class TestTextLayout:
+    """Tests for TextLayout."""
+
+    def test_wrap_matches_full_line_measurement(self):
+        """Additive widths produce the same breaks as measuring whole lines."""
+        font = FakeFont()
+        text = " ".join(("wim" * (i % 5 + 1)) + str(i) for i in range(400))
+
+        assert TextLayout().wrap(text, font, 300) == _greedy_wrap(text, font, 300)
+
+    def test_word_widths_are_cached(self):
+        """Each distinct word is measured once per font."""
+        font = FakeFont()
+        layout = TextLayout()
+
+        layout.wrap("alpha beta gamma " * 200, font, 120)
+        layout.wrap("alpha beta gamma", font, 120)
+
+        # One call per distinct word plus the space width
+        assert font.calls == 4
+
+    def test_text_width_is_additive(self):
+        """Text width is the sum of word and space widths."""
+        font = FakeFont()
+        assert TextLayout().text_width("mill  wim", font) == font.getlength("mill  wim")
+
+    def test_long_token_is_broken(self):
+        """A token wider than the line is split at the longest fitting prefixes."""
+        font = FakeFont()
+        token = "m" * 20 + "i" * 40
+
+        lines = TextLayout().wrap(f"start {token} end", font, 100)
+
+        assert lines[0] == "start"
+        assert "".join(lines[1:-1]) + lines[-1].split(" ")[0] == token
+        for line in lines:
+            assert font.getlength(line) <= 100
+        # Breaks are maximal: the next character would not fit
+        assert lines[1] == "m" * 9
+        assert lines[-1].endswith(" end")
+
+    def test_single_character_wider_than_line(self):
+        """A character wider than the line still makes progress."""
+        assert TextLayout().wrap("mmm", FakeFont(), 5) == ["m", "m", "m"]
+
+    def test_blank_text(self):
+        """Text without words is returned unchanged."""
+        assert TextLayout().wrap("   ", FakeFont(), 100) == ["   "]
+
+    def test_caches_are_per_font(self):
+        """Widths measured with one font are not reused for another."""
+        layout = TextLayout()
+        small, large = FakeFont(), FakeFont()
+        large.getlength = lambda text: 2 * FakeFont.getlength(small, text)
+
+        assert layout.text_width("word", large) == 2 * layout.text_width("word", small)
+
+    def test_word_cache_is_bounded(self):
+        """The word cache is reset once it reaches its size limit."""
+        layout = TextLayout(max_cached_words=10)
+        font = FakeFont()
+        for i in range(25):
+            layout.text_width(f"word{i}", font)
+        assert len(layout.metrics(font)._words) <= 10
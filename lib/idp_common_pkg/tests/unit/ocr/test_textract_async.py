@@ -0,0 +1,259 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for asynchronous multi-page Textract jobs.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.models import Document, Status
+from idp_common.ocr import service as ocr_service
+from idp_common.ocr import textract_async
+from idp_common.ocr.service import OcrService
+
+
+class FakeTextract:
+    """In-memory stand-in for the asynchronous Textract APIs."""
+
+    def __init__(self, num_pages, in_progress_polls=1, status="SUCCEEDED", page_size=3):
+        self.num_pages = num_pages
+        self.in_progress_polls = in_progress_polls
+        self.status = status
+        self.page_size = page_size
+        self.started = []
+        self.get_calls = []
+        self.detect_document_text = MagicMock(
+            return_value={
+                "DocumentMetadata": {"Pages": 1},
+                "Blocks": [{"BlockType": "PAGE", "Id": "sync", "Page": 1}],
+            }
+        )
+        self.blocks = []
+        for page in range(1, num_pages + 1):
+            self.blocks.append({"BlockType": "PAGE", "Id": f"p{page}", "Page": page})
+            self.blocks.append(
+                {
+                    "BlockType": "LINE",
+                    "Id": f"l{page}",
+                    "Page": page,
+                    "Text": f"text {page}",
+                    "Confidence": 98.0,
+                }
+            )
+
+    def start_document_text_detection(self, DocumentLocation):
+        self.started.append(("text", DocumentLocation, None))
+        return {"JobId": "job-1"}
+
+    def start_document_analysis(self, DocumentLocation, FeatureTypes):
+        self.started.append(("analysis", DocumentLocation, FeatureTypes))
+        return {"JobId": "job-1"}
+
+    def _get(self, JobId, MaxResults, NextToken=None):
+        self.get_calls.append(NextToken)
+        if self.in_progress_polls:
+            self.in_progress_polls -= 1
+            return {"JobStatus": "IN_PROGRESS"}
+        if self.status == "FAILED":
+            return {"JobStatus": "FAILED", "StatusMessage": "InvalidPDF"}
+        start = int(NextToken or 0)
+        end = start + self.page_size
+        response = {
+            "JobStatus": self.status,
+            "DocumentMetadata": {"Pages": self.num_pages},
+            "Blocks": self.blocks[start:end],
+        }
+        if end < len(self.blocks):
+            response["NextToken"] = str(end)
+        return response
+
+    get_document_text_detection = _get
+    get_document_analysis = _get
+
+
+@pytest.mark.unit
+class TestTextractAsync:
+    """Tests for the async job helpers."""
+
+    def test_wait_collects_paginated_blocks_by_page(self):
+        """Blocks from every result page are grouped by page number."""
+        fake = FakeTextract(num_pages=3, in_progress_polls=2, page_size=4)
+        sleeps = []
+
+        blocks_by_page = textract_async.wait_for_job(
+            fake, "job-1", analysis=False, poll_interval=5, sleep=sleeps.append
+        )
+
+        assert sorted(blocks_by_page) == [1, 2, 3]
+        assert [b["Id"] for b in blocks_by_page[2]] == ["p2", "l2"]
+        assert sleeps == [1.0, 2.0]
+        # two IN_PROGRESS polls, then the first result page and one follow-up
+        assert fake.get_calls == [None, None, None, "4"]
+
+    def test_failed_job_raises(self):
+        """A FAILED job raises with the status message."""
+        fake = FakeTextract(num_pages=1, in_progress_polls=0, status="FAILED")
+        with pytest.raises(textract_async.TextractJobError, match="InvalidPDF"):
+            textract_async.wait_for_job(fake, "job-1", analysis=False)
+
+    def test_timeout_raises(self):
+        """A job still running at the deadline raises."""
+        fake = FakeTextract(num_pages=1, in_progress_polls=100)
+        with pytest.raises(textract_async.TextractJobError, match="did not finish"):
+            textract_async.wait_for_job(
+                fake, "job-1", analysis=False, timeout=0.5, sleep=lambda s: None
+            )
+
+    def test_start_job_uses_analysis_for_features(self):
+        """Feature types select StartDocumentAnalysis."""
+        fake = FakeTextract(num_pages=1)
+        textract_async.start_job(fake, "bucket", "doc.pdf", ["TABLES"])
+        textract_async.start_job(fake, "bucket", "doc.pdf")
+        location = {"S3Object": {"Bucket": "bucket", "Name": "doc.pdf"}}
+        assert fake.started == [
+            ("analysis", location, ["TABLES"]),
+            ("text", location, None),
+        ]
+
+    def test_page_response_resets_page_number(self):
+        """Per-page responses use page 1 without modifying the job's blocks."""
+        block = {"BlockType": "LINE", "Id": "l7", "Page": 7}
+        response = textract_async.page_response([block])
+        assert response["Blocks"] == [{"BlockType": "LINE", "Id": "l7", "Page": 1}]
+        assert response["DocumentMetadata"] == {"Pages": 1}
+        assert block["Page"] == 7
+
+
+@pytest.mark.unit
+class TestOcrServiceAsyncTextract:
+    """Tests for OcrService switching to async jobs above the page threshold."""
+
+    def _service(self, fake, threshold=3, **ocr_config):
+        config = {
+            "ocr": {
+                "backend": "textract",
+                "textract_async": {"page_threshold": threshold, "poll_interval": 0.01},
+                **ocr_config,
+            }
+        }
+        with patch("boto3.client"):
+            service = OcrService(config=config)
+        service.textract_client = fake
+        service.s3_client = MagicMock()
+        service.s3_client.get_object.return_value = {"Body": MagicMock()}
+        return service
+
+    def _run(self, service, num_pages):
+        pdf_doc = MagicMock()
+        pdf_doc.is_pdf = True
+        pdf_doc.__len__.return_value = num_pages
+        document = Document(
+            id="doc", input_bucket="in", input_key="doc.pdf", output_bucket="out"
+        )
+        written = {}
+        lock = threading.Lock()
+
+        def write(content, bucket, key, content_type=None):
+            with lock:
+                written[key] = content
+
+        def read(uri):
+            with lock:
+                return written[uri.split("/", 3)[3]]
+
+        with (
+            patch.object(ocr_service, "fitz") as mock_fitz,
+            patch.object(
+                service, "_extract_page_image", return_value=b"img"
+            ) as mock_extract,
+            patch("idp_common.s3.write_content", side_effect=write),
+            patch("idp_common.s3.get_binary_content", side_effect=read),
+        ):
+            mock_fitz.open.return_value = pdf_doc
+            result = service.process_document(document)
+        return result, written, mock_extract.call_count
+
+    def test_large_pdf_uses_one_async_job(self):
+        """Above the threshold the document is processed by a single job."""
+        fake = FakeTextract(num_pages=3)
+        service = self._service(fake)
+
+        result, written, _ = self._run(service, 3)
+
+        assert result.status != Status.FAILED
+        assert sorted(result.pages) == ["1", "2", "3"]
+        assert len(fake.started) == 1
+        assert fake.started[0][1] == {"S3Object": {"Bucket": "in", "Name": "doc.pdf"}}
+        fake.detect_document_text.assert_not_called()
+        raw_page_2 = written["doc.pdf/pages/2/rawText.json"]
+        assert [b["Id"] for b in raw_page_2["Blocks"]] == ["p2", "l2"]
+        assert all(b["Page"] == 1 for b in raw_page_2["Blocks"])
+        assert "doc.pdf/pages/3/image.jpg" in written
+        assert result.metering == {"OCR/textract/detect_document_text": {"pages": 3}}
+
+    def test_small_pdf_stays_synchronous(self):
+        """Below the threshold pages use synchronous calls."""
+        fake = FakeTextract(num_pages=2)
+        service = self._service(fake)
+
+        result, _, _ = self._run(service, 2)
+
+        assert fake.started == []
+        assert fake.detect_document_text.call_count == 2
+        assert sorted(result.pages) == ["1", "2"]
+
+    def test_failed_job_falls_back_to_sync(self):
+        """If the job fails every page is processed synchronously."""
+        fake = FakeTextract(num_pages=3, status="FAILED")
+        service = self._service(fake)
+
+        result, _, renders = self._run(service, 3)
+
+        assert len(fake.started) == 1
+        assert fake.detect_document_text.call_count == 3
+        assert sorted(result.pages) == ["1", "2", "3"]
+        assert result.status != Status.FAILED
+        # Pages are rendered once, while the job runs; the fallback reuses them
+        assert renders == 3
+        assert result.pages["2"].image_uri == "s3://out/doc.pdf/pages/2/image.jpg"
+
+    def test_failed_job_fallback_renders_pages_whose_image_is_missing(self):
+        """Pages whose uploaded image cannot be read are rendered again."""
+        fake = FakeTextract(num_pages=3, status="FAILED")
+        service = self._service(fake)
+        upload_page_image = service._upload_page_image
+
+        def upload_all_but_page_2(page_index, **kwargs):
+            if page_index == 1:
+                raise RuntimeError("upload failed")
+            return upload_page_image(page_index, **kwargs)
+
+        with patch.object(
+            service, "_upload_page_image", side_effect=upload_all_but_page_2
+        ):
+            result, written, renders = self._run(service, 3)
+
+        assert fake.detect_document_text.call_count == 3
+        assert result.status != Status.FAILED
+        assert renders == 3
+        assert "doc.pdf/pages/2/image.jpg" in written
+
+    def test_preprocessing_disables_async(self):
+        """Preprocessed images cannot be sent as the original PDF."""
+        fake = FakeTextract(num_pages=3)
+        service = self._service(fake, image={"preprocessing": True})
+        assert not service._use_async_textract(MagicMock(is_pdf=True), 10)
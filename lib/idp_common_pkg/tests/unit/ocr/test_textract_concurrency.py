@@ -0,0 +1,222 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the AIMD Textract concurrency governor.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.ocr import concurrency
+from idp_common.ocr.concurrency import AimdConcurrencyGovernor
+from idp_common.ocr.service import OcrService
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "DetectDocumentText")
+
+
+@pytest.fixture(autouse=True)
+def reset_governor():
+    concurrency.reset_textract_governor()
+    yield
+    concurrency.reset_textract_governor()
+
+
+@pytest.mark.unit
+class TestAimdConcurrencyGovernor:
+    """Tests for the AIMD limit and retry behavior."""
+
+    def test_additive_increase(self):
+        """Successes raise the limit by about one per window of calls."""
+        governor = AimdConcurrencyGovernor(initial_limit=2, max_limit=4)
+        for _ in range(2):
+            governor.release(governor.acquire())
+        assert governor.limit == 2  # 2 + 1/2 + 1/2.5
+        for _ in range(3):
+            governor.release(governor.acquire())
+        assert governor.limit == 3
+        for _ in range(50):
+            governor.release(governor.acquire())
+        assert governor.limit == 4
+
+    def test_multiplicative_decrease_once_per_window(self):
+        """Throttles from calls started before the last cut count but do not cut again."""
+        governor = AimdConcurrencyGovernor(initial_limit=16)
+        starts = [governor.acquire() for _ in range(3)]
+        governor.release(starts[0], throttled=True)
+        governor.release(starts[1], throttled=True)
+        assert governor.limit == 8
+        time.sleep(0.001)
+        governor.release(governor.acquire(), throttled=True)
+        governor.release(starts[2], succeeded=False)
+
+        stats = governor.stats
+        assert stats["limit"] == 4
+        assert stats["throttles"] == 3
+        assert stats["decreases"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["successes"] == 0
+
+    def test_limit_never_below_minimum(self):
+        """Repeated throttling stops at min_limit."""
+        governor = AimdConcurrencyGovernor(initial_limit=4, min_limit=2)
+        for _ in range(5):
+            time.sleep(0.001)
+            governor.release(governor.acquire(), throttled=True)
+        assert governor.limit == 2
+
+    def test_acquire_blocks_at_limit(self):
+        """A caller waits while the limit is reached."""
+        governor = AimdConcurrencyGovernor(initial_limit=1, max_limit=1)
+        first = governor.acquire()
+        acquired = threading.Event()
+
+        def waiter():
+            governor.release(governor.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        assert not acquired.wait(0.1)
+        governor.release(first)
+        thread.join(5)
+        assert acquired.is_set()
+
+    def test_call_retries_throttles(self):
+        """Throttled calls are retried and the limit is reduced."""
+        governor = AimdConcurrencyGovernor(initial_limit=8)
+        api = MagicMock(
+            side_effect=[_client_error("ThrottlingException"), {"Blocks": []}]
+        )
+        with patch.object(concurrency.time, "sleep") as mock_sleep:
+            assert governor.call(api, Document={"Bytes": b"x"}) == {"Blocks": []}
+        assert api.call_count == 2
+        mock_sleep.assert_called_once()
+        assert governor.stats["throttles"] == 1
+        assert governor.limit == 4
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            ReadTimeoutError(endpoint_url="https://textract"),
+            EndpointConnectionError(endpoint_url="https://textract"),
+            ConnectionClosedError(endpoint_url="https://textract"),
+        ],
+    )
+    def test_call_retries_connection_errors(self, error):
+        """Connection and timeout errors are retried without reducing the limit."""
+        governor = AimdConcurrencyGovernor(initial_limit=8)
+        api = MagicMock(side_effect=[error, {"Blocks": []}])
+        with patch.object(concurrency.time, "sleep") as mock_sleep:
+            assert governor.call(api) == {"Blocks": []}
+        assert api.call_count == 2
+        mock_sleep.assert_called_once()
+        assert governor.stats["throttles"] == 0
+        assert governor.limit == 8
+
+    def test_call_raises_other_errors(self):
+        """Non-retryable errors are raised immediately."""
+        governor = AimdConcurrencyGovernor()
+        api = MagicMock(side_effect=_client_error("InvalidParameterException"))
+        with pytest.raises(ClientError):
+            governor.call(api)
+        assert api.call_count == 1
+        assert governor.stats["in_flight"] == 0
+
+    def test_call_gives_up_after_max_retries(self):
+        """Persistent throttling is raised after max_retries."""
+        governor = AimdConcurrencyGovernor(max_retries=2)
+        api = MagicMock(
+            side_effect=_client_error("ProvisionedThroughputExceededException")
+        )
+        with patch.object(concurrency.time, "sleep"):
+            with pytest.raises(ClientError):
+                governor.call(api)
+        assert api.call_count == 3
+
+    def test_publish_metrics(self):
+        """The limit and new throttles are published."""
+        governor = AimdConcurrencyGovernor(initial_limit=6)
+        governor.release(governor.acquire(), throttled=True)
+        with patch("idp_common.metrics.put_metric") as mock_put:
+            governor.publish_metrics()
+            governor.publish_metrics()
+        assert [c.args for c in mock_put.call_args_list] == [
+            ("TextractConcurrencyLimit", 3),
+            ("TextractThrottles", 1),
+            ("TextractConcurrencyLimit", 3),
+            ("TextractThrottles", 0),
+        ]
+
+
+@pytest.mark.unit
+class TestOcrServiceConcurrency:
+    """Tests for OcrService integration with the governor."""
+
+    def test_fixed_mode_by_default(self):
+        """Without configuration Textract calls are not governed."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"max_workers": 20}})
+        assert service.textract_governor is None
+        assert service.page_workers == 20
+
+    def test_aimd_mode(self):
+        """AIMD mode shares one governor and disables botocore retries."""
+        config = {
+            "ocr": {
+                "max_workers": 10,
+                "concurrency": {"mode": "aimd", "initial": "4", "max": "30"},
+            }
+        }
+        with patch("boto3.client") as mock_client:
+            service = OcrService(config=config)
+            other = OcrService(config=config)
+
+        assert service.textract_governor is other.textract_governor
+        assert service.textract_governor.limit == 4
+        assert service.page_workers == 30
+        textract_config = next(
+            c.kwargs["config"]
+            for c in mock_client.call_args_list
+            if c.args[0] == "textract"
+        )
+        assert textract_config.retries == {"total_max_attempts": 1, "mode": "standard"}
+
+        service.textract_client.detect_document_text.side_effect = [
+            _client_error("ThrottlingException"),
+            {"DocumentMetadata": {"Pages": 1}, "Blocks": []},
+        ]
+        with patch.object(concurrency.time, "sleep"):
+            response = service._call_textract(
+                "detect_document_text", Document={"Bytes": b"img"}
+            )
+        assert response["DocumentMetadata"]["Pages"] == 1
+        assert service.textract_governor.stats["throttles"] == 1
+
+    def test_invalid_mode(self):
+        """An unknown concurrency mode is rejected."""
+        with patch("boto3.client"):
+            with pytest.raises(ValueError, match="Invalid concurrency mode"):
+                OcrService(config={"ocr": {"concurrency": {"mode": "turbo"}}})
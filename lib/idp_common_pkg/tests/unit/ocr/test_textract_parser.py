@@ -0,0 +1,379 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Golden-output tests for the single-pass Textract block parser.
+
+Each sample response is rendered by the native parser and compared with a
+golden markdown string, and with textractor's markdown after normalizing
+whitespace, markdown table syntax and number formatting (textractor coerces
+numeric table cells, e.g. "10.00" becomes "10").
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import importlib
+import re
+import sys
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.ocr import textract_parser
+from idp_common.ocr.service import OcrService
+
+
+def _geometry(left, top, width, height):
+    return {
+        "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + width, "Y": top},
+            {"X": left + width, "Y": top + height},
+            {"X": left, "Y": top + height},
+        ],
+    }
+
+
+class ResponseBuilder:
+    """Builds single-page Textract responses with consistent geometry."""
+
+    def __init__(self):
+        self.blocks = []
+        self.count = 0
+
+    def _id(self, prefix):
+        self.count += 1
+        return f"{prefix}-{self.count}"
+
+    def line(self, text, left, top, confidence=99.1):
+        words = []
+        x = left
+        for word_text in text.split():
+            word = {
+                "BlockType": "WORD",
+                "Id": self._id("word"),
+                "Text": word_text,
+                "TextType": "PRINTED",
+                "Confidence": 99.0,
+                "Geometry": _geometry(x, top, 0.08, 0.02),
+                "Page": 1,
+            }
+            self.blocks.append(word)
+            words.append(word)
+            x += 0.09
+        self.blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": self._id("line"),
+                "Text": text,
+                "Confidence": confidence,
+                "Geometry": _geometry(left, top, x - left, 0.02),
+                "Relationships": [{"Type": "CHILD", "Ids": [w["Id"] for w in words]}],
+                "Page": 1,
+            }
+        )
+        return words
+
+    def table(self, rows, left, top):
+        cells = []
+        for row_index, row in enumerate(rows):
+            for col_index, text in enumerate(row):
+                cell_left = left + col_index * 0.3
+                cell_top = top + row_index * 0.05
+                words = self.line(text, cell_left, cell_top)
+                cell = {
+                    "BlockType": "CELL",
+                    "Id": self._id("cell"),
+                    "RowIndex": row_index + 1,
+                    "ColumnIndex": col_index + 1,
+                    "RowSpan": 1,
+                    "ColumnSpan": 1,
+                    "Confidence": 95.0,
+                    "Geometry": _geometry(cell_left, cell_top, 0.3, 0.05),
+                    "Relationships": [
+                        {"Type": "CHILD", "Ids": [w["Id"] for w in words]}
+                    ],
+                    "Page": 1,
+                }
+                if row_index == 0:
+                    cell["EntityTypes"] = ["COLUMN_HEADER"]
+                self.blocks.append(cell)
+                cells.append(cell)
+        self.blocks.append(
+            {
+                "BlockType": "TABLE",
+                "Id": self._id("table"),
+                "Confidence": 97.0,
+                "EntityTypes": ["STRUCTURED_TABLE"],
+                "Geometry": _geometry(left, top, 0.3 * len(rows[0]), 0.05 * len(rows)),
+                "Relationships": [{"Type": "CHILD", "Ids": [c["Id"] for c in cells]}],
+                "Page": 1,
+            }
+        )
+
+    def key_value(self, key_words, value_ids, left, top):
+        key_id, value_id = self._id("key"), self._id("value")
+        self.blocks.append(
+            {
+                "BlockType": "KEY_VALUE_SET",
+                "Id": key_id,
+                "EntityTypes": ["KEY"],
+                "Confidence": 90.0,
+                "Geometry": _geometry(left, top, 0.08, 0.02),
+                "Relationships": [
+                    {"Type": "VALUE", "Ids": [value_id]},
+                    {"Type": "CHILD", "Ids": [w["Id"] for w in key_words]},
+                ],
+                "Page": 1,
+            }
+        )
+        self.blocks.append(
+            {
+                "BlockType": "KEY_VALUE_SET",
+                "Id": value_id,
+                "EntityTypes": ["VALUE"],
+                "Confidence": 90.0,
+                "Geometry": _geometry(left + 0.09, top, 0.2, 0.02),
+                "Relationships": [{"Type": "CHILD", "Ids": value_ids}],
+                "Page": 1,
+            }
+        )
+
+    def selection(self, selected, left, top):
+        block = {
+            "BlockType": "SELECTION_ELEMENT",
+            "Id": self._id("selection"),
+            "SelectionStatus": "SELECTED" if selected else "NOT_SELECTED",
+            "Confidence": 99.0,
+            "Geometry": _geometry(left, top, 0.02, 0.02),
+            "Page": 1,
+        }
+        self.blocks.append(block)
+        return block
+
+    def response(self):
+        top_level = [
+            b["Id"]
+            for b in self.blocks
+            if b["BlockType"] in ("LINE", "TABLE", "KEY_VALUE_SET")
+        ]
+        page = {
+            "BlockType": "PAGE",
+            "Id": "page-0",
+            "Geometry": _geometry(0, 0, 1, 1),
+            "Relationships": [{"Type": "CHILD", "Ids": top_level}],
+            "Page": 1,
+        }
+        return {"DocumentMetadata": {"Pages": 1}, "Blocks": [page] + self.blocks}
+
+
+def _lines_sample():
+    builder = ResponseBuilder()
+    builder.line("Hello World", 0.1, 0.1)
+    builder.line("Second line | with pipe", 0.1, 0.13)
+    builder.line("Right column", 0.6, 0.4)
+    return builder.response()
+
+
+def _table_sample():
+    builder = ResponseBuilder()
+    builder.line("Invoice Summary", 0.1, 0.05)
+    builder.table(
+        [["Item", "Amount"], ["Widget", "10.00"], ["Gadget", "5.50"]], 0.1, 0.2
+    )
+    builder.line("Thank you", 0.1, 0.6)
+    return builder.response()
+
+
+def _forms_sample():
+    builder = ResponseBuilder()
+    builder.line("Application Form", 0.1, 0.05)
+    words = builder.line("Name: John Smith", 0.1, 0.1)
+    builder.key_value(words[:1], [w["Id"] for w in words[1:]], 0.1, 0.1)
+    words = builder.line("Married:", 0.1, 0.15)
+    box = builder.selection(True, 0.2, 0.15)
+    builder.key_value(words, [box["Id"]], 0.1, 0.15)
+    words = builder.line("Veteran:", 0.1, 0.2)
+    box = builder.selection(False, 0.2, 0.2)
+    builder.key_value(words, [box["Id"]], 0.1, 0.2)
+    builder.line("Signature below", 0.1, 0.3)
+    return builder.response()
+
+
+GOLDEN = {
+    "lines": (
+        _lines_sample,
+        "Hello World\nSecond line | with pipe\nRight column",
+    ),
+    "table": (
+        _table_sample,
+        "Invoice Summary\n\n"
+        "| Item | Amount |\n|---|---|\n| Widget | 10.00 |\n| Gadget | 5.50 |\n\n"
+        "Thank you",
+    ),
+    "forms": (
+        _forms_sample,
+        "Application Form\n\nName: John Smith\nMarried: [X]\nVeteran: [ ]\n\n"
+        "Signature below",
+    ),
+}
+
+
+def _normalize(markdown):
+    """Reduce markdown to comparable tokens."""
+    tokens = []
+    for line in markdown.splitlines():
+        if re.fullmatch(r"[\s|:\-]*", line):
+            continue  # blank lines and table separator rows
+        line = re.sub(r"(?<!\\)\|", " ", line).replace("\\|", "|").lstrip("# ")
+        for token in line.split():
+            try:
+                token = repr(float(token))
+            except ValueError:
+                pass
+            tokens.append(token)
+    return tokens
+
+
+def _textractor_parse():
+    """Import the real textractor parser even if other tests mocked it."""
+    pytest.importorskip("pandas")
+    with patch.dict(sys.modules):
+        for name in list(sys.modules):
+            if name == "textractor" or name.startswith("textractor."):
+                del sys.modules[name]
+        try:
+            response_parser = importlib.import_module(
+                "textractor.parsers.response_parser"
+            )
+        except ImportError:
+            pytest.skip("amazon-textract-textractor is not installed")
+    return response_parser.parse
+
+
+@pytest.mark.unit
+class TestTextractParserGolden:
+    """Golden-output tests for the native parser."""
+
+    @pytest.mark.parametrize("name", sorted(GOLDEN))
+    def test_matches_golden(self, name):
+        """The native parser output matches the golden markdown."""
+        sample, expected = GOLDEN[name]
+        assert textract_parser.to_markdown(sample()) == expected
+
+    @pytest.mark.parametrize("name", ["forms", "table"])
+    def test_matches_textractor(self, name):
+        """Native and textractor markdown contain the same content in order."""
+        parse = _textractor_parse()
+        sample, _ = GOLDEN[name]
+        response = sample()
+        textractor_markdown = parse(response).to_markdown()
+        assert _normalize(textract_parser.to_markdown(response)) == _normalize(
+            textractor_markdown
+        )
+
+    def test_empty_page(self):
+        """A page without lines renders as an empty string."""
+        assert textract_parser.to_markdown({"Blocks": []}) == ""
+
+    def test_merged_cells_and_heading(self):
+        """Spanned cells leave gaps and LAYOUT_TITLE lines become headings."""
+        builder = ResponseBuilder()
+        words = builder.line("Report", 0.1, 0.02)
+        title_line = builder.blocks[-1]
+        builder.blocks.append(
+            {
+                "BlockType": "LAYOUT_TITLE",
+                "Id": "layout-1",
+                "Relationships": [{"Type": "CHILD", "Ids": [title_line["Id"]]}],
+            }
+        )
+        builder.table([["A", "B"], ["1", "2"]], 0.1, 0.2)
+        cells = [b for b in builder.blocks if b["BlockType"] == "CELL"]
+        cells[0]["ColumnSpan"] = 2
+        builder.blocks.remove(cells[1])
+        table = builder.blocks[-1]
+        table["Relationships"][0]["Ids"].remove(cells[1]["Id"])
+
+        markdown = textract_parser.to_markdown(builder.response())
+
+        assert words[0]["Text"] == "Report"
+        assert markdown == "# Report\n\n| A |  |\n|---|---|\n| 1 | 2 |\n\nB"
+
+    def test_index_shared_with_text_confidence(self):
+        """The service builds one index for the confidence data and markdown."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {}})
+        response = _table_sample()
+
+        with (
+            patch("idp_common.s3.write_content") as mock_write,
+            patch.object(
+                textract_parser,
+                "TextractBlockIndex",
+                wraps=textract_parser.TextractBlockIndex,
+            ) as mock_index,
+        ):
+            service._write_textract_artifacts(response, "bucket", "doc", 1)
+
+        mock_index.assert_called_once_with(response)
+        written = {c.args[2]: c.args[0] for c in mock_write.call_args_list}
+        assert written["doc/pages/1/result.json"]["text"] == GOLDEN["table"][1]
+        assert (
+            "| Invoice Summary | 99.1 |"
+            in (written["doc/pages/1/textConfidence.json"]["text"])
+        )
+
+
+@pytest.mark.unit
+class TestOcrServiceMarkdownParser:
+    """Tests for selecting and falling back between parsers."""
+
+    def test_default_is_native(self):
+        """The native parser is used unless textractor is configured."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {}})
+        assert service.markdown_parser == "native"
+        with patch.object(service, "_parse_with_textractor") as mock_textractor:
+            result = service._parse_textract_response(_lines_sample(), 1)
+        mock_textractor.assert_not_called()
+        assert result["text"] == GOLDEN["lines"][1]
+
+    def test_textractor_configured(self):
+        """markdown_parser: textractor keeps the previous parser."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {"markdown_parser": "textractor"}})
+        with patch.object(
+            service, "_parse_with_textractor", return_value={"text": "tx"}
+        ) as mock_textractor:
+            assert service._parse_textract_response({"Blocks": []}, 1) == {"text": "tx"}
+        mock_textractor.assert_called_once()
+
+    def test_native_failure_falls_back(self):
+        """If the native parser raises, textractor is used."""
+        with patch("boto3.client"):
+            service = OcrService(config={"ocr": {}})
+        with (
+            patch.object(
+                textract_parser, "to_markdown", side_effect=KeyError("Blocks")
+            ),
+            patch.object(
+                service, "_parse_with_textractor", return_value={"text": "tx"}
+            ) as mock_textractor,
+        ):
+            assert service._parse_textract_response({"Blocks": []}, 1) == {"text": "tx"}
+        mock_textractor.assert_called_once_with({"Blocks": []}, " for page 1")
+
+    def test_invalid_parser(self):
+        """An unknown parser name is rejected."""
+        with patch("boto3.client"):
+            with pytest.raises(ValueError, match="Invalid markdown_parser"):
+                OcrService(config={"ocr": {"markdown_parser": "regex"}})
@@ -0,0 +1,193 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the pipelined OCR artifact upload stage.
+"""
+
+# ruff: noqa: E402, I001
+# The above line disables E402 (module level import not at top of file) and I001 (import block sorting) for this file
+
+import pytest
+
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Mock PyMuPDF and textractor before importing any modules that might depend on them
+sys.modules.setdefault("fitz", MagicMock())
+sys.modules.setdefault("textractor", MagicMock())
+sys.modules.setdefault("textractor.parsers", MagicMock())
+sys.modules.setdefault("textractor.parsers.response_parser", MagicMock())
+
+from idp_common.models import Document, Status
+from idp_common.ocr import service as ocr_service
+from idp_common.ocr.service import OcrService
+from idp_common.ocr.upload_pipeline import UploadPipeline
+
+
+@pytest.mark.unit
+class TestUploadPipeline:
+    """Tests for the UploadPipeline class."""
+
+    def test_uploads_all_items(self):
+        """Every submitted write is performed before drain() returns."""
+        written = []
+        lock = threading.Lock()
+
+        def write_fn(content, bucket, key, content_type):
+            with lock:
+                written.append((bucket, key, content, content_type))
+
+        with UploadPipeline(max_workers=3, queue_depth=2, write_fn=write_fn) as pipe:
+            for i in range(10):
+                pipe.submit(f"c{i}", "bucket", f"k{i}", "text/plain")
+            assert pipe.drain() == []
+            assert pipe.stats["uploaded"] == 10
+
+        assert sorted(key for _, key, _, _ in written) == sorted(
+            f"k{i}" for i in range(10)
+        )
+        assert all(ct == "text/plain" for _, _, _, ct in written)
+
+    def test_backpressure_blocks_when_queue_full(self):
+        """submit() blocks once queue_depth writes are pending."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def write_fn(content, bucket, key, content_type):
+            started.set()
+            release.wait(5)
+
+        pipe = UploadPipeline(max_workers=1, queue_depth=1, write_fn=write_fn)
+        pipe.submit("a", "bucket", "k1")  # taken by the worker, which blocks
+        assert started.wait(5)
+        pipe.submit("b", "bucket", "k2")  # fills the queue
+
+        submitted = threading.Event()
+
+        def producer():
+            pipe.submit("c", "bucket", "k3")
+            submitted.set()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        assert not submitted.wait(0.2)
+
+        release.set()
+        thread.join(5)
+        assert submitted.is_set()
+        assert pipe.close() == []
+        assert pipe.stats["uploaded"] == 3
+        assert pipe.stats["blocked_seconds"] > 0
+
+    def test_errors_are_collected(self):
+        """Failed writes are reported by drain() without stopping other uploads."""
+
+        def write_fn(content, bucket, key, content_type):
+            if key.endswith("bad"):
+                raise Exception("AccessDenied")
+
+        pipe = UploadPipeline(max_workers=2, write_fn=write_fn)
+        pipe.submit("x", "bucket", "good")
+        pipe.submit("y", "bucket", "bad")
+        errors = pipe.close()
+
+        assert errors == [{"key": "bad", "error": "AccessDenied"}]
+        assert pipe.stats["uploaded"] == 1
+        with pytest.raises(RuntimeError, match="closed"):
+            pipe.submit("z", "bucket", "late")
+
+
+@pytest.mark.unit
+class TestOcrServiceUploads:
+    """Tests for OcrService integration with the upload pipeline."""
+
+    def _service(self, upload_config=None):
+        config = {"ocr": {"backend": "none"}}
+        if upload_config is not None:
+            config["ocr"]["upload"] = upload_config
+        with patch("boto3.client"):
+            return OcrService(config=config)
+
+    def test_upload_config(self):
+        """Upload settings are read from ocr.upload with pipelining on by default."""
+        service = self._service()
+        assert service.upload_pipelined
+        assert service.upload_workers == 10
+
+        service = self._service({"pipelined": "false", "queue_depth": "8"})
+        assert not service.upload_pipelined
+        assert service.upload_queue_depth == 8
+
+    def test_write_artifact_without_pipeline(self):
+        """Outside process_document artifacts are written synchronously."""
+        service = self._service()
+        with patch("idp_common.s3.write_content") as mock_write:
+            service._write_artifact(b"img", "bucket", "key", content_type="image/jpeg")
+        mock_write.assert_called_once_with(
+            b"img", "bucket", "key", content_type="image/jpeg"
+        )
+
+    def _run_document(self, service, write_side_effect):
+        pdf_doc = MagicMock()
+        pdf_doc.is_pdf = True
+        pdf_doc.__len__.return_value = 2
+        document = Document(
+            id="doc", input_bucket="in", input_key="doc.pdf", output_bucket="out"
+        )
+        s3_client = MagicMock()
+        s3_client.get_object.return_value = {"Body": MagicMock()}
+        service.s3_client = s3_client
+
+        with (
+            patch.object(ocr_service, "fitz") as mock_fitz,
+            patch.object(service, "_extract_page_image", return_value=b"img"),
+            patch(
+                "idp_common.s3.write_content", side_effect=write_side_effect
+            ) as mock_write,
+        ):
+            mock_fitz.open.return_value = pdf_doc
+            result = service.process_document(document)
+        return result, mock_write
+
+    def test_process_document_drains_before_building_pages(self):
+        """All artifacts are written before pages are added to the document."""
+        service = self._service()
+        written = set()
+        lock = threading.Lock()
+
+        def write(content, bucket, key, content_type=None):
+            with lock:
+                written.add(key)
+
+        original_add = service._add_page_results
+
+        def add_page_results(document, page_results, upload_errors):
+            assert service._upload_pipeline is None
+            assert "doc.pdf/pages/1/image.jpg" in written
+            assert "doc.pdf/pages/2/image.jpg" in written
+            original_add(document, page_results, upload_errors)
+
+        with patch.object(service, "_add_page_results", add_page_results):
+            result, _ = self._run_document(service, write)
+
+        assert sorted(result.pages) == ["1", "2"]
+        assert result.status != Status.FAILED
+        assert result.errors == []
+
+    def test_failed_upload_drops_page(self):
+        """A page whose artifact upload fails is reported and not added."""
+        service = self._service()
+
+        def write(content, bucket, key, content_type=None):
+            if key == "doc.pdf/pages/2/image.jpg":
+                raise Exception("SlowDown")
+
+        result, _ = self._run_document(service, write)
+
+        assert list(result.pages) == ["1"]
+        assert any(
+            "Error uploading artifacts for page 2: SlowDown" in error
+            for error in result.errors
+        )
@@ -12,9 +12,10 @@ import pytest
 
 # Mock dependencies before importing modules
 import warnings
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Import standard library modules
+import asyncio
 import json
 
 # Import application modules
@@ -276,6 +277,26 @@ class TestSummarizationService:
         assert result.metadata["metering"]["input_tokens"] == 100
         assert result.metadata["metering"]["output_tokens"] == 50
 
+    @patch("idp_common.bedrock.invoke_model_async", new_callable=AsyncMock)
+    def test_process_text_async_success(self, mock_invoke_model_async, service):
+        """Test processing text with the async Bedrock client."""
+        mock_invoke_model_async.return_value = {
+            "response": {
+                "output": {
+                    "message": {
+                        "content": [{"text": '{"summary": "This is a summary"}'}]
+                    }
+                }
+            },
+            "metering": {"input_tokens": 100, "output_tokens": 50},
+        }
+
+        result = asyncio.run(service.process_text_async("Test document text"))
+
+        assert result.content["summary"] == "This is a summary"
+        assert result.metadata["metering"]["input_tokens"] == 100
+        assert mock_invoke_model_async.await_args.kwargs["context"] == "Summarization"
+
     @patch("idp_common.bedrock.invoke_model")
     def test_process_text_empty(self, mock_invoke_model, service):
         """Test processing empty text."""
@@ -1,6 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+import io
+from unittest.mock import patch
+
 import pytest
 from idp_common.ocr.document_converter import DocumentConverter
 
@@ -65,3 +68,131 @@ def test_create_empty_page():
     empty_page = converter._create_empty_page()
     assert isinstance(empty_page, bytes)
     assert len(empty_page) > 0
+
+
+def _csv_rows(count):
+    return "id,name,amount\n" + "".join(f"{i},item{i},{i}.5\n" for i in range(count))
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.split("|")[1:-1]]
+
+
+def _table_rows(pages):
+    """Data rows of markdown table pages, without header and separator lines."""
+    return [
+        line
+        for page_text in pages
+        for line in page_text.split("\n")[2:]
+        if line.startswith("|")
+    ]
+
+
+@pytest.mark.unit
+def test_iter_csv_pages_is_lazy():
+    """Pages are rendered only as the generator is consumed."""
+    converter = DocumentConverter(dpi=72, chunk_rows=10)
+
+    with patch.object(
+        converter, "_render_markdown_page", wraps=converter._render_markdown_page
+    ) as mock_render:
+        pages = converter.iter_csv_pages(_csv_rows(500))
+        mock_render.assert_not_called()
+        next(pages)
+        assert mock_render.call_count == 1
+
+
+@pytest.mark.unit
+def test_csv_chunks_repeat_header_per_page():
+    """Chunked CSV reading keeps every row once and a header on every page."""
+    converter = DocumentConverter(dpi=72, chunk_rows=7)
+
+    pages = [text for _, text in converter.iter_csv_pages(_csv_rows(200))]
+
+    assert len(pages) > 1
+    for page_text in pages:
+        assert _cells(page_text.split("\n")[0]) == ["id", "name", "amount"]
+    rows = _table_rows(pages)
+    assert len(rows) == 200
+    assert [_cells(row)[1] for row in rows] == [f"item{i}" for i in range(200)]
+
+
+@pytest.mark.unit
+def test_csv_error_after_first_page_is_raised():
+    """A failure in a later chunk raises instead of truncating the document."""
+    converter = DocumentConverter(dpi=72, chunk_rows=7)
+    original = converter._iter_csv_markdown
+
+    def failing_markdown(content):
+        for i, line in enumerate(original(content)):
+            if i == 100:
+                raise ValueError("bad row")
+            yield line
+
+    with patch.object(converter, "_iter_csv_markdown", side_effect=failing_markdown):
+        pages = converter.iter_csv_pages(_csv_rows(200))
+        assert next(pages)
+        with pytest.raises(ValueError, match="bad row"):
+            list(pages)
+
+
+@pytest.mark.unit
+def test_iter_excel_pages_streams_rows():
+    """Workbooks are read in read-only mode and chunked like CSV input."""
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Data"
+    sheet.append(["Item", "Qty", "Item"])
+    for i in range(60):
+        sheet.append([f"item{i}", i, None])
+    workbook.create_sheet("Empty")
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    converter = DocumentConverter(dpi=72, chunk_rows=8)
+    with patch.object(
+        openpyxl, "load_workbook", wraps=openpyxl.load_workbook
+    ) as mock_load:
+        pages = [text for _, text in converter.iter_excel_pages(buffer.getvalue())]
+
+    assert mock_load.call_args.kwargs["read_only"] is True
+    # Only one sheet has data, so no sheet heading is added
+    assert not any(line.startswith("##") for line in pages[0].split("\n"))
+    assert _cells(pages[0].split("\n")[0]) == ["Item", "Qty", "Item.1"]
+    rows = _table_rows(pages)
+    assert len(rows) == 60
+    assert _cells(rows[-1])[0] == "item59"
+
+
+@pytest.mark.unit
+def test_convert_methods_match_iterators():
+    """The list-returning methods return the pages of the generators."""
+    converter = DocumentConverter(dpi=72)
+    content = _csv_rows(20)
+
+    def texts(pages):
+        return [text for _, text in pages]
+
+    assert texts(converter.convert_csv_to_pages(content)) == texts(
+        converter.iter_csv_pages(content)
+    )
+    assert texts(converter.convert_text_to_pages("")) == [""]
+
+
+@pytest.mark.unit
+def test_markdown_page_starting_in_table_repeats_header():
+    """A page that starts inside a table gets the table header and separator."""
+    converter = DocumentConverter(dpi=72)
+    lines_per_page = (
+        converter.page_height - 2 * converter.margin
+    ) // converter.MARKDOWN_LINE_HEIGHT
+    lines = ["# Title", "", "| a | b |", "|---|---|"] + [
+        f"| {i} | x |" for i in range(lines_per_page)
+    ]
+
+    pages = converter._convert_markdown_to_pages("\n".join(lines))
+
+    assert len(pages) == 2
+    assert pages[0][1].split("\n")[:3] == ["# Title", "", "| a | b |"]
+    assert pages[1][1].split("\n")[:2] == ["| a | b |", "|---|---|"]
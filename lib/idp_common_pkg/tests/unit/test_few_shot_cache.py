@@ -0,0 +1,171 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the few-shot example content cache.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from idp_common.classification.service import ClassificationService
+from idp_common.extraction.service import ExtractionService
+from idp_common.utils import few_shot_cache
+from idp_common.utils.few_shot_cache import FewShotContentCache, compute_few_shot_key
+
+ATTACHMENT = {"image": {"format": "png", "source": {"bytes": b"png"}}}
+
+
+@pytest.fixture(autouse=True)
+def reset_cache(monkeypatch):
+    monkeypatch.delenv("FEW_SHOT_CACHE_MAX_ENTRIES", raising=False)
+    monkeypatch.delenv("FEW_SHOT_CACHE_TTL_SECONDS", raising=False)
+    monkeypatch.delenv("CONFIGURATION_BUCKET", raising=False)
+    monkeypatch.delenv("ROOT_DIR", raising=False)
+    few_shot_cache.reset_few_shot_cache()
+    yield
+    few_shot_cache.reset_few_shot_cache()
+
+
+def _config(image_path="s3://bucket/examples/invoice.png"):
+    return {
+        "classes": [
+            {
+                "name": "invoice",
+                "description": "An invoice",
+                "attributes": [{"name": "number", "description": "Invoice number"}],
+                "examples": [
+                    {
+                        "name": "example-1",
+                        "classPrompt": "This is an invoice",
+                        "attributesPrompt": '{"number": "1"}',
+                        "imagePath": image_path,
+                    }
+                ],
+            },
+            {"name": "letter", "description": "A letter"},
+        ],
+        "classification": {
+            "model": "us.amazon.nova-pro-v1:0",
+            "system_prompt": "system",
+            "task_prompt": "{DOCUMENT_TEXT}",
+        },
+        "extraction": {"model": "us.amazon.nova-pro-v1:0"},
+    }
+
+
+@pytest.mark.unit
+class TestFewShotContentCache:
+    def test_built_once_per_key(self):
+        cache = FewShotContentCache()
+        build = lambda: ([{"text": "example"}], True)  # noqa: E731
+
+        first = cache.get_or_build("key", build)
+        first.append({"text": "caller addition"})
+        second = cache.get_or_build("key", build)
+
+        assert second == [{"text": "example"}]
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_incomplete_content_is_not_cached(self):
+        cache = FewShotContentCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return [{"text": "partial"}], False
+
+        cache.get_or_build("key", build)
+        cache.get_or_build("key", build)
+
+        assert len(calls) == 2
+
+    def test_lru_and_ttl(self):
+        cache = FewShotContentCache(max_entries=1, ttl_seconds=0.01)
+        cache.get_or_build("a", lambda: ([], True))
+        cache.get_or_build("b", lambda: ([], True))
+        assert cache.stats()["entries"] == 1
+
+        time.sleep(0.02)
+        calls = []
+        cache.get_or_build("b", lambda: (calls.append(1) or [], True))
+        assert calls == [1]
+
+    def test_concurrent_misses_build_once(self):
+        cache = FewShotContentCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.05)
+            return [{"text": "example"}], True
+
+        threads = [
+            threading.Thread(target=cache.get_or_build, args=("key", build))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_zero_entries_disables_cache(self, monkeypatch):
+        monkeypatch.setenv("FEW_SHOT_CACHE_MAX_ENTRIES", "0")
+        calls = []
+
+        for _ in range(2):
+            few_shot_cache.get_few_shot_cache().get_or_build(
+                "key", lambda: (calls.append(1) or [], True)
+            )
+
+        assert len(calls) == 2
+
+    def test_key_changes_with_configuration(self):
+        assert compute_few_shot_key("x", {"a": 1, "b": 2}) == compute_few_shot_key(
+            "x", {"b": 2, "a": 1}
+        )
+        assert compute_few_shot_key("x", {"a": 1}) != compute_few_shot_key(
+            "x", {"a": 2}
+        )
+
+
+@pytest.mark.unit
+class TestServiceFewShotCaching:
+    @patch("idp_common.image.prepare_bedrock_image_attachment", return_value=ATTACHMENT)
+    @patch("idp_common.s3.get_binary_content", return_value=b"png")
+    def test_classification_examples_loaded_once(self, mock_get_binary, _):
+        with patch("boto3.Session"):
+            service = ClassificationService(
+                region="us-east-1", config=_config(), backend="bedrock"
+            )
+
+        for _ in range(3):
+            content = service._build_few_shot_examples_content()
+
+        assert content == [{"text": "This is an invoice"}, ATTACHMENT]
+        assert mock_get_binary.call_count == 1
+
+    @patch("idp_common.image.prepare_bedrock_image_attachment", return_value=ATTACHMENT)
+    @patch("idp_common.s3.get_binary_content", return_value=b"png")
+    def test_extraction_cache_follows_configuration(self, mock_get_binary, _):
+        ExtractionService(config=_config())._build_few_shot_examples_content("invoice")
+        ExtractionService(config=_config())._build_few_shot_examples_content("Invoice")
+        assert mock_get_binary.call_count == 1
+
+        changed = ExtractionService(config=_config("s3://bucket/examples/new.png"))
+        changed._build_few_shot_examples_content("invoice")
+        assert mock_get_binary.call_args.args == ("s3://bucket/examples/new.png",)
+        assert mock_get_binary.call_count == 2
+
+    @patch("idp_common.s3.get_binary_content", side_effect=RuntimeError("S3 error"))
+    def test_failed_images_are_retried(self, mock_get_binary):
+        service = ExtractionService(config=_config())
+
+        service._build_few_shot_examples_content("invoice")
+        service._build_few_shot_examples_content("invoice")
+
+        assert mock_get_binary.call_count == 2
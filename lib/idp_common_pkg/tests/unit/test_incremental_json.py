@@ -0,0 +1,64 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for incremental parsing of streamed JSON objects.
+"""
+
+import pytest
+from idp_common.utils.incremental_json import IncrementalJsonParser, MalformedJsonError
+
+
+def _feed_chars(parser, text):
+    completed = []
+    for char in text:
+        completed.extend(parser.feed(char))
+    return completed
+
+
+@pytest.mark.unit
+class TestIncrementalJsonParser:
+    def test_attributes_yielded_as_they_complete(self):
+        parser = IncrementalJsonParser()
+
+        assert parser.feed('{"a": 1, "b": ') == [("a", 1)]
+        assert parser.feed('[1, {"c": "}"}], "d"') == [("b", [1, {"c": "}"}])]
+        assert parser.feed(': "x\\"y"}') == [("d", 'x"y')]
+        assert parser.complete
+        assert parser.result() == {"a": 1, "b": [1, {"c": "}"}], "d": 'x"y'}
+
+    def test_char_by_char_matches_json(self):
+        text = '{"name": "a, b", "items": [{"k": [1, 2]}, {}], "n": null}'
+        parser = IncrementalJsonParser()
+
+        _feed_chars(parser, text)
+
+        assert parser.result() == {
+            "name": "a, b",
+            "items": [{"k": [1, 2]}, {}],
+            "n": None,
+        }
+
+    def test_prose_and_fence_are_skipped(self):
+        parser = IncrementalJsonParser()
+
+        _feed_chars(
+            parser,
+            'Fields in {braces} follow:\n```json\n{"a": "1"}\n```\nDone {"b": 2}',
+        )
+
+        assert parser.result() == {"a": "1"}
+        assert parser.complete
+
+    def test_empty_object(self):
+        parser = IncrementalJsonParser()
+
+        assert parser.feed("{ }") == []
+        assert parser.complete
+
+    def test_malformed_attribute_raises(self):
+        parser = IncrementalJsonParser()
+        parser.feed('{"a": 1, ')
+
+        with pytest.raises(MalformedJsonError):
+            parser.feed("b: 2,")
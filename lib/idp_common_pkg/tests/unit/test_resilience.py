@@ -0,0 +1,310 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Unit tests for the retry policy (retry budget, circuit breaker, hedging).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from idp_common.bedrock.client import BedrockClient
+from idp_common.utils import resilience
+from idp_common.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    RetryBudget,
+    RetryPolicy,
+)
+
+MODEL_ID = "us.amazon.nova-pro-v1:0"
+
+RESPONSE = {
+    "output": {"message": {"content": [{"text": "answer"}]}},
+    "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15},
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_policies(monkeypatch):
+    monkeypatch.delenv("RETRY_POLICY", raising=False)
+    monkeypatch.delenv("BEDROCK_RESPONSE_CACHE", raising=False)
+    monkeypatch.delenv("BEDROCK_RATE_LIMITS", raising=False)
+    resilience.reset_retry_policies()
+    yield
+    resilience.reset_retry_policies()
+
+
+def _throttle():
+    return ClientError(
+        {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}},
+        "Converse",
+    )
+
+
+def _client(retry_policy):
+    client = BedrockClient(
+        region="us-east-1", metrics_enabled=False, retry_policy=retry_policy
+    )
+    client._calculate_backoff = lambda retry_count: 0
+    client._client = MagicMock()
+    return client
+
+
+@pytest.mark.unit
+class TestRetryBudget:
+    def test_retries_capped_at_ratio_of_calls(self):
+        budget = RetryBudget(retry_ratio=0.1, min_retries_per_second=0, max_tokens=1)
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+        for _ in range(10):
+            budget.record_call()
+
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+    def test_min_retries_per_second_refills(self):
+        budget = RetryBudget(retry_ratio=0, min_retries_per_second=1000, max_tokens=1)
+        assert budget.try_spend()
+        time.sleep(0.01)
+        assert budget.try_spend()
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("model", failure_threshold=2, recovery_seconds=60)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("model", failure_threshold=2, recovery_seconds=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("model", failure_threshold=1, recovery_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("model", failure_threshold=1, recovery_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.unit
+class TestLatencyTracker:
+    def test_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.record(i)
+        assert tracker.percentile(0.95) is None
+
+        for i in range(9, 100):
+            tracker.record(i)
+        assert tracker.percentile(0.95) == 95
+
+
+@pytest.mark.unit
+class TestHedging:
+    def _policy(self, latency):
+        policy = RetryPolicy("test", hedge_percentile=0.95, min_latency_samples=1)
+        policy.record_success("model", latency)
+        return policy
+
+    def test_no_hedging_by_default(self):
+        policy = RetryPolicy("test")
+        policy.record_success("model", 0.01)
+        assert policy.hedge_delay("model") is None
+
+    def test_slow_request_is_hedged(self):
+        policy = self._policy(0.01)
+        calls = []
+        release = threading.Event()
+
+        def request():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(1)
+                return "slow"
+            return "fast"
+
+        try:
+            assert policy.call("model", request) == "fast"
+        finally:
+            release.set()
+        assert len(calls) == 2
+
+    def test_fast_request_is_not_hedged(self):
+        policy = self._policy(1.0)
+        request = MagicMock(return_value="result")
+
+        assert policy.call("model", request) == "result"
+        assert request.call_count == 1
+
+    def test_hedge_failure_falls_back_to_primary(self):
+        policy = self._policy(0.01)
+        calls = []
+
+        def request():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                return "primary"
+            raise RuntimeError("hedge failed")
+
+        assert policy.call("model", request) == "primary"
+
+    def test_hedge_needs_retry_budget(self):
+        policy = RetryPolicy(
+            "test",
+            retry_ratio=0,
+            min_retries_per_second=0,
+            max_retry_tokens=0,
+            hedge_percentile=0.95,
+            min_latency_samples=1,
+        )
+        policy.record_success("model", 0.001)
+        request = MagicMock(side_effect=lambda: time.sleep(0.02) or "result")
+
+        assert policy.call("model", request) == "result"
+        assert request.call_count == 1
+
+    def test_async_hedge_cancels_loser(self):
+        policy = self._policy(0.01)
+        cancelled = []
+
+        async def run():
+            calls = 0
+
+            async def request():
+                nonlocal calls
+                calls += 1
+                if calls == 1:
+                    try:
+                        await asyncio.sleep(1)
+                    except asyncio.CancelledError:
+                        cancelled.append(True)
+                        raise
+                    return "slow"
+                return "fast"
+
+            result = await policy.call_async("model", request)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(run()) == "fast"
+        assert cancelled == [True]
+
+
+@pytest.mark.unit
+class TestGetRetryPolicy:
+    def test_disabled_by_default(self):
+        policy = resilience.get_retry_policy("bedrock")
+
+        assert policy.retry_budget is None
+        assert policy.failure_threshold is None
+        assert policy.hedge_percentile is None
+
+    def test_settings_from_environment(self, monkeypatch):
+        monkeypatch.setenv(
+            "RETRY_POLICY", json.dumps({"retry_ratio": 0.2, "failure_threshold": 3})
+        )
+
+        policy = resilience.get_retry_policy("bedrock")
+
+        assert policy.retry_budget.retry_ratio == 0.2
+        assert policy.failure_threshold == 3
+        assert resilience.get_retry_policy("bedrock") is policy
+        assert resilience.get_retry_policy("sagemaker") is not policy
+
+
+@pytest.mark.unit
+class TestBedrockClientRetryPolicy:
+    def test_retry_budget_stops_retries(self):
+        policy = RetryPolicy(
+            "bedrock", retry_ratio=0, min_retries_per_second=0, max_retry_tokens=1
+        )
+        client = _client(policy)
+        client.client.converse.side_effect = _throttle()
+
+        with pytest.raises(ClientError):
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        # One attempt plus the single retry in the budget
+        assert client.client.converse.call_count == 2
+
+    def test_open_circuit_fails_fast(self):
+        policy = RetryPolicy("bedrock", failure_threshold=2, recovery_seconds=60)
+        client = _client(policy)
+        client.client.converse.side_effect = _throttle()
+
+        with pytest.raises(CircuitOpenError):
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+        assert client.client.converse.call_count == 2
+
+        with pytest.raises(CircuitOpenError):
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+        assert client.client.converse.call_count == 2
+
+    def test_successful_attempts_record_latency(self):
+        policy = RetryPolicy("bedrock", hedge_percentile=0.95, min_latency_samples=1)
+        client = _client(policy)
+        client.client.converse.return_value = dict(RESPONSE)
+
+        client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        assert policy.hedge_delay(MODEL_ID) is not None
+
+    def test_embedding_uses_retry_budget(self):
+        policy = RetryPolicy(
+            "bedrock", retry_ratio=0, min_retries_per_second=0, max_retry_tokens=0
+        )
+        client = _client(policy)
+        client.client.invoke_model.side_effect = _throttle()
+
+        with pytest.raises(ClientError):
+            client.generate_embedding("some text")
+
+        assert client.client.invoke_model.call_count == 1
+
+    def test_request_not_sanitized_when_info_disabled(self):
+        client = _client(RetryPolicy("bedrock"))
+        client.client.converse.return_value = dict(RESPONSE)
+
+        with (
+            patch("idp_common.bedrock.client.logger") as logger,
+            patch.object(client, "_sanitize_messages_for_logging") as sanitize,
+        ):
+            logger.isEnabledFor.return_value = False
+            client.invoke_model(MODEL_ID, "system", [{"text": "hi"}])
+
+        sanitize.assert_not_called()
@@ -8,6 +8,7 @@ import logging
 import time
 from datetime import datetime
 
+from idp_common import metrics
 from idp_common.bda.bda_blueprint_service import BdaBlueprintService
 
 
@@ -18,6 +19,7 @@ logging.getLogger('idp_common.bedrock.client').setLevel(os.environ.get("BEDROCK_
 
 
 
+@metrics.flush_after
 def handler(event, context):
     """
     Processes discovery jobs from SQS queue.
@@ -994,6 +994,7 @@ def process_segments(
     
     return document, overall_hitl_triggered
 
+@metrics.flush_after
 def handler(event, context):
     """
     Process the BDA results and build a Document object with pages and sections.
@@ -11,7 +11,7 @@ import string
 from urllib.parse import urlparse
 from decimal import Decimal
 
-from idp_common import s3, utils
+from idp_common import s3, utils, metrics
 from idp_common.models import Document, Page, Section, Status, HitlMetadata
 from idp_common.docs_service import create_document_service
 from idp_common.config import get_config
@@ -376,6 +376,7 @@ def process_section_for_hitl(section: Section, section_data: dict, confidence_th
     
     return any_hitl_triggered
 
+@metrics.flush_after
 def handler(event, context):
     """
     Consolidates the results from multiple extraction steps into a single output.
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Measure OCR image preprocessing cost per megapixel for the NumPy pipeline and
+the Pillow apply_adaptive_binarization fallback.
+
+Example:
+    python scripts/benchmark_image_preprocessing.py page.jpg
+    python scripts/benchmark_image_preprocessing.py page.jpg --steps normalize deskew binarize
+"""
+
+import argparse
+import logging
+
+from idp_common.image.preprocessing import benchmark_preprocessing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR image preprocessing engines"
+    )
+    parser.add_argument("image", help="Path to a local page image (JPEG/PNG)")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["numpy", "pillow"],
+        help="Preprocessing engines to compare (default: numpy pillow)",
+    )
+    parser.add_argument(
+        "--steps",
+        nargs="+",
+        default=None,
+        help="Pipeline steps for the numpy engine (default: binarize)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per engine (fastest is reported)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with open(args.image, "rb") as f:
+        content = f.read()
+
+    results = benchmark_preprocessing(
+        content, steps=args.steps, engines=args.engines, repeat=args.repeat
+    )
+    print(f"{'engine':<10} {'megapixels':>10} {'seconds':>9} {'ms/MP':>9}")
+    for engine, stats in results.items():
+        print(
+            f"{engine:<10} {stats['megapixels']:>10.2f} {stats['seconds']:>9.3f} "
+            f"{stats['ms_per_megapixel']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Compare OCR page rasterization throughput (pages/sec) between the thread and
+process modes of idp_common.ocr.rasterizer.PageRasterizer.
+
+Example:
+    python scripts/benchmark_ocr_rasterization.py samples/lending_package.pdf --workers 4
+"""
+
+import argparse
+import logging
+
+from idp_common.ocr.rasterizer import benchmark_rasterization
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR page rasterization modes"
+    )
+    parser.add_argument("pdf", help="Path to a local PDF file")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["thread", "process"],
+        help="Rasterization modes to compare (default: thread process)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Workers per mode")
+    parser.add_argument("--dpi", type=int, default=150, help="Render DPI")
+    parser.add_argument("--target-width", type=int, default=951)
+    parser.add_argument("--target-height", type=int, default=1268)
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of runs per mode"
+    )
+    args = parser.parse_args()
+
+    # Per-page INFO logs from the renderer would dominate the measurement
+    logging.basicConfig(level=logging.WARNING)
+
+    with open(args.pdf, "rb") as f:
+        content = f.read()
+
+    resize_config = {
+        "target_width": args.target_width,
+        "target_height": args.target_height,
+    }
+
+    print(f"{'mode':<10} {'run':>3} {'pages':>6} {'errors':>6} {'seconds':>9} {'pages/s':>9}")
+    for run in range(1, args.repeat + 1):
+        results = benchmark_rasterization(
+            content,
+            modes=args.modes,
+            workers=args.workers,
+            dpi=args.dpi,
+            resize_config=resize_config,
+        )
+        for mode, stats in results.items():
+            print(
+                f"{mode:<10} {run:>3} {stats['pages']:>6} {stats['errors']:>6} "
+                f"{stats['seconds']:>9.2f} {stats['pages_per_second']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ import hashlib
 import os
 from urllib.parse import urlparse
 from botocore.exceptions import ClientError
+from idp_common import metrics
 from idp_common.bedrock.client import BedrockClient
 
 # Set up logging
@@ -93,6 +94,7 @@ def get_summarization_model():
         logger.error(f"Error getting summarization model from config: {str(e)}")
         return 'us.amazon.nova-pro-v1:0'  # Fallback default
 
+@metrics.flush_after
 def handler(event, context):
     response_data = {}
 